@@ -8,6 +8,8 @@ from typing import Any, Dict, Optional
 
 import yaml
 
+from client.message_protocol import WIRE_FORMATS
+
 
 class ConfigValidationError(Exception):
     """Custom exception for configuration validation errors."""
@@ -122,6 +124,16 @@ class ConfigManager:
         if not isinstance(heartbeat_config["interval"], int):
             raise ConfigValidationError("Invalid type for heartbeat.interval: must be integer")
 
+        # Wire format is optional
+        if (
+            "wire_format" in heartbeat_config
+            and heartbeat_config["wire_format"] not in WIRE_FORMATS
+        ):
+            raise ConfigValidationError(
+                f"Invalid heartbeat.wire_format: {heartbeat_config['wire_format']}. "
+                f"Must be one of: {', '.join(WIRE_FORMATS)}"
+            )
+
         # Validate logging section
         logging_config = config["logging"]
         required_logging_fields = ["level"]
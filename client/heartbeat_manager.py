@@ -11,7 +11,12 @@ from typing import Any, Dict, Optional
 
 from client.config_manager import ConfigManager
 from client.connection_manager import ConnectionError, ConnectionManager
-from client.message_protocol import MessageProtocol, TCPSender
+from client.message_protocol import (
+    WIRE_FORMAT_COMPACT,
+    WIRE_FORMAT_JSON,
+    MessageProtocol,
+    TCPSender,
+)
 from client.system_info import SystemInfo
 
 
@@ -37,6 +42,7 @@ class HeartbeatManager:
         # Load heartbeat configuration with default
         heartbeat_config = config.get("heartbeat", {})
         self._interval = heartbeat_config.get("interval", 60)  # Default 60 seconds
+        self._wire_format = heartbeat_config.get("wire_format", WIRE_FORMAT_JSON)
 
         # Initialize components
         self._config = config
@@ -186,11 +192,16 @@ class HeartbeatManager:
         Handles errors gracefully and reschedules the next heartbeat.
         """
         try:
-            # Create heartbeat message with auth token support
-            message = self._create_heartbeat_message()
-
-            # Serialize and frame the message
-            serialized = json.dumps(message).encode("utf-8")
+            # Create and serialize the heartbeat message with auth token support
+            if self._wire_format == WIRE_FORMAT_COMPACT:
+                serialized = self._protocol.serialize_compact_registration(
+                    self._system_info.get_hostname(), self.auth_token
+                )
+            else:
+                message = self._create_heartbeat_message()
+                serialized = json.dumps(message).encode("utf-8")
+
+            # Frame the message
             framed = self._sender.frame_message(serialized)
 
             # Connect and send
@@ -6,7 +6,19 @@ Handles message creation, validation, serialization, and TCP framing.
 import json
 import struct
 from datetime import datetime, timezone
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
+
+# Wire formats understood by the server. "compact" is a fixed binary layout for
+# registrations, marked by a leading 0x02 byte in place of JSON's "{"; it
+# carries the same v1.0 message in a fraction of the bytes, including the full
+# auth token (it is smaller on the wire, not more private).
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_COMPACT = "compact"
+WIRE_FORMATS = (WIRE_FORMAT_JSON, WIRE_FORMAT_COMPACT)
+COMPACT_MARKER = 0x02
+COMPACT_REGISTRATION = 0x01
+# marker, message type, timestamp in epoch milliseconds
+_COMPACT_HEADER = struct.Struct("!BBQ")
 
 
 class MessageValidationError(Exception):
@@ -130,6 +142,52 @@ class MessageProtocol:
         except (TypeError, ValueError) as e:
             raise MessageValidationError(f"JSON serialization failed: {e}")
 
+    def serialize_compact_registration(
+        self, hostname: str, auth_token: Optional[str] = None, timestamp: Optional[datetime] = None
+    ) -> bytes:
+        """
+        Serialize a registration in the compact binary wire format.
+
+        Layout: marker (0x02), type (0x01), uint64 epoch milliseconds, then
+        uint8-length-prefixed hostname and auth token (ASCII). An empty token
+        means none.
+
+        Args:
+            hostname: Client hostname to register
+            auth_token: Optional API token
+            timestamp: Registration time (defaults to now)
+
+        Returns:
+            Compact payload bytes (without the TCP length prefix)
+
+        Raises:
+            MessageValidationError: If a field cannot be encoded
+        """
+        if not hostname or not isinstance(hostname, str) or not hostname.strip():
+            raise MessageValidationError("Hostname must be a non-empty string")
+
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+
+        try:
+            hostname_bytes = hostname.strip().encode("ascii")
+            token_bytes = (auth_token or "").encode("ascii")
+        except UnicodeEncodeError as e:
+            raise MessageValidationError(f"Compact encoding requires ASCII fields: {e}")
+
+        if len(hostname_bytes) > 255 or len(token_bytes) > 255:
+            raise MessageValidationError("Compact encoding limits fields to 255 bytes")
+
+        return (
+            _COMPACT_HEADER.pack(
+                COMPACT_MARKER, COMPACT_REGISTRATION, int(timestamp.timestamp() * 1000)
+            )
+            + bytes((len(hostname_bytes),))
+            + hostname_bytes
+            + bytes((len(token_bytes),))
+            + token_bytes
+        )
+
     def get_current_version(self) -> str:
         """
         Get the current protocol version.
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Backfill API token lookup hashes for Prism.
+
+Tokens issued before the lookup_hash column existed are found by a bcrypt
+scan the first time a client presents them. Run this before upgrading a
+fleet to do that work offline: it reads the clients' plain tokens (one per
+line, e.g. collected from their prism-client.yaml files) and stores the
+lookup hash of every legacy token that matches.
+
+The lookup key must match the server's (api.token_lookup_key or
+API_TOKEN_LOOKUP_KEY).
+
+Usage:
+    API_TOKEN_LOOKUP_KEY=... python scripts/backfill_token_lookup_hashes.py \\
+        --database /data/prism.db tokens.txt
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.auth.models import configure_token_lookup_key
+from server.registration_processor import RegistrationProcessor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database", required=True, help="Path to the server's SQLite database")
+    parser.add_argument(
+        "tokens", nargs="?", default="-", help="File with one plain token per line (- for stdin)"
+    )
+    args = parser.parse_args()
+
+    configure_token_lookup_key(None)
+
+    stream = sys.stdin if args.tokens == "-" else open(args.tokens, encoding="utf-8")
+    with stream:
+        tokens = [line.strip() for line in stream if line.strip()]
+
+    with RegistrationProcessor({"database": {"path": args.database}}) as processor:
+        backfilled = processor.backfill_lookup_hashes(tokens)
+
+    print(f"Backfilled {backfilled} of {len(tokens)} tokens")
+
+
+if __name__ == "__main__":
+    main()
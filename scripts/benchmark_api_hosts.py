@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Host API load test for Prism.
+
+Sends N concurrent GET /api/hosts requests through the ASGI app and reports
+requests per second, first with a database manager created (engine, PRAGMAs
+and schema check) and disposed for every request, as the API dependency
+used to do, then with the shared manager created once at startup.
+
+Usage:
+    python scripts/benchmark_api_hosts.py [--requests 2000] [--concurrency 20] [--hosts 50]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+import httpx
+from fastapi import Depends
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.api.app import create_app
+from server.api.dependencies import get_app_config, get_database_manager
+from server.auth.dependencies import get_current_verified_user
+from server.database.connection import DatabaseManager
+from server.database.operations import HostOperations
+
+
+def _per_request_manager(config: dict = Depends(get_app_config)):
+    """Create and dispose of a database manager per request, as before."""
+    db_manager = DatabaseManager(config)
+    db_manager.initialize_schema()
+    try:
+        yield db_manager
+    finally:
+        db_manager.cleanup()
+
+
+async def _load(app, requests: int, concurrency: int) -> float:
+    """Send the requests from concurrent workers; return requests per second."""
+    transport = httpx.ASGITransport(app=app)
+    remaining = iter(range(requests))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            for _ in remaining:
+                response = await client.get("/api/hosts", params={"per_page": 50})
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def _run(requests: int, concurrency: int, hosts: int) -> None:
+    """Measure both dependency setups against the same database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"database": {"path": os.path.join(tmp, "bench.db")}}
+        user = SimpleNamespace(id=uuid.uuid4(), username="bench", is_admin=False)
+
+        setup = DatabaseManager(config)
+        setup.initialize_schema()
+        host_ops = HostOperations(setup)
+        for i in range(hosts):
+            host_ops.create_host(f"host-{i}", f"10.0.{i // 256}.{i % 256}", str(user.id))
+        setup.cleanup()
+
+        print(f"Requests: {requests}, concurrency: {concurrency}, hosts per page: {hosts}")
+        for label, per_request in (("per-request manager", True), ("shared manager", False)):
+            app = create_app(config)
+            app.dependency_overrides[get_current_verified_user] = lambda: user
+            if per_request:
+                app.dependency_overrides[get_database_manager] = _per_request_manager
+
+            async with app.router.lifespan_context(app):
+                await _load(app, min(requests, concurrency), concurrency)  # warm-up
+                rate = await _load(app, requests, concurrency)
+            print(f"  {label:20s} {rate:10.1f} req/s")
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--hosts", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.requests, args.concurrency, args.hosts))
+
+
+if __name__ == "__main__":
+    main()
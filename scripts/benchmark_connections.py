@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Connection throughput benchmark for the Prism TCP server.
+
+Opens short-lived client connections (connect, send one registration, read
+the response, close) and reports connections/sec, once with the shared
+server-scoped registration service and once with the legacy per-connection
+pipeline, where every connection builds its own processor and engine.
+
+Usage:
+    python scripts/benchmark_connections.py [--connections 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.protocol import MessageProtocol
+from server.tcp_server import TCPServer
+
+
+async def _one_connection(port: int, index: int) -> None:
+    """Run a single connect/register/close cycle."""
+    protocol = MessageProtocol()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    message = {
+        "version": "1.0",
+        "type": "registration",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "hostname": f"bench-host-{index}",
+        "auth_token": "benchmark-token-not-registered",
+    }
+    writer.write(protocol.encode_message(message))
+    await writer.drain()
+    await reader.read(4096)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _run(shared: bool, connections: int, concurrency: int) -> float:
+    """Run the benchmark and return connections per second."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = {
+            "server": {"host": "127.0.0.1", "tcp_port": 0, "max_connections": 10000},
+            "database": {"path": os.path.join(tmp_dir, "bench.db")},
+            "registration": {"enable_rate_limiting": False},
+        }
+        server = TCPServer(config)
+        if not shared and server.registration_service:
+            # Legacy behaviour: every ConnectionHandler builds its own pipeline
+            await server.registration_service.close()
+            server.registration_service = None
+
+        await server.start()
+        port = server.get_server_address()[1]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(index: int) -> None:
+            async with semaphore:
+                await _one_connection(port, index)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(connections)))
+        elapsed = time.perf_counter() - start
+
+        await server.stop(graceful=False)
+        return connections / elapsed
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    per_connection = asyncio.run(_run(False, args.connections, args.concurrency))
+    shared = asyncio.run(_run(True, args.connections, args.concurrency))
+
+    print(f"Connections: {args.connections}, concurrency: {args.concurrency}")
+    print(f"  per-connection pipeline: {per_connection:8.1f} conn/s")
+    print(f"  shared pipeline:         {shared:8.1f} conn/s")
+    print(f"  speedup:                 {shared / per_connection:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+DNS update batching benchmark for Prism.
+
+Simulates a carrier renumbering N hosts against a PowerDNS API with a fixed
+per-request latency, comparing one PATCH per host (create_a_record, as the
+registration path did inline) with DNSUpdateQueue's multi-RRset PATCHes.
+No database is used, so only the PowerDNS side is measured.
+
+Usage:
+    python scripts/benchmark_dns_batching.py [--hosts 5000] [--latency-ms 2] [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.dns_manager import PowerDNSClient
+from server.dns_update_queue import DNSUpdateQueue
+
+
+def _client(latency: float) -> tuple:
+    """Create a PowerDNS client whose requests sleep instead of hitting the API."""
+    client = PowerDNSClient({"powerdns": {"enabled": True, "default_zone": "bench.local."}})
+    requests = []
+
+    async def make_request(method, endpoint, json_data=None, params=None):
+        requests.append(len(json_data["rrsets"]))
+        await asyncio.sleep(latency)
+        return {}
+
+    client._make_request = make_request
+    return client, requests
+
+
+async def _run_inline(hosts: int, latency: float) -> tuple:
+    """PATCH each host on its own, serially."""
+    client, requests = _client(latency)
+    start = time.perf_counter()
+    for i in range(hosts):
+        await client.create_a_record(f"host-{i}", f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+    return time.perf_counter() - start, len(requests)
+
+
+async def _run_queue(hosts: int, latency: float, batch_size: int) -> tuple:
+    """Queue every host and flush once."""
+    client, requests = _client(latency)
+    queue = DNSUpdateQueue(client, batch_size=batch_size)
+    start = time.perf_counter()
+    for i in range(hosts):
+        queue.enqueue(None, f"host-{i}", f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+    await queue.flush()
+    return time.perf_counter() - start, len(requests)
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000.0
+    inline_time, inline_requests = asyncio.run(_run_inline(args.hosts, latency))
+    queue_time, queue_requests = asyncio.run(_run_queue(args.hosts, latency, args.batch_size))
+
+    print(f"Hosts: {args.hosts}, API latency: {args.latency_ms}ms")
+    print(f"  per-host PATCH  {inline_requests:6d} requests  {inline_time:8.3f}s")
+    print(f"  batched queue   {queue_requests:6d} requests  {queue_time:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
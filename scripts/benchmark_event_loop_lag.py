@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Event loop lag benchmark for the Prism TCP registration path.
+
+Starts a TCP server, opens N concurrent authenticated clients that each
+register a distinct host, and samples event loop lag while they run. The
+run is repeated with registration.executor_workers=0 (blocking SQLite and
+bcrypt work inline on the loop, the legacy behaviour) and with a bounded
+executor, so the two lag distributions can be compared.
+
+Usage:
+    python scripts/benchmark_event_loop_lag.py [--clients 5000] [--workers 8]
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.auth.models import APIToken, User
+from server.protocol import MessageProtocol
+from server.tcp_server import TCPServer
+
+BENCH_TOKEN = "benchmarkTokenForLoopLag12345678"
+
+
+def _seed_token(server: TCPServer) -> None:
+    """Create a user and API token for the benchmark clients."""
+    with server.db_manager.get_session() as session:
+        user = User(email="bench@example.com", username="bench", password_hash="x")
+        session.add(user)
+        session.flush()
+        session.add(
+            APIToken(
+                user_id=user.id,
+                name="benchmark",
+                token_hash=APIToken.hash_token(BENCH_TOKEN),
+                lookup_hash=APIToken.compute_lookup_hash(BENCH_TOKEN),
+            )
+        )
+
+
+async def _client(port: int, index: int) -> None:
+    """Register one host and wait for the response."""
+    protocol = MessageProtocol()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    message = {
+        "version": "1.0",
+        "type": "registration",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "hostname": f"lag-host-{index}",
+        "auth_token": BENCH_TOKEN,
+    }
+    writer.write(protocol.encode_message(message))
+    await writer.drain()
+    await reader.read(4096)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _sample_lag(samples: list, stop: asyncio.Event, interval: float = 0.01) -> None:
+    """Record how late each scheduled wakeup runs."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - scheduled))
+
+
+async def _run(workers: int, clients: int) -> dict:
+    """Run one benchmark pass and return lag statistics."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = {
+            "server": {"host": "127.0.0.1", "tcp_port": 0, "max_connections": clients * 2},
+            "database": {"path": os.path.join(tmp_dir, "bench.db")},
+            "registration": {
+                "executor_workers": workers,
+                "enable_rate_limiting": False,
+            },
+        }
+        server = TCPServer(config)
+        _seed_token(server)
+        await server.start()
+        port = server.get_server_address()[1]
+
+        samples: list = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_lag(samples, stop))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_client(port, i) for i in range(clients)), return_exceptions=True)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await sampler
+        await server.stop(graceful=False)
+
+    samples.sort()
+    return {
+        "elapsed": elapsed,
+        "p50": statistics.median(samples) * 1000,
+        "p99": samples[int(len(samples) * 0.99) - 1] * 1000,
+        "max": samples[-1] * 1000,
+    }
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # Each client needs two descriptors (client and server side)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, args.clients * 3)), hard))
+
+    print(f"Concurrent clients: {args.clients}")
+    for label, workers in (
+        ("inline (workers=0)", 0),
+        (f"executor (workers={args.workers})", args.workers),
+    ):
+        result = asyncio.run(_run(workers, args.clients))
+        print(
+            f"  {label:22s} total={result['elapsed']:6.2f}s  loop lag "
+            f"p50={result['p50']:7.2f}ms p99={result['p99']:8.2f}ms max={result['max']:8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Heartbeat write throughput benchmark for Prism.
+
+Seeds N online hosts and replays heartbeats for them, comparing the legacy
+path (one update_host_last_seen transaction per heartbeat) against the
+write-behind HeartbeatBuffer (coalesced executemany flushes). Reports
+heartbeats/sec sustained and how many rows each path actually wrote.
+
+Usage:
+    python scripts/benchmark_heartbeat_buffer.py [--hosts 10000] [--heartbeats 50000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.database.connection import DatabaseManager
+from server.database.models import Host
+from server.database.operations import HostOperations
+from server.heartbeat_buffer import HeartbeatBuffer
+
+
+def _seed_hosts(db_manager: DatabaseManager, count: int) -> list:
+    """Insert online hosts and return (id, hostname) pairs."""
+    with db_manager.get_session() as session:
+        session.add_all(
+            Host(hostname=f"hb-host-{i}", current_ip="10.0.0.1", created_by="bench")
+            for i in range(count)
+        )
+    with db_manager.get_session() as session:
+        return [(host.id, host.hostname) for host in session.query(Host).all()]
+
+
+def _run_direct(db_manager: DatabaseManager, schedule: list) -> float:
+    """Write every heartbeat immediately, as the processor did before."""
+    host_ops = HostOperations(db_manager)
+    start = time.perf_counter()
+    for _, hostname in schedule:
+        host_ops.update_host_last_seen(hostname)
+    return time.perf_counter() - start
+
+
+async def _run_buffered(db_manager: DatabaseManager, schedule: list, interval_ms: int) -> tuple:
+    """Record heartbeats into the buffer while it flushes in the background."""
+    buffer = HeartbeatBuffer(db_manager, flush_interval_ms=interval_ms)
+    buffer.start()
+    start = time.perf_counter()
+    for index, (host_id, _) in enumerate(schedule):
+        buffer.record(host_id)
+        if index % 1000 == 0:
+            # Yield like a server handling many connections would
+            await asyncio.sleep(0)
+    await buffer.stop()
+    return time.perf_counter() - start, buffer.get_stats()
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=10000)
+    parser.add_argument("--heartbeats", type=int, default=50000)
+    parser.add_argument("--direct-sample", type=int, default=2000)
+    parser.add_argument("--flush-interval-ms", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = {"database": {"path": os.path.join(tmp_dir, "bench.db")}}
+        db_manager = DatabaseManager(config)
+        db_manager.initialize_schema()
+        hosts = _seed_hosts(db_manager, args.hosts)
+
+        schedule = [random.choice(hosts) for _ in range(args.heartbeats)]
+
+        # The direct path is slow; time a sample and extrapolate the rate
+        direct_elapsed = _run_direct(db_manager, schedule[: args.direct_sample])
+        direct_rate = args.direct_sample / direct_elapsed
+
+        buffered_elapsed, stats = asyncio.run(
+            _run_buffered(db_manager, schedule, args.flush_interval_ms)
+        )
+        buffered_rate = args.heartbeats / buffered_elapsed
+
+        db_manager.cleanup()
+
+    print(f"Hosts: {args.hosts}  heartbeats: {args.heartbeats}")
+    print(f"  direct   {direct_rate:10.0f} heartbeats/s  (1 transaction per heartbeat)")
+    print(
+        f"  buffered {buffered_rate:10.0f} heartbeats/s  "
+        f"({stats['flushes']} flushes, {stats['rows_flushed']} rows, "
+        f"{stats['heartbeats_coalesced']} coalesced)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Heartbeat timeout sweep benchmark for Prism.
+
+Seeds N online hosts with a fraction of them stale, then times the legacy
+check_host_timeouts + mark_hosts_offline path against the set-based
+sweep_host_timeouts, both on a fresh copy of the same database. Also times
+a steady-state sweep where nothing has timed out, which is what the
+monitor runs most of the time.
+
+Usage:
+    python scripts/benchmark_heartbeat_sweep.py [--hosts 100000] [--stale-percent 1]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.database.connection import DatabaseManager
+from server.database.migrations import DatabaseMigrations
+from server.heartbeat_monitor import HeartbeatMonitor
+
+
+def _seed(db_path: str, hosts: int, stale_percent: float) -> None:
+    """Create the schema and bulk insert hosts with raw sqlite3 for speed."""
+    db_manager = DatabaseManager({"database": {"path": db_path}})
+    db_manager.initialize_schema()
+    DatabaseMigrations(db_manager).migrate_to_latest()
+    db_manager.cleanup()
+
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(hours=1)
+    stale_every = max(1, int(100 / stale_percent)) if stale_percent else 0
+
+    def fmt(value: datetime) -> str:
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+    rows = (
+        (
+            f"sweep-host-{i}",
+            "10.0.0.1",
+            fmt(now),
+            fmt(stale if stale_every and i % stale_every == 0 else now),
+            "online",
+            "bench",
+            fmt(now),
+            fmt(now),
+        )
+        for i in range(hosts)
+    )
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO hosts (hostname, current_ip, first_seen, last_seen, status, created_by, "
+        "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _config(db_path: str) -> dict:
+    """Monitor configuration for a benchmark database."""
+    return {
+        "database": {"path": db_path},
+        "heartbeat": {"timeout_multiplier": 2, "grace_period": 30, "max_hosts_per_check": 1000},
+    }
+
+
+def _offline_ids(db_path: str) -> set:
+    """Ids of the hosts a run left offline."""
+    conn = sqlite3.connect(db_path)
+    ids = {row[0] for row in conn.execute("SELECT id FROM hosts WHERE status = 'offline'")}
+    conn.close()
+    return ids
+
+
+async def _legacy(db_path: str) -> tuple:
+    """Load online hosts, filter in Python, then mark each one offline."""
+    monitor = HeartbeatMonitor(_config(db_path))
+    start = time.perf_counter()
+    # The legacy check only looks at max_hosts_per_check hosts per pass
+    timeout_result = await monitor.check_host_timeouts(limit=10**9)
+    result = await monitor.mark_hosts_offline(timeout_result.timed_out_host_ids)
+    elapsed = time.perf_counter() - start
+    monitor.cleanup()
+    return elapsed, result.hosts_marked_offline
+
+
+async def _sweep(db_path: str) -> tuple:
+    """Run the set-based sweep twice: once with stale hosts, once steady state."""
+    monitor = HeartbeatMonitor(_config(db_path))
+
+    start = time.perf_counter()
+    result = await monitor.sweep_host_timeouts()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await monitor.sweep_host_timeouts()
+    steady = time.perf_counter() - start
+
+    monitor.cleanup()
+    return elapsed, result.hosts_marked_offline, steady
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=100000)
+    parser.add_argument("--stale-percent", type=float, default=1.0)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seed_path = os.path.join(tmp_dir, "seed.db")
+        _seed(seed_path, args.hosts, args.stale_percent)
+
+        print(f"Hosts: {args.hosts}  stale: {args.stale_percent}%")
+
+        if not args.skip_legacy:
+            legacy_path = os.path.join(tmp_dir, "legacy.db")
+            shutil.copy(seed_path, legacy_path)
+            elapsed, marked = asyncio.run(_legacy(legacy_path))
+            print(f"  legacy loop  {elapsed * 1000:10.1f}ms  ({marked} hosts marked offline)")
+
+        sweep_path = os.path.join(tmp_dir, "sweep.db")
+        shutil.copy(seed_path, sweep_path)
+        elapsed, marked, steady = asyncio.run(_sweep(sweep_path))
+        print(f"  sweep        {elapsed * 1000:10.1f}ms  ({marked} hosts marked offline)")
+        print(f"  sweep (idle) {steady * 1000:10.1f}ms  (no timed out hosts)")
+
+        if not args.skip_legacy:
+            # Both paths must leave exactly the same hosts offline
+            assert _offline_ids(legacy_path) == _offline_ids(sweep_path), "offline hosts differ"
+
+
+if __name__ == "__main__":
+    main()
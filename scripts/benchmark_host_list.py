@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Host list query benchmark for Prism.
+
+Compares serving one page of GET /api/hosts by loading every host of the
+user, searching and slicing in Python (as the route used to) against
+HostOperations.get_hosts_page, which filters, counts and pages in SQL.
+
+Usage:
+    python scripts/benchmark_host_list.py [--hosts 100000] [--pages 20] [--per-page 50]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.database.connection import DatabaseManager
+from server.database.models import Host
+from server.database.operations import HostOperations
+
+
+def _populate(db_manager: DatabaseManager, count: int, user_id: str) -> None:
+    """Insert hosts for one user in bulk, with spread-out last_seen times."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "hostname": f"{('web', 'db', 'cache', 'api')[i % 4]}-{i}.example",
+            "current_ip": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            "status": "online" if i % 3 else "offline",
+            "created_by": user_id,
+            "first_seen": now,
+            "last_seen": now - timedelta(seconds=i),
+            "created_at": now,
+            "updated_at": now,
+            "dns_sync_status": "pending",
+        }
+        for i in range(count)
+    ]
+    with db_manager.get_session() as session:
+        session.bulk_insert_mappings(Host, rows)
+
+
+def _python_page(host_ops: HostOperations, user_id, search, offset, per_page):
+    """Serve a page the old way: load all, search and slice in Python."""
+    hosts = host_ops.get_all_hosts(user_id=user_id)
+    if search:
+        hosts = [host for host in hosts if search.lower() in host.hostname.lower()]
+    return hosts[offset : offset + per_page], len(hosts)
+
+
+def _sql_page(host_ops: HostOperations, user_id, search, offset, per_page):
+    """Serve a page with get_hosts_page."""
+    return host_ops.get_hosts_page(user_id=user_id, search=search, limit=per_page, offset=offset)
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=100000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--per-page", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager({"database": {"path": os.path.join(tmp, "bench.db")}})
+        db_manager.initialize_schema()
+        _populate(db_manager, args.hosts, "bench-user")
+        host_ops = HostOperations(db_manager)
+
+        print(f"Hosts: {args.hosts}, pages: {args.pages}, per page: {args.per_page}")
+        for search in (None, "cache-1"):
+            print(f"  search={search!r}")
+            results = {}
+            for label, serve in (("python filter", _python_page), ("sql page", _sql_page)):
+                start = time.perf_counter()
+                for page in range(args.pages):
+                    hosts, total = serve(
+                        host_ops, "bench-user", search, page * args.per_page, args.per_page
+                    )
+                elapsed = (time.perf_counter() - start) / args.pages
+                results[label] = ([host.id for host in hosts], total)
+                print(f"    {label:14s} {elapsed * 1000:10.2f} ms/page")
+
+            # Both must serve the same page
+            assert results["python filter"] == results["sql page"]
+
+        db_manager.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Host statistics benchmark for Prism.
+
+Compares computing the /api/health and /api/stats host statistics with the
+six separate queries get_host_statistics used to run against the single
+conditional-aggregate query, and against serving them from the API's
+statistics cache. Also compares one user's summary aggregated over hosts
+with reading it from the host_counters row.
+
+Usage:
+    python scripts/benchmark_host_stats.py [--hosts 100000] [--calls 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import desc, func
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.api.stats_cache import StatsCache
+from server.database.connection import DatabaseManager
+from server.database.models import Host
+from server.database.operations import HostOperations
+
+
+def _populate(db_manager: DatabaseManager, count: int) -> None:
+    """Insert hosts in bulk, a third of them offline."""
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "hostname": f"host-{i}",
+            "current_ip": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+            "status": "offline" if i % 3 == 0 else "online",
+            "created_by": f"user-{i % 100}",
+            "first_seen": now - timedelta(minutes=i),
+            "last_seen": now - timedelta(minutes=i),
+            "created_at": now,
+            "updated_at": now,
+            "dns_sync_status": "pending",
+        }
+        for i in range(count)
+    ]
+    with db_manager.get_session() as session:
+        session.bulk_insert_mappings(Host, rows)
+
+
+def _separate_queries(db_manager: DatabaseManager) -> dict:
+    """Compute the statistics the way get_host_statistics used to: six queries."""
+    with db_manager.get_session() as session:
+        since_24h = datetime.now(timezone.utc) - timedelta(hours=24)
+        total = session.query(func.count(Host.id)).scalar() or 0
+        online = session.query(func.count(Host.id)).filter(Host.status == "online").scalar() or 0
+        offline = session.query(func.count(Host.id)).filter(Host.status == "offline").scalar() or 0
+        recent = session.query(func.count(Host.id)).filter(Host.last_seen >= since_24h).scalar()
+        oldest = session.query(Host).order_by(Host.first_seen).first()
+        newest = session.query(Host).order_by(desc(Host.first_seen)).first()
+        return {
+            "total_hosts": total,
+            "online_hosts": online,
+            "offline_hosts": offline,
+            "recent_activity_24h": recent or 0,
+            "oldest_host_date": oldest.first_seen.isoformat() if oldest else None,
+            "newest_host_date": newest.first_seen.isoformat() if newest else None,
+        }
+
+
+def _time(label: str, calls: int, func) -> dict:
+    """Call func repeatedly and print the mean time per call."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        result = func()
+    elapsed = (time.perf_counter() - start) / calls
+    print(f"  {label:20s} {elapsed * 1000:10.3f} ms/call")
+    return result
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hosts", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager({"database": {"path": os.path.join(tmp, "bench.db")}})
+        db_manager.initialize_schema()
+        _populate(db_manager, args.hosts)
+        host_ops = HostOperations(db_manager)
+        cache = StatsCache(ttl=5)
+
+        print(f"Hosts: {args.hosts}, calls: {args.calls}")
+        before = _time("six queries", args.calls, lambda: _separate_queries(db_manager))
+        after = _time("one aggregate", args.calls, host_ops.get_host_statistics)
+        cached = _time(
+            "cached (ttl 5s)", args.calls, lambda: cache.get("hosts", host_ops.get_host_statistics)
+        )
+
+        # All three must report the same figures
+        after.pop("last_seen_date")
+        cached = {key: value for key, value in cached.items() if key != "last_seen_date"}
+        assert before == after == cached
+
+        aggregated = _time(
+            "user aggregate", args.calls, lambda: host_ops.get_host_statistics(user_id="user-7")
+        )
+        counters = _time("user counters", args.calls, lambda: host_ops.get_host_counters("user-7"))
+        for key in ("total_hosts", "online_hosts", "offline_hosts"):
+            assert aggregated[key] == counters[key]
+
+        db_manager.cleanup()
+
+
+if __name__ == "__main__":
+    main()
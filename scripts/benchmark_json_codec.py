@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+JSON codec throughput benchmark for Prism.
+
+Encodes and decodes registration messages through MessageProtocol with each
+installed JSON backend (stdlib json, orjson, msgspec) and reports
+registration messages/sec for encode, decode, and the response round trip
+the server does per registration.
+
+Usage:
+    python scripts/benchmark_json_codec.py [--messages 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.json_codec import BACKENDS, JSONCodec, available_backends
+from server.protocol import MessageProtocol
+
+
+def _registration(index: int) -> dict:
+    """Build a registration message like the client sends."""
+    return {
+        "version": "1.0",
+        "type": "registration",
+        "timestamp": "2025-06-01T15:30:00+00:00",
+        "hostname": f"bench-host-{index}",
+        "auth_token": "a" * 64,
+    }
+
+
+def _best(repeat: int, func) -> float:
+    """Run func ``repeat`` times and return the fastest wall time."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _bench_backend(backend: str, messages: list, repeat: int) -> tuple:
+    """Return (encode, decode, round trip) messages/sec for one backend."""
+    protocol = MessageProtocol(max_buffer_size=1 << 30, codec=JSONCodec(backend))
+    stream = b"".join(protocol.encode_message(message) for message in messages)
+    count = len(messages)
+
+    def encode():
+        for message in messages:
+            protocol.encode_message(message)
+
+    def decode():
+        protocol.decode_messages(stream)
+
+    def round_trip():
+        # Decode a registration and encode the response, as a connection does
+        for frame in protocol.decode_messages(stream):
+            protocol.encode_message(
+                protocol.create_registration_response("success", frame["hostname"])
+            )
+
+    return (
+        count / _best(repeat, encode),
+        count / _best(repeat, decode),
+        count / _best(repeat, round_trip),
+    )
+
+
+def main() -> None:
+    """Parse arguments and print a per-backend comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    messages = [_registration(i) for i in range(args.messages)]
+    installed = available_backends()
+
+    print(f"Messages: {args.messages}, best of {args.repeat}")
+    print(f"  {'backend':<8} {'encode/s':>12} {'decode/s':>12} {'round trip/s':>14}")
+    for backend in BACKENDS:
+        if backend not in installed:
+            print(f"  {backend:<8} not installed")
+            continue
+        encode_rate, decode_rate, round_trip_rate = _bench_backend(backend, messages, args.repeat)
+        print(f"  {backend:<8} {encode_rate:12.0f} {decode_rate:12.0f} {round_trip_rate:14.0f}")
+
+
+if __name__ == "__main__":
+    main()
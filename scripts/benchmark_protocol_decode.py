@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Message framing micro-benchmark for Prism.
+
+Decodes 1, 100 and 10k pipelined registration frames delivered in 4KB reads,
+comparing the legacy decoder (re-slice the buffer after every frame, decode
+to str before json.loads) against MessageProtocol.decode_messages and
+MessageProtocol.read_message over an asyncio.StreamReader.
+
+Usage:
+    python scripts/benchmark_protocol_decode.py [--repeat 5] [--read-size 4096]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.protocol import MessageProtocol
+
+
+def _legacy_decode(buffer: bytearray, data: bytes) -> tuple:
+    """Decoder as it was before: copies the remaining buffer after each frame."""
+    buffer.extend(data)
+    messages = []
+    while len(buffer) >= 4:
+        length = struct.unpack("!I", buffer[:4])[0]
+        total_length = 4 + length
+        if len(buffer) < total_length:
+            break
+        messages.append(json.loads(buffer[4:total_length].decode("utf-8")))
+        buffer = buffer[total_length:]
+    return buffer, messages
+
+
+def _build_stream(frames: int) -> bytes:
+    """Encode ``frames`` registration messages back to back."""
+    protocol = MessageProtocol()
+    return b"".join(
+        protocol.encode_message(
+            {
+                "version": "1.0",
+                "type": "registration",
+                "timestamp": "2025-06-01T15:30:00Z",
+                "hostname": f"bench-host-{i}",
+            }
+        )
+        for i in range(frames)
+    )
+
+
+def _chunks(stream: bytes, read_size: int) -> list:
+    """Split a stream the way successive reader.read(read_size) calls would."""
+    return [stream[start : start + read_size] for start in range(0, len(stream), read_size)]
+
+
+def _run_legacy(chunks: list) -> float:
+    """Time the legacy decoder over all chunks."""
+    start = time.perf_counter()
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer, _ = _legacy_decode(buffer, chunk)
+    return time.perf_counter() - start
+
+
+def _run_decode(chunks: list) -> float:
+    """Time decode_messages over all chunks."""
+    protocol = MessageProtocol(max_buffer_size=64 * 1024 * 1024)
+    start = time.perf_counter()
+    for chunk in chunks:
+        protocol.decode_messages(chunk)
+    return time.perf_counter() - start
+
+
+async def _run_stream(stream: bytes, frames: int) -> float:
+    """Time read_message pulling every frame out of a StreamReader."""
+    protocol = MessageProtocol()
+    reader = asyncio.StreamReader(limit=len(stream) + 1)
+    reader.feed_data(stream)
+    reader.feed_eof()
+    start = time.perf_counter()
+    for _ in range(frames):
+        await protocol.read_message(reader)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--read-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    print(f"Read size: {args.read_size} bytes, best of {args.repeat}")
+    for frames in (1, 100, 10000):
+        stream = _build_stream(frames)
+        chunks = _chunks(stream, args.read_size)
+
+        legacy = min(_run_legacy(chunks) for _ in range(args.repeat))
+        decode = min(_run_decode(chunks) for _ in range(args.repeat))
+        readexactly = min(asyncio.run(_run_stream(stream, frames)) for _ in range(args.repeat))
+
+        print(f"  {frames:>6} frames ({len(stream)} bytes)")
+        print(f"    legacy slice  {legacy * 1e6 / frames:8.2f} us/frame")
+        print(f"    offset decode {decode * 1e6 / frames:8.2f} us/frame")
+        print(f"    readexactly   {readexactly * 1e6 / frames:8.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Record search benchmark for Prism.
+
+Compares search_records scanning zones fetched from a simulated PowerDNS
+API (fixed per-request latency, zone cache disabled) with the local FTS5
+search index, for name and content queries over N zones.
+
+Usage:
+    python scripts/benchmark_record_search.py [--zones 500] [--rrsets 50] [--latency-ms 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.database.connection import DatabaseManager
+from server.dns_manager import PowerDNSClient
+from server.dns_search_index import DNSSearchIndex
+
+QUERIES = [("host-7", False), ("10.3.", True), ("zz-none", False)]
+
+
+def _client(zones: int, rrsets: int, latency: float) -> PowerDNSClient:
+    """Create a PowerDNS client whose requests sleep instead of hitting the API."""
+    client = PowerDNSClient({"powerdns": {"enabled": True, "cache_enabled": False}})
+    names = [f"zone{i}.bench." for i in range(zones)]
+
+    async def make_request(method, endpoint, json_data=None, params=None):
+        await asyncio.sleep(latency)
+        if endpoint == "servers/localhost/zones":
+            return [{"name": name, "serial": 1} for name in names]
+        name = endpoint.rsplit("/", 1)[1]
+        zone_number = int(name[4:].split(".")[0])
+        return {
+            "name": name,
+            "serial": 1,
+            "rrsets": [
+                {
+                    "name": f"host-{i}.{name}",
+                    "type": "A",
+                    "ttl": 300,
+                    "records": [{"content": f"10.{zone_number % 256}.{i // 256}.{i % 256}"}],
+                }
+                for i in range(rrsets)
+            ],
+        }
+
+    client._make_request = make_request
+    return client
+
+
+async def _run(zones: int, rrsets: int, latency: float) -> None:
+    """Time each query against PowerDNS and against the index."""
+    client = _client(zones, rrsets, latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager({"database": {"path": os.path.join(tmp, "search.db")}})
+        db_manager.initialize_schema()
+        index = DNSSearchIndex(db_manager, client)
+
+        start = time.perf_counter()
+        await index.reconcile()
+        print(f"Zones: {zones} x {rrsets} RRsets, API latency: {latency * 1000:.1f}ms")
+        print(f"  initial index build {time.perf_counter() - start:8.3f}s")
+
+        for query, content in QUERIES:
+            start = time.perf_counter()
+            live = await client.search_records(query, content_search=content, limit=100)
+            live_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            indexed = await index.search(query, content_search=content, limit=100)
+            index_time = time.perf_counter() - start
+
+            kind = "content" if content else "name"
+            print(f"  {kind} '{query}' ({len(indexed)} results)")
+            print(f"    PowerDNS scan  {live_time * 1000:9.2f}ms  ({len(live)} results)")
+            print(f"    local index    {index_time * 1000:9.2f}ms")
+
+        db_manager.cleanup()
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=500)
+    parser.add_argument("--rrsets", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.zones, args.rrsets, args.latency_ms / 1000.0))
+
+
+if __name__ == "__main__":
+    main()
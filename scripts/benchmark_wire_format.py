@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Heartbeat wire format benchmark for Prism.
+
+Compares the JSON heartbeat the client sends today with the compact binary
+registration frame: bytes on the wire per heartbeat and server-side decode
+time per frame through MessageProtocol.decode_messages.
+
+Usage:
+    python scripts/benchmark_wire_format.py [--frames 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+# Add parent directory to path to import client and server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from client.message_protocol import MessageProtocol as ClientProtocol
+from client.message_protocol import TCPSender
+from server.protocol import MessageProtocol
+
+TOKEN = "a" * 64
+
+
+def _json_frame(index: int) -> bytes:
+    """Build a heartbeat frame the way HeartbeatManager does for wire_format json."""
+    message = {
+        "version": "1.0",
+        "type": "registration",
+        "hostname": f"bench-host-{index}",
+        "client_ip": "192.168.1.100",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "auth_token": TOKEN,
+    }
+    return TCPSender().frame_message(json.dumps(message).encode("utf-8"))
+
+
+def _compact_frame(index: int) -> bytes:
+    """Build a heartbeat frame the way HeartbeatManager does for wire_format compact."""
+    payload = ClientProtocol().serialize_compact_registration(f"bench-host-{index}", TOKEN)
+    return TCPSender().frame_message(payload)
+
+
+def _decode_time(stream: bytes, repeat: int) -> float:
+    """Return the fastest time to decode the whole stream."""
+    timings = []
+    for _ in range(repeat):
+        protocol = MessageProtocol(max_buffer_size=1 << 30)
+        start = time.perf_counter()
+        protocol.decode_messages(stream)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Parse arguments and print a JSON vs compact comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Frames: {args.frames}, best of {args.repeat}")
+    print(f"  {'format':<8} {'bytes/frame':>12} {'decode us/frame':>16}")
+    for name, build in (("json", _json_frame), ("compact", _compact_frame)):
+        stream = b"".join(build(i) for i in range(args.frames))
+        elapsed = _decode_time(stream, args.repeat)
+        print(
+            f"  {name:<8} {len(stream) / args.frames:12.1f} " f"{elapsed * 1e6 / args.frames:16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
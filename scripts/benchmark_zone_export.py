@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Zone export benchmark for Prism.
+
+Compares peak memory and time of the buffered export_zones with the
+streamed stream_export_zones for each format, over N zones served by a
+simulated PowerDNS API (fixed per-request latency, zone cache disabled).
+
+Usage:
+    python scripts/benchmark_zone_export.py [--zones 500] [--rrsets 200] [--latency-ms 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.dns_manager import PowerDNSClient
+from server.json_codec import get_json_codec
+
+FORMATS = ["json", "bind", "csv"]
+
+
+def _client(zones: int, rrsets: int, latency: float) -> PowerDNSClient:
+    """Create a PowerDNS client whose requests sleep instead of hitting the API."""
+    client = PowerDNSClient({"powerdns": {"enabled": True, "cache_enabled": False}})
+    names = [f"zone{i}.bench." for i in range(zones)]
+
+    async def make_request(method, endpoint, json_data=None, params=None):
+        await asyncio.sleep(latency)
+        if endpoint == "servers/localhost/zones":
+            return [{"name": name} for name in names]
+        name = endpoint.rsplit("/", 1)[1]
+        return {
+            "name": name,
+            "rrsets": [
+                {
+                    "name": f"host-{i}.{name}",
+                    "type": "A",
+                    "ttl": 300,
+                    "records": [{"content": f"10.0.{i // 256}.{i % 256}", "disabled": False}],
+                }
+                for i in range(rrsets)
+            ],
+        }
+
+    client._make_request = make_request
+    return client
+
+
+async def _buffered(client: PowerDNSClient, zone_names: list, format: str) -> int:
+    """Run the buffered export, encode it as the API would and return its size."""
+    result = await client.export_zones(zone_names=zone_names, format=format)
+    if format == "json":
+        return len(get_json_codec().dumps(result))
+    return len(result["data"].encode())
+
+
+async def _streamed(client: PowerDNSClient, zone_names: list, format: str) -> int:
+    """Consume the streamed export and return its size."""
+    size = 0
+    async for chunk in await client.stream_export_zones(zone_names=zone_names, format=format):
+        size += len(chunk)
+    return size
+
+
+async def _measure(run, *args) -> tuple:
+    """Return (seconds, peak MiB, size) for one export."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = await run(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+async def _run(zones: int, rrsets: int, latency: float) -> None:
+    """Time each format buffered and streamed."""
+    client = _client(zones, rrsets, latency)
+    zone_names = [f"zone{i}.bench." for i in range(zones)]
+    print(f"Zones: {zones} x {rrsets} RRsets, API latency: {latency * 1000:.1f}ms")
+
+    for format in FORMATS:
+        print(f"  {format}")
+        for label, run in (("buffered", _buffered), ("streamed", _streamed)):
+            elapsed, peak, size = await _measure(run, client, zone_names, format)
+            print(
+                f"    {label}  {elapsed:8.3f}s  peak {peak:8.1f} MiB"
+                f"  ({size / (1024 * 1024):.1f} MiB output)"
+            )
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=500)
+    parser.add_argument("--rrsets", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.zones, args.rrsets, args.latency_ms / 1000.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Zone fan-out benchmark for Prism.
+
+Runs a local PowerDNS API stand-in (aiohttp.web, fixed per-request latency)
+serving N zones, then times list_zones, search_records and export_zones
+through a real PowerDNSClient, walking zones one at a time
+(zone_concurrency=1, the old behaviour) and with bounded fan-out. The zone
+cache is disabled so every zone fetch reaches the stand-in.
+
+Usage:
+    python scripts/benchmark_zone_fanout.py [--zones 300] [--latency-ms 5] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from aiohttp import web
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.dns_manager import PowerDNSClient, close_shared_session
+
+
+def _stand_in(zones: int, latency: float) -> tuple:
+    """Create the PowerDNS stand-in app and its request counter."""
+    names = [f"zone{i}.bench." for i in range(zones)]
+    requests = []
+
+    async def list_zones(request):
+        requests.append(request.path)
+        await asyncio.sleep(latency)
+        return web.json_response([{"id": name, "name": name, "serial": 1} for name in names])
+
+    async def get_zone(request):
+        requests.append(request.path)
+        await asyncio.sleep(latency)
+        name = request.match_info["zone"]
+        rrsets = [
+            {"name": f"host{i}.{name}", "type": "A", "ttl": 300, "records": []} for i in range(20)
+        ]
+        return web.json_response({"id": name, "name": name, "serial": 1, "rrsets": rrsets})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/servers/localhost/zones", list_zones)
+    app.router.add_get("/api/v1/servers/localhost/zones/{zone}", get_zone)
+    return app, names, requests
+
+
+async def _run(zones: int, latency: float, concurrency: int) -> None:
+    """Time each zone walk sequentially and with fan-out."""
+    app, names, requests = _stand_in(zones, latency)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    operations = {
+        "list_zones": lambda client: client.list_zones(),
+        "search_records (limit 100)": lambda client: client.search_records("host1", limit=100),
+        "export_zones (all, named)": lambda client: client.export_zones(zone_names=names),
+    }
+
+    print(f"Zones: {zones}, API latency: {latency * 1000:.1f}ms")
+    try:
+        for label, operation in operations.items():
+            timings = []
+            for zone_concurrency in (1, concurrency):
+                client = PowerDNSClient(
+                    {
+                        "powerdns": {
+                            "enabled": True,
+                            "api_url": f"http://127.0.0.1:{port}/api/v1",
+                            "cache_enabled": False,
+                            "zone_concurrency": zone_concurrency,
+                        }
+                    }
+                )
+                requests.clear()
+                start = time.perf_counter()
+                await operation(client)
+                timings.append((time.perf_counter() - start, len(requests)))
+
+            (seq_time, seq_requests), (fan_time, fan_requests) = timings
+            print(f"  {label}")
+            print(f"    sequential       {seq_requests:5d} requests  {seq_time:8.3f}s")
+            print(
+                f"    concurrency={concurrency:<4d} {fan_requests:5d} requests  {fan_time:8.3f}s"
+                f"  ({seq_time / fan_time:.1f}x)"
+            )
+    finally:
+        await close_shared_session()
+        await runner.cleanup()
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.zones, args.latency_ms / 1000.0, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Zone hierarchy benchmark for Prism.
+
+Compares looking up the parent and level of every zone in a listing with
+detect_zone_hierarchy (a scan of the whole listing per zone) against one
+ZoneHierarchy index. The scan is timed on a sample of zones and
+extrapolated to the full listing.
+
+Usage:
+    python scripts/benchmark_zone_hierarchy.py [--zones 50000] [--sample 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.dns_manager import PowerDNSClient, ZoneHierarchy
+
+
+def _zone_names(count: int) -> list:
+    """Generate customer domains, each with a few nested subzones."""
+    names = []
+    domain = 0
+    while len(names) < count:
+        base = f"customer{domain}.example."
+        names.extend([base, f"dev.{base}", f"api.dev.{base}", f"eu.{base}", f"us.{base}"])
+        domain += 1
+    return names[:count]
+
+
+def _scan(zone_name: str, zone_names: list) -> dict:
+    """Look up one zone the way detect_zone_hierarchy used to: compare with every zone."""
+    hierarchy = {"zone": zone_name, "parent": None, "children": [], "level": 0}
+    zone_labels = zone_name[:-1].split(".")
+    for existing in zone_names:
+        if existing == zone_name:
+            continue
+        existing_labels = existing[:-1].split(".")
+        if len(existing_labels) < len(zone_labels):
+            if zone_labels[-len(existing_labels) :] == existing_labels:
+                if not hierarchy["parent"] or len(existing_labels) > len(
+                    hierarchy["parent"][:-1].split(".")
+                ):
+                    hierarchy["parent"] = existing
+        elif len(existing_labels) > len(zone_labels):
+            if existing_labels[-len(zone_labels) :] == zone_labels:
+                hierarchy["children"].append(existing)
+    if hierarchy["parent"]:
+        hierarchy["level"] = len(zone_labels) - len(hierarchy["parent"][:-1].split("."))
+    return hierarchy
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+
+    zone_names = _zone_names(args.zones)
+    sample = zone_names[:: max(1, len(zone_names) // args.sample)][: args.sample]
+    print(f"Zones: {len(zone_names)}")
+
+    start = time.perf_counter()
+    scanned = [_scan(zone_name, zone_names) for zone_name in sample]
+    per_zone = (time.perf_counter() - start) / len(sample)
+    print(f"  per-zone scan   {per_zone * len(zone_names):10.3f}s  (estimated from {len(sample)})")
+
+    start = time.perf_counter()
+    hierarchy = ZoneHierarchy(zone_names)
+    built = time.perf_counter() - start
+    for zone_name in zone_names:
+        hierarchy.level(zone_name)
+        hierarchy.parent(zone_name)
+    elapsed = time.perf_counter() - start
+    print(f"  hierarchy index {elapsed:10.3f}s  (build {built:.3f}s)")
+
+    # The index must agree with the scan
+    client = PowerDNSClient({"powerdns": {"enabled": True}})
+    for expected in scanned:
+        assert hierarchy.describe(expected["zone"]) == expected
+        assert client.detect_zone_hierarchy(expected["zone"], zone_names[:1000]) == _scan(
+            expected["zone"], zone_names[:1000]
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Zone import benchmark for Prism.
+
+Imports a generated BIND zone file of N zones x M records into a simulated
+PowerDNS API (fixed per-request latency) one RRset per PATCH and one zone
+at a time, as imports used to run, and with batched PATCHes and concurrent
+zones.
+
+Usage:
+    python scripts/benchmark_zone_import.py [--zones 20] [--records 5000] [--latency-ms 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path to import server modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from server.dns_manager import PowerDNSAPIError, PowerDNSClient
+
+
+def _zone_file(zones: int, records: int) -> str:
+    """Generate a zone file with one SOA and N A records per zone."""
+    lines = []
+    for z in range(zones):
+        lines.append(f"$ORIGIN zone{z}.bench.")
+        lines.append("@ 3600 IN SOA ns1 hostmaster 1 1h 15m 1w 300")
+        lines.extend(f"host-{i} A 10.{z % 256}.{i // 256 % 256}.{i % 256}" for i in range(records))
+    return "\n".join(lines)
+
+
+def _client(latency: float, zone_concurrency: int, batch_size: int) -> tuple:
+    """Create a PowerDNS client whose requests sleep instead of hitting the API."""
+    client = PowerDNSClient(
+        {
+            "powerdns": {
+                "enabled": True,
+                "cache_enabled": False,
+                "zone_concurrency": zone_concurrency,
+                "import_batch_size": batch_size,
+            }
+        }
+    )
+    requests = {"count": 0}
+
+    async def make_request(method, endpoint, json_data=None, params=None):
+        requests["count"] += 1
+        await asyncio.sleep(latency)
+        if method == "GET":
+            raise PowerDNSAPIError("Not found", status_code=404)
+        return {}
+
+    client._make_request = make_request
+    return client, requests
+
+
+async def _run(zones: int, records: int, latency: float) -> None:
+    """Time the import one RRset at a time and batched."""
+    data = _zone_file(zones, records)
+    print(f"Zones: {zones} x {records} records, API latency: {latency * 1000:.1f}ms")
+
+    for label, zone_concurrency, batch_size in (
+        ("serial, 1 RRset/PATCH", 1, 1),
+        ("concurrent, batched", 10, 1000),
+    ):
+        client, requests = _client(latency, zone_concurrency, batch_size)
+        start = time.perf_counter()
+        result = await client.import_zones(data, format="bind")
+        elapsed = time.perf_counter() - start
+        print(
+            f"  {label:22s} {elapsed:8.3f}s  {requests['count']:6d} requests"
+            f"  ({result['records_added']} records)"
+        )
+
+
+def main() -> None:
+    """Parse arguments and print a before/after comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--zones", type=int, default=20)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.zones, args.records, args.latency_ms / 1000.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""add lookup hash to api tokens
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c3d4e5f6a7"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add indexed lookup_hash column; existing tokens are backfilled on first use."""
+    with op.batch_alter_table("api_tokens", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("lookup_hash", sa.String(length=64), nullable=True))
+        batch_op.create_index("ix_api_tokens_lookup_hash", ["lookup_hash"], unique=True)
+
+
+def downgrade() -> None:
+    """Remove lookup_hash column."""
+    with op.batch_alter_table("api_tokens", schema=None) as batch_op:
+        batch_op.drop_index("ix_api_tokens_lookup_hash")
+        batch_op.drop_column("lookup_hash")
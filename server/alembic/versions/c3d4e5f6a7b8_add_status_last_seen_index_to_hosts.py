@@ -0,0 +1,27 @@
+"""add status last_seen index to hosts
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d4e5f6a7b8"
+down_revision: Union[str, None] = "b2c3d4e5f6a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (status, last_seen) index used by the heartbeat timeout sweep."""
+    op.create_index("idx_hosts_status_last_seen", "hosts", ["status", "last_seen"], unique=False)
+
+
+def downgrade() -> None:
+    """Remove heartbeat timeout sweep index."""
+    op.drop_index("idx_hosts_status_last_seen", table_name="hosts")
@@ -8,9 +8,11 @@ import logging
 import os
 import time
 import uuid
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.datastructures import Default
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -19,12 +21,18 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from server.api.dependencies import set_app_config
+from server.api.dependencies import (
+    close_database_manager,
+    init_database_manager,
+    set_app_config,
+)
 from server.api.models import ErrorResponse
 from server.api.routes import dns, health, hosts, metrics, tokens, users
 from server.auth.dependencies import get_current_verified_user
+from server.auth.models import configure_token_lookup_key
 from server.auth.routes import router as auth_router
-from server.database.connection import init_async_db
+from server.database.connection import close_async_db, init_async_db
+from server.json_codec import get_json_codec
 from server.monitoring import get_metrics_collector
 
 logger = logging.getLogger(__name__)
@@ -45,6 +53,14 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class CodecJSONResponse(JSONResponse):
+    """JSON response rendered with the shared JSON codec (orjson/msgspec when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        """Encode response content."""
+        return get_json_codec().dumps(content)
+
+
 # Create limiter
 limiter = Limiter(key_func=get_remote_address)
 
@@ -76,6 +92,20 @@ def create_app(config: Dict[str, Any]) -> FastAPI:
     # Get API configuration
     api_config = config.get("api", {})
 
+    # Key for API token lookup hashes (required in production)
+    configure_token_lookup_key(
+        api_config.get("token_lookup_key"),
+        config.get("server", {}).get("environment", "development"),
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Create the shared database engine and schema once, dispose of it on shutdown."""
+        init_database_manager(config)
+        yield
+        close_database_manager()
+        await close_async_db()
+
     # Create FastAPI app
     app = FastAPI(
         title="Prism DNS Server API",
@@ -84,6 +114,10 @@ def create_app(config: Dict[str, Any]) -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        # Wrapped in Default so routes with a response model keep FastAPI's
+        # direct Pydantic serialization; other routes render through the codec
+        default_response_class=Default(CodecJSONResponse),
+        lifespan=lifespan,
     )
 
     # Configure CORS
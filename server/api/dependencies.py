@@ -5,10 +5,12 @@ Dependency injection for database and other services.
 """
 
 import logging
-from typing import Any, Dict, Generator
+import threading
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, status
 
+from server.api.stats_cache import StatsCache
 from server.database.connection import DatabaseManager
 from server.database.operations import HostOperations
 
@@ -17,6 +19,14 @@ logger = logging.getLogger(__name__)
 # Global configuration - will be set by app initialization
 _app_config: Dict[str, Any] = {}
 
+# Database manager shared by all requests, and the configuration it was built from
+_db_manager: Optional[DatabaseManager] = None
+_db_manager_config: Optional[Dict[str, Any]] = None
+_db_manager_lock = threading.Lock()
+
+# Statistics cache for the shared database, replaced along with the manager
+_stats_cache: Optional[StatsCache] = None
+
 
 def set_app_config(config: Dict[str, Any]) -> None:
     """
@@ -26,6 +36,8 @@ def set_app_config(config: Dict[str, Any]) -> None:
         config: Application configuration
     """
     global _app_config
+    if config is not _app_config:
+        close_database_manager()
     _app_config = config
     logger.info("Application configuration set for API dependencies")
 
@@ -45,34 +57,85 @@ def get_app_config() -> Dict[str, Any]:
     return _app_config
 
 
+def init_database_manager(config: Dict[str, Any]) -> DatabaseManager:
+    """
+    Create the shared database manager and its schema, once per configuration.
+
+    Called at application startup; requests arriving before that (or after
+    the configuration changed) create it on first use instead.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Shared DatabaseManager instance
+    """
+    global _db_manager, _db_manager_config, _stats_cache
+    with _db_manager_lock:
+        if _db_manager is None or _db_manager_config is not config:
+            if _db_manager is not None:
+                _db_manager.cleanup()
+            db_manager = DatabaseManager(config)
+            db_manager.initialize_schema()
+            _db_manager, _db_manager_config = db_manager, config
+            _stats_cache = StatsCache(ttl=config.get("api", {}).get("stats_cache_ttl", 5))
+            logger.info("Shared database manager initialized for API")
+        return _db_manager
+
+
+def close_database_manager() -> None:
+    """Dispose of the shared database manager's engine, if one was created."""
+    global _db_manager, _db_manager_config, _stats_cache
+    with _db_manager_lock:
+        if _db_manager is not None:
+            try:
+                _db_manager.cleanup()
+            except Exception as e:
+                logger.warning(f"Error cleaning up database manager: {e}")
+        _db_manager, _db_manager_config, _stats_cache = None, None, None
+
+
 def get_database_manager(
     config: Dict[str, Any] = Depends(get_app_config),
-) -> Generator[DatabaseManager, None, None]:
+) -> DatabaseManager:
     """
     Get database manager dependency.
 
+    All requests share one engine and session factory; each request still
+    gets its own session through DatabaseManager.get_session().
+
     Args:
         config: Application configuration
 
-    Yields:
-        DatabaseManager instance
+    Returns:
+        Shared DatabaseManager instance
     """
-    db_manager = None
+    db_manager = _db_manager
+    if db_manager is not None and _db_manager_config is config:
+        return db_manager
+
     try:
-        db_manager = DatabaseManager(config)
-        db_manager.initialize_schema()
-        yield db_manager
+        return init_database_manager(config)
     except Exception as e:
         logger.error(f"Database manager error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database connection error"
         )
-    finally:
-        if db_manager:
-            try:
-                db_manager.cleanup()
-            except Exception as e:
-                logger.warning(f"Error cleaning up database manager: {e}")
+
+
+def get_stats_cache(
+    db_manager: DatabaseManager = Depends(get_database_manager),
+) -> StatsCache:
+    """
+    Get the statistics cache for the shared database.
+
+    Args:
+        db_manager: Database manager instance (ensures the cache exists)
+
+    Returns:
+        Shared StatsCache instance
+    """
+    return _stats_cache or StatsCache(ttl=0)
 
 
 def get_host_operations(
@@ -33,6 +33,8 @@ class HostListResponse(BaseModel):
     page: int = Field(..., description="Current page number")
     per_page: int = Field(..., description="Items per page")
     pages: int = Field(..., description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
+    prev_cursor: Optional[str] = Field(None, description="Cursor for the previous page, if any")
 
 
 class HealthResponse(BaseModel):
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cursor Pagination for Prism DNS Server
+Opaque keyset cursors for paginated API listings.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Sequence
+
+from fastapi import HTTPException, status
+
+NEXT = "next"
+PREV = "prev"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to another listing."""
+
+    pass
+
+
+class Cursor(NamedTuple):
+    """A decoded cursor: the sort key of an item and which way to page from it."""
+
+    key: List[Any]
+    direction: str
+
+
+def _encode_value(value: Any) -> Any:
+    """Make a sort key value JSON-safe, tagging datetimes."""
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Reverse _encode_value."""
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(scope: str, key: Sequence[Any], direction: str = NEXT) -> str:
+    """
+    Encode a cursor pointing at one item of a listing.
+
+    Args:
+        scope: Listing the cursor belongs to (including its sort order)
+        key: Sort key of the item, ending with its unique id
+        direction: NEXT for the items after it, PREV for the items before it
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"s": scope, "k": [_encode_value(value) for value in key], "d": direction}
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(scope: str, cursor: str) -> Cursor:
+    """
+    Decode a cursor produced by encode_cursor for the same listing.
+
+    Args:
+        scope: Listing the cursor must belong to
+        cursor: Cursor string from a previous response
+
+    Returns:
+        Decoded Cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or from another listing
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+        key = [_decode_value(value) for value in payload["k"]]
+        direction = payload["d"]
+        cursor_scope = payload["s"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+
+    if cursor_scope != scope or direction not in (NEXT, PREV) or not key:
+        raise InvalidCursorError("Cursor does not belong to this listing")
+
+    return Cursor(key, direction)
+
+
+def parse_cursor(scope: str, cursor: str) -> Cursor:
+    """
+    Decode a cursor from a request, rejecting bad ones with a 400.
+
+    Args:
+        scope: Listing the cursor must belong to
+        cursor: Cursor query parameter
+
+    Returns:
+        Decoded Cursor
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    try:
+        return decode_cursor(scope, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -4,20 +4,25 @@ DNS API Routes (SCRUM-116)
 PowerDNS API integration endpoints for DNS zone and record management.
 """
 
+import csv
+import io
 import logging
 import os
+import zlib
+from bisect import bisect_left, bisect_right
+from contextlib import aclosing
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 
-from server.api.dependencies import get_app_config
+from server.api.dependencies import get_app_config, get_database_manager
+from server.api.pagination import NEXT, PREV, Cursor, encode_cursor, parse_cursor
 from server.auth.dependencies import get_admin_override, get_current_verified_user
 from server.auth.models import User
-from server.database.connection import DatabaseManager
 from server.database.dns_operations import DNSZoneOwnershipOperations
 from server.dns_manager import (
     PowerDNSAPIError,
@@ -25,6 +30,8 @@ from server.dns_manager import (
     PowerDNSConnectionError,
     PowerDNSError,
 )
+from server.dns_search_index import get_dns_search_index
+from server.json_codec import get_json_codec
 from server.monitoring import get_metrics_collector
 
 logger = logging.getLogger(__name__)
@@ -34,15 +41,27 @@ limiter = Limiter(key_func=get_remote_address)
 router = APIRouter(prefix="/dns", tags=["DNS Management"])
 
 
+# Client for the current app configuration; its HTTP pool is process-wide
+_powerdns_client: Optional[PowerDNSClient] = None
+_powerdns_client_config: Optional[Dict[str, Any]] = None
+
+
 def get_powerdns_client() -> PowerDNSClient:
     """
     Get PowerDNS client instance.
 
+    The client is reused across requests. Closing it (``async with``) does
+    not close the shared connection pool.
+
     Returns:
         PowerDNSClient instance
     """
+    global _powerdns_client, _powerdns_client_config
     config = get_app_config()
-    return PowerDNSClient(config)
+    if _powerdns_client is None or _powerdns_client_config is not config:
+        _powerdns_client = PowerDNSClient(config)
+        _powerdns_client_config = config
+    return _powerdns_client
 
 
 def get_dns_zone_ops() -> DNSZoneOwnershipOperations:
@@ -52,9 +71,7 @@ def get_dns_zone_ops() -> DNSZoneOwnershipOperations:
     Returns:
         DNSZoneOwnershipOperations instance
     """
-    config = get_app_config()
-    db_manager = DatabaseManager(config)
-    return DNSZoneOwnershipOperations(db_manager)
+    return DNSZoneOwnershipOperations(get_database_manager(get_app_config()))
 
 
 def filter_zones_by_user(zones: List[Dict[str, Any]], user_zones: List[str]) -> List[Dict[str, Any]]:
@@ -81,6 +98,48 @@ def filter_zones_by_user(zones: List[Dict[str, Any]], user_zones: List[str]) ->
     return filtered
 
 
+# Sort values for zone listings; the zone name is appended as a tie-breaker
+_ZONE_SORT_FIELDS = {
+    "name": lambda zone: zone.get("name", ""),
+    "type": lambda zone: zone.get("kind", ""),
+    "serial": lambda zone: zone.get("serial") or 0,
+}
+
+
+def _zone_cursor_window(
+    keys: List[List[Any]], reverse: bool, cursor: Cursor, limit: int
+) -> Tuple[int, int]:
+    """
+    Find the slice of a sorted zone listing that a cursor points to.
+
+    Args:
+        keys: Sort keys of the listing, in listing order
+        reverse: Whether the listing is in descending order
+        cursor: Decoded cursor naming a zone key and a direction
+        limit: Page size
+
+    Returns:
+        (start, end) slice bounds
+
+    Raises:
+        HTTPException: 400 if the cursor key does not fit the sort field
+    """
+    ascending = keys[::-1] if reverse else keys
+    try:
+        # Zones sorting at or before the key, and strictly before it
+        at_or_below = bisect_right(ascending, cursor.key)
+        below = bisect_left(ascending, cursor.key)
+    except TypeError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    total = len(keys)
+    if cursor.direction == NEXT:
+        start = total - below if reverse else at_or_below
+        return start, start + limit
+    end = total - at_or_below if reverse else below
+    return max(0, end - limit), end
+
+
 @router.get("/zones", response_model=Dict[str, Any])
 @limiter.limit("100/minute")
 async def list_zones(
@@ -92,12 +151,19 @@ async def list_zones(
     search: Optional[str] = Query(None, description="Search term for zone names"),
     sort: str = Query("name", description="Sort field (name, type, serial)"),
     order: str = Query("asc", description="Sort order (asc, desc)"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from next_cursor/prev_cursor of a previous page (overrides page)"
+    ),
 ):
     """
     List DNS zones with pagination and search.
 
     This endpoint provides a simple proxy to PowerDNS API for listing zones.
     Following KISS principles - minimal transformation, direct proxy.
+
+    Zones are ordered by the sort field, then name. A cursor pages from the
+    zone it names rather than from a position, so zones created or deleted
+    meanwhile do not shift the following pages.
     """
     metrics = get_metrics_collector()
 
@@ -124,21 +190,32 @@ async def list_zones(
                 search_lower = search.lower()
                 zones = [z for z in zones if search_lower in z.get("name", "").lower()]
 
-            # Sort zones
+            # Sort zones, breaking ties by name so every zone has a unique key
             reverse = order.lower() == "desc"
-            if sort == "name":
-                zones.sort(key=lambda x: x.get("name", ""), reverse=reverse)
-            elif sort == "type":
-                zones.sort(key=lambda x: x.get("kind", ""), reverse=reverse)
-            elif sort == "serial":
-                zones.sort(key=lambda x: x.get("serial", 0), reverse=reverse)
+            sort_value = _ZONE_SORT_FIELDS.get(sort, _ZONE_SORT_FIELDS["name"])
+
+            def zone_key(zone: Dict[str, Any]) -> List[Any]:
+                return [sort_value(zone), zone.get("name", "")]
+
+            zones.sort(key=zone_key, reverse=reverse)
+            keys = [zone_key(zone) for zone in zones]
 
             # Pagination
             total = len(zones)
-            start = (page - 1) * limit
-            end = start + limit
+            scope = f"zones:{sort}:{order.lower()}"
+            if cursor is None:
+                start = (page - 1) * limit
+                end = start + limit
+            else:
+                start, end = _zone_cursor_window(keys, reverse, parse_cursor(scope, cursor), limit)
             paginated_zones = zones[start:end]
 
+            next_cursor = prev_cursor = None
+            if paginated_zones and end < total:
+                next_cursor = encode_cursor(scope, keys[end - 1], NEXT)
+            if paginated_zones and start > 0:
+                prev_cursor = encode_cursor(scope, keys[start], PREV)
+
             # Add zone statistics
             for zone in paginated_zones:
                 zone["record_count"] = len(zone.get("rrsets", []))
@@ -153,9 +230,13 @@ async def list_zones(
                     "limit": limit,
                     "total": total,
                     "pages": (total + limit - 1) // limit,
+                    "next_cursor": next_cursor,
+                    "prev_cursor": prev_cursor,
                 },
             }
 
+    except HTTPException:
+        raise
     except PowerDNSConnectionError as e:
         logger.error(f"PowerDNS connection error: {e}")
         metrics.record_dns_operation("list_zones", "error")
@@ -872,7 +953,31 @@ async def search_records(
                 zone_fqdn = f"{zone}."
                 if zone_fqdn not in user_zones:
                     raise HTTPException(status_code=404, detail=f"Zone '{zone}' not found")
-        
+
+        # Answer from the local index once it has been built
+        search_index = get_dns_search_index()
+        if search_index is not None and search_index.ready:
+            search_zones = [
+                zone_name for zone_name in user_zones if not zone or zone_name in (zone, f"{zone}.")
+            ]
+            all_records = await search_index.search(
+                q,
+                record_type=record_type,
+                zones=search_zones,
+                content_search=content,
+                limit=limit,
+            )
+
+            metrics.record_dns_operation("search_records", "success")
+
+            return {
+                "query": q,
+                "total": len(all_records),
+                "records": all_records,
+                "zones_searched": len(search_zones),
+                "filters": {"record_type": record_type, "zone": zone, "content_search": content},
+            }
+
         async with get_powerdns_client() as dns_client:
             # Get all zones to search
             all_zones = await dns_client.list_zones()
@@ -944,20 +1049,172 @@ async def search_records(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Gzip-compress a stream of chunks incrementally.
+
+    Args:
+        chunks: Uncompressed chunks
+
+    Yields:
+        Gzip stream chunks
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def _metered_chunks(chunks: AsyncIterator[bytes], operation: str) -> AsyncIterator[bytes]:
+    """
+    Pass a stream of chunks through, recording the operation's outcome.
+
+    The response has already started when a streamed export fails, so the
+    outcome is only known once the last chunk has been sent.
+
+    Args:
+        chunks: Export chunks
+        operation: DNS operation name for metrics
+
+    Yields:
+        The chunks unchanged
+    """
+    metrics = get_metrics_collector()
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception as e:
+        logger.error(f"Error streaming {operation}: {e}")
+        metrics.record_dns_operation(operation, "error")
+        raise
+    metrics.record_dns_operation(operation, "success")
+
+
+def _streaming_export(
+    chunks: AsyncIterator[bytes], media_type: str, filename: str, gzip: bool, operation: str
+) -> StreamingResponse:
+    """
+    Build a download response that sends export chunks as they are produced.
+
+    Args:
+        chunks: Export chunks
+        media_type: Media type of the uncompressed export
+        filename: Download file name
+        gzip: Compress the stream with Content-Encoding: gzip
+        operation: DNS operation name; its outcome is recorded when the stream ends
+
+    Returns:
+        StreamingResponse for the export
+    """
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        chunks = _gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _metered_chunks(chunks, operation), media_type=media_type, headers=headers
+    )
+
+
+async def _record_export_chunks(
+    dns_client: PowerDNSClient,
+    zone_names: List[str],
+    format: str,
+    exported_at: str,
+    username: str,
+) -> AsyncIterator[bytes]:
+    """
+    Fetch zone records concurrently and encode each zone as it arrives.
+
+    Args:
+        dns_client: PowerDNS client
+        zone_names: Zones to export
+        format: Export format (json, ndjson, csv, bind)
+        exported_at: Export timestamp
+        username: Exporting user
+
+    Yields:
+        UTF-8 encoded export chunks
+    """
+    codec = get_json_codec()
+    if format == "json":
+        yield b'{"zones":['
+    elif format == "csv":
+        yield "Zone,Name,Type,TTL,Content,Priority\r\n".encode()
+    elif format == "bind":
+        yield f"; DNS Records Export - {exported_at}\n; User: {username}\n\n".encode()
+
+    first = True
+    zone_records = dns_client.map_zones(zone_names, dns_client.list_records)
+    async with aclosing(zone_records):
+        async for zone_name, records in zone_records:
+            if isinstance(records, Exception):
+                logger.warning(f"Error exporting zone {zone_name}: {records}")
+                continue
+
+            if format == "json":
+                zone_data = codec.dumps({"name": zone_name, "records": records})
+                yield (b"" if first else b",") + zone_data
+            elif format == "ndjson":
+                yield codec.dumps({"name": zone_name, "records": records}) + b"\n"
+            elif format == "csv":
+                output = io.StringIO()
+                writer = csv.writer(output)
+                for record in records:
+                    writer.writerow(
+                        [
+                            zone_name,
+                            record.get("name", ""),
+                            record.get("type", ""),
+                            record.get("ttl", ""),
+                            record.get("content", ""),
+                            record.get("priority", ""),
+                        ]
+                    )
+                yield output.getvalue().encode()
+            else:
+                output_lines = [f"; Zone: {zone_name}"]
+                for record in records:
+                    name = record.get("name", "@")
+                    ttl = record.get("ttl", 3600)
+                    rtype = record.get("type", "A")
+                    content = record.get("content", "")
+
+                    # Format BIND record line
+                    if rtype == "MX":
+                        priority = record.get("priority", 10)
+                        output_lines.append(f"{name} {ttl} IN {rtype} {priority} {content}")
+                    else:
+                        output_lines.append(f"{name} {ttl} IN {rtype} {content}")
+                output_lines.append("")
+                yield "".join(f"{line}\n" for line in output_lines).encode()
+            first = False
+
+    if format == "json":
+        metadata = codec.dumps({"exported_at": exported_at, "user": username})
+        yield b"]," + metadata[1:]
+
+
 @router.get("/records/export", response_model=Dict[str, Any])
 @limiter.limit("30/minute")
 async def export_records(
     request: Request,
     current_user: User = Depends(get_current_verified_user),
-    format: str = Query("json", regex="^(json|csv|bind)$", description="Export format"),
+    format: str = Query("json", pattern="^(json|ndjson|csv|bind)$", description="Export format"),
+    gzip: bool = Query(False, description="Gzip-compress the response stream"),
 ):
     """
     Export records from user's zones only.
     
     Supports export formats:
     - json: Structured JSON format
+    - ndjson: One JSON object per zone per line
     - csv: Comma-separated values
     - bind: BIND zone file format
+
+    The export is streamed: zones are fetched concurrently and each one is
+    sent as soon as it is encoded, so large exports are never held in memory.
     """
     metrics = get_metrics_collector()
     
@@ -966,93 +1223,30 @@ async def export_records(
         dns_zone_ops = get_dns_zone_ops()
         user_zones = dns_zone_ops.get_user_zones(str(current_user.id))
         
-        async with get_powerdns_client() as dns_client:
-            # Get all zones and filter by user
-            all_zones = await dns_client.list_zones()
-            filtered_zones = filter_zones_by_user(all_zones, user_zones)
-            
-            # Collect all records from user's zones
-            export_data = {
-                "zones": [],
-                "exported_at": datetime.utcnow().isoformat(),
-                "user": current_user.username
-            }
-            
-            for zone_info in filtered_zones:
-                zone_name = zone_info["name"]
-                try:
-                    records = await dns_client.list_records(zone_name)
-                    export_data["zones"].append({
-                        "name": zone_name,
-                        "records": records
-                    })
-                except Exception as e:
-                    logger.warning(f"Error exporting zone {zone_name}: {e}")
-            
-            metrics.record_dns_operation("export_records", "success")
-            
-            # Format output based on requested format
-            if format == "json":
-                return export_data
-            elif format == "csv":
-                # Convert to CSV format
-                import csv
-                import io
-                
-                output = io.StringIO()
-                writer = csv.writer(output)
-                writer.writerow(["Zone", "Name", "Type", "TTL", "Content", "Priority"])
-                
-                for zone_data in export_data["zones"]:
-                    zone_name = zone_data["name"]
-                    for record in zone_data["records"]:
-                        writer.writerow([
-                            zone_name,
-                            record.get("name", ""),
-                            record.get("type", ""),
-                            record.get("ttl", ""),
-                            record.get("content", ""),
-                            record.get("priority", "")
-                        ])
-                
-                from fastapi.responses import Response
-                return Response(
-                    content=output.getvalue(),
-                    media_type="text/csv",
-                    headers={"Content-Disposition": "attachment; filename=dns-records.csv"}
-                )
-            elif format == "bind":
-                # Convert to BIND zone file format
-                output_lines = []
-                output_lines.append(f"; DNS Records Export - {export_data['exported_at']}")
-                output_lines.append(f"; User: {export_data['user']}")
-                output_lines.append("")
-                
-                for zone_data in export_data["zones"]:
-                    zone_name = zone_data["name"]
-                    output_lines.append(f"; Zone: {zone_name}")
-                    
-                    for record in zone_data["records"]:
-                        name = record.get("name", "@")
-                        ttl = record.get("ttl", 3600)
-                        rtype = record.get("type", "A")
-                        content = record.get("content", "")
-                        
-                        # Format BIND record line
-                        if rtype == "MX":
-                            priority = record.get("priority", 10)
-                            output_lines.append(f"{name} {ttl} IN {rtype} {priority} {content}")
-                        else:
-                            output_lines.append(f"{name} {ttl} IN {rtype} {content}")
-                    
-                    output_lines.append("")
-                
-                from fastapi.responses import Response
-                return Response(
-                    content="\n".join(output_lines),
-                    media_type="text/plain",
-                    headers={"Content-Disposition": "attachment; filename=dns-records.zone"}
-                )
+        dns_client = get_powerdns_client()
+        # Get all zones and filter by user
+        all_zones = await dns_client.list_zone_summaries()
+        filtered_zones = filter_zones_by_user(all_zones, user_zones)
+        zone_names = [zone_info["name"] for zone_info in filtered_zones]
+
+        chunks = _record_export_chunks(
+            dns_client,
+            zone_names,
+            format,
+            datetime.utcnow().isoformat(),
+            current_user.username,
+        )
+
+        media_types = {
+            "json": "application/json",
+            "ndjson": "application/x-ndjson",
+            "csv": "text/csv",
+            "bind": "text/plain",
+        }
+        extension = "zone" if format == "bind" else format
+        return _streaming_export(
+            chunks, media_types[format], f"dns-records.{extension}", gzip, "export_records"
+        )
                 
     except Exception as e:
         logger.error(f"Error exporting records: {e}")
@@ -1070,16 +1264,21 @@ async def export_zones(
     ),
     zones: Optional[str] = Query(None, description="Comma-separated list of zone names"),
     include_dnssec: bool = Query(True, description="Include DNSSEC data"),
+    stream: bool = Query(False, description="Stream full zones as they are fetched"),
+    gzip: bool = Query(False, description="Gzip-compress the streamed response"),
 ):
     """
     Export DNS zones in specified format.
 
     Supports multiple export formats:
     - JSON: PowerDNS API compatible format
+    - NDJSON: One zone per line (streaming only)
     - BIND: Standard zone file format
     - CSV: Simplified tabular format
 
-    Optionally specify zone names to export specific zones only.
+    Optionally specify zone names to export specific zones only. With
+    stream=true the export is sent as it is produced, fetching zones
+    concurrently, so memory stays flat regardless of export size.
     """
     metrics = get_metrics_collector()
 
@@ -1090,6 +1289,25 @@ async def export_zones(
             if zones:
                 zone_names = [z.strip() for z in zones.split(",") if z.strip()]
 
+            if stream:
+                chunks = await dns_client.stream_export_zones(
+                    zone_names=zone_names, format=export_format.lower()
+                )
+
+                media_types = {
+                    "json": "application/json",
+                    "ndjson": "application/x-ndjson",
+                    "bind": "text/plain",
+                    "csv": "text/csv",
+                }
+                return _streaming_export(
+                    chunks,
+                    media_types[export_format.lower()],
+                    f"dns-export.{export_format.lower()}",
+                    gzip,
+                    "export_zones",
+                )
+
             # Export zones
             export_result = await dns_client.export_zones(
                 zone_names=zone_names, format=export_format.lower(), include_dnssec=include_dnssec
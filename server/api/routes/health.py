@@ -12,8 +12,9 @@ from typing import Any, Dict
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 
-from server.api.dependencies import get_database_manager, get_host_operations
+from server.api.dependencies import get_database_manager, get_host_operations, get_stats_cache
 from server.api.models import HealthResponse, StatisticsResponse
+from server.api.stats_cache import StatsCache
 from server.database.connection import DatabaseManager
 from server.database.operations import HostOperations
 
@@ -31,12 +32,16 @@ _server_start_time = time.time()
     summary="Server health check",
     description="Get server health status and basic statistics",
 )
-async def get_health(host_ops: HostOperations = Depends(get_host_operations)) -> HealthResponse:
+async def get_health(
+    host_ops: HostOperations = Depends(get_host_operations),
+    stats_cache: StatsCache = Depends(get_stats_cache),
+) -> HealthResponse:
     """
     Get server health status and basic host statistics.
 
     Args:
         host_ops: Host operations dependency
+        stats_cache: Statistics cache dependency
 
     Returns:
         HealthResponse with server health information
@@ -46,7 +51,7 @@ async def get_health(host_ops: HostOperations = Depends(get_host_operations)) ->
         uptime = time.time() - _server_start_time
 
         # Get host statistics
-        stats = host_ops.get_host_statistics()
+        stats = stats_cache.get("hosts", host_ops.get_host_statistics)
 
         # Test database connectivity
         database_status = "healthy"
@@ -102,6 +107,7 @@ async def get_health(host_ops: HostOperations = Depends(get_host_operations)) ->
 async def get_statistics(
     host_ops: HostOperations = Depends(get_host_operations),
     db_manager: DatabaseManager = Depends(get_database_manager),
+    stats_cache: StatsCache = Depends(get_stats_cache),
 ) -> StatisticsResponse:
     """
     Get detailed server and host statistics.
@@ -109,13 +115,14 @@ async def get_statistics(
     Args:
         host_ops: Host operations dependency
         db_manager: Database manager dependency
+        stats_cache: Statistics cache dependency
 
     Returns:
         StatisticsResponse with detailed statistics
     """
     try:
         # Get host statistics
-        host_statistics = host_ops.get_host_statistics()
+        host_statistics = stats_cache.get("hosts", host_ops.get_host_statistics)
 
         # Calculate uptime info
         uptime_seconds = time.time() - _server_start_time
@@ -12,13 +12,15 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.exc import SQLAlchemyError
 
-from server.api.dependencies import get_database_manager, get_host_operations
+from server.api.dependencies import get_database_manager, get_host_operations, get_stats_cache
 from server.api.models import (
     HostListResponse,
     HostResponse,
     PaginationParams,
     create_error_response,
 )
+from server.api.pagination import NEXT, PREV, encode_cursor, parse_cursor
+from server.api.stats_cache import StatsCache
 from pydantic import BaseModel
 
 
@@ -64,6 +66,70 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["hosts"])
 
+CURSOR_QUERY = Query(
+    None, description="Cursor from next_cursor/prev_cursor of a previous page (overrides page)"
+)
+
+
+def _get_host_page(
+    host_ops: HostOperations,
+    user_id: Optional[str],
+    host_status: Optional[str],
+    search: Optional[str],
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+):
+    """
+    Fetch one page of hosts by page number or cursor.
+
+    Cursor pages fetch one extra host to learn whether the listing goes on
+    in the direction of travel.
+
+    Returns:
+        Tuple of (hosts, total, next_cursor, prev_cursor)
+    """
+    if cursor is None:
+        offset = (page - 1) * per_page
+        hosts, total = host_ops.get_hosts_page(
+            user_id=user_id, status=host_status, search=search, limit=per_page, offset=offset
+        )
+        has_next = offset + len(hosts) < total
+        has_prev = offset > 0
+    else:
+        key, direction = parse_cursor("hosts", cursor)
+        if len(key) != 2 or not isinstance(key[0], datetime) or not isinstance(key[1], int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+        if direction == NEXT:
+            hosts, total = host_ops.get_hosts_page(
+                user_id=user_id,
+                status=host_status,
+                search=search,
+                limit=per_page + 1,
+                after=tuple(key),
+            )
+            has_next, has_prev = len(hosts) > per_page, True
+            hosts = hosts[:per_page]
+        else:
+            hosts, total = host_ops.get_hosts_page(
+                user_id=user_id,
+                status=host_status,
+                search=search,
+                limit=per_page + 1,
+                before=tuple(key),
+            )
+            has_next, has_prev = True, len(hosts) > per_page
+            hosts = hosts[-per_page:]
+
+    next_cursor = prev_cursor = None
+    if hosts and has_next:
+        next_cursor = encode_cursor("hosts", (hosts[-1].last_seen, hosts[-1].id), NEXT)
+    if hosts and has_prev:
+        prev_cursor = encode_cursor("hosts", (hosts[0].last_seen, hosts[0].id), PREV)
+
+    return hosts, total, next_cursor, prev_cursor
+
 
 @router.get(
     "/hosts",
@@ -78,6 +144,7 @@ async def get_hosts(
     per_page: int = Query(50, ge=1, le=1000, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by host status"),
     search: Optional[str] = Query(None, description="Search in hostname"),
+    cursor: Optional[str] = CURSOR_QUERY,
     host_ops: HostOperations = Depends(get_host_operations),
 ) -> HostListResponse:
     """
@@ -88,6 +155,7 @@ async def get_hosts(
         per_page: Number of items per page
         status: Optional status filter
         search: Optional hostname search
+        cursor: Optional cursor from a previous page, used instead of page
         host_ops: Host operations dependency
 
     Returns:
@@ -113,34 +181,19 @@ async def get_hosts(
                 detail="Status must be 'online' or 'offline'",
             )
 
-        # Calculate offset
-        offset = (page - 1) * per_page
-
         # Get filtered hosts - filter by current user unless admin requesting all
         if all and current_user.is_admin:
             logger.info(f"Admin {current_user.username} viewing all hosts")
             # Admin sees all hosts
-            if status:
-                hosts = host_ops.get_hosts_by_status(status, user_id=None)
-            else:
-                hosts = host_ops.get_all_hosts(user_id=None)
+            user_id = None
         else:
             # Normal user or admin without all=true - filter by user_id
             user_id = str(current_user.id)
-            if status:
-                hosts = host_ops.get_hosts_by_status(status, user_id=user_id)
-            else:
-                hosts = host_ops.get_all_hosts(user_id=user_id)
-
-        # Apply search filter if provided
-        if search:
-            search_lower = search.lower()
-            hosts = [host for host in hosts if search_lower in host.hostname.lower()]
-
-        total_hosts = len(hosts)
 
-        # Apply pagination
-        paginated_hosts = hosts[offset : offset + per_page]
+        # Search, count and paginate in the database
+        paginated_hosts, total_hosts, next_cursor, prev_cursor = _get_host_page(
+            host_ops, user_id, status, search, page, per_page, cursor
+        )
 
         # Convert to response models
         if all and current_user.is_admin:
@@ -177,7 +230,13 @@ async def get_hosts(
         logger.info(f"Retrieved {len(host_responses)} hosts (page {page}/{total_pages})")
 
         return HostListResponse(
-            hosts=host_responses, total=total_hosts, page=page, per_page=per_page, pages=total_pages
+            hosts=host_responses,
+            total=total_hosts,
+            page=page,
+            per_page=per_page,
+            pages=total_pages,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     except HTTPException:
@@ -292,6 +351,7 @@ async def get_hosts_by_status(
     current_user: User = Depends(get_current_verified_user),
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     per_page: int = Query(50, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = CURSOR_QUERY,
     host_ops: HostOperations = Depends(get_host_operations),
 ) -> HostListResponse:
     """
@@ -301,6 +361,7 @@ async def get_hosts_by_status(
         host_status: Status to filter by (online/offline)
         page: Page number (1-based)
         per_page: Number of items per page
+        cursor: Optional cursor from a previous page, used instead of page
         host_ops: Host operations dependency
 
     Returns:
@@ -328,12 +389,9 @@ async def get_hosts_by_status(
 
         # Get hosts by status - filter by current user
         user_id = str(current_user.id)
-        hosts = host_ops.get_hosts_by_status(host_status, user_id=user_id)
-        total_hosts = len(hosts)
-
-        # Apply pagination
-        offset = (page - 1) * per_page
-        paginated_hosts = hosts[offset : offset + per_page]
+        paginated_hosts, total_hosts, next_cursor, prev_cursor = _get_host_page(
+            host_ops, user_id, host_status, None, page, per_page, cursor
+        )
 
         # Convert to response models
         host_responses = [
@@ -356,7 +414,13 @@ async def get_hosts_by_status(
         )
 
         return HostListResponse(
-            hosts=host_responses, total=total_hosts, page=page, per_page=per_page, pages=total_pages
+            hosts=host_responses,
+            total=total_hosts,
+            page=page,
+            per_page=per_page,
+            pages=total_pages,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
 
     except HTTPException:
@@ -383,56 +447,32 @@ async def get_hosts_by_status(
 async def get_host_stats(
     current_user: User = Depends(get_current_verified_user),
     host_ops: HostOperations = Depends(get_host_operations),
-    db_manager = Depends(get_database_manager),
+    stats_cache: StatsCache = Depends(get_stats_cache),
 ) -> HostStatsWithSystemResponse:
     """
     Get statistics for user's hosts.
+
+    User counts are read from the user's host_counters row; the system
+    stats for admins are summed over host_counters and cached briefly.
     
     Returns:
         HostStatsWithSystemResponse with user stats and system stats for admins
     """
     try:
-        # Get user's hosts
-        user_id = str(current_user.id)
-        user_hosts = host_ops.get_all_hosts(user_id=user_id)
-        
-        online_count = sum(1 for h in user_hosts if h.status == "online")
-        offline_count = sum(1 for h in user_hosts if h.status == "offline")
-        
-        # Get last registration time
-        last_registration = None
-        if user_hosts:
-            last_registration = max(h.last_seen for h in user_hosts)
+        # Counters are maintained as hosts change, so this is a single row lookup
+        stats = host_ops.get_host_counters(str(current_user.id))
         
         response = HostStatsWithSystemResponse(
-            total_hosts=len(user_hosts),
-            online_hosts=online_count,
-            offline_hosts=offline_count,
-            last_registration=last_registration
+            total_hosts=stats["total_hosts"],
+            online_hosts=stats["online_hosts"],
+            offline_hosts=stats["offline_hosts"],
+            last_registration=stats["last_registration"]
         )
         
         # Add system-wide stats for admins
         if current_user.is_admin:
-            with db_manager.get_session() as session:
-                from sqlalchemy import select, func
-                
-                # Total system hosts
-                total_system_hosts = session.query(Host).count()
-                
-                # Users with hosts
-                users_with_hosts = session.query(Host.created_by).distinct().count()
-                
-                # Anonymous hosts (assuming system user ID is a specific value)
-                # For now, count hosts without created_by
-                anonymous_hosts = session.query(Host).filter(
-                    (Host.created_by == None) | (Host.created_by == "")
-                ).count()
-                
-                response.system_stats = SystemStatsResponse(
-                    total_hosts=total_system_hosts,
-                    users_with_hosts=users_with_hosts,
-                    anonymous_hosts=anonymous_hosts
-                )
+            system_stats = stats_cache.get("system", host_ops.get_system_host_statistics)
+            response.system_stats = SystemStatsResponse(**system_stats)
         
         logger.info(f"Retrieved host stats for {current_user.username}")
         
@@ -87,6 +87,7 @@ async def create_token(
         user_id=current_user.id,
         name=request.name,
         token_hash=APIToken.hash_token(plain_token),
+        lookup_hash=APIToken.compute_lookup_hash(plain_token),
         expires_at=expires_at
     )
     
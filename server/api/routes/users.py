@@ -8,12 +8,14 @@ import json
 import logging
 from datetime import datetime, timezone
 from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, EmailStr, Field, validator
-from sqlalchemy import desc, select
+from sqlalchemy import and_, desc, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from server.api.pagination import NEXT, PREV, encode_cursor, parse_cursor
 from server.auth.dependencies import get_current_user, get_current_verified_user
 from server.auth.models import RefreshToken, TokenBlacklist, User, UserActivity
 from server.auth.service import AuthService
@@ -334,26 +336,76 @@ async def delete_account(
     "/me/activity", response_model=List[UserActivityResponse], summary="Get user activity log"
 )
 async def get_activity_log(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor/X-Prev-Cursor header (overrides page)"
+    ),
     current_user: User = Depends(get_current_verified_user),
     db: AsyncSession = Depends(get_async_db),
 ) -> List[UserActivityResponse]:
     """
     Get the current user's activity log with pagination.
 
-    Returns activities in reverse chronological order.
+    Returns activities in reverse chronological order. Pages are chosen by
+    page number or by a cursor; cursors for the neighbouring pages are
+    returned in the X-Next-Cursor and X-Prev-Cursor headers.
     """
-    offset = (page - 1) * limit
-
-    result = await db.execute(
-        select(UserActivity)
-        .where(UserActivity.user_id == current_user.id)
-        .order_by(desc(UserActivity.created_at))
-        .offset(offset)
-        .limit(limit)
-    )
-    activities = result.scalars().all()
+    query = select(UserActivity).where(UserActivity.user_id == current_user.id)
+    newest_first = (desc(UserActivity.created_at), desc(UserActivity.id))
+
+    if cursor is None:
+        offset = (page - 1) * limit
+        result = await db.execute(query.order_by(*newest_first).offset(offset).limit(limit + 1))
+        activities = list(result.scalars().all())
+        has_next, has_prev = len(activities) > limit, offset > 0
+        activities = activities[:limit]
+    else:
+        key, direction = parse_cursor("activity", cursor)
+        try:
+            created_at, activity_id = key[0], UUID(key[1])
+        except (ValueError, TypeError, AttributeError, IndexError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        if not isinstance(created_at, datetime):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+        if direction == NEXT:
+            query = query.where(
+                or_(
+                    UserActivity.created_at < created_at,
+                    and_(UserActivity.created_at == created_at, UserActivity.id < activity_id),
+                )
+            )
+            result = await db.execute(query.order_by(*newest_first).limit(limit + 1))
+            activities = list(result.scalars().all())
+            has_next, has_prev = len(activities) > limit, True
+            activities = activities[:limit]
+        else:
+            # Walk towards newer activity, then restore newest-first order
+            query = query.where(
+                or_(
+                    UserActivity.created_at > created_at,
+                    and_(UserActivity.created_at == created_at, UserActivity.id > activity_id),
+                )
+            )
+            result = await db.execute(
+                query.order_by(UserActivity.created_at, UserActivity.id).limit(limit + 1)
+            )
+            activities = list(result.scalars().all())[::-1]
+            has_next, has_prev = True, len(activities) > limit
+            activities = activities[-limit:]
+
+    if activities and has_next:
+        last = activities[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            "activity", (last.created_at, str(last.id)), NEXT
+        )
+    if activities and has_prev:
+        first = activities[0]
+        response.headers["X-Prev-Cursor"] = encode_cursor(
+            "activity", (first.created_at, str(first.id)), PREV
+        )
 
     return [
         UserActivityResponse(
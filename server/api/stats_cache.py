@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Statistics Cache for Prism DNS Server
+Short-lived cache of aggregate host statistics shared by API requests.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCache:
+    """
+    Cache of computed statistics, each kept for ``ttl`` seconds.
+
+    Health checks, dashboards and monitoring poll the statistics endpoints
+    far more often than the numbers change. With the cache, each statistic
+    is aggregated at most once per ``ttl`` however often it is requested, at
+    the cost of being up to ``ttl`` seconds old. A ``ttl`` of 0 disables it.
+    """
+
+    def __init__(self, ttl: float = 5, max_entries: int = 10000):
+        """
+        Initialize statistics cache.
+
+        Args:
+            ttl: Seconds a computed statistic is served from the cache
+            max_entries: Entries kept before expired ones are dropped (per-user stats)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # key -> (computed at, value)
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a statistic, computing it if missing or older than ttl.
+
+        Args:
+            key: Statistic identifier (e.g. ``("hosts", user_id)``)
+            compute: Function computing the statistic
+
+        Returns:
+            Cached or freshly computed value
+        """
+        if self.ttl <= 0:
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+
+        value = compute()
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._drop_expired(now)
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every cached statistic."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit and miss counts and the number of entries
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def _drop_expired(self, now: float) -> None:
+        """Remove entries older than ttl (lock held)."""
+        expired = [key for key, (at, _) in self._entries.items() if now - at >= self.ttl]
+        for key in expired:
+            del self._entries[key]
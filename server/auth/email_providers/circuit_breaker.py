@@ -1,138 +1,22 @@
 #!/usr/bin/env python3
 """
 Circuit breaker pattern for SMTP connections.
-"""
-
-import logging
-from datetime import datetime, timedelta
-from enum import Enum
-from typing import Any, Callable, Type
-
-logger = logging.getLogger(__name__)
-
-
-class CircuitState(Enum):
-    """Circuit breaker states."""
-
-    CLOSED = "closed"  # Normal operation
-    OPEN = "open"  # Failing, reject requests
-    HALF_OPEN = "half_open"  # Testing if recovered
-
-
-class CircuitBreaker:
-    """
-    Circuit breaker to prevent cascading failures.
-
-    The circuit breaker has three states:
-    - CLOSED: Normal operation, requests pass through
-    - OPEN: Too many failures, requests are rejected
-    - HALF_OPEN: Testing if the service has recovered
-    """
-
-    def __init__(
-        self,
-        failure_threshold: int = 5,
-        recovery_timeout: int = 60,
-        expected_exception: Type[Exception] = Exception,
-    ):
-        """
-        Initialize circuit breaker.
-
-        Args:
-            failure_threshold: Number of failures before opening circuit
-            recovery_timeout: Seconds to wait before attempting recovery
-            expected_exception: Exception type that triggers the circuit
-        """
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.expected_exception = expected_exception
-        self.failure_count = 0
-        self.last_failure_time = None
-        self.state = CircuitState.CLOSED
 
-    async def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
-        """
-        Call function through circuit breaker.
-
-        Args:
-            func: Async function to call
-            *args: Positional arguments for func
-            **kwargs: Keyword arguments for func
-
-        Returns:
-            Result of func
-
-        Raises:
-            Exception: If circuit is open or func raises
-        """
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-                logger.info("Circuit breaker transitioning to HALF_OPEN")
-            else:
-                raise Exception("Circuit breaker is OPEN")
-
-        try:
-            result = await func(*args, **kwargs)
-            self._on_success()
-            return result
-        except self.expected_exception as e:
-            self._on_failure()
-            raise
-
-    def _should_attempt_reset(self) -> bool:
-        """
-        Check if we should attempt to reset the circuit.
-
-        Returns:
-            bool: True if we should transition to half-open
-        """
-        if self.last_failure_time is None:
-            return False
-
-        time_since_failure = datetime.now() - self.last_failure_time
-        return time_since_failure.total_seconds() >= self.recovery_timeout
-
-    def _on_success(self) -> None:
-        """Handle successful call."""
-        if self.state == CircuitState.HALF_OPEN:
-            logger.info("Circuit breaker closing after successful call")
-            self.state = CircuitState.CLOSED
-
-        self.failure_count = 0
-        self.last_failure_time = None
+The implementation lives in server.resilience and is shared with the
+PowerDNS client.
+"""
 
-    def _on_failure(self) -> None:
-        """Handle failed call."""
-        self.failure_count += 1
-        self.last_failure_time = datetime.now()
+from datetime import datetime
 
-        if self.failure_count >= self.failure_threshold:
-            if self.state != CircuitState.OPEN:
-                logger.warning(f"Circuit breaker opening after {self.failure_count} failures")
-                self.state = CircuitState.OPEN
-        elif self.state == CircuitState.HALF_OPEN:
-            logger.warning("Circuit breaker reopening after failure in HALF_OPEN state")
-            self.state = CircuitState.OPEN
+from server.resilience import CircuitBreaker as _CircuitBreaker
+from server.resilience import CircuitOpenError, CircuitState
 
-    def is_closed(self) -> bool:
-        """Check if circuit is closed (normal operation)."""
-        return self.state == CircuitState.CLOSED
+__all__ = ["CircuitBreaker", "CircuitOpenError", "CircuitState"]
 
-    def is_open(self) -> bool:
-        """Check if circuit is open (rejecting requests)."""
-        return self.state == CircuitState.OPEN
 
-    def reset(self) -> None:
-        """Manually reset the circuit breaker."""
-        self.state = CircuitState.CLOSED
-        self.failure_count = 0
-        self.last_failure_time = None
-        logger.info("Circuit breaker manually reset")
+class CircuitBreaker(_CircuitBreaker):
+    """Circuit breaker for SMTP connections, timed with this module's clock."""
 
-    def __repr__(self) -> str:
-        """String representation."""
-        return (
-            f"<CircuitBreaker state={self.state.value} "
-            f"failures={self.failure_count}/{self.failure_threshold}>"
-        )
+    def _now(self) -> datetime:
+        """Get the current time."""
+        return datetime.now()
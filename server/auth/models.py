@@ -4,6 +4,10 @@ Authentication models for Prism DNS Server (SCRUM-53).
 SQLAlchemy models for user authentication and organizations.
 """
 
+import hashlib
+import hmac
+import logging
+import os
 import re
 from datetime import datetime, timezone
 from typing import List, Optional
@@ -24,6 +28,8 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.types import CHAR, TypeDecorator
 
+logger = logging.getLogger(__name__)
+
 
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
@@ -598,6 +604,53 @@ Index("idx_email_verification_tokens_expires", EmailVerificationToken.expires_at
 Index("idx_refresh_tokens_user_expires", RefreshToken.user_id, RefreshToken.expires_at)
 Index("idx_password_reset_tokens_expires", PasswordResetToken.expires_at)
 Index("idx_api_keys_user_org", APIKey.user_id, APIKey.org_id)
+# Keyset pagination of a user's activity log, newest first
+Index(
+    "idx_user_activities_user_created",
+    UserActivity.user_id,
+    UserActivity.created_at,
+    UserActivity.id,
+)
+
+
+# Publicly known key, accepted only outside production (see configure_token_lookup_key)
+DEVELOPMENT_TOKEN_LOOKUP_KEY = "prism-api-token-lookup"
+
+# Secret HMAC key for APIToken.lookup_hash, set at startup
+_token_lookup_key: Optional[bytes] = None
+
+
+def configure_token_lookup_key(key: Optional[str], environment: str = "production") -> None:
+    """
+    Set the secret key used to compute API token lookup hashes.
+
+    Falls back to the API_TOKEN_LOOKUP_KEY environment variable. Outside
+    production a missing key is replaced by DEVELOPMENT_TOKEN_LOOKUP_KEY with
+    a warning.
+
+    Args:
+        key: Configured key (api.token_lookup_key)
+        environment: Server environment
+
+    Raises:
+        ValueError: If no key is configured in production
+    """
+    global _token_lookup_key
+
+    key = key or os.getenv("API_TOKEN_LOOKUP_KEY")
+    if not key:
+        if environment == "production":
+            raise ValueError(
+                "API token lookup key is not set: configure api.token_lookup_key "
+                "or API_TOKEN_LOOKUP_KEY"
+            )
+        logger.warning(
+            "API token lookup key is not set; using the public development key. "
+            "Set api.token_lookup_key or API_TOKEN_LOOKUP_KEY before deploying."
+        )
+        key = DEVELOPMENT_TOKEN_LOOKUP_KEY
+
+    _token_lookup_key = key.encode("utf-8")
 
 
 class APIToken(Base):
@@ -619,6 +672,8 @@ class APIToken(Base):
     # Token details
     name = Column(String(255), nullable=False)
     token_hash = Column(String(255), nullable=False, unique=True, index=True)
+    # Keyed SHA-256 of the plain token for O(1) lookup; NULL for legacy tokens
+    lookup_hash = Column(String(64), nullable=True, unique=True, index=True)
 
     # Usage tracking
     last_used_at = Column(DateTime(timezone=True), nullable=True)
@@ -667,6 +722,27 @@ class APIToken(Base):
         import bcrypt
         return bcrypt.checkpw(plain_token.encode('utf-8'), self.token_hash.encode('utf-8'))
 
+    @staticmethod
+    def compute_lookup_hash(plain_token: str) -> str:
+        """
+        Compute the indexed lookup key for a plain text token.
+
+        The key is an HMAC-SHA256 of the token keyed with the secret set by
+        configure_token_lookup_key (or API_TOKEN_LOOKUP_KEY), so a token can
+        be located with a single indexed query before the bcrypt hash is
+        verified.
+
+        Raises:
+            RuntimeError: If no lookup key has been configured
+        """
+        key = _token_lookup_key
+        if key is None:
+            env_key = os.getenv("API_TOKEN_LOOKUP_KEY")
+            if not env_key:
+                raise RuntimeError("API token lookup key is not configured")
+            key = env_key.encode("utf-8")
+        return hmac.new(key, plain_token.encode("utf-8"), hashlib.sha256).hexdigest()
+
     def __str__(self) -> str:
         """String representation of APIToken."""
         return f"APIToken(name='{self.name}', user_id='{self.user_id}')"
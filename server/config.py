@@ -196,6 +196,8 @@ class APIConfig:
         ]
     )
     request_timeout: int = 30
+    stats_cache_ttl: int = 5
+    token_lookup_key: str = ""
 
     def __post_init__(self):
         """Validate configuration after initialization."""
@@ -208,6 +210,12 @@ class APIConfig:
         if not isinstance(self.request_timeout, int) or self.request_timeout <= 0:
             raise ConfigValidationError("request_timeout must be a positive integer")
 
+        if not isinstance(self.stats_cache_ttl, int) or self.stats_cache_ttl < 0:
+            raise ConfigValidationError("stats_cache_ttl must be a non-negative integer")
+
+        if not isinstance(self.token_lookup_key, str):
+            raise ConfigValidationError("token_lookup_key must be a string")
+
 
 @dataclass
 class PowerDNSConfig:
@@ -221,8 +229,26 @@ class PowerDNSConfig:
     timeout: int = 5
     retry_attempts: int = 3
     retry_delay: int = 1
+    retry_max_delay: int = 10
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_threshold: int = 5
+    circuit_breaker_timeout: int = 30
     record_types: list = field(default_factory=lambda: ["A", "AAAA"])
     auto_ptr: bool = False
+    connection_limit: int = 100
+    keepalive_timeout: int = 30
+    zone_concurrency: int = 10
+    import_batch_size: int = 1000
+    cache_enabled: bool = True
+    cache_ttl: int = 60
+    cache_list_ttl: int = 5
+    cache_max_zones: int = 1000
+    search_index_enabled: bool = True
+    search_reconcile_interval: int = 300
+    host_reconcile_enabled: bool = True
+    host_reconcile_interval: int = 60
+    host_reconcile_page_size: int = 500
+    host_reconcile_rate_limit: int = 10
 
     def __post_init__(self):
         """Validate configuration after initialization."""
@@ -250,12 +276,105 @@ class PowerDNSConfig:
         if not isinstance(self.retry_delay, int) or self.retry_delay <= 0:
             raise ConfigValidationError("retry_delay must be a positive integer")
 
+        if not isinstance(self.retry_max_delay, int) or self.retry_max_delay < self.retry_delay:
+            raise ConfigValidationError("retry_max_delay must be an integer >= retry_delay")
+
+        if not isinstance(self.circuit_breaker_enabled, bool):
+            raise ConfigValidationError("circuit_breaker_enabled must be a boolean")
+
+        if (
+            not isinstance(self.circuit_breaker_threshold, int)
+            or self.circuit_breaker_threshold <= 0
+        ):
+            raise ConfigValidationError("circuit_breaker_threshold must be a positive integer")
+
+        if not isinstance(self.circuit_breaker_timeout, int) or self.circuit_breaker_timeout <= 0:
+            raise ConfigValidationError("circuit_breaker_timeout must be a positive integer")
+
         if not isinstance(self.record_types, list) or not self.record_types:
             raise ConfigValidationError("record_types must be a non-empty list")
 
         if not isinstance(self.auto_ptr, bool):
             raise ConfigValidationError("auto_ptr must be a boolean")
 
+        if not isinstance(self.connection_limit, int) or self.connection_limit <= 0:
+            raise ConfigValidationError("connection_limit must be a positive integer")
+
+        if not isinstance(self.keepalive_timeout, int) or self.keepalive_timeout <= 0:
+            raise ConfigValidationError("keepalive_timeout must be a positive integer")
+
+        if not isinstance(self.zone_concurrency, int) or self.zone_concurrency <= 0:
+            raise ConfigValidationError("zone_concurrency must be a positive integer")
+
+        if not isinstance(self.import_batch_size, int) or self.import_batch_size <= 0:
+            raise ConfigValidationError("import_batch_size must be a positive integer")
+
+        if not isinstance(self.cache_enabled, bool):
+            raise ConfigValidationError("cache_enabled must be a boolean")
+
+        if not isinstance(self.cache_ttl, int) or self.cache_ttl <= 0:
+            raise ConfigValidationError("cache_ttl must be a positive integer")
+
+        if not isinstance(self.cache_list_ttl, int) or self.cache_list_ttl <= 0:
+            raise ConfigValidationError("cache_list_ttl must be a positive integer")
+
+        if not isinstance(self.cache_max_zones, int) or self.cache_max_zones <= 0:
+            raise ConfigValidationError("cache_max_zones must be a positive integer")
+
+        if not isinstance(self.search_index_enabled, bool):
+            raise ConfigValidationError("search_index_enabled must be a boolean")
+
+        if (
+            not isinstance(self.search_reconcile_interval, int)
+            or self.search_reconcile_interval <= 0
+        ):
+            raise ConfigValidationError("search_reconcile_interval must be a positive integer")
+
+        if not isinstance(self.host_reconcile_enabled, bool):
+            raise ConfigValidationError("host_reconcile_enabled must be a boolean")
+
+        if not isinstance(self.host_reconcile_interval, int) or self.host_reconcile_interval <= 0:
+            raise ConfigValidationError("host_reconcile_interval must be a positive integer")
+
+        if not isinstance(self.host_reconcile_page_size, int) or self.host_reconcile_page_size <= 0:
+            raise ConfigValidationError("host_reconcile_page_size must be a positive integer")
+
+        if (
+            not isinstance(self.host_reconcile_rate_limit, int)
+            or self.host_reconcile_rate_limit <= 0
+        ):
+            raise ConfigValidationError("host_reconcile_rate_limit must be a positive integer")
+
+
+@dataclass
+class RegistrationConfig:
+    """Registration pipeline configuration section."""
+
+    executor_workers: int = 8
+    heartbeat_flush_interval_ms: int = 500
+    heartbeat_max_pending: int = 10000
+    host_index_enabled: bool = True
+    dns_batch_enabled: bool = True
+    dns_flush_interval_ms: int = 200
+    dns_batch_size: int = 500
+
+    def __post_init__(self):
+        """Validate configuration after initialization."""
+        if not isinstance(self.executor_workers, int) or self.executor_workers < 0:
+            raise ConfigValidationError("executor_workers must be a non-negative integer")
+
+        if self.heartbeat_flush_interval_ms <= 0:
+            raise ConfigValidationError("heartbeat_flush_interval_ms must be positive")
+
+        if self.heartbeat_max_pending <= 0:
+            raise ConfigValidationError("heartbeat_max_pending must be positive")
+
+        if self.dns_flush_interval_ms <= 0:
+            raise ConfigValidationError("dns_flush_interval_ms must be positive")
+
+        if self.dns_batch_size <= 0:
+            raise ConfigValidationError("dns_batch_size must be positive")
+
 
 class ServerConfiguration:
     """
@@ -282,6 +401,7 @@ class ServerConfiguration:
             self.logging = LoggingConfig(**config_dict.get("logging", {}))
             self.api = APIConfig(**config_dict.get("api", {}))
             self.powerdns = PowerDNSConfig(**config_dict.get("powerdns", {}))
+            self.registration = RegistrationConfig(**config_dict.get("registration", {}))
 
         except TypeError as e:
             raise ConfigValidationError(f"Configuration initialization error: {e}")
@@ -350,6 +470,7 @@ class ServerConfiguration:
             "PRISM_LOGGING_FILE": ("logging", "file", str),
             "PRISM_LOGGING_MAX_SIZE": ("logging", "max_size", int),
             "PRISM_LOGGING_BACKUP_COUNT": ("logging", "backup_count", int),
+            "API_TOKEN_LOOKUP_KEY": ("api", "token_lookup_key", str),
             "POWERDNS_ENABLED": ("powerdns", "enabled", bool),
             "POWERDNS_API_URL": ("powerdns", "api_url", str),
             "POWERDNS_API_KEY": ("powerdns", "api_key", str),
@@ -357,6 +478,17 @@ class ServerConfiguration:
             "POWERDNS_DEFAULT_TTL": ("powerdns", "default_ttl", int),
             "POWERDNS_TIMEOUT": ("powerdns", "timeout", int),
             "POWERDNS_RETRY_ATTEMPTS": ("powerdns", "retry_attempts", int),
+            "PRISM_REGISTRATION_EXECUTOR_WORKERS": ("registration", "executor_workers", int),
+            "PRISM_REGISTRATION_HEARTBEAT_FLUSH_INTERVAL_MS": (
+                "registration",
+                "heartbeat_flush_interval_ms",
+                int,
+            ),
+            "PRISM_REGISTRATION_HEARTBEAT_MAX_PENDING": (
+                "registration",
+                "heartbeat_max_pending",
+                int,
+            ),
         }
 
         for env_var, (section, key, value_type) in env_mappings.items():
@@ -417,6 +549,8 @@ class ServerConfiguration:
                 "enable_cors": self.api.enable_cors,
                 "cors_origins": self.api.cors_origins,
                 "request_timeout": self.api.request_timeout,
+                "stats_cache_ttl": self.api.stats_cache_ttl,
+                "token_lookup_key": self.api.token_lookup_key,
             },
             "powerdns": {
                 "enabled": self.powerdns.enabled,
@@ -427,8 +561,35 @@ class ServerConfiguration:
                 "timeout": self.powerdns.timeout,
                 "retry_attempts": self.powerdns.retry_attempts,
                 "retry_delay": self.powerdns.retry_delay,
+                "retry_max_delay": self.powerdns.retry_max_delay,
+                "circuit_breaker_enabled": self.powerdns.circuit_breaker_enabled,
+                "circuit_breaker_threshold": self.powerdns.circuit_breaker_threshold,
+                "circuit_breaker_timeout": self.powerdns.circuit_breaker_timeout,
                 "record_types": self.powerdns.record_types,
                 "auto_ptr": self.powerdns.auto_ptr,
+                "connection_limit": self.powerdns.connection_limit,
+                "keepalive_timeout": self.powerdns.keepalive_timeout,
+                "zone_concurrency": self.powerdns.zone_concurrency,
+                "import_batch_size": self.powerdns.import_batch_size,
+                "cache_enabled": self.powerdns.cache_enabled,
+                "cache_ttl": self.powerdns.cache_ttl,
+                "cache_list_ttl": self.powerdns.cache_list_ttl,
+                "cache_max_zones": self.powerdns.cache_max_zones,
+                "search_index_enabled": self.powerdns.search_index_enabled,
+                "search_reconcile_interval": self.powerdns.search_reconcile_interval,
+                "host_reconcile_enabled": self.powerdns.host_reconcile_enabled,
+                "host_reconcile_interval": self.powerdns.host_reconcile_interval,
+                "host_reconcile_page_size": self.powerdns.host_reconcile_page_size,
+                "host_reconcile_rate_limit": self.powerdns.host_reconcile_rate_limit,
+            },
+            "registration": {
+                "executor_workers": self.registration.executor_workers,
+                "heartbeat_flush_interval_ms": self.registration.heartbeat_flush_interval_ms,
+                "heartbeat_max_pending": self.registration.heartbeat_max_pending,
+                "host_index_enabled": self.registration.host_index_enabled,
+                "dns_batch_enabled": self.registration.dns_batch_enabled,
+                "dns_flush_interval_ms": self.registration.dns_flush_interval_ms,
+                "dns_batch_size": self.registration.dns_batch_size,
             },
         }
 
@@ -449,6 +610,12 @@ class ServerConfiguration:
         if self.server.tcp_port == self.server.api_port:
             raise ConfigValidationError("TCP port and API port cannot be the same")
 
+        # API token lookup hashes must not be keyed with the public development key
+        if self.server.environment == "production" and not self.api.token_lookup_key:
+            raise ConfigValidationError(
+                "api.token_lookup_key (API_TOKEN_LOOKUP_KEY) must be set in production"
+            )
+
         logger.info("Configuration validation completed successfully")
         return True
 
@@ -12,10 +12,11 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from .database.connection import DatabaseManager
 from .database.operations import HostOperations
-from .dns_manager import PowerDNSClient, create_dns_client
+from .dns_manager import PowerDNSClient, PowerDNSConnectionError, create_dns_client
 from .message_validator import MessageValidator, SecurityValidator
-from .protocol import MessageProtocol, ProtocolError
+from .protocol import FrameSizeError, MessageProtocol, ProtocolError
 from .registration_processor import RegistrationProcessor, create_registration_processor
+from .registration_service import RegistrationService
 from .server_stats import ServerStats
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ class ConnectionHandler:
         db_manager: Optional[DatabaseManager] = None,
         stats: Optional[ServerStats] = None,
         timeout: float = 30.0,
+        registration_service: Optional[RegistrationService] = None,
     ):
         """
         Initialize connection handler.
@@ -57,6 +59,9 @@ class ConnectionHandler:
             db_manager: Database manager for host operations
             stats: Server statistics tracker
             timeout: Connection timeout in seconds
+            registration_service: Server-scoped registration pipeline. When
+                provided, its processor and DNS client are shared instead of
+                being created (and torn down) for this connection.
         """
         self.reader = reader
         self.writer = writer
@@ -80,21 +85,30 @@ class ConnectionHandler:
         self.start_time = time.time()
         self.messages_processed = 0
 
-        # Initialize host operations if database available
-        self.host_ops = None
-        if self.db_manager:
-            self.host_ops = HostOperations(self.db_manager)
-
-        # Initialize registration processor with config
-        self.registration_processor = None
-        if config:
-            self.registration_processor = create_registration_processor(config)
-
-        # Initialize DNS client if enabled
-        self.dns_client = None
-        powerdns_config = config.get("powerdns", {})
-        if powerdns_config.get("enabled", False):
-            self.dns_client = create_dns_client(config)
+        # Shared components are owned by the server, not by this connection
+        self.registration_service = registration_service
+        self._owns_dns_client = registration_service is None
+
+        if registration_service:
+            self.host_ops = registration_service.host_ops
+            self.registration_processor = registration_service.registration_processor
+            self.dns_client = registration_service.dns_client
+            self.dns_update_queue = registration_service.dns_update_queue
+        else:
+            # Standalone handler: build a private pipeline
+            self.host_ops = None
+            if self.db_manager:
+                self.host_ops = HostOperations(self.db_manager)
+
+            self.registration_processor = None
+            if config:
+                self.registration_processor = create_registration_processor(config)
+
+            self.dns_client = None
+            self.dns_update_queue = None
+            powerdns_config = (config or {}).get("powerdns", {})
+            if powerdns_config.get("enabled", False):
+                self.dns_client = create_dns_client(config)
 
         logger.info(f"Connection handler initialized for {self.client_ip}:{self.client_port}")
 
@@ -114,24 +128,34 @@ class ConnectionHandler:
             # Main message processing loop
             while self.connected:
                 try:
-                    # Read message with timeout
-                    message_data = await asyncio.wait_for(
-                        self.reader.read(4096), timeout=self.timeout
+                    # Read one length-prefixed message with timeout
+                    message = await asyncio.wait_for(
+                        self.protocol.read_message(self.reader), timeout=self.timeout
                     )
 
                     # Check for client disconnect
-                    if not message_data:
+                    if message is None:
                         logger.info(f"Client {self.client_ip} disconnected")
                         break
 
-                    # Process received data
-                    await self._process_received_data(message_data)
+                    await self._process_framed_message(message)
+
+                except asyncio.IncompleteReadError:
+                    logger.info(f"Client {self.client_ip} disconnected mid-message")
+                    break
 
                 except asyncio.TimeoutError:
                     logger.warning(f"Connection timeout for {self.client_ip}")
                     await self._send_error_response("Connection timeout")
                     break
 
+                except FrameSizeError as e:
+                    # The rest of the stream cannot be framed, so drop the client
+                    logger.warning(f"Protocol error from {self.client_ip}: {e}")
+                    self.stats.error_occurred("protocol_error", str(e))
+                    await self._send_error_response(f"Protocol error: {e}")
+                    break
+
                 except ProtocolError as e:
                     logger.warning(f"Protocol error from {self.client_ip}: {e}")
                     self.stats.error_occurred("protocol_error", str(e))
@@ -151,30 +175,22 @@ class ConnectionHandler:
         finally:
             await self._cleanup_connection()
 
-    async def _process_received_data(self, data: bytes) -> None:
+    async def _process_framed_message(self, message: Dict[str, Any]) -> None:
         """
-        Process received data and extract messages.
+        Process one message read from the stream and record its timing.
 
         Args:
-            data: Raw bytes received from client
+            message: Decoded message dictionary
         """
         try:
-            # Decode messages from data
-            messages = self.protocol.decode_messages(data)
-
-            # Process each complete message
-            for message in messages:
-                start_time = time.time()
-                await self._process_message(message)
-                processing_time = time.time() - start_time
+            start_time = time.time()
+            await self._process_message(message)
+            processing_time = time.time() - start_time
 
-                # Record processing time
-                self.stats.message_processed(processing_time)
-                self.messages_processed += 1
+            # Record processing time
+            self.stats.message_processed(processing_time)
+            self.messages_processed += 1
 
-        except ProtocolError as e:
-            # Let the caller handle protocol errors
-            raise
         except Exception as e:
             logger.error(f"Error processing data from {self.client_ip}: {e}")
             raise
@@ -253,7 +269,11 @@ class ConnectionHandler:
             if result.success:
                 # Registration successful, now handle DNS if enabled
                 if self.dns_client and result.result_type in ["new_registration", "ip_change"]:
-                    await self._handle_dns_registration(hostname, self.client_ip, result)
+                    if self.dns_update_queue:
+                        # Sent with other pending changes by the queue's flush task
+                        self.dns_update_queue.enqueue(result.host_id, hostname, self.client_ip)
+                    else:
+                        await self._handle_dns_registration(hostname, self.client_ip, result)
 
                 await self._send_success_response(result.message)
             else:
@@ -290,8 +310,10 @@ class ConnectionHandler:
             # Update host with DNS information
             if self.host_ops and dns_result.get("status") == "success":
                 zone = dns_result.get("zone", self.dns_client.default_zone)
-                self.host_ops.update_dns_info(
-                    hostname=hostname,
+                await self._run_blocking(
+                    "update_dns_info",
+                    self.host_ops.update_dns_info_by_id,
+                    registration_result.host_id,
                     dns_zone=zone,
                     dns_record_id=dns_result.get("fqdn"),
                     dns_sync_status="synced",
@@ -299,15 +321,52 @@ class ConnectionHandler:
                 logger.info(f"DNS record created/updated for {hostname}: {dns_result}")
             elif self.host_ops:
                 # DNS creation failed
-                self.host_ops.update_dns_info(hostname=hostname, dns_sync_status="failed")
+                await self._run_blocking(
+                    "update_dns_info",
+                    self.host_ops.update_dns_info_by_id,
+                    registration_result.host_id,
+                    dns_sync_status="failed",
+                )
                 logger.warning(f"Failed to create DNS record for {hostname}")
 
+        except PowerDNSConnectionError as e:
+            logger.warning(f"PowerDNS unavailable, DNS for {hostname} left pending: {e}")
+            # Left for the DNS sync to retry once PowerDNS is reachable
+            if self.host_ops:
+                await self._run_blocking(
+                    "update_dns_info",
+                    self.host_ops.update_dns_info_by_id,
+                    registration_result.host_id,
+                    dns_sync_status="pending",
+                )
+
         except Exception as e:
             logger.error(f"Error handling DNS registration for {hostname}: {e}")
             # Update sync status to failed
             if self.host_ops:
-                self.host_ops.update_dns_info(hostname=hostname, dns_sync_status="failed")
+                await self._run_blocking(
+                    "update_dns_info",
+                    self.host_ops.update_dns_info_by_id,
+                    registration_result.host_id,
+                    dns_sync_status="failed",
+                )
+
+    async def _run_blocking(self, operation: str, func, *args, **kwargs) -> Any:
+        """
+        Run a blocking call through the registration executor when available.
+
+        Args:
+            operation: Operation name used for metrics
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
 
+        Returns:
+            Result of func
+        """
+        if self.registration_processor:
+            return await self.registration_processor.run_blocking(operation, func, *args, **kwargs)
+        return func(*args, **kwargs)
 
     async def _send_success_response(self, message: str) -> None:
         """
@@ -336,11 +395,8 @@ class ConnectionHandler:
             message: Response message content
         """
         try:
-            # Create response message
-            response = self.protocol.create_registration_response(status, message)
-
-            # Encode response
-            encoded_response = self.protocol.encode_message(response)
+            # Encode response in the wire format the client used
+            encoded_response = self.protocol.encode_response(status, message)
 
             # Send response
             self.writer.write(encoded_response)
@@ -365,8 +421,8 @@ class ConnectionHandler:
                 self.writer.close()
                 await self.writer.wait_closed()
 
-            # Close DNS client if present
-            if self.dns_client:
+            # Close DNS client if this connection created it
+            if self.dns_client and self._owns_dns_client:
                 await self.dns_client.close()
 
             # Record connection closing
@@ -14,7 +14,7 @@ from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from .models import Base
 
@@ -118,6 +118,19 @@ class DatabaseManager:
             },
         }
 
+        # File databases get a real pool so sessions used from executor threads
+        # each hold their own connection (WAL allows concurrent readers).
+        # In-memory databases must share a single connection.
+        if self.config.path != ":memory:":
+            engine_kwargs.update(
+                {
+                    "poolclass": QueuePool,
+                    "pool_size": self.config.connection_pool_size,
+                    "max_overflow": 0,
+                    "pool_timeout": self.config.pool_timeout,
+                }
+            )
+
         try:
             self.engine = create_engine(db_url, **engine_kwargs)
 
@@ -361,3 +374,9 @@ def init_async_db(config: Dict[str, Any]):
     global _async_db_manager
     _async_db_manager = AsyncDatabaseManager(config)
     return _async_db_manager
+
+
+async def close_async_db() -> None:
+    """Release the async database manager's pooled connections."""
+    if _async_db_manager is not None:
+        await _async_db_manager.cleanup()
@@ -11,7 +11,15 @@ from sqlalchemy import MetaData, Table, text
 from sqlalchemy.exc import SQLAlchemyError
 
 from .connection import DatabaseManager
-from .models import SCHEMA_VERSION
+from .models import (
+    HOST_COUNTER_DDL,
+    HOST_COUNTER_REBUILD,
+    HOST_SEARCH_FTS_DDL,
+    SCHEMA_VERSION,
+    DNSSearchRecord,
+    DNSSearchZone,
+    fts5_trigram_available,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +65,18 @@ class DatabaseMigrations:
         self._migrations[6] = self._migrate_to_v6
         # Migration from version 6 to version 7 (Add is_admin field to users)
         self._migrations[7] = self._migrate_to_v7
+        # Migration from version 7 to version 8 (Indexed API token lookup)
+        self._migrations[8] = self._migrate_to_v8
+        # Migration from version 8 to version 9 (Heartbeat timeout sweep index)
+        self._migrations[9] = self._migrate_to_v9
+        # Migration from version 9 to version 10 (Local DNS record search index)
+        self._migrations[10] = self._migrate_to_v10
+        # Migration from version 10 to version 11 (Host list indexes)
+        self._migrations[11] = self._migrate_to_v11
+        # Migration from version 11 to version 12 (Activity log cursor pagination index)
+        self._migrations[12] = self._migrate_to_v12
+        # Migration from version 12 to version 13 (Per-user host counters)
+        self._migrations[13] = self._migrate_to_v13
 
     def get_current_schema_version(self) -> int:
         """
@@ -555,6 +575,198 @@ class DatabaseMigrations:
             logger.error(f"Admin field migration failed: {e}")
             raise MigrationError(f"Migration to version 7 failed: {e}")
 
+    def _migrate_to_v8(self) -> None:
+        """
+        Migration to version 8: Add lookup_hash column to api_tokens table.
+
+        Adds an indexed keyed-hash column so TCP token validation is a single
+        indexed query instead of a bcrypt scan over every active token.
+        Existing tokens keep a NULL lookup_hash and are backfilled the first
+        time they are used.
+        """
+        logger.info("Running migration to version 8: Indexed API token lookup")
+
+        try:
+            with self.db_manager.get_session() as session:
+                # Check if api_tokens table exists
+                result = session.execute(
+                    text("SELECT name FROM sqlite_master WHERE type='table' AND name='api_tokens'")
+                )
+                if not result.fetchone():
+                    logger.info("api_tokens table does not exist, skipping lookup_hash migration")
+                    return
+
+                result = session.execute(text("PRAGMA table_info(api_tokens)"))
+                existing_columns = {row[1] for row in result.fetchall()}
+
+                if "lookup_hash" not in existing_columns:
+                    session.execute(
+                        text("ALTER TABLE api_tokens ADD COLUMN lookup_hash VARCHAR(64)")
+                    )
+                    logger.info("Added lookup_hash column to api_tokens table")
+                else:
+                    logger.info("lookup_hash column already exists in api_tokens table")
+
+                session.execute(
+                    text(
+                        "CREATE UNIQUE INDEX IF NOT EXISTS ix_api_tokens_lookup_hash "
+                        "ON api_tokens(lookup_hash)"
+                    )
+                )
+
+                logger.info("API token lookup migration completed")
+
+        except SQLAlchemyError as e:
+            logger.error(f"API token lookup migration failed: {e}")
+            raise MigrationError(f"Migration to version 8 failed: {e}")
+
+    def _migrate_to_v9(self) -> None:
+        """
+        Migration to version 9: Add (status, last_seen) index on hosts.
+
+        The heartbeat timeout sweep filters on status equality and a
+        last_seen range. Without statistics SQLite picks ix_hosts_status for
+        that query and walks every online host; this index lets it seek
+        straight to the timed out ones.
+        """
+        logger.info("Running migration to version 9: Heartbeat timeout sweep index")
+
+        try:
+            with self.db_manager.get_session() as session:
+                session.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_hosts_status_last_seen "
+                        "ON hosts(status, last_seen)"
+                    )
+                )
+
+                logger.info("Heartbeat timeout sweep index migration completed")
+
+        except SQLAlchemyError as e:
+            logger.error(f"Heartbeat timeout sweep index migration failed: {e}")
+            raise MigrationError(f"Migration to version 9 failed: {e}")
+
+    def _migrate_to_v10(self) -> None:
+        """
+        Migration to version 10: Add the local DNS record search index.
+
+        Creates dns_search_records (a copy of PowerDNS RRsets), its FTS5
+        trigram index and sync triggers, and dns_search_zones. The index is
+        filled by the first reconcile after startup. Without FTS5 only the
+        plain tables are created and search falls back to scanning them.
+        """
+        logger.info("Running migration to version 10: Local DNS record search index")
+
+        try:
+            DNSSearchRecord.__table__.create(bind=self.db_manager.engine, checkfirst=True)
+            DNSSearchZone.__table__.create(bind=self.db_manager.engine, checkfirst=True)
+
+            logger.info("DNS record search index migration completed")
+
+        except SQLAlchemyError as e:
+            logger.error(f"DNS record search index migration failed: {e}")
+            raise MigrationError(f"Migration to version 10 failed: {e}")
+
+    def _migrate_to_v11(self) -> None:
+        """
+        Migration to version 11: Add host list indexes.
+
+        Adds an index on (created_by, last_seen) for per-user host pages and,
+        where FTS5 is available, a trigram index over hostnames (with sync
+        triggers) for substring search, built from the existing rows.
+        """
+        logger.info("Running migration to version 11: Host list indexes")
+
+        try:
+            with self.db_manager.get_session() as session:
+                session.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_hosts_created_by_last_seen "
+                        "ON hosts(created_by, last_seen)"
+                    )
+                )
+
+                if fts5_trigram_available(session.connection()):
+                    for statement in HOST_SEARCH_FTS_DDL:
+                        session.execute(text(statement))
+                    session.execute(text("INSERT INTO host_search(host_search) VALUES ('rebuild')"))
+                else:
+                    logger.warning("SQLite FTS5 trigram index unavailable; host search scans")
+
+                logger.info("Host list index migration completed")
+
+        except SQLAlchemyError as e:
+            logger.error(f"Host list index migration failed: {e}")
+            raise MigrationError(f"Migration to version 11 failed: {e}")
+
+    def _migrate_to_v12(self) -> None:
+        """
+        Migration to version 12: Add (user_id, created_at, id) index on user_activities.
+
+        Serves the activity log newest first and its cursor pages, which
+        seek on (created_at, id) within one user.
+        """
+        logger.info("Running migration to version 12: Activity log cursor pagination index")
+
+        try:
+            with self.db_manager.get_session() as session:
+                result = session.execute(
+                    text(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type='table' AND name='user_activities'"
+                    )
+                )
+                if not result.fetchone():
+                    logger.info("user_activities table does not exist, skipping index migration")
+                    return
+
+                session.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_user_activities_user_created "
+                        "ON user_activities(user_id, created_at, id)"
+                    )
+                )
+
+                logger.info("Activity log index migration completed")
+
+        except SQLAlchemyError as e:
+            logger.error(f"Activity log index migration failed: {e}")
+            raise MigrationError(f"Migration to version 12 failed: {e}")
+
+    def _migrate_to_v13(self) -> None:
+        """
+        Migration to version 13: Add per-user host counters.
+
+        Creates the host_counters table and the triggers on hosts that keep
+        it up to date, then fills it from the existing hosts.
+        """
+        logger.info("Running migration to version 13: Per-user host counters")
+
+        try:
+            with self.db_manager.get_session() as session:
+                session.execute(
+                    text(
+                        """
+                    CREATE TABLE IF NOT EXISTS host_counters (
+                        user_id VARCHAR(36) NOT NULL PRIMARY KEY,
+                        total_hosts INTEGER NOT NULL DEFAULT 0,
+                        online_hosts INTEGER NOT NULL DEFAULT 0,
+                        offline_hosts INTEGER NOT NULL DEFAULT 0,
+                        last_registration DATETIME
+                    )
+                """
+                    )
+                )
+
+                for statement in HOST_COUNTER_DDL + HOST_COUNTER_REBUILD:
+                    session.execute(text(statement))
+
+                logger.info("Host counters migration completed")
+
+        except SQLAlchemyError as e:
+            logger.error(f"Host counters migration failed: {e}")
+            raise MigrationError(f"Migration to version 13 failed: {e}")
+
     def get_migration_history(self) -> List[Dict[str, Any]]:
         """
         Get migration history.
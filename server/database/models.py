@@ -9,7 +9,19 @@ import re
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, UniqueConstraint, create_engine, event
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    create_engine,
+    event,
+)
+from sqlalchemy.schema import DDL
 from sqlalchemy.orm import declarative_base, validates
 
 # Create the declarative base
@@ -245,6 +257,11 @@ class Host(Base):
 # Create additional indexes for performance
 Index("idx_hostname_status", Host.hostname, Host.status)
 Index("idx_last_seen_status", Host.last_seen, Host.status)
+# Equality on status then range on last_seen: covers the heartbeat timeout sweep
+Index("idx_hosts_status_last_seen", Host.status, Host.last_seen)
+# Per-user host listing, newest first (GET /api/hosts). The rowid (id) is the
+# implicit last column, so this also serves (last_seen, id) keyset pages.
+Index("idx_hosts_created_by_last_seen", Host.created_by, Host.last_seen)
 
 
 class DNSZoneOwnership(Base):
@@ -292,6 +309,168 @@ class DNSZoneOwnership(Base):
         }
 
 
+class DNSSearchRecord(Base):
+    """
+    Local copy of a PowerDNS RRset for record search.
+
+    One row per (zone, name, type) RRset. ``content`` holds the record
+    contents one per line and, with ``name``, is indexed for substring
+    search by the dns_record_search FTS5 table (see DNS_SEARCH_FTS_DDL).
+    """
+
+    __tablename__ = "dns_search_records"
+
+    __table_args__ = (UniqueConstraint("zone", "name", "type", name="uq_dns_search_rrset"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    zone = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False)
+    type = Column(String(10), nullable=False)
+    ttl = Column(Integer, nullable=True)
+    records = Column(Text, nullable=False)  # JSON list of PowerDNS records
+    content = Column(Text, nullable=False)  # Record contents, newline separated
+
+
+class HostCounter(Base):
+    """
+    Per-user host counts, maintained by triggers on hosts (see HOST_COUNTER_DDL).
+
+    One row per user owning at least one host. ``last_registration`` is the
+    latest time one of the user's hosts was registered or came back online.
+    """
+
+    __tablename__ = "host_counters"
+
+    user_id = Column(String(36), primary_key=True)
+    total_hosts = Column(Integer, nullable=False, default=0)
+    online_hosts = Column(Integer, nullable=False, default=0)
+    offline_hosts = Column(Integer, nullable=False, default=0)
+    last_registration = Column(DateTime(timezone=True), nullable=True)
+
+
+class DNSSearchZone(Base):
+    """SOA serial of each zone as last copied into dns_search_records."""
+
+    __tablename__ = "dns_search_zones"
+
+    zone = Column(String(255), primary_key=True)
+    serial = Column(Integer, nullable=True)
+    indexed_at = Column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+# Trigram FTS5 index over dns_search_records, kept in sync by triggers. The
+# trigram tokenizer matches arbitrary substrings of three or more characters.
+DNS_SEARCH_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS dns_record_search USING fts5("
+    "name, content, content='dns_search_records', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS dns_search_records_ai AFTER INSERT ON dns_search_records "
+    "BEGIN INSERT INTO dns_record_search(rowid, name, content) "
+    "VALUES (new.id, new.name, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS dns_search_records_ad AFTER DELETE ON dns_search_records "
+    "BEGIN INSERT INTO dns_record_search(dns_record_search, rowid, name, content) "
+    "VALUES ('delete', old.id, old.name, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS dns_search_records_au AFTER UPDATE ON dns_search_records "
+    "BEGIN INSERT INTO dns_record_search(dns_record_search, rowid, name, content) "
+    "VALUES ('delete', old.id, old.name, old.content); "
+    "INSERT INTO dns_record_search(rowid, name, content) "
+    "VALUES (new.id, new.name, new.content); END",
+]
+
+
+def fts5_trigram_available(connection) -> bool:
+    """Check whether this SQLite build has FTS5 with the trigram tokenizer (3.34+)."""
+    if connection.dialect.name != "sqlite":
+        return False
+    version = tuple(connection.dialect.dbapi.sqlite_version_info)
+    options = {row[0] for row in connection.exec_driver_sql("PRAGMA compile_options")}
+    return version >= (3, 34, 0) and "ENABLE_FTS5" in options
+
+
+# Trigram FTS5 index over hosts.hostname for substring host search, same scheme
+# as DNS_SEARCH_FTS_DDL. Only hostname changes touch the index.
+HOST_SEARCH_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS host_search USING fts5("
+    "hostname, content='hosts', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS hosts_search_ai AFTER INSERT ON hosts "
+    "BEGIN INSERT INTO host_search(rowid, hostname) VALUES (new.id, new.hostname); END",
+    "CREATE TRIGGER IF NOT EXISTS hosts_search_ad AFTER DELETE ON hosts "
+    "BEGIN INSERT INTO host_search(host_search, rowid, hostname) "
+    "VALUES ('delete', old.id, old.hostname); END",
+    "CREATE TRIGGER IF NOT EXISTS hosts_search_au AFTER UPDATE OF hostname ON hosts "
+    "BEGIN INSERT INTO host_search(host_search, rowid, hostname) "
+    "VALUES ('delete', old.id, old.hostname); "
+    "INSERT INTO host_search(rowid, hostname) VALUES (new.id, new.hostname); END",
+]
+
+
+# Keep host_counters in step with hosts in the same transaction as every
+# insert, delete, status transition and change of owner. Updates that leave
+# status and owner alone (heartbeats) do not touch the counters.
+_HOST_COUNTER_ADD = (
+    "INSERT INTO host_counters "
+    "(user_id, total_hosts, online_hosts, offline_hosts, last_registration) "
+    "VALUES (new.created_by, 1, new.status = 'online', new.status = 'offline', new.last_seen) "
+    "ON CONFLICT(user_id) DO UPDATE SET total_hosts = total_hosts + 1, "
+    "online_hosts = online_hosts + excluded.online_hosts, "
+    "offline_hosts = offline_hosts + excluded.offline_hosts, "
+    "last_registration = max(coalesce(last_registration, excluded.last_registration), "
+    "excluded.last_registration); "
+)
+_HOST_COUNTER_REMOVE = (
+    "UPDATE host_counters SET total_hosts = total_hosts - 1, "
+    "online_hosts = online_hosts - (old.status = 'online'), "
+    "offline_hosts = offline_hosts - (old.status = 'offline') "
+    "WHERE user_id = old.created_by; "
+    "DELETE FROM host_counters WHERE user_id = old.created_by AND total_hosts <= 0; "
+)
+HOST_COUNTER_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS hosts_counters_ai AFTER INSERT ON hosts "
+    f"BEGIN {_HOST_COUNTER_ADD}END",
+    "CREATE TRIGGER IF NOT EXISTS hosts_counters_ad AFTER DELETE ON hosts "
+    f"BEGIN {_HOST_COUNTER_REMOVE}END",
+    "CREATE TRIGGER IF NOT EXISTS hosts_counters_au_status AFTER UPDATE OF status ON hosts "
+    "WHEN old.status IS NOT new.status AND old.created_by = new.created_by "
+    "BEGIN UPDATE host_counters SET "
+    "online_hosts = online_hosts + (new.status = 'online') - (old.status = 'online'), "
+    "offline_hosts = offline_hosts + (new.status = 'offline') - (old.status = 'offline'), "
+    "last_registration = CASE WHEN new.status = 'online' "
+    "THEN max(coalesce(last_registration, new.last_seen), new.last_seen) "
+    "ELSE last_registration END "
+    "WHERE user_id = new.created_by; END",
+    "CREATE TRIGGER IF NOT EXISTS hosts_counters_au_owner AFTER UPDATE OF created_by ON hosts "
+    "WHEN old.created_by IS NOT new.created_by "
+    f"BEGIN {_HOST_COUNTER_REMOVE}{_HOST_COUNTER_ADD}END",
+]
+
+# Rebuild host_counters from hosts (after creating the triggers on an existing table)
+HOST_COUNTER_REBUILD = [
+    "DELETE FROM host_counters",
+    "INSERT INTO host_counters "
+    "(user_id, total_hosts, online_hosts, offline_hosts, last_registration) "
+    "SELECT created_by, count(*), sum(status = 'online'), sum(status = 'offline'), "
+    "max(last_seen) FROM hosts GROUP BY created_by",
+]
+
+
+for _statement in HOST_COUNTER_DDL:
+    event.listen(Host.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+for _table, _statements in (
+    (DNSSearchRecord.__table__, DNS_SEARCH_FTS_DDL),
+    (Host.__table__, HOST_SEARCH_FTS_DDL),
+):
+    for _statement in _statements:
+        event.listen(
+            _table,
+            "after_create",
+            DDL(_statement).execute_if(
+                callable_=lambda ddl, target, bind, **kw: fts5_trigram_available(bind)
+            ),
+        )
+
+
 # Event listeners for automatic timestamp updates
 @event.listens_for(Host, "before_update")
 def update_timestamps(mapper, connection, target):
@@ -306,4 +485,4 @@ def update_dns_zone_ownership_timestamps(mapper, connection, target):
 
 
 # Database schema version for migrations
-SCHEMA_VERSION = 7  # Version 7: Add is_admin field to users table (SCRUM-133)
+SCHEMA_VERSION = 13  # Version 13: Per-user host counters
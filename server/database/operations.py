@@ -6,14 +6,14 @@ Host record management and database operations.
 
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import and_, bindparam, case, desc, func, or_, select, text
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from .connection import DatabaseManager
-from .models import Host
+from .models import Host, HostCounter
 
 logger = logging.getLogger(__name__)
 
@@ -127,20 +127,24 @@ class HostOperations:
             logger.error(f"Database error retrieving host ID {host_id}: {e}")
             return None
 
-    def update_host_ip(self, hostname: str, new_ip: str) -> bool:
+    def update_host_ip(self, hostname: str, new_ip: str, user_id: str = None) -> bool:
         """
         Update host IP address.
 
         Args:
             hostname: Hostname to update
             new_ip: New IP address
+            user_id: Optional owner of the host (hostnames are only unique per user)
 
         Returns:
             True if update successful, False otherwise
         """
         try:
             with self.db_manager.get_session() as session:
-                host = session.query(Host).filter(Host.hostname == hostname).first()
+                query = session.query(Host).filter(Host.hostname == hostname)
+                if user_id:
+                    query = query.filter(Host.created_by == user_id)
+                host = query.first()
 
                 if not host:
                     logger.warning(f"Host not found for IP update: {hostname}")
@@ -161,19 +165,23 @@ class HostOperations:
             logger.error(f"Database error updating IP for {hostname}: {e}")
             return False
 
-    def update_host_last_seen(self, hostname: str) -> bool:
+    def update_host_last_seen(self, hostname: str, user_id: str = None) -> bool:
         """
         Update host last seen timestamp.
 
         Args:
             hostname: Hostname to update
+            user_id: Optional owner of the host (hostnames are only unique per user)
 
         Returns:
             True if update successful, False otherwise
         """
         try:
             with self.db_manager.get_session() as session:
-                host = session.query(Host).filter(Host.hostname == hostname).first()
+                query = session.query(Host).filter(Host.hostname == hostname)
+                if user_id:
+                    query = query.filter(Host.created_by == user_id)
+                host = query.first()
 
                 if not host:
                     logger.warning(f"Host not found for last_seen update: {hostname}")
@@ -188,6 +196,211 @@ class HostOperations:
             logger.error(f"Database error updating last_seen for {hostname}: {e}")
             return False
 
+    def set_host_online(
+        self,
+        host_id: int,
+        ip_address: Optional[str] = None,
+        seen_at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Record a registration for a known host with one primary key UPDATE.
+
+        Sets the host online and moves last_seen, and current_ip when given,
+        without loading the row first.
+
+        Args:
+            host_id: Host primary key
+            ip_address: New IP address (unchanged if None)
+            seen_at: Time the host was seen (defaults to now)
+
+        Returns:
+            True if the host was updated, False otherwise
+        """
+        if seen_at is None:
+            seen_at = datetime.now(timezone.utc)
+
+        values: Dict[str, Any] = {"status": "online", "last_seen": seen_at, "updated_at": seen_at}
+        if ip_address is not None:
+            try:
+                Host.validate_ip(ip_address)
+            except ValueError as e:
+                logger.error(f"Invalid IP address for host ID {host_id}: {e}")
+                return False
+            values["current_ip"] = ip_address
+
+        hosts_table = Host.__table__
+        try:
+            with self.db_manager.get_session() as session:
+                result = session.execute(
+                    hosts_table.update().where(hosts_table.c.id == host_id).values(**values)
+                )
+
+                if result.rowcount == 0:
+                    logger.warning(f"Host not found for online update: ID {host_id}")
+                    return False
+
+                return True
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error setting host ID {host_id} online: {e}")
+            return False
+
+    def bulk_update_last_seen(self, last_seen_by_id: Dict[int, datetime]) -> int:
+        """
+        Apply many heartbeat updates in one transaction.
+
+        Each host is set online with its own last_seen timestamp using a single
+        executemany UPDATE keyed by primary key.
+
+        Args:
+            last_seen_by_id: Mapping of host ID to last seen timestamp
+
+        Returns:
+            Number of rows updated
+
+        Raises:
+            SQLAlchemyError: If the batch could not be written, so callers can retry it
+        """
+        if not last_seen_by_id:
+            return 0
+
+        hosts_table = Host.__table__
+        stmt = (
+            hosts_table.update()
+            .where(hosts_table.c.id == bindparam("host_id"))
+            .values(
+                last_seen=bindparam("seen_at"),
+                updated_at=bindparam("seen_at"),
+                status="online",
+            )
+        )
+        params = [
+            {"host_id": host_id, "seen_at": seen_at} for host_id, seen_at in last_seen_by_id.items()
+        ]
+
+        try:
+            with self.db_manager.get_session() as session:
+                result = session.execute(stmt, params)
+                return result.rowcount
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error applying {len(params)} heartbeat updates: {e}")
+            raise
+
+    def bulk_update_dns_info(
+        self,
+        synced: Dict[int, Tuple[str, str]],
+        failed: Iterable[int] = (),
+        pending: Iterable[int] = (),
+        addresses: Optional[Dict[int, str]] = None,
+    ) -> int:
+        """
+        Record the outcome of a batch of DNS updates in one transaction.
+
+        Synced hosts get their zone and record name with one executemany
+        UPDATE keyed by primary key; failed and pending hosts are flagged
+        with a single UPDATE ... WHERE id IN (...) each. last_seen is left
+        untouched.
+
+        When ``addresses`` is given, a synced host whose current_ip no longer
+        matches the address that was sent for it changed IP meanwhile; it is
+        marked pending instead, so the newer address gets synced.
+
+        Args:
+            synced: Mapping of host ID to (zone, record FQDN)
+            failed: Host IDs whose DNS update failed
+            pending: Host IDs whose DNS update was deferred for a later flush
+            addresses: Mapping of synced host ID to the address sent (optional)
+
+        Returns:
+            Number of rows updated
+
+        Raises:
+            SQLAlchemyError: If the batch could not be written
+        """
+        failed = list(failed)
+        pending = list(pending)
+        if not synced and not failed and not pending:
+            return 0
+
+        hosts_table = Host.__table__
+        rows = 0
+
+        try:
+            with self.db_manager.get_session() as session:
+                if synced:
+                    stmt = (
+                        hosts_table.update()
+                        .where(hosts_table.c.id == bindparam("host_id"))
+                        .values(
+                            dns_zone=bindparam("zone"),
+                            dns_record_id=bindparam("fqdn"),
+                            dns_sync_status="synced",
+                            dns_last_sync=datetime.now(timezone.utc),
+                            last_seen=hosts_table.c.last_seen,
+                        )
+                    )
+                    params = [
+                        {"host_id": host_id, "zone": zone, "fqdn": fqdn}
+                        for host_id, (zone, fqdn) in synced.items()
+                    ]
+                    if addresses is not None:
+                        stmt = stmt.where(hosts_table.c.current_ip == bindparam("address"))
+                        for row in params:
+                            row["address"] = addresses[row["host_id"]]
+                    rows += session.execute(stmt, params).rowcount
+
+                    if addresses is not None:
+                        stale = (
+                            hosts_table.update()
+                            .where(hosts_table.c.id == bindparam("host_id"))
+                            .where(hosts_table.c.current_ip != bindparam("address"))
+                            .values(dns_sync_status="pending", last_seen=hosts_table.c.last_seen)
+                        )
+                        rows += session.execute(
+                            stale, [{k: row[k] for k in ("host_id", "address")} for row in params]
+                        ).rowcount
+
+                if failed:
+                    rows += session.execute(
+                        hosts_table.update()
+                        .where(hosts_table.c.id.in_(failed))
+                        .values(dns_sync_status="failed", last_seen=hosts_table.c.last_seen)
+                    ).rowcount
+
+                if pending:
+                    rows += session.execute(
+                        hosts_table.update()
+                        .where(hosts_table.c.id.in_(pending))
+                        .values(dns_sync_status="pending", last_seen=hosts_table.c.last_seen)
+                    ).rowcount
+
+                return rows
+
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Database error recording DNS status for "
+                f"{len(synced) + len(failed) + len(pending)} hosts: {e}"
+            )
+            raise
+
+    def get_existing_host_ids(self, host_ids: List[int]) -> Set[int]:
+        """
+        Find which of the given host IDs still exist.
+
+        Args:
+            host_ids: Host primary keys to check
+
+        Returns:
+            Set of IDs that have a host row
+        """
+        hosts_table = Host.__table__
+        with self.db_manager.get_session() as session:
+            rows = session.execute(
+                select(hosts_table.c.id).where(hosts_table.c.id.in_(host_ids))
+            ).scalars()
+            return set(rows)
+
     def get_all_hosts(self, limit: Optional[int] = None, offset: int = 0, user_id: str = None) -> List[Host]:
         """
         Retrieve all hosts with optional pagination and user filtering.
@@ -253,19 +466,127 @@ class HostOperations:
             logger.error(f"Database error retrieving hosts by status {status}: {e}")
             return []
 
-    def mark_host_offline(self, hostname: str) -> bool:
+    def get_hosts_page(
+        self,
+        user_id: str = None,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> Tuple[List[Host], int]:
+        """
+        Retrieve one page of hosts, newest first, with the total match count.
+
+        Filtering, counting and paging all run in SQL. Searches of three or
+        more characters use the host_search trigram index where available;
+        shorter ones (and databases without FTS5) scan hostnames.
+
+        Pages start at ``offset``, or, given a (last_seen, id) key, directly
+        after or before that host (keyset paging), so deep pages cost the same
+        as the first and heartbeats moving hosts do not shift later pages.
+
+        Args:
+            user_id: Optional user ID to filter by (for user isolation)
+            status: Optional host status ('online' or 'offline')
+            search: Optional case-insensitive hostname substring
+            limit: Maximum number of hosts to return
+            offset: Number of hosts to skip
+            after: Optional (last_seen, id) key; return the hosts after it
+            before: Optional (last_seen, id) key; return the hosts before it
+
+        Returns:
+            Tuple of (hosts on the page, total number of matching hosts)
+        """
+        try:
+            with self.db_manager.get_session() as session:
+                query = session.query(Host)
+
+                # Filter by user if specified
+                if user_id:
+                    query = query.filter(Host.created_by == user_id)
+
+                if status:
+                    query = query.filter(Host.status == status)
+
+                if search:
+                    if len(search) >= 3 and self._host_search_available(session):
+                        # A quoted trigram phrase matches any substring, case-insensitively
+                        query = query.filter(
+                            text(
+                                "hosts.id IN (SELECT rowid FROM host_search "
+                                "WHERE host_search MATCH :host_match)"
+                            ).bindparams(host_match=f'"{search.replace(chr(34), chr(34) * 2)}"')
+                        )
+                    else:
+                        query = query.filter(
+                            func.instr(func.lower(Host.hostname), search.lower()) > 0
+                        )
+
+                total = query.with_entities(func.count(Host.id)).scalar() or 0
+
+                if before is not None:
+                    # Walk towards newer hosts, then restore newest-first order
+                    last_seen, host_id = before
+                    hosts = (
+                        query.filter(
+                            or_(
+                                Host.last_seen > last_seen,
+                                and_(Host.last_seen == last_seen, Host.id > host_id),
+                            )
+                        )
+                        .order_by(Host.last_seen, Host.id)
+                        .limit(limit)
+                        .all()
+                    )
+                    return hosts[::-1], total
+
+                if after is not None:
+                    last_seen, host_id = after
+                    query = query.filter(
+                        or_(
+                            Host.last_seen < last_seen,
+                            and_(Host.last_seen == last_seen, Host.id < host_id),
+                        )
+                    )
+
+                query = query.order_by(desc(Host.last_seen), desc(Host.id))
+                if after is None and offset > 0:
+                    query = query.offset(offset)
+
+                hosts = query.limit(limit).all()
+                return hosts, total
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error retrieving host page: {e}")
+            return [], 0
+
+    @staticmethod
+    def _host_search_available(session: Session) -> bool:
+        """Check whether the host_search FTS5 trigram table exists."""
+        result = session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='host_search'")
+        )
+        return result.fetchone() is not None
+
+    def mark_host_offline(self, hostname: str, user_id: str = None) -> bool:
         """
         Mark host as offline.
 
         Args:
             hostname: Hostname to mark offline
+            user_id: Optional owner of the host (hostnames are only unique per user)
 
         Returns:
             True if update successful, False otherwise
         """
         try:
             with self.db_manager.get_session() as session:
-                host = session.query(Host).filter(Host.hostname == hostname).first()
+                query = session.query(Host).filter(Host.hostname == hostname)
+                if user_id:
+                    query = query.filter(Host.created_by == user_id)
+                host = query.first()
 
                 if not host:
                     logger.warning(f"Host not found for offline marking: {hostname}")
@@ -281,36 +602,121 @@ class HostOperations:
             logger.error(f"Database error marking host offline {hostname}: {e}")
             return False
 
-    def mark_hosts_offline_by_timeout(self, timeout_threshold: datetime) -> int:
+    def mark_host_offline_by_id(self, host_id: int) -> bool:
         """
-        Mark hosts offline based on timeout threshold.
+        Mark host as offline with one primary key UPDATE.
+
+        last_seen is preserved, as in the timeout sweep.
 
         Args:
-            timeout_threshold: Hosts with last_seen before this time are marked offline
+            host_id: Host primary key
 
         Returns:
-            Number of hosts marked offline
+            True if update successful, False otherwise
         """
+        hosts_table = Host.__table__
         try:
             with self.db_manager.get_session() as session:
-                # Find online hosts that have timed out
-                timed_out_hosts = (
-                    session.query(Host)
-                    .filter(and_(Host.status == "online", Host.last_seen < timeout_threshold))
-                    .all()
+                result = session.execute(
+                    hosts_table.update()
+                    .where(hosts_table.c.id == host_id)
+                    .values(status="offline", last_seen=hosts_table.c.last_seen)
                 )
 
-                count = 0
-                for host in timed_out_hosts:
-                    host.set_offline()
-                    count += 1
-                    logger.info(f"Marked host offline due to timeout: {host.hostname}")
+                if result.rowcount == 0:
+                    logger.warning(f"Host not found for offline marking: ID {host_id}")
+                    return False
 
-                return count
+                return True
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error marking host ID {host_id} offline: {e}")
+            return False
+
+    def mark_hosts_offline_by_timeout(self, timeout_threshold: datetime) -> int:
+        """
+        Mark hosts offline based on timeout threshold.
+
+        Args:
+            timeout_threshold: Hosts with last_seen before this time are marked offline
+
+        Returns:
+            Number of hosts marked offline
+        """
+        chunk_size = 1000
+        count = 0
+        try:
+            while True:
+                marked = self.mark_timed_out_hosts_offline(timeout_threshold, limit=chunk_size)
+                count += len(marked)
+                if len(marked) < chunk_size:
+                    return count
 
         except SQLAlchemyError as e:
             logger.error(f"Database error marking hosts offline by timeout: {e}")
-            return 0
+            return count
+
+    def mark_timed_out_hosts_offline(
+        self, timeout_threshold: datetime, limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Mark one chunk of timed out hosts offline with a single UPDATE.
+
+        Runs ``UPDATE hosts SET status='offline' WHERE id IN (SELECT id ...
+        WHERE status='online' AND last_seen < :cutoff LIMIT :limit)`` so the
+        range scan uses idx_hosts_status_last_seen and each call holds the write
+        lock for at most ``limit`` rows. Callers loop until fewer than
+        ``limit`` rows come back. last_seen is left untouched.
+
+        Args:
+            timeout_threshold: Hosts with last_seen before this time are marked offline
+            limit: Maximum number of hosts to mark in this chunk
+
+        Returns:
+            List of dicts with id, hostname and created_by for each host marked offline
+
+        Raises:
+            SQLAlchemyError: If the update failed
+        """
+        hosts_table = Host.__table__
+        chunk = (
+            select(hosts_table.c.id)
+            .where(
+                and_(
+                    hosts_table.c.status == "online",
+                    hosts_table.c.last_seen < timeout_threshold,
+                )
+            )
+            .limit(limit)
+            .scalar_subquery()
+        )
+        columns = (hosts_table.c.id, hosts_table.c.hostname, hosts_table.c.created_by)
+
+        with self.db_manager.get_session() as session:
+            if session.bind.dialect.update_returning:
+                stmt = (
+                    hosts_table.update()
+                    .where(hosts_table.c.id.in_(chunk))
+                    # Set last_seen to itself so the column onupdate does not bump it
+                    .values(status="offline", last_seen=hosts_table.c.last_seen)
+                    .returning(*columns)
+                )
+                rows = session.execute(stmt).all()
+            else:
+                rows = session.execute(select(*columns).where(hosts_table.c.id.in_(chunk))).all()
+                if rows:
+                    session.execute(
+                        hosts_table.update()
+                        .where(hosts_table.c.id.in_([row.id for row in rows]))
+                        .values(status="offline", last_seen=hosts_table.c.last_seen)
+                    )
+
+        if rows:
+            logger.info(f"Marked {len(rows)} hosts offline due to timeout")
+
+        return [
+            {"id": row.id, "hostname": row.hostname, "created_by": row.created_by} for row in rows
+        ]
 
     def cleanup_old_hosts(self, older_than_days: int) -> int:
         """
@@ -467,42 +873,47 @@ class HostOperations:
             logger.error(f"Database error getting recently seen hosts: {e}")
             return []
 
-    def get_host_statistics(self) -> Dict[str, Any]:
+    def get_host_statistics(self, user_id: str = None) -> Dict[str, Any]:
         """
         Get comprehensive host statistics.
 
+        All figures come from one conditional-aggregate query.
+
+        Args:
+            user_id: Optional user ID to filter by (for user isolation)
+
         Returns:
             Dictionary with various host statistics
         """
         try:
             with self.db_manager.get_session() as session:
-                total_hosts = session.query(func.count(Host.id)).scalar() or 0
-                online_hosts = (
-                    session.query(func.count(Host.id)).filter(Host.status == "online").scalar() or 0
-                )
-                offline_hosts = (
-                    session.query(func.count(Host.id)).filter(Host.status == "offline").scalar()
-                    or 0
-                )
-
                 # Recent activity (last 24 hours)
                 since_24h = datetime.now(timezone.utc) - timedelta(hours=24)
-                recent_hosts = (
-                    session.query(func.count(Host.id)).filter(Host.last_seen >= since_24h).scalar()
-                    or 0
+                query = session.query(
+                    func.count(Host.id),
+                    func.sum(case((Host.status == "online", 1), else_=0)),
+                    func.sum(case((Host.status == "offline", 1), else_=0)),
+                    func.sum(case((Host.last_seen >= since_24h, 1), else_=0)),
+                    # Oldest and newest hosts, and the latest registration
+                    func.min(Host.first_seen),
+                    func.max(Host.first_seen),
+                    func.max(Host.last_seen),
                 )
 
-                # Oldest and newest hosts
-                oldest_host = session.query(Host).order_by(Host.first_seen).first()
-                newest_host = session.query(Host).order_by(desc(Host.first_seen)).first()
+                # Filter by user if specified
+                if user_id:
+                    query = query.filter(Host.created_by == user_id)
+
+                total, online, offline, recent, oldest, newest, last_seen = query.one()
 
                 return {
-                    "total_hosts": total_hosts,
-                    "online_hosts": online_hosts,
-                    "offline_hosts": offline_hosts,
-                    "recent_activity_24h": recent_hosts,
-                    "oldest_host_date": oldest_host.first_seen.isoformat() if oldest_host else None,
-                    "newest_host_date": newest_host.first_seen.isoformat() if newest_host else None,
+                    "total_hosts": total or 0,
+                    "online_hosts": online or 0,
+                    "offline_hosts": offline or 0,
+                    "recent_activity_24h": recent or 0,
+                    "oldest_host_date": oldest.isoformat() if oldest else None,
+                    "newest_host_date": newest.isoformat() if newest else None,
+                    "last_seen_date": last_seen.isoformat() if last_seen else None,
                 }
 
         except SQLAlchemyError as e:
@@ -514,8 +925,74 @@ class HostOperations:
                 "recent_activity_24h": 0,
                 "oldest_host_date": None,
                 "newest_host_date": None,
+                "last_seen_date": None,
             }
 
+    def get_host_counters(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get a user's host counts from host_counters (a primary key lookup).
+
+        Args:
+            user_id: Owner of the hosts
+
+        Returns:
+            Dictionary with total, online and offline hosts and the last registration
+        """
+        try:
+            with self.db_manager.get_session() as session:
+                counter = session.get(HostCounter, user_id)
+                if counter is None:
+                    return {
+                        "total_hosts": 0,
+                        "online_hosts": 0,
+                        "offline_hosts": 0,
+                        "last_registration": None,
+                    }
+
+                return {
+                    "total_hosts": counter.total_hosts,
+                    "online_hosts": counter.online_hosts,
+                    "offline_hosts": counter.offline_hosts,
+                    "last_registration": counter.last_registration,
+                }
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error getting host counters for {user_id}: {e}")
+            return {
+                "total_hosts": 0,
+                "online_hosts": 0,
+                "offline_hosts": 0,
+                "last_registration": None,
+            }
+
+    def get_system_host_statistics(self) -> Dict[str, Any]:
+        """
+        Get system-wide host ownership statistics from host_counters.
+
+        host_counters has one row per owner, so this sums one row per user
+        rather than scanning hosts for distinct owners.
+
+        Returns:
+            Dictionary with total hosts, users owning hosts and hosts without an owner
+        """
+        try:
+            with self.db_manager.get_session() as session:
+                total, users, anonymous = session.query(
+                    func.sum(HostCounter.total_hosts),
+                    func.count(HostCounter.user_id),
+                    func.sum(case((HostCounter.user_id == "", HostCounter.total_hosts), else_=0)),
+                ).one()
+
+                return {
+                    "total_hosts": total or 0,
+                    "users_with_hosts": users or 0,
+                    "anonymous_hosts": anonymous or 0,
+                }
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error getting system host statistics: {e}")
+            return {"total_hosts": 0, "users_with_hosts": 0, "anonymous_hosts": 0}
+
     def update_dns_info(
         self,
         hostname: str,
@@ -523,6 +1000,7 @@ class HostOperations:
         dns_record_id: Optional[str] = None,
         dns_ttl: Optional[int] = None,
         dns_sync_status: Optional[str] = None,
+        user_id: str = None,
     ) -> bool:
         """
         Update DNS information for a host.
@@ -533,13 +1011,17 @@ class HostOperations:
             dns_record_id: PowerDNS record ID
             dns_ttl: DNS TTL value
             dns_sync_status: Sync status (pending, synced, failed)
+            user_id: Optional owner of the host (hostnames are only unique per user)
 
         Returns:
             True if update successful, False otherwise
         """
         try:
             with self.db_manager.get_session() as session:
-                host = session.query(Host).filter(Host.hostname == hostname).first()
+                query = session.query(Host).filter(Host.hostname == hostname)
+                if user_id:
+                    query = query.filter(Host.created_by == user_id)
+                host = query.first()
 
                 if not host:
                     logger.warning(f"Host not found for DNS update: {hostname}")
@@ -564,23 +1046,81 @@ class HostOperations:
             logger.error(f"Database error updating DNS info for {hostname}: {e}")
             return False
 
-    def get_hosts_pending_dns_sync(self, limit: Optional[int] = None) -> List[Host]:
+    def update_dns_info_by_id(
+        self,
+        host_id: int,
+        dns_zone: Optional[str] = None,
+        dns_record_id: Optional[str] = None,
+        dns_ttl: Optional[int] = None,
+        dns_sync_status: Optional[str] = None,
+    ) -> bool:
+        """
+        Update DNS information for a host with one primary key UPDATE.
+
+        Args:
+            host_id: Host primary key
+            dns_zone: DNS zone
+            dns_record_id: PowerDNS record ID
+            dns_ttl: DNS TTL value
+            dns_sync_status: Sync status (pending, synced, failed)
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        hosts_table = Host.__table__
+        # DNS bookkeeping is not a sighting of the host: keep last_seen as is
+        values: Dict[str, Any] = {"last_seen": hosts_table.c.last_seen}
+        if dns_zone is not None:
+            values["dns_zone"] = dns_zone
+        if dns_record_id is not None:
+            values["dns_record_id"] = dns_record_id
+        if dns_ttl is not None:
+            values["dns_ttl"] = dns_ttl
+        if dns_sync_status is not None:
+            values["dns_sync_status"] = dns_sync_status
+            if dns_sync_status == "synced":
+                values["dns_last_sync"] = datetime.now(timezone.utc)
+
+        try:
+            with self.db_manager.get_session() as session:
+                result = session.execute(
+                    hosts_table.update().where(hosts_table.c.id == host_id).values(**values)
+                )
+
+                if result.rowcount == 0:
+                    logger.warning(f"Host not found for DNS update: ID {host_id}")
+                    return False
+
+                logger.info(f"Updated DNS info for host ID {host_id}")
+                return True
+
+        except SQLAlchemyError as e:
+            logger.error(f"Database error updating DNS info for host ID {host_id}: {e}")
+            return False
+
+    def get_hosts_pending_dns_sync(
+        self, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Host]:
         """
         Get hosts that need DNS synchronization.
 
         Args:
             limit: Maximum number of hosts to return
+            after_id: If given, only hosts with a higher ID are returned, in
+                ID order, so large backlogs can be read page by page
 
         Returns:
             List of Host instances pending DNS sync
         """
         try:
             with self.db_manager.get_session() as session:
-                query = (
-                    session.query(Host)
-                    .filter(Host.dns_sync_status.in_(["pending", "failed", None]))
-                    .order_by(Host.created_at)
+                query = session.query(Host).filter(
+                    Host.dns_sync_status.in_(["pending", "failed", None])
                 )
+                if after_id is not None:
+                    query = query.filter(Host.id > after_id).order_by(Host.id)
+                else:
+                    query = query.order_by(Host.created_at)
 
                 if limit:
                     query = query.limit(limit)
@@ -596,39 +1136,40 @@ class HostOperations:
         """
         Get DNS synchronization statistics.
 
+        All figures come from one conditional-aggregate query. Hosts with
+        no sync status yet count as pending.
+
         Returns:
             Dictionary with DNS sync statistics
         """
         try:
             with self.db_manager.get_session() as session:
-                total_hosts = session.query(func.count(Host.id)).scalar() or 0
-
-                synced_hosts = (
-                    session.query(func.count(Host.id))
-                    .filter(Host.dns_sync_status == "synced")
-                    .scalar()
-                    or 0
-                )
-
-                pending_hosts = (
-                    session.query(func.count(Host.id))
-                    .filter(Host.dns_sync_status.in_(["pending", None]))
-                    .scalar()
-                    or 0
-                )
-
-                failed_hosts = (
-                    session.query(func.count(Host.id))
-                    .filter(Host.dns_sync_status == "failed")
-                    .scalar()
-                    or 0
-                )
+                total_hosts, synced_hosts, pending_hosts, failed_hosts = session.query(
+                    func.count(Host.id),
+                    func.sum(case((Host.dns_sync_status == "synced", 1), else_=0)),
+                    func.sum(
+                        case(
+                            (
+                                or_(
+                                    Host.dns_sync_status == "pending",
+                                    Host.dns_sync_status.is_(None),
+                                ),
+                                1,
+                            ),
+                            else_=0,
+                        )
+                    ),
+                    func.sum(case((Host.dns_sync_status == "failed", 1), else_=0)),
+                ).one()
+
+                total_hosts = total_hosts or 0
+                synced_hosts = synced_hosts or 0
 
                 return {
                     "total_hosts": total_hosts,
                     "dns_synced": synced_hosts,
-                    "dns_pending": pending_hosts,
-                    "dns_failed": failed_hosts,
+                    "dns_pending": pending_hosts or 0,
+                    "dns_failed": failed_hosts or 0,
                     "sync_percentage": (synced_hosts / total_hosts * 100) if total_hosts > 0 else 0,
                 }
 
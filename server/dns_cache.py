@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Zone Cache for Prism DNS Server
+Read-through cache of PowerDNS zone listings and zone RRsets.
+"""
+
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .dns_names import absolute_zone_name
+from .monitoring import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+# Lookup result -> statistics key
+_STAT_KEYS = {"hit": "hits", "miss": "misses", "stale": "stale"}
+
+# Every live cache, so a write through one client invalidates the others
+_caches: "weakref.WeakSet[ZoneCache]" = weakref.WeakSet()
+
+
+def invalidate_zone_caches(zone_name: Optional[str] = None) -> None:
+    """
+    Drop a zone (or everything) from every zone cache in the process.
+
+    Args:
+        zone_name: Zone that changed; None drops everything
+    """
+    for cache in list(_caches):
+        cache.invalidate(zone_name)
+
+
+class ZoneCache:
+    """
+    Cache of PowerDNS zone details validated against SOA serials.
+
+    The zone listing (``GET /zones``) is cheap and carries each zone's SOA
+    serial, so it is cached only briefly (``list_ttl``). Zone details with
+    their RRsets are expensive and are cached per zone, LRU-bounded to
+    ``max_zones``. A cached zone is served while it is younger than ``ttl``
+    and its serial still matches the latest listing; a serial bump seen in
+    the listing makes it stale immediately. Writes made through any Prism
+    client call invalidate_zone_caches() so they are visible on the next
+    read.
+    """
+
+    def __init__(self, ttl: float = 60, list_ttl: float = 5, max_zones: int = 1000):
+        """
+        Initialize zone cache.
+
+        Args:
+            ttl: Maximum age in seconds of cached zone details
+            list_ttl: Maximum age in seconds of the cached zone listing
+            max_zones: Maximum number of zones with cached details
+        """
+        self.ttl = ttl
+        self.list_ttl = list_ttl
+        self.max_zones = max_zones
+
+        # zone name -> (cached at, serial, zone details), least recently used first
+        self._zones: "OrderedDict[str, Tuple[float, Any, Dict[str, Any]]]" = OrderedDict()
+        self._zone_list: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        # Latest serial per zone according to the zone listing
+        self._serials: Dict[str, Any] = {}
+
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+        _caches.add(self)
+
+    def get_zone_list(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the cached zone listing.
+
+        Returns:
+            Copies of the zone summaries, or None if missing or expired
+        """
+        if self._zone_list is None:
+            self._record("zone_list", "miss")
+            return None
+
+        cached_at, zones = self._zone_list
+        if time.monotonic() - cached_at >= self.list_ttl:
+            self._zone_list = None
+            self._record("zone_list", "stale")
+            return None
+
+        self._record("zone_list", "hit")
+        return [dict(zone) for zone in zones]
+
+    def put_zone_list(self, zones: List[Dict[str, Any]]) -> None:
+        """
+        Cache a zone listing and take the serials it reports as current.
+
+        Args:
+            zones: Zone summaries as returned by PowerDNS
+        """
+        self._zone_list = (time.monotonic(), [dict(zone) for zone in zones])
+        self._serials = {
+            absolute_zone_name(zone["name"]): zone.get("serial") for zone in zones if "name" in zone
+        }
+
+    def get_zone(self, zone_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached details for a zone.
+
+        Args:
+            zone_name: Zone name
+
+        Returns:
+            Copy of the zone details, or None if missing, expired or outdated
+        """
+        zone_name = absolute_zone_name(zone_name)
+        entry = self._zones.get(zone_name)
+        if entry is None:
+            self._record("zone", "miss")
+            return None
+
+        cached_at, serial, zone = entry
+        current_serial = self._serials.get(zone_name, serial)
+        if time.monotonic() - cached_at >= self.ttl or current_serial != serial:
+            del self._zones[zone_name]
+            self._record("zone", "stale")
+            return None
+
+        self._zones.move_to_end(zone_name)
+        self._record("zone", "hit")
+        return dict(zone)
+
+    def put_zone(self, zone_name: str, zone: Dict[str, Any]) -> None:
+        """
+        Cache details for a zone, evicting the least recently used beyond max_zones.
+
+        Args:
+            zone_name: Zone name
+            zone: Zone details including rrsets and serial
+        """
+        zone_name = absolute_zone_name(zone_name)
+        self._zones[zone_name] = (time.monotonic(), zone.get("serial"), dict(zone))
+        self._zones.move_to_end(zone_name)
+        if "serial" in zone:
+            self._serials[zone_name] = zone["serial"]
+
+        while len(self._zones) > self.max_zones:
+            self._zones.popitem(last=False)
+            self._stats["evictions"] += 1
+            get_metrics_collector().record_powerdns_cache_eviction("lru")
+
+    def invalidate(self, zone_name: Optional[str] = None) -> None:
+        """
+        Drop cached data after a write.
+
+        Args:
+            zone_name: Zone that changed; None drops everything
+        """
+        self._zone_list = None
+        if zone_name is None:
+            dropped = len(self._zones)
+            self._zones.clear()
+            self._serials.clear()
+        else:
+            zone_name = absolute_zone_name(zone_name)
+            dropped = 1 if self._zones.pop(zone_name, None) is not None else 0
+            self._serials.pop(zone_name, None)
+
+        if dropped:
+            self._stats["evictions"] += dropped
+            get_metrics_collector().record_powerdns_cache_eviction("invalidated", dropped)
+
+    def _record(self, cache: str, result: str) -> None:
+        """Count a lookup."""
+        self._stats[_STAT_KEYS[result]] += 1
+        get_metrics_collector().record_powerdns_cache_request(cache, result)
+
+    def __len__(self) -> int:
+        """Get number of zones with cached details."""
+        return len(self._zones)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self._stats.copy()
+        stats["zones"] = len(self._zones)
+        stats["zone_list_cached"] = self._zone_list is not None
+        return stats
@@ -5,20 +5,103 @@ Manages DNS records through PowerDNS API integration.
 """
 
 import asyncio
+import csv
+import io
 import json
 import logging
 import re
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from contextlib import aclosing
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from urllib.parse import urljoin
 
 import aiohttp
 from aiohttp import ClientError, ClientTimeout
 
+from .dns_cache import ZoneCache, invalidate_zone_caches
+from .dns_names import build_fqdn
+from .dns_search_index import get_dns_search_index
+from .json_codec import get_json_codec
 from .monitoring import get_metrics_collector
+from .resilience import CircuitBreaker, CircuitOpenError, RetryConfig
+from .zone_file import iter_zone_file
 
 logger = logging.getLogger(__name__)
 
+# Seconds resolved PowerDNS API host addresses are cached by the connector
+_DNS_CACHE_TTL = 300
+
+# Column header of CSV zone exports
+_CSV_EXPORT_HEADER = ["zone", "name", "type", "ttl", "content", "disabled"]
+
+# An item of a batched PowerDNS write and the result of sending it
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+# Process-wide HTTP session for PowerDNS API calls and the loop it belongs to
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_shared_session(
+    connection_limit: int = 100, keepalive_timeout: int = 30
+) -> aiohttp.ClientSession:
+    """
+    Get or create the process-wide PowerDNS HTTP session.
+
+    All PowerDNSClient instances (TCP server, API routes, DNS update queue)
+    send through one keep-alive connection pool instead of opening and
+    tearing down a pool per client. The pool settings of the first caller
+    win. A session belongs to one event loop, so a new one is created if
+    called from a different loop.
+
+    Args:
+        connection_limit: Maximum simultaneous connections in the pool
+        keepalive_timeout: Seconds an idle connection is kept open
+
+    Returns:
+        Shared aiohttp session
+    """
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=connection_limit,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=_DNS_CACHE_TTL,
+        )
+        _shared_session = aiohttp.ClientSession(connector=connector)
+        _shared_session_loop = loop
+        logger.info(
+            f"PowerDNS HTTP pool created: limit={connection_limit}, "
+            f"keepalive={keepalive_timeout}s"
+        )
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    """Close the process-wide PowerDNS HTTP session (call once at shutdown)."""
+    global _shared_session, _shared_session_loop
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+    _shared_session_loop = None
+
 
 class PowerDNSError(Exception):
     """Base exception for PowerDNS operations."""
@@ -46,6 +129,182 @@ class PowerDNSConnectionError(PowerDNSError):
     pass
 
 
+class PowerDNSCircuitOpenError(PowerDNSConnectionError):
+    """Request rejected without contacting PowerDNS because its circuit is open."""
+
+    pass
+
+
+async def send_with_single_retry(
+    send: Callable[[List[_Item]], Awaitable[_Result]],
+    items: List[_Item],
+    describe: Callable[[_Item], str],
+    zone: str,
+) -> List[Tuple[List[_Item], Optional[_Result]]]:
+    """
+    Send a batch in one request, retrying its items singly if it is rejected.
+
+    PowerDNS refuses a multi-RRset PATCH as a whole, so one bad RRset would
+    fail every other item sent with it; sending them one at a time finds it.
+
+    Args:
+        send: Coroutine function sending a list of items in one request
+        items: Items to send
+        describe: Name of an item for log messages
+        zone: Zone the items belong to, for log messages
+
+    Returns:
+        (items, result) pairs in send order; result is None for rejected items
+
+    Raises:
+        PowerDNSConnectionError: If PowerDNS is unreachable
+    """
+    try:
+        return [(items, await send(items))]
+    except PowerDNSConnectionError:
+        raise
+    except PowerDNSError as e:
+        if len(items) == 1:
+            logger.warning(f"PowerDNS rejected {describe(items[0])} in {zone}: {e}")
+            return [(items, None)]
+        logger.warning(f"PowerDNS rejected a batch of {len(items)} in {zone}, retrying singly: {e}")
+
+    outcomes: List[Tuple[List[_Item], Optional[_Result]]] = []
+    for item in items:
+        try:
+            outcomes.append(([item], await send([item])))
+        except PowerDNSConnectionError:
+            raise
+        except PowerDNSError as e:
+            logger.warning(f"PowerDNS rejected {describe(item)} in {zone}: {e}")
+            outcomes.append(([item], None))
+    return outcomes
+
+
+class _ZoneNode:
+    """Trie node for one label; zones holds the zone names ending here."""
+
+    __slots__ = ("children", "zones")
+
+    def __init__(self):
+        self.children: Dict[str, "_ZoneNode"] = {}
+        self.zones: List[Tuple[int, str]] = []
+
+
+class ZoneHierarchy:
+    """
+    Parent/child index over a set of zone names.
+
+    Zones are stored in a trie keyed by their labels from the top down
+    (com -> example -> sub), built once per zone listing. Parent and level
+    lookups walk the labels of one zone instead of comparing it with every
+    other zone, and children are collected from its subtree.
+    """
+
+    def __init__(self, zone_names: Iterable[str]):
+        """
+        Build the index.
+
+        Args:
+            zone_names: Zone names, with or without trailing dots
+        """
+        self._root = _ZoneNode()
+        for position, zone_name in enumerate(zone_names):
+            node = self._root
+            for label in reversed(self._labels(zone_name)):
+                child = node.children.get(label)
+                if child is None:
+                    child = node.children[label] = _ZoneNode()
+                node = child
+            node.zones.append((position, zone_name))
+
+    @staticmethod
+    def _labels(zone_name: str) -> List[str]:
+        """Split a zone name into labels, ignoring the trailing dot."""
+        return zone_name[:-1].split(".") if zone_name.endswith(".") else zone_name.split(".")
+
+    def _parent(self, zone_name: str) -> Tuple[Optional[str], int]:
+        """Find the closest enclosing zone and its label count."""
+        labels = self._labels(zone_name)
+        parent: Optional[str] = None
+        parent_depth = 0
+        node = self._root
+        # Proper ancestors only: stop before the zone's own labels are exhausted
+        for depth, label in enumerate(reversed(labels[1:]), 1):
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.zones:
+                parent, parent_depth = node.zones[0][1], depth
+        return parent, parent_depth
+
+    def parent(self, zone_name: str) -> Optional[str]:
+        """
+        Get the closest zone that zone_name is a subdomain of.
+
+        Args:
+            zone_name: Zone to look up (need not be indexed)
+
+        Returns:
+            Parent zone name, or None
+        """
+        return self._parent(zone_name)[0]
+
+    def level(self, zone_name: str) -> int:
+        """
+        Get the number of labels between a zone and its parent zone.
+
+        Args:
+            zone_name: Zone to look up (need not be indexed)
+
+        Returns:
+            Label distance to the parent zone, or 0 without a parent
+        """
+        parent, parent_depth = self._parent(zone_name)
+        return len(self._labels(zone_name)) - parent_depth if parent else 0
+
+    def children(self, zone_name: str) -> List[str]:
+        """
+        Get every indexed zone below a zone, at any depth.
+
+        Args:
+            zone_name: Zone to look up (need not be indexed)
+
+        Returns:
+            Descendant zone names in the order they were indexed
+        """
+        node = self._root
+        for label in reversed(self._labels(zone_name)):
+            node = node.children.get(label)
+            if node is None:
+                return []
+
+        found = []
+        stack = list(node.children.values())
+        while stack:
+            node = stack.pop()
+            found.extend(node.zones)
+            stack.extend(node.children.values())
+        return [name for _, name in sorted(found)]
+
+    def describe(self, zone_name: str) -> Dict[str, Any]:
+        """
+        Get the parent, children and level of a zone.
+
+        Args:
+            zone_name: Zone to look up (need not be indexed)
+
+        Returns:
+            Dictionary with zone, parent, children and level
+        """
+        return {
+            "zone": zone_name,
+            "parent": self.parent(zone_name),
+            "children": self.children(zone_name),
+            "level": self.level(zone_name),
+        }
+
+
 class PowerDNSClient:
     """
     Client for PowerDNS API integration.
@@ -76,6 +335,20 @@ class PowerDNSClient:
         self.timeout = powerdns_config.get("timeout", 5)
         self.retry_attempts = powerdns_config.get("retry_attempts", 3)
         self.retry_delay = powerdns_config.get("retry_delay", 1)
+        self.retry_max_delay = powerdns_config.get("retry_max_delay", 10)
+        self._retry = RetryConfig(
+            max_attempts=self.retry_attempts,
+            initial_delay=self.retry_delay,
+            max_delay=self.retry_max_delay,
+        )
+
+        # Circuit breakers: one for the API host (connection failures) and one
+        # per endpoint (server errors), created on first failure
+        self.circuit_breaker_enabled = powerdns_config.get("circuit_breaker_enabled", True)
+        self.circuit_breaker_threshold = powerdns_config.get("circuit_breaker_threshold", 5)
+        self.circuit_breaker_timeout = powerdns_config.get("circuit_breaker_timeout", 30)
+        self._host_breaker = self._create_breaker("api")
+        self._endpoint_breakers: Dict[str, CircuitBreaker] = {}
 
         # Record type settings
         self.record_types = powerdns_config.get("record_types", ["A", "AAAA"])
@@ -85,28 +358,84 @@ class PowerDNSClient:
         if not self.default_zone.endswith("."):
             self.default_zone += "."
 
-        # Session management
+        # Connection pool settings (applied when the shared session is created)
+        self.connection_limit = powerdns_config.get("connection_limit", 100)
+        self.keepalive_timeout = powerdns_config.get("keepalive_timeout", 30)
+        # Zones fetched in parallel when walking many zones
+        self.zone_concurrency = powerdns_config.get("zone_concurrency", 10)
+        self.import_batch_size = powerdns_config.get("import_batch_size", 1000)
+
+        # Per-request settings; the pooled session is shared by every client
+        self._headers = {
+            "X-API-Key": self.api_key,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        self._client_timeout = ClientTimeout(total=self.timeout)
         self._session: Optional[aiohttp.ClientSession] = None
 
+        # Read-through cache of zone listings and zone details
+        self.zone_cache: Optional[ZoneCache] = None
+        if powerdns_config.get("cache_enabled", True):
+            self.zone_cache = ZoneCache(
+                ttl=powerdns_config.get("cache_ttl", 60),
+                list_ttl=powerdns_config.get("cache_list_ttl", 5),
+                max_zones=powerdns_config.get("cache_max_zones", 1000),
+            )
+
         logger.info(
             f"PowerDNS client initialized: enabled={self.enabled}, "
             f"url={self.base_url}, zone={self.default_zone}"
         )
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
-        if self._session is None or self._session.closed:
-            timeout = ClientTimeout(total=self.timeout)
-            headers = {
-                "X-API-Key": self.api_key,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            }
-            self._session = aiohttp.ClientSession(
-                timeout=timeout,
-                headers=headers,
-            )
-        return self._session
+        """Get the HTTP session (the process-wide pooled session unless one was set)."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return await get_shared_session(self.connection_limit, self.keepalive_timeout)
+
+    async def map_zones(
+        self, zone_names: List[str], fetch: Callable[[str], Awaitable[Any]]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Fetch zones concurrently and yield the results in zone order.
+
+        At most zone_concurrency zones are fetched or waiting to be consumed
+        at once, so memory stays bounded however many zones are mapped and
+        however slowly the caller consumes them. Closing the iterator early
+        (use contextlib.aclosing) cancels the fetches that have not finished,
+        so callers can stop once they have enough results.
+
+        Args:
+            zone_names: Zones to fetch
+            fetch: Coroutine function called with each zone name
+
+        Yields:
+            (zone name, result) tuples; a fetch that raised yields its exception
+        """
+        remaining = iter(zone_names)
+        window: Deque[Tuple[str, asyncio.Task]] = deque()
+
+        def fill_window() -> None:
+            for zone_name in islice(remaining, self.zone_concurrency - len(window)):
+                window.append((zone_name, asyncio.create_task(fetch(zone_name))))
+
+        try:
+            fill_window()
+            while window:
+                zone_name, task = window.popleft()
+                try:
+                    result = await task
+                except Exception as e:
+                    result = e
+                # Start the next fetch before handing this result over
+                fill_window()
+                yield zone_name, result
+        finally:
+            tasks = [task for _, task in window]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _make_request(
         self,
@@ -118,6 +447,13 @@ class PowerDNSClient:
         """
         Make HTTP request to PowerDNS API with retry logic.
 
+        Connection errors, timeouts and 5xx responses (except to POST, which
+        is not idempotent) are retried with jittered exponential backoff.
+        Once a request has failed circuit_breaker_threshold times in a row -
+        for connection errors across the whole API, for server errors per
+        endpoint - further requests fail fast with PowerDNSCircuitOpenError
+        until circuit_breaker_timeout has passed.
+
         Args:
             method: HTTP method (GET, POST, PATCH, DELETE)
             endpoint: API endpoint path
@@ -130,12 +466,20 @@ class PowerDNSClient:
         Raises:
             PowerDNSAPIError: For API errors
             PowerDNSConnectionError: For connection errors
+            PowerDNSCircuitOpenError: If the request was rejected by a circuit breaker
         """
         url = urljoin(self.base_url, endpoint)
-        session = await self._get_session()
         metrics = get_metrics_collector()
         start_time = time.time()
 
+        try:
+            self._check_circuits(endpoint)
+        except PowerDNSCircuitOpenError:
+            metrics.record_powerdns_api_request(method, endpoint, "rejected", 0.0)
+            raise
+
+        session = await self._get_session()
+
         for attempt in range(self.retry_attempts):
             try:
                 async with session.request(
@@ -143,49 +487,129 @@ class PowerDNSClient:
                     url=url,
                     json=json_data,
                     params=params,
+                    headers=self._headers,
+                    timeout=self._client_timeout,
                 ) as response:
+                    status = response.status
                     response_text = await response.text()
-                    duration = time.time() - start_time
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger.warning(
+                    f"Connection error on attempt {attempt + 1}/{self.retry_attempts}: {e}"
+                )
+                error: PowerDNSError = PowerDNSConnectionError(
+                    f"Failed to connect to PowerDNS API: {e}"
+                )
+                retryable = True
+            except Exception as e:
+                logger.error(f"Unexpected error making request to {url}: {e}")
+                duration = time.time() - start_time
+                metrics.record_powerdns_api_request(method, endpoint, "error", duration)
+                raise PowerDNSError(f"Unexpected error: {e}")
+            else:
+                duration = time.time() - start_time
+                self._host_breaker.record_success()
 
-                    # Handle successful responses
-                    if response.status in (200, 201, 204):
-                        metrics.record_powerdns_api_request(method, endpoint, "success", duration)
-                        if response_text:
-                            return json.loads(response_text)
+                # Handle successful responses
+                if status in (200, 201, 204):
+                    self._record_endpoint_success(endpoint)
+                    metrics.record_powerdns_api_request(method, endpoint, "success", duration)
+                    if not response_text:
                         return {}
-
-                    # Handle API errors
                     try:
-                        error_data = json.loads(response_text) if response_text else {}
-                    except json.JSONDecodeError:
-                        error_data = {"error": response_text}
+                        return json.loads(response_text)
+                    except json.JSONDecodeError as e:
+                        raise PowerDNSError(f"Unexpected error: invalid JSON response: {e}")
 
+                # Handle API errors
+                try:
+                    error_data = json.loads(response_text) if response_text else {}
+                except json.JSONDecodeError:
+                    error_data = {"error": response_text}
+
+                error = PowerDNSAPIError(
+                    f"API error: {status} - {response_text}",
+                    status_code=status,
+                    response_data=error_data,
+                )
+                if status < 500:
+                    # The request was wrong, not the server
+                    self._record_endpoint_success(endpoint)
                     metrics.record_powerdns_api_request(method, endpoint, "error", duration)
+                    raise error
 
-                    raise PowerDNSAPIError(
-                        f"API error: {response.status} - {response_text}",
-                        status_code=response.status,
-                        response_data=error_data,
-                    )
-
-            except ClientError as e:
+                # A server error may be transient; a repeated POST could create twice
                 logger.warning(
-                    f"Connection error on attempt {attempt + 1}/{self.retry_attempts}: {e}"
+                    f"PowerDNS {status} for {method} {endpoint} on attempt "
+                    f"{attempt + 1}/{self.retry_attempts}"
                 )
+                retryable = method != "POST"
 
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
+            if retryable and attempt < self.retry_attempts - 1:
+                await asyncio.sleep(self._retry.get_delay(attempt))
+                continue
 
-                duration = time.time() - start_time
-                metrics.record_powerdns_api_request(method, endpoint, "error", duration)
-                raise PowerDNSConnectionError(f"Failed to connect to PowerDNS API: {e}")
+            if isinstance(error, PowerDNSAPIError):
+                self._record_endpoint_failure(endpoint)
+            else:
+                self._host_breaker.record_failure()
+            duration = time.time() - start_time
+            metrics.record_powerdns_api_request(method, endpoint, "error", duration)
+            raise error
+
+    def _create_breaker(self, name: str) -> CircuitBreaker:
+        """Create a circuit breaker with the configured threshold and timeout."""
+        return CircuitBreaker(
+            failure_threshold=self.circuit_breaker_threshold,
+            recovery_timeout=self.circuit_breaker_timeout,
+            name=f"PowerDNS {name}",
+        )
 
-            except Exception as e:
-                logger.error(f"Unexpected error making request to {url}: {e}")
-                duration = time.time() - start_time
-                metrics.record_powerdns_api_request(method, endpoint, "error", duration)
-                raise PowerDNSError(f"Unexpected error: {e}")
+    def _check_circuits(self, endpoint: str) -> None:
+        """
+        Fail fast if the API host or this endpoint has been failing.
+
+        Raises:
+            PowerDNSCircuitOpenError: If either circuit is open
+        """
+        if not self.circuit_breaker_enabled:
+            return
+        breakers = [self._host_breaker, self._endpoint_breakers.get(endpoint)]
+        for breaker in breakers:
+            if breaker is None:
+                continue
+            try:
+                breaker.before_call()
+            except CircuitOpenError as e:
+                raise PowerDNSCircuitOpenError(str(e))
+
+    def _record_endpoint_success(self, endpoint: str) -> None:
+        """Close an endpoint's circuit; healthy endpoints keep no breaker."""
+        breaker = self._endpoint_breakers.pop(endpoint, None)
+        if breaker is not None:
+            breaker.record_success()
+
+    def _record_endpoint_failure(self, endpoint: str) -> None:
+        """Count a server error against an endpoint's circuit."""
+        breaker = self._endpoint_breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._endpoint_breakers[endpoint] = self._create_breaker(endpoint)
+        breaker.record_failure()
+
+    def get_circuit_status(self) -> Dict[str, Any]:
+        """
+        Get the state of the API host circuit and of failing endpoints.
+
+        Returns:
+            Dictionary with host state and per-endpoint state and failures
+        """
+        return {
+            "enabled": self.circuit_breaker_enabled,
+            "host": self._host_breaker.state.value,
+            "endpoints": {
+                endpoint: {"state": breaker.state.value, "failures": breaker.failure_count}
+                for endpoint, breaker in self._endpoint_breakers.items()
+            },
+        }
 
     async def _patch_zone(self, zone: str, rrsets_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -199,7 +623,26 @@ class PowerDNSClient:
             Response data
         """
         endpoint = f"servers/localhost/zones/{zone}"
-        return await self._make_request("PATCH", endpoint, json_data=rrsets_data)
+        try:
+            result = await self._make_request("PATCH", endpoint, json_data=rrsets_data)
+        finally:
+            # Even a failed request may have been applied (e.g. a timeout)
+            self._invalidate_cache(zone)
+
+        search_index = get_dns_search_index()
+        if search_index is not None:
+            search_index.apply_rrsets(zone, rrsets_data.get("rrsets", []))
+        return result
+
+    def _invalidate_cache(self, zone: str) -> None:
+        """Drop cached data for a zone after a write, in every client's cache."""
+        invalidate_zone_caches(zone)
+
+    def _request_search_reconcile(self) -> None:
+        """Have the search index pick up a created or deleted zone."""
+        search_index = get_dns_search_index()
+        if search_index is not None:
+            search_index.request_reconcile()
 
     async def create_a_record(
         self,
@@ -235,10 +678,7 @@ class PowerDNSClient:
             zone += "."
 
         # Build FQDN
-        if hostname.endswith("."):
-            fqdn = hostname
-        else:
-            fqdn = f"{hostname}.{zone}"
+        fqdn = build_fqdn(hostname, zone)
 
         rrsets = {
             "rrsets": [
@@ -301,10 +741,7 @@ class PowerDNSClient:
             zone += "."
 
         # Build FQDN
-        if hostname.endswith("."):
-            fqdn = hostname
-        else:
-            fqdn = f"{hostname}.{zone}"
+        fqdn = build_fqdn(hostname, zone)
 
         rrsets = {
             "rrsets": [
@@ -336,6 +773,67 @@ class PowerDNSClient:
             metrics.record_powerdns_record_operation("create", "AAAA", "failed")
             raise
 
+    async def replace_address_records(
+        self,
+        zone: str,
+        records: List[Tuple[str, str, str]],
+        ttl: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Replace many A/AAAA records in one zone with a single PATCH.
+
+        PowerDNS applies all RRsets of a PATCH in one transaction, so either
+        every record is replaced or none is.
+
+        Args:
+            zone: DNS zone
+            records: (hostname, record type, address) tuples; hostnames are
+                relative to the zone unless they end with a dot
+            ttl: Time to live (defaults to configured TTL)
+
+        Returns:
+            API response data with the FQDN of each record, in order
+
+        Raises:
+            PowerDNSError: On any error
+        """
+        if not self.enabled:
+            logger.debug("PowerDNS integration disabled, skipping batched record update")
+            return {"status": "disabled"}
+
+        ttl = ttl or self.default_ttl
+        if not zone.endswith("."):
+            zone += "."
+
+        fqdns = [build_fqdn(hostname, zone) for hostname, _, _ in records]
+        rrsets = {
+            "rrsets": [
+                {
+                    "name": fqdn,
+                    "type": record_type,
+                    "ttl": ttl,
+                    "changetype": "REPLACE",
+                    "records": [{"content": content, "disabled": False}],
+                }
+                for fqdn, (_, record_type, content) in zip(fqdns, records)
+            ]
+        }
+
+        logger.info(f"Replacing {len(records)} address records in {zone}")
+
+        metrics = get_metrics_collector()
+        try:
+            await self._patch_zone(zone, rrsets)
+        except Exception as e:
+            logger.error(f"Failed to replace {len(records)} address records in {zone}: {e}")
+            for _, record_type, _ in records:
+                metrics.record_powerdns_record_operation("create", record_type, "failed")
+            raise
+
+        for _, record_type, _ in records:
+            metrics.record_powerdns_record_operation("create", record_type, "success")
+        return {"status": "success", "zone": zone, "fqdns": fqdns}
+
     async def update_record(
         self,
         hostname: str,
@@ -392,10 +890,7 @@ class PowerDNSClient:
             zone += "."
 
         # Build FQDN
-        if hostname.endswith("."):
-            fqdn = hostname
-        else:
-            fqdn = f"{hostname}.{zone}"
+        fqdn = build_fqdn(hostname, zone)
 
         rrsets = {
             "rrsets": [
@@ -448,10 +943,7 @@ class PowerDNSClient:
             zone += "."
 
         # Build FQDN
-        if hostname.endswith("."):
-            fqdn = hostname
-        else:
-            fqdn = f"{hostname}.{zone}"
+        fqdn = build_fqdn(hostname, zone)
 
         try:
             # Get zone data
@@ -565,7 +1057,11 @@ class PowerDNSClient:
         metrics = get_metrics_collector()
         try:
             endpoint = "servers/localhost/zones"
-            result = await self._make_request("POST", endpoint, json_data=zone_data)
+            try:
+                result = await self._make_request("POST", endpoint, json_data=zone_data)
+            finally:
+                self._invalidate_cache(zone)
+            self._request_search_reconcile()
             logger.info(f"Successfully created zone {zone}")
             metrics.record_powerdns_zone_operation("create", "success")
             return {"status": "created", "zone": zone}
@@ -586,24 +1082,30 @@ class PowerDNSClient:
             return []
 
         try:
-            endpoint = "servers/localhost/zones"
-            zones = await self._make_request("GET", endpoint)
+            zones = await self.list_zone_summaries()
+
+            # Fetch zone details (for nameservers) concurrently
+            details_by_zone = {}
+            zone_names = [zone["name"] for zone in zones]
+            async with aclosing(self.map_zones(zone_names, self.get_zone_details)) as results:
+                async for zone_name, zone_details in results:
+                    details_by_zone[zone_name] = zone_details
 
-            # Add computed fields and fetch zone details for nameservers
+            # Add computed fields
             for zone in zones:
                 zone["record_count"] = 0  # Will be updated from zone details
                 zone["status"] = "Active"  # PowerDNS doesn't have status
-                
-                # Fetch zone details to get nameservers
-                try:
-                    zone_details = await self.get_zone_details(zone["name"])
-                    if zone_details:
-                        zone["nameservers"] = zone_details.get("nameservers", [])
-                        zone["record_count"] = zone_details.get("record_count", 0)
-                    else:
-                        zone["nameservers"] = []
-                except Exception as e:
-                    logger.debug(f"Could not fetch details for zone {zone.get('name')}: {e}")
+
+                zone_details = details_by_zone.get(zone["name"])
+                if isinstance(zone_details, Exception):
+                    logger.debug(
+                        f"Could not fetch details for zone {zone.get('name')}: {zone_details}"
+                    )
+                    zone["nameservers"] = []
+                elif zone_details:
+                    zone["nameservers"] = zone_details.get("nameservers", [])
+                    zone["record_count"] = zone_details.get("record_count", 0)
+                else:
                     zone["nameservers"] = []
 
             return zones
@@ -611,6 +1113,20 @@ class PowerDNSClient:
             logger.error(f"Failed to list zones: {e}")
             return []
 
+    async def list_zone_summaries(self) -> List[Dict[str, Any]]:
+        """
+        List all DNS zones without fetching zone details.
+
+        Returns:
+            Zone summaries (name, kind, serial, ...) as returned by PowerDNS
+        """
+        zones = self.zone_cache.get_zone_list() if self.zone_cache is not None else None
+        if zones is None:
+            zones = await self._make_request("GET", "servers/localhost/zones")
+            if self.zone_cache is not None:
+                self.zone_cache.put_zone_list(zones)
+        return zones
+
     async def get_zone_details(self, zone_name: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed zone information.
@@ -625,6 +1141,11 @@ class PowerDNSClient:
             logger.debug("PowerDNS integration disabled")
             return None
 
+        if self.zone_cache is not None:
+            zone = self.zone_cache.get_zone(zone_name)
+            if zone is not None:
+                return zone
+
         try:
             endpoint = f"servers/localhost/zones/{zone_name}"
             zone = await self._make_request("GET", endpoint)
@@ -642,6 +1163,8 @@ class PowerDNSClient:
                             nameservers.append(record.get("content", ""))
             zone["nameservers"] = nameservers
 
+            if self.zone_cache is not None:
+                self.zone_cache.put_zone(zone_name, zone)
             return zone
         except Exception as e:
             logger.error(f"Failed to get zone details for {zone_name}: {e}")
@@ -730,6 +1253,9 @@ class PowerDNSClient:
         """
         Detect zone hierarchy relationships.
 
+        Builds a ZoneHierarchy for one lookup; build one directly to look
+        up many zones against the same listing.
+
         Args:
             zone_name: Zone to check
             existing_zones: List of existing zone names
@@ -737,38 +1263,7 @@ class PowerDNSClient:
         Returns:
             Dictionary with parent and children zones
         """
-        hierarchy = {"zone": zone_name, "parent": None, "children": [], "level": 0}
-
-        # Remove trailing dot for comparison
-        zone_labels = zone_name[:-1].split(".") if zone_name.endswith(".") else zone_name.split(".")
-
-        for existing in existing_zones:
-            if existing == zone_name:
-                continue
-
-            existing_labels = (
-                existing[:-1].split(".") if existing.endswith(".") else existing.split(".")
-            )
-
-            # Check if existing is a parent of zone
-            if len(existing_labels) < len(zone_labels):
-                if zone_labels[-len(existing_labels) :] == existing_labels:
-                    if not hierarchy["parent"] or len(existing_labels) > len(
-                        hierarchy["parent"][:-1].split(".")
-                    ):
-                        hierarchy["parent"] = existing
-
-            # Check if existing is a child of zone
-            elif len(existing_labels) > len(zone_labels):
-                if existing_labels[-len(zone_labels) :] == zone_labels:
-                    hierarchy["children"].append(existing)
-
-        # Calculate hierarchy level
-        if hierarchy["parent"]:
-            parent_labels = hierarchy["parent"][:-1].split(".")
-            hierarchy["level"] = len(zone_labels) - len(parent_labels)
-
-        return hierarchy
+        return ZoneHierarchy(existing_zones).describe(zone_name)
 
     async def update_zone(self, zone_name: str, zone_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -832,7 +1327,10 @@ class PowerDNSClient:
                 elif default_value is not None:
                     update_data[field_name] = default_value
 
-            result = await self._make_request("PUT", endpoint, json_data=update_data)
+            try:
+                result = await self._make_request("PUT", endpoint, json_data=update_data)
+            finally:
+                self._invalidate_cache(zone_name)
             logger.info(f"Successfully updated zone {zone_name}")
             metrics.record_powerdns_zone_operation("update", "success")
             return {"status": "updated", "zone": zone_name}
@@ -915,34 +1413,9 @@ class PowerDNSClient:
         if not self.enabled:
             raise PowerDNSError("PowerDNS integration is disabled")
 
-        # Validate record type
-        valid_types = ["A", "AAAA", "CNAME", "MX", "TXT", "NS", "SOA", "SRV", "PTR", "CAA"]
-        if record_type not in valid_types:
-            raise ValueError(f"Invalid record type: {record_type}")
-
-        # Ensure name is FQDN
-        if not name.endswith("."):
-            name += "."
-
-        # Validate records
-        for record in records:
-            if "content" not in record:
-                raise ValueError("Each record must have 'content' field")
-
-            # Type-specific validation
-            self._validate_record_content(record_type, record["content"])
-
-        rrset_data = {
-            "rrsets": [
-                {
-                    "name": name,
-                    "type": record_type,
-                    "ttl": ttl,
-                    "changetype": "REPLACE",
-                    "records": records,
-                }
-            ]
-        }
+        rrset = self._build_replace_rrset(name, record_type, records, ttl)
+        name = rrset["name"]
+        rrset_data = {"rrsets": [rrset]}
 
         metrics = get_metrics_collector()
         try:
@@ -993,6 +1466,49 @@ class PowerDNSClient:
             metrics.record_powerdns_record_operation("delete", record_type, "failed")
             raise
 
+    def _build_replace_rrset(
+        self, name: str, record_type: str, records: List[Dict[str, Any]], ttl: int
+    ) -> Dict[str, Any]:
+        """
+        Validate a record set and build its REPLACE change for a PATCH.
+
+        Args:
+            name: Record name (made FQDN)
+            record_type: Record type
+            records: List of record data dicts with 'content' and optional 'disabled'
+            ttl: Time to live
+
+        Returns:
+            RRset change
+
+        Raises:
+            ValueError: If the type or any record is invalid
+        """
+        # Validate record type
+        valid_types = ["A", "AAAA", "CNAME", "MX", "TXT", "NS", "SOA", "SRV", "PTR", "CAA"]
+        if record_type not in valid_types:
+            raise ValueError(f"Invalid record type: {record_type}")
+
+        # Ensure name is FQDN
+        if not name.endswith("."):
+            name += "."
+
+        # Validate records
+        for record in records:
+            if "content" not in record:
+                raise ValueError("Each record must have 'content' field")
+
+            # Type-specific validation
+            self._validate_record_content(record_type, record["content"])
+
+        return {
+            "name": name,
+            "type": record_type,
+            "ttl": ttl,
+            "changetype": "REPLACE",
+            "records": records,
+        }
+
     def _validate_record_content(self, record_type: str, content: str):
         """
         Validate record content based on type.
@@ -1076,7 +1592,11 @@ class PowerDNSClient:
         metrics = get_metrics_collector()
         try:
             endpoint = f"servers/localhost/zones/{zone_name}"
-            await self._make_request("DELETE", endpoint)
+            try:
+                await self._make_request("DELETE", endpoint)
+            finally:
+                self._invalidate_cache(zone_name)
+            self._request_search_reconcile()
             logger.info(f"Successfully deleted zone {zone_name}")
             metrics.record_powerdns_zone_operation("delete", "success")
             return {"status": "deleted", "zone": zone_name}
@@ -1131,15 +1651,8 @@ class PowerDNSClient:
 
             # Filter by hierarchy level
             if hierarchy_level is not None:
-                filtered_zones = []
-                all_zone_names = [z.get("name", "") for z in zones]
-
-                for zone in zones:
-                    zone_name = zone.get("name", "")
-                    hierarchy = self.detect_zone_hierarchy(zone_name, all_zone_names)
-                    if hierarchy["level"] == hierarchy_level:
-                        filtered_zones.append(zone)
-                zones = filtered_zones
+                hierarchy = ZoneHierarchy(z.get("name", "") for z in zones)
+                zones = [z for z in zones if hierarchy.level(z.get("name", "")) == hierarchy_level]
 
             # Limit results
             return zones[:limit]
@@ -1173,6 +1686,17 @@ class PowerDNSClient:
             raise PowerDNSError("PowerDNS integration is disabled")
 
         try:
+            # Answer from the local index once it has been built
+            search_index = get_dns_search_index()
+            if search_index is not None and search_index.ready:
+                return await search_index.search(
+                    query,
+                    record_type=record_type,
+                    zones=[zone_name] if zone_name else None,
+                    content_search=content_search,
+                    limit=limit,
+                )
+
             results = []
 
             # Get zones to search
@@ -1181,15 +1705,19 @@ class PowerDNSClient:
                 if not zones[0]:
                     return []
             else:
-                zones = await self.list_zones()
+                # Only names are needed; details are fetched zone by zone below
+                zones = await self.list_zone_summaries()
 
             query_lower = query.lower() if query else ""
 
-            # Search through each zone
-            for zone in zones:
-                zone_id = zone.get("id", zone.get("name", ""))
-                try:
-                    records = await self.list_records(zone_id)
+            # Search zones concurrently; results keep zone order and the
+            # remaining fetches are cancelled once limit is reached
+            zone_ids = [zone.get("id", zone.get("name", "")) for zone in zones]
+            async with aclosing(self.map_zones(zone_ids, self.list_records)) as zone_records:
+                async for zone_id, records in zone_records:
+                    if isinstance(records, Exception):
+                        logger.warning(f"Failed to search records in zone {zone_id}: {records}")
+                        continue
 
                     for record in records:
                         # Filter by record type
@@ -1219,10 +1747,6 @@ class PowerDNSClient:
                         if len(results) >= limit:
                             return results
 
-                except Exception as e:
-                    logger.warning(f"Failed to search records in zone {zone_id}: {e}")
-                    continue
-
             return results
 
         except Exception as e:
@@ -1257,7 +1781,9 @@ class PowerDNSClient:
 
         try:
             zones = await self.list_zones()
-            all_zone_names = [z.get("name", "") for z in zones]
+            hierarchy = None
+            if filters.get("parent_zone"):
+                hierarchy = ZoneHierarchy(z.get("name", "") for z in zones)
 
             # Apply filters
             filtered_zones = []
@@ -1275,9 +1801,8 @@ class PowerDNSClient:
                         continue
 
                 # Filter by parent zone
-                if filters.get("parent_zone"):
-                    hierarchy = self.detect_zone_hierarchy(zone.get("name", ""), all_zone_names)
-                    if hierarchy["parent"] != filters["parent_zone"]:
+                if hierarchy is not None:
+                    if hierarchy.parent(zone.get("name", "")) != filters["parent_zone"]:
                         continue
 
                 # Filter by serial (as proxy for modification date)
@@ -1328,10 +1853,10 @@ class PowerDNSClient:
             # Get zones to export
             if zone_names:
                 zones = []
-                for zone_name in zone_names:
-                    zone = await self.get_zone_details(zone_name)
-                    if zone:
-                        zones.append(zone)
+                async with aclosing(self.map_zones(zone_names, self.get_zone_details)) as results:
+                    async for _, zone in results:
+                        if zone and not isinstance(zone, Exception):
+                            zones.append(zone)
             else:
                 zones = await self.list_zones()
 
@@ -1349,72 +1874,154 @@ class PowerDNSClient:
             logger.error(f"Failed to export zones: {e}")
             raise
 
-    def _export_zones_bind(self, zones: List[Dict[str, Any]]) -> str:
+    async def stream_export_zones(
+        self, zone_names: Optional[List[str]] = None, format: str = "json"
+    ) -> AsyncIterator[bytes]:
         """
-        Export zones in BIND format.
+        Export DNS zones as a stream of encoded chunks.
+
+        Zones are fetched concurrently through map_zones and each one is
+        encoded as soon as it arrives, so memory stays flat regardless of
+        export size. The format is validated and the zone list fetched before
+        this returns, so those errors surface before any output is sent.
 
         Args:
-            zones: List of zones to export
+            zone_names: List of zone names to export (None = all zones)
+            format: Export format (json, ndjson, bind, csv)
 
         Returns:
-            BIND formatted zone data
+            Async iterator of UTF-8 chunks, one per zone plus framing
         """
-        bind_data = []
+        if not self.enabled:
+            raise PowerDNSError("PowerDNS integration is disabled")
+        if format not in ("json", "ndjson", "bind", "csv"):
+            raise ValueError(f"Unsupported export format: {format}")
 
-        for zone in zones:
-            zone_name = zone.get("name", "")
-            bind_data.append(f"; Zone: {zone_name}")
-            bind_data.append(f"; Exported from PowerDNS")
-            bind_data.append("")
+        if not zone_names:
+            zone_names = [zone["name"] for zone in await self.list_zone_summaries()]
 
-            # Process RRsets
-            for rrset in zone.get("rrsets", []):
-                name = rrset.get("name", "")
-                ttl = rrset.get("ttl", 300)
-                record_type = rrset.get("type", "")
+        return self._export_chunks(zone_names, format)
 
-                for record in rrset.get("records", []):
-                    content = record.get("content", "")
-                    if not record.get("disabled", False):
-                        bind_data.append(f"{name}\t{ttl}\tIN\t{record_type}\t{content}")
+    async def _export_chunks(self, zone_names: List[str], format: str) -> AsyncIterator[bytes]:
+        """
+        Fetch zones concurrently and encode each one in the export format.
 
-            bind_data.append("")  # Empty line between zones
+        Args:
+            zone_names: Zones to export
+            format: Export format (json, ndjson, bind, csv)
 
-        return "\n".join(bind_data)
+        Yields:
+            UTF-8 encoded export chunks
+        """
+        codec = get_json_codec()
+        if format == "json":
+            yield b'{"format":"json","version":"1.0","zones":['
+        elif format == "csv":
+            yield self._csv_rows([_CSV_EXPORT_HEADER])
+
+        first = True
+        async with aclosing(self.map_zones(zone_names, self.get_zone_details)) as results:
+            async for zone_name, zone in results:
+                if isinstance(zone, Exception):
+                    logger.warning(f"Skipping zone {zone_name} in export: {zone}")
+                    continue
+                if not zone:
+                    continue
 
-    def _export_zones_csv(self, zones: List[Dict[str, Any]]) -> str:
+                if format == "json":
+                    yield (b"" if first else b",") + codec.dumps(zone)
+                elif format == "ndjson":
+                    yield codec.dumps(zone) + b"\n"
+                elif format == "bind":
+                    yield "".join(f"{line}\n" for line in self._bind_zone_lines(zone)).encode()
+                else:
+                    yield self._csv_rows(self._csv_zone_rows(zone))
+                first = False
+
+        if format == "json":
+            yield b"]}"
+
+    def _bind_zone_lines(self, zone: Dict[str, Any]) -> Iterator[str]:
         """
-        Export zones in CSV format.
+        Format one zone as BIND zone file lines.
 
         Args:
-            zones: List of zones to export
+            zone: Zone with RRsets
 
-        Returns:
-            CSV formatted zone data
+        Yields:
+            BIND formatted lines, ending with a blank separator line
         """
-        import csv
-        import io
+        yield f"; Zone: {zone.get('name', '')}"
+        yield "; Exported from PowerDNS"
+        yield ""
 
+        for rrset in zone.get("rrsets", []):
+            name = rrset.get("name", "")
+            ttl = rrset.get("ttl", 300)
+            record_type = rrset.get("type", "")
+
+            for record in rrset.get("records", []):
+                content = record.get("content", "")
+                if not record.get("disabled", False):
+                    yield f"{name}\t{ttl}\tIN\t{record_type}\t{content}"
+
+        yield ""  # Empty line between zones
+
+    def _csv_zone_rows(self, zone: Dict[str, Any]) -> Iterator[List[Any]]:
+        """
+        Format one zone as CSV rows.
+
+        Args:
+            zone: Zone with RRsets
+
+        Yields:
+            Rows matching _CSV_EXPORT_HEADER
+        """
+        zone_name = zone.get("name", "")
+
+        for rrset in zone.get("rrsets", []):
+            name = rrset.get("name", "")
+            ttl = rrset.get("ttl", 300)
+            record_type = rrset.get("type", "")
+
+            for record in rrset.get("records", []):
+                content = record.get("content", "")
+                disabled = record.get("disabled", False)
+                yield [zone_name, name, record_type, ttl, content, disabled]
+
+    @staticmethod
+    def _csv_rows(rows: Iterable[List[Any]]) -> bytes:
+        """Encode rows as UTF-8 CSV."""
         output = io.StringIO()
-        writer = csv.writer(output)
+        csv.writer(output).writerows(rows)
+        return output.getvalue().encode()
 
-        # Header
-        writer.writerow(["zone", "name", "type", "ttl", "content", "disabled"])
+    def _export_zones_bind(self, zones: List[Dict[str, Any]]) -> str:
+        """
+        Export zones in BIND format.
 
-        for zone in zones:
-            zone_name = zone.get("name", "")
+        Args:
+            zones: List of zones to export
 
-            for rrset in zone.get("rrsets", []):
-                name = rrset.get("name", "")
-                ttl = rrset.get("ttl", 300)
-                record_type = rrset.get("type", "")
+        Returns:
+            BIND formatted zone data
+        """
+        return "\n".join(line for zone in zones for line in self._bind_zone_lines(zone))
+
+    def _export_zones_csv(self, zones: List[Dict[str, Any]]) -> str:
+        """
+        Export zones in CSV format.
 
-                for record in rrset.get("records", []):
-                    content = record.get("content", "")
-                    disabled = record.get("disabled", False)
-                    writer.writerow([zone_name, name, record_type, ttl, content, disabled])
+        Args:
+            zones: List of zones to export
 
-        return output.getvalue()
+        Returns:
+            CSV formatted zone data
+        """
+        rows = [_CSV_EXPORT_HEADER]
+        for zone in zones:
+            rows.extend(self._csv_zone_rows(zone))
+        return self._csv_rows(rows).decode()
 
     async def import_zones(
         self,
@@ -1422,15 +2029,22 @@ class PowerDNSClient:
         format: str = "json",
         mode: str = "merge",
         dry_run: bool = False,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
         Import DNS zones from specified format.
 
+        Zones are imported concurrently (at most zone_concurrency at once) and
+        the RRsets of each zone are sent in PATCHes of up to
+        import_batch_size RRsets.
+
         Args:
             data: Import data in specified format
             format: Import format (json, bind)
             mode: Import mode (merge, replace, skip)
             dry_run: Preview changes without applying
+            progress: Called after each zone with zone, zones_done, zones_total
+                and records_added
 
         Returns:
             Import result with statistics
@@ -1469,40 +2083,39 @@ class PowerDNSClient:
                 "errors": [],
             }
 
-            for zone_data in import_zones:
-                zone_name = zone_data.get("name", "")
-
-                try:
-                    # Check if zone exists
-                    existing_zone = await self.get_zone_details(zone_name)
-
-                    if existing_zone:
-                        if mode == "skip":
-                            results["zones_skipped"] += 1
-                            continue
-                        elif mode == "replace":
-                            if not dry_run:
-                                await self.delete_zone(zone_name)
-                                await self._create_zone_from_import(zone_data)
-                            results["zones_updated"] += 1
-                        else:  # merge
-                            if not dry_run:
-                                await self._merge_zone_data(existing_zone, zone_data)
-                            results["zones_updated"] += 1
+            zones_by_name = {zone_data["name"]: zone_data for zone_data in import_zones}
+
+            async def import_zone(zone_name: str) -> str:
+                return await self._import_zone(zones_by_name[zone_name], mode, dry_run)
+
+            zones_done = 0
+            outcomes = self.map_zones(list(zones_by_name), import_zone)
+            async with aclosing(outcomes):
+                async for zone_name, outcome in outcomes:
+                    zones_done += 1
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Failed to import zone {zone_name}: {outcome}")
+                        results["errors"].append(f"Zone {zone_name}: {str(outcome)}")
+                    elif outcome == "skipped":
+                        results["zones_skipped"] += 1
                     else:
-                        if not dry_run:
-                            await self._create_zone_from_import(zone_data)
-                        results["zones_created"] += 1
-
-                    results["zones_processed"] += 1
-
-                    # Count records
-                    for rrset in zone_data.get("rrsets", []):
-                        results["records_added"] += len(rrset.get("records", []))
-
-                except Exception as e:
-                    logger.error(f"Failed to import zone {zone_name}: {e}")
-                    results["errors"].append(f"Zone {zone_name}: {str(e)}")
+                        results[f"zones_{outcome}"] += 1
+                        results["zones_processed"] += 1
+
+                        # Count records
+                        for rrset in zones_by_name[zone_name].get("rrsets", []):
+                            results["records_added"] += len(rrset.get("records", []))
+
+                    logger.info(f"Imported zone {zone_name} ({zones_done}/{len(zones_by_name)})")
+                    if progress is not None:
+                        progress(
+                            {
+                                "zone": zone_name,
+                                "zones_done": zones_done,
+                                "zones_total": len(zones_by_name),
+                                "records_added": results["records_added"],
+                            }
+                        )
 
             return results
 
@@ -1526,86 +2139,47 @@ class PowerDNSClient:
             raise ValueError(f"Invalid JSON: {e}")
 
     def _parse_bind_import(self, data: str) -> List[Dict[str, Any]]:
-        """Parse BIND zone file format."""
-        zones = {}
-        current_zone = None
-        current_origin = None
-
-        lines = data.strip().split("\n")
-        for line in lines:
-            line = line.strip()
-
-            # Skip comments and empty lines
-            if not line or line.startswith(";"):
-                continue
-
-            # Parse $ORIGIN directive
-            if line.startswith("$ORIGIN"):
-                parts = line.split()
-                if len(parts) >= 2:
-                    current_origin = parts[1]
-                    if not current_origin.endswith("."):
-                        current_origin += "."
-                continue
-
-            # Parse $TTL directive
-            if line.startswith("$TTL"):
-                continue  # Handle TTL in record parsing
-
-            # Parse resource records
-            parts = line.split(None, 4)
-            if len(parts) >= 4:
-                name = parts[0]
-
-                # Handle relative names
-                if name == "@" and current_origin:
-                    name = current_origin
-                elif not name.endswith(".") and current_origin:
-                    name = f"{name}.{current_origin}"
-
-                # Determine zone from name
-                zone_name = self._determine_zone_from_name(name)
-                if zone_name not in zones:
-                    zones[zone_name] = {
-                        "name": zone_name,
-                        "kind": "Native",
-                        "rrsets": {},
-                    }
+        """
+        Parse BIND zone file format.
 
-                # Parse record fields
-                if parts[1].isdigit():
-                    ttl = int(parts[1])
-                    record_class = parts[2]  # Usually "IN"
-                    record_type = parts[3]
-                    content = parts[4] if len(parts) > 4 else ""
-                else:
-                    ttl = 300  # Default TTL
-                    record_class = parts[1]
-                    record_type = parts[2]
-                    content = parts[3] if len(parts) > 3 else ""
-
-                # Create RRset key
-                rrset_key = f"{name}:{record_type}"
-                if rrset_key not in zones[zone_name]["rrsets"]:
-                    zones[zone_name]["rrsets"][rrset_key] = {
-                        "name": name,
-                        "type": record_type,
-                        "ttl": ttl,
-                        "records": [],
-                    }
+        Each record belongs to the closest enclosing zone with an SOA record
+        in the data. Records outside every such zone fall back to the zone
+        guessed from their last two labels.
+        """
+        rrsets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        soa_owners = set()
+
+        for record in iter_zone_file(io.StringIO(data)):
+            if record.type == "SOA":
+                soa_owners.add(record.name.lower())
+
+            rrset = rrsets.get((record.name, record.type))
+            if rrset is None:
+                rrset = rrsets[(record.name, record.type)] = {
+                    "name": record.name,
+                    "type": record.type,
+                    "ttl": record.ttl,
+                    "records": [],
+                }
+            rrset["records"].append({"content": record.content, "disabled": False})
 
-                # Add record
-                zones[zone_name]["rrsets"][rrset_key]["records"].append(
-                    {"content": content, "disabled": False}
-                )
+        zones: Dict[str, Dict[str, Any]] = {}
+        for (name, _), rrset in rrsets.items():
+            zone_name = self._enclosing_zone(name.lower(), soa_owners)
+            if zone_name not in zones:
+                zones[zone_name] = {"name": zone_name, "kind": "Native", "rrsets": []}
+            zones[zone_name]["rrsets"].append(rrset)
 
-        # Convert rrsets dict to list
-        result = []
-        for zone_name, zone_data in zones.items():
-            zone_data["rrsets"] = list(zone_data["rrsets"].values())
-            result.append(zone_data)
+        return list(zones.values())
 
-        return result
+    def _enclosing_zone(self, name: str, zone_names: set) -> str:
+        """Find the longest zone in zone_names containing name, else guess it."""
+        labels = name.split(".")
+        for i in range(len(labels) - 1):
+            candidate = ".".join(labels[i:])
+            if candidate in zone_names:
+                return candidate
+        return self._determine_zone_from_name(name)
 
     def _determine_zone_from_name(self, name: str) -> str:
         """Determine zone name from record name."""
@@ -1618,6 +2192,7 @@ class PowerDNSClient:
     def _validate_import(self, zones: List[Dict[str, Any]]) -> List[str]:
         """Validate import data."""
         errors = []
+        seen = set()
 
         for i, zone in enumerate(zones):
             zone_name = zone.get("name", f"zone_{i}")
@@ -1627,6 +2202,10 @@ class PowerDNSClient:
                 errors.append(f"Zone {i}: Missing zone name")
                 continue
 
+            if zone_name in seen:
+                errors.append(f"Zone {zone_name}: Duplicate zone")
+            seen.add(zone_name)
+
             is_valid, error_msg = self.validate_zone_name(zone["name"])
             if not is_valid:
                 errors.append(f"Zone {zone_name}: {error_msg}")
@@ -1645,12 +2224,43 @@ class PowerDNSClient:
 
         return errors
 
+    async def _import_zone(self, zone_data: Dict[str, Any], mode: str, dry_run: bool) -> str:
+        """
+        Import one zone according to the import mode.
+
+        Args:
+            zone_data: Zone to import
+            mode: Import mode (merge, replace, skip)
+            dry_run: Preview changes without applying
+
+        Returns:
+            Outcome: created, updated or skipped
+        """
+        zone_name = zone_data["name"]
+
+        # Check if zone exists
+        existing_zone = await self.get_zone_details(zone_name)
+
+        if not existing_zone:
+            if not dry_run:
+                await self._create_zone_from_import(zone_data)
+            return "created"
+
+        if mode == "skip":
+            return "skipped"
+        if not dry_run:
+            if mode == "replace":
+                await self.delete_zone(zone_name)
+                await self._create_zone_from_import(zone_data)
+            else:  # merge
+                await self._merge_zone_data(existing_zone, zone_data)
+        return "updated"
+
     async def _create_zone_from_import(self, zone_data: Dict[str, Any]) -> None:
         """Create zone from import data."""
         # Create the zone
-        zone_name = zone_data["name"]
-        await self.create_zone(
-            zone=zone_name,
+        result = await self.create_zone(
+            zone=zone_data["name"],
             kind=zone_data.get("kind", "Native"),
             nameservers=zone_data.get("nameservers", []),
             masters=zone_data.get("masters", []),
@@ -1658,14 +2268,7 @@ class PowerDNSClient:
         )
 
         # Add records
-        for rrset in zone_data.get("rrsets", []):
-            await self.create_or_update_record(
-                zone_name=zone_name,
-                name=rrset["name"],
-                record_type=rrset["type"],
-                records=rrset.get("records", []),
-                ttl=rrset.get("ttl", 300),
-            )
+        await self._replace_rrsets(result["zone"], zone_data.get("rrsets", []))
 
     async def _merge_zone_data(
         self, existing_zone: Dict[str, Any], import_zone: Dict[str, Any]
@@ -1678,19 +2281,48 @@ class PowerDNSClient:
             await self.update_zone(zone_name, import_zone)
 
         # Merge records
-        for rrset in import_zone.get("rrsets", []):
-            await self.create_or_update_record(
-                zone_name=zone_name,
-                name=rrset["name"],
-                record_type=rrset["type"],
-                records=rrset.get("records", []),
-                ttl=rrset.get("ttl", 300),
+        await self._replace_rrsets(zone_name, import_zone.get("rrsets", []))
+
+    async def _replace_rrsets(self, zone_name: str, rrsets: List[Dict[str, Any]]) -> None:
+        """
+        Replace imported RRsets in a zone, import_batch_size RRsets per PATCH.
+
+        Every RRset is validated before the first PATCH is sent.
+
+        Args:
+            zone_name: Name of the zone
+            rrsets: RRsets with name, type, records and optional ttl
+        """
+        changes = [
+            self._build_replace_rrset(
+                rrset["name"], rrset["type"], rrset.get("records", []), rrset.get("ttl", 300)
             )
+            for rrset in rrsets
+        ]
+
+        metrics = get_metrics_collector()
+        for start in range(0, len(changes), self.import_batch_size):
+            batch = changes[start : start + self.import_batch_size]
+            try:
+                await self._patch_zone(zone_name, {"rrsets": batch})
+            except Exception:
+                for change in batch:
+                    metrics.record_powerdns_record_operation(
+                        "create_or_update", change["type"], "failed"
+                    )
+                raise
+            for change in batch:
+                metrics.record_powerdns_record_operation(
+                    "create_or_update", change["type"], "success"
+                )
+
+        logger.info(f"Imported {len(changes)} RRsets into zone {zone_name}")
 
     async def close(self):
-        """Close HTTP session."""
+        """Close this client's own HTTP session; the shared session stays open."""
         if self._session and not self._session.closed:
             await self._session.close()
+        self._session = None
 
     async def __aenter__(self):
         """Async context manager entry."""
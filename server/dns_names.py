@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+DNS Name Helpers for Prism DNS Server
+Normalize zone names and qualify hostnames the way PowerDNS stores them.
+"""
+
+
+def absolute_zone_name(zone_name: str) -> str:
+    """Normalize a zone name to its absolute form (with the trailing dot)."""
+    return zone_name if zone_name.endswith(".") else zone_name + "."
+
+
+def build_fqdn(hostname: str, zone: str) -> str:
+    """Qualify a hostname with the zone unless it is already absolute."""
+    if hostname.endswith("."):
+        return hostname
+    return f"{hostname}.{absolute_zone_name(zone)}"
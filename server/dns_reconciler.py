@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+DNS Reconciler for Prism DNS Server
+Background repair of host address records whose DNS sync is pending or failed.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .database.connection import DatabaseManager
+from .database.models import Host
+from .database.operations import HostOperations
+from .dns_manager import PowerDNSClient, PowerDNSConnectionError, send_with_single_retry
+from .dns_names import absolute_zone_name, build_fqdn
+from .monitoring import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+# (host ID, hostname, record type, address) of a host's address record
+HostRecord = Tuple[int, str, str, str]
+
+
+class DNSReconcilerConfigError(Exception):
+    """Exception raised for DNS reconciler configuration errors."""
+
+    pass
+
+
+class DNSReconcilerConfig:
+    """Configuration for the background DNS reconciler."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize DNS reconciler configuration."""
+        powerdns_config = config.get("powerdns", {})
+
+        self.enabled = powerdns_config.get("host_reconcile_enabled", True)
+        self.interval = powerdns_config.get("host_reconcile_interval", 60)
+        self.page_size = powerdns_config.get("host_reconcile_page_size", 500)
+        self.rate_limit = powerdns_config.get("host_reconcile_rate_limit", 10)
+
+        if self.interval <= 0:
+            raise DNSReconcilerConfigError("host_reconcile_interval must be positive")
+
+        if self.page_size <= 0:
+            raise DNSReconcilerConfigError("host_reconcile_page_size must be positive")
+
+        if self.rate_limit <= 0:
+            raise DNSReconcilerConfigError("host_reconcile_rate_limit must be positive")
+
+
+class DNSReconciler:
+    """
+    Brings hosts whose dns_sync_status is pending or failed back in sync.
+
+    Every ``interval`` seconds the backlog is read ``page_size`` hosts at a
+    time. Each page is grouped by zone and compared with the zone's RRsets,
+    fetched once per zone, not once per host. Hosts whose record already
+    holds their address are marked synced without a request. The others
+    are corrected with one multi-RRset PATCH per zone, at most
+    ``rate_limit`` PATCHes per second, so a large backlog does not flood
+    PowerDNS. As in the DNS update queue, a refused PATCH is retried one
+    record at a time so only the bad records are marked failed.
+
+    Hosts in zones PowerDNS does not have are marked failed. A pass stops
+    early if PowerDNS is unreachable and leaves the remaining hosts as they
+    are. A host that changes IP while its correction is in flight is left
+    pending, so its newer address is sent later.
+
+    The backlog size and lag are exported as the prism_dns_reconcile_backlog
+    and prism_dns_reconcile_lag_seconds gauges. Lag is how long the
+    longest-waiting host has been unsynced, measured from the first pass
+    that found it.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        dns_client: PowerDNSClient,
+        interval: float = 60,
+        page_size: int = 500,
+        rate_limit: float = 10,
+    ):
+        """
+        Initialize DNS reconciler.
+
+        Args:
+            db_manager: Database manager holding the hosts
+            dns_client: PowerDNS client used for lookups and corrections
+            interval: Seconds between reconcile passes
+            page_size: Hosts read per page, and so the most RRsets per PATCH
+            rate_limit: Maximum PATCHes per second
+        """
+        self.host_ops = HostOperations(db_manager)
+        self.dns_client = dns_client
+        self.interval = interval
+        self.page_size = page_size
+        self.min_patch_interval = 1.0 / rate_limit
+
+        # Host ID -> time the host was first found unsynced
+        self._unsynced_since: Dict[int, float] = {}
+        self._next_patch_at = 0.0
+        self._reconcile_lock = asyncio.Lock()
+        self._reconcile_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Single worker thread keeps database reads and writes off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dns-reconcile")
+
+        self._stats = {
+            "passes": 0,
+            "pass_errors": 0,
+            "hosts_checked": 0,
+            "hosts_in_sync": 0,
+            "hosts_corrected": 0,
+            "hosts_failed": 0,
+            "patches": 0,
+            "backlog": 0,
+            "lag_seconds": 0.0,
+            "last_pass_ms": 0.0,
+        }
+
+        logger.info(
+            f"DNSReconciler initialized: interval={interval}s, page_size={page_size}, "
+            f"rate_limit={rate_limit}/s"
+        )
+
+    def request_reconcile(self) -> None:
+        """Ask the background task to run a pass now."""
+        self._reconcile_requested.set()
+
+    async def reconcile(self) -> int:
+        """
+        Run one pass over the whole backlog.
+
+        Returns:
+            Number of hosts brought in sync
+        """
+        async with self._reconcile_lock:
+            start_time = time.time()
+            try:
+                zones = {zone["name"] for zone in await self.dns_client.list_zone_summaries()}
+            except Exception as e:
+                self._stats["pass_errors"] += 1
+                logger.error(f"DNS reconcile could not list zones: {e}")
+                return 0
+
+            seen: Set[int] = set()
+            synced: Set[int] = set()
+            complete = False
+            after_id = 0
+            try:
+                while True:
+                    hosts = await self._run(
+                        self.host_ops.get_hosts_pending_dns_sync, self.page_size, after_id
+                    )
+                    if hosts:
+                        after_id = hosts[-1].id
+                        seen.update(host.id for host in hosts)
+                        synced.update(await self._reconcile_page(hosts, zones))
+                    if len(hosts) < self.page_size:
+                        complete = True
+                        break
+            except PowerDNSConnectionError as e:
+                self._stats["pass_errors"] += 1
+                logger.warning(f"DNS reconcile stopped, PowerDNS unreachable: {e}")
+
+            await self._update_backlog(seen, synced, complete)
+            self._stats["passes"] += 1
+            self._stats["last_pass_ms"] = (time.time() - start_time) * 1000
+            if seen:
+                logger.info(
+                    f"DNS reconcile checked {len(seen)} hosts, {len(synced)} synced in "
+                    f"{self._stats['last_pass_ms']:.1f}ms"
+                )
+            return len(synced)
+
+    async def _reconcile_page(self, hosts: List[Host], zones: Set[str]) -> Set[int]:
+        """Diff one page of hosts against their zones; return the IDs now synced."""
+        by_zone: Dict[str, List[HostRecord]] = {}
+        failed: List[int] = []
+        for host in hosts:
+            zone = absolute_zone_name(host.dns_zone or self.dns_client.default_zone)
+            try:
+                version = ipaddress.ip_address(host.current_ip).version
+            except ValueError:
+                failed.append(host.id)
+                continue
+            if zone not in zones:
+                failed.append(host.id)
+                continue
+            record_type = "A" if version == 4 else "AAAA"
+            by_zone.setdefault(zone, []).append(
+                (host.id, host.hostname, record_type, host.current_ip)
+            )
+
+        synced: Dict[int, Tuple[str, str]] = {}
+        addresses: Dict[int, str] = {}
+        try:
+            # aclosing cancels prefetched zone fetches if a correction raises
+            async with aclosing(
+                self.dns_client.map_zones(list(by_zone), self.dns_client.get_zone_details)
+            ) as zone_details:
+                async for zone, details in zone_details:
+                    if details is None or isinstance(details, Exception):
+                        # Not fetched (the client logged why); retried next pass
+                        continue
+                    in_sync, stale = self._diff_zone(zone, by_zone[zone], details)
+                    for host_id, hostname, _, address in in_sync:
+                        synced[host_id] = (zone, build_fqdn(hostname, zone))
+                        addresses[host_id] = address
+                    self._stats["hosts_in_sync"] += len(in_sync)
+
+                    corrected, rejected = await self._correct_zone(zone, stale)
+                    for host_id, fqdn, address in corrected:
+                        synced[host_id] = (zone, fqdn)
+                        addresses[host_id] = address
+                    failed.extend(rejected)
+        finally:
+            self._stats["hosts_checked"] += len(hosts)
+            self._stats["hosts_failed"] += len(failed)
+            if synced or failed:
+                await self._run(self.host_ops.bulk_update_dns_info, synced, failed, (), addresses)
+
+        return set(synced)
+
+    def _diff_zone(
+        self, zone: str, records: List[HostRecord], details: Dict[str, Any]
+    ) -> Tuple[List[HostRecord], List[HostRecord]]:
+        """Split a zone's host records into (already in sync, needing correction)."""
+        contents = {
+            (rrset["name"], rrset["type"]): [
+                record["content"]
+                for record in rrset.get("records", [])
+                if not record.get("disabled", False)
+            ]
+            for rrset in details.get("rrsets", [])
+        }
+
+        in_sync: List[HostRecord] = []
+        stale: List[HostRecord] = []
+        for record in records:
+            _, hostname, record_type, address = record
+            fqdn = build_fqdn(hostname, zone)
+            if contents.get((fqdn, record_type)) == [address]:
+                in_sync.append(record)
+            else:
+                stale.append(record)
+        return in_sync, stale
+
+    async def _correct_zone(
+        self, zone: str, records: List[HostRecord]
+    ) -> Tuple[List[Tuple[int, str, str]], List[int]]:
+        """
+        Send corrections for one zone.
+
+        Returns:
+            ((host ID, FQDN, address) of corrected hosts, IDs of rejected hosts)
+
+        Raises:
+            PowerDNSConnectionError: If PowerDNS is unreachable
+        """
+        if not records:
+            return [], []
+
+        batches = await send_with_single_retry(
+            lambda batch: self._patch(zone, batch), records, lambda record: record[1], zone
+        )
+
+        corrected: List[Tuple[int, str, str]] = []
+        rejected: List[int] = []
+        for sent, result in batches:
+            if result is None:
+                rejected.extend(host_id for host_id, _, _, _ in sent)
+                continue
+            for (host_id, _, _, address), fqdn in zip(sent, result["fqdns"]):
+                corrected.append((host_id, fqdn, address))
+        self._stats["hosts_corrected"] += len(corrected)
+        return corrected, rejected
+
+    async def _patch(self, zone: str, records: List[HostRecord]) -> Dict[str, Any]:
+        """Send one multi-RRset PATCH, waiting for the rate limit first."""
+        delay = self._next_patch_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_patch_at = time.monotonic() + self.min_patch_interval
+
+        self._stats["patches"] += 1
+        return await self.dns_client.replace_address_records(
+            zone,
+            [(hostname, record_type, address) for _, hostname, record_type, address in records],
+        )
+
+    async def _update_backlog(self, seen: Set[int], synced: Set[int], complete: bool) -> None:
+        """Refresh the backlog size and lag gauges after a pass."""
+        now = time.time()
+        if complete:
+            # Hosts the pass did not find have left the backlog
+            waiting = {host_id: self._unsynced_since.get(host_id, now) for host_id in seen}
+        else:
+            waiting = dict(self._unsynced_since)
+            for host_id in seen:
+                waiting.setdefault(host_id, now)
+        for host_id in synced:
+            waiting.pop(host_id, None)
+        self._unsynced_since = waiting
+
+        lag = now - min(waiting.values()) if waiting else 0.0
+        status = await self._run(self.host_ops.get_dns_statistics)
+        backlog = status["dns_pending"] + status["dns_failed"]
+
+        metrics = get_metrics_collector()
+        metrics.update_dns_sync_status(
+            status["dns_pending"], status["dns_synced"], status["dns_failed"]
+        )
+        metrics.update_dns_reconcile_backlog(backlog, lag)
+        self._stats["backlog"] = backlog
+        self._stats["lag_seconds"] = lag
+
+    async def _run(self, func, *args) -> Any:
+        """Run a database call on the reconciler thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _reconcile_loop(self) -> None:
+        """Reconcile at startup, then periodically or when requested."""
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self._stats["pass_errors"] += 1
+                logger.error(f"DNS reconcile pass failed: {e}")
+            try:
+                await asyncio.wait_for(self._reconcile_requested.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._reconcile_requested.clear()
+
+    def start(self) -> None:
+        """Start the background reconcile task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._reconcile_loop())
+            self._task.set_name("dns_reconciler")
+
+    async def stop(self) -> None:
+        """Stop the background reconcile task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get reconciler statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        return self._stats.copy()
+
+
+def create_dns_reconciler(
+    config: Dict[str, Any],
+    db_manager: DatabaseManager,
+    dns_client: PowerDNSClient,
+) -> DNSReconciler:
+    """
+    Create a DNS reconciler from configuration.
+
+    Args:
+        config: Configuration dictionary
+        db_manager: Database manager holding the hosts
+        dns_client: PowerDNS client used for lookups and corrections
+
+    Returns:
+        Configured DNSReconciler instance
+    """
+    reconciler_config = DNSReconcilerConfig(config)
+    return DNSReconciler(
+        db_manager,
+        dns_client,
+        interval=reconciler_config.interval,
+        page_size=reconciler_config.page_size,
+        rate_limit=reconciler_config.rate_limit,
+    )
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+DNS Search Index for Prism DNS Server
+Local SQLite copy of PowerDNS RRsets for fast record search.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select, text
+
+from .database.connection import DatabaseManager
+from .database.models import DNSSearchRecord, DNSSearchZone
+from .dns_names import absolute_zone_name
+from .json_codec import get_json_codec
+
+if TYPE_CHECKING:
+    from .dns_manager import PowerDNSClient
+
+logger = logging.getLogger(__name__)
+
+# Seconds our own RRset changes wait before being written to the index
+_FLUSH_INTERVAL = 1.0
+
+# Shortest query the trigram index can answer; shorter ones scan the table
+_MIN_FTS_QUERY = 3
+
+# (zone, name, type) of an RRset
+RRsetKey = Tuple[str, str, str]
+
+# Index registered by the running server, used by PowerDNSClient and the API
+_search_index: Optional["DNSSearchIndex"] = None
+
+
+def get_dns_search_index() -> Optional["DNSSearchIndex"]:
+    """Get the running DNS search index, if any."""
+    return _search_index
+
+
+class DNSSearchIndexConfigError(Exception):
+    """Exception raised for DNS search index configuration errors."""
+
+    pass
+
+
+class DNSSearchIndexConfig:
+    """Configuration for the local DNS record search index."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize DNS search index configuration."""
+        powerdns_config = config.get("powerdns", {})
+
+        self.enabled = powerdns_config.get("search_index_enabled", True)
+        self.reconcile_interval = powerdns_config.get("search_reconcile_interval", 300)
+
+        if self.reconcile_interval <= 0:
+            raise DNSSearchIndexConfigError("search_reconcile_interval must be positive")
+
+
+class DNSSearchIndex:
+    """
+    Incrementally maintained local index of PowerDNS RRsets.
+
+    Each RRset is a row in dns_search_records; its name and record contents
+    are indexed by an FTS5 trigram table, so substring queries on names or
+    contents cost an index lookup instead of fetching every zone from
+    PowerDNS. Queries shorter than three characters, or SQLite builds
+    without FTS5, fall back to scanning the table.
+
+    The index is kept current two ways:
+
+    - RRset changes Prism sends to PowerDNS are passed to apply_rrsets() by
+      PowerDNSClient and written within about a second.
+    - A reconcile runs at startup and every ``reconcile_interval`` seconds:
+      zones whose SOA serial differs from the one last indexed are fetched
+      and replaced, and zones gone from PowerDNS are dropped. This catches
+      changes made outside Prism.
+
+    Until the first reconcile completes ``ready`` is False and callers
+    should search PowerDNS directly. Writes and reconciles are serialized,
+    so an RRset change is never overwritten by an older zone copy.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        dns_client: "PowerDNSClient",
+        reconcile_interval: float = 300,
+    ):
+        """
+        Initialize DNS search index.
+
+        Args:
+            db_manager: Database manager holding the index tables
+            dns_client: PowerDNS client used by reconciles
+            reconcile_interval: Seconds between full reconciles with PowerDNS
+        """
+        self.db_manager = db_manager
+        self.dns_client = dns_client
+        self.reconcile_interval = reconcile_interval
+        self.ready = False
+
+        # (zone, name, type) -> RRset to store, or None to delete it
+        self._pending: Dict[RRsetKey, Optional[Dict[str, Any]]] = {}
+        self._write_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._reconcile_requested = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._has_fts: Optional[bool] = None
+        # Single writer thread keeps index writes ordered and off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dns-search")
+        self._codec = get_json_codec()
+
+        self._stats = {
+            "rrsets_applied": 0,
+            "reconciles": 0,
+            "reconcile_errors": 0,
+            "zones_indexed": 0,
+            "zones_removed": 0,
+            "searches": 0,
+            "last_reconcile_ms": 0.0,
+        }
+
+        logger.info(f"DNSSearchIndex initialized: reconcile_interval={reconcile_interval}s")
+
+    def apply_rrsets(self, zone: str, rrsets: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue RRset changes that were accepted by PowerDNS.
+
+        Args:
+            zone: Zone the RRsets belong to
+            rrsets: RRsets from a PATCH body (with changetype REPLACE or DELETE)
+        """
+        zone = absolute_zone_name(zone)
+        for rrset in rrsets:
+            key = (zone, rrset.get("name", ""), rrset.get("type", "").upper())
+            if rrset.get("changetype", "REPLACE").upper() == "DELETE" or not rrset.get("records"):
+                self._pending[key] = None
+            else:
+                self._pending[key] = rrset
+        self._flush_requested.set()
+
+    def request_reconcile(self) -> None:
+        """Reconcile with PowerDNS soon (e.g. after a zone was created or deleted)."""
+        self._reconcile_requested.set()
+
+    async def flush(self) -> int:
+        """
+        Write queued RRset changes to the index.
+
+        Returns:
+            Number of RRsets written
+        """
+        async with self._write_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            try:
+                await self._run(self._write_rrsets, batch)
+            except Exception as e:
+                # The next reconcile re-indexes these zones (their serials changed)
+                logger.error(f"Could not write {len(batch)} RRsets to the search index: {e}")
+                return 0
+
+            self._stats["rrsets_applied"] += len(batch)
+            return len(batch)
+
+    async def reconcile(self) -> int:
+        """
+        Bring the index in line with PowerDNS using SOA serials.
+
+        Returns:
+            Number of zones re-indexed or removed
+        """
+        async with self._write_lock:
+            start_time = time.time()
+            try:
+                zones = await self.dns_client.list_zone_summaries()
+                indexed = await self._run(self._load_serials)
+            except Exception as e:
+                self._stats["reconcile_errors"] += 1
+                logger.error(f"DNS search index reconcile failed: {e}")
+                return 0
+
+            listed = {absolute_zone_name(zone["name"]): zone.get("serial") for zone in zones}
+            stale = [
+                zone
+                for zone, serial in listed.items()
+                if serial is None or zone not in indexed or indexed[zone] != serial
+            ]
+            removed = [zone for zone in indexed if zone not in listed]
+
+            reindexed = 0
+            zone_details = self.dns_client.map_zones(stale, self.dns_client.get_zone_details)
+            async with aclosing(zone_details):
+                async for zone, details in zone_details:
+                    if not details or isinstance(details, Exception):
+                        logger.warning(f"Could not fetch {zone} for the search index: {details}")
+                        continue
+                    await self._run(
+                        self._replace_zone, zone, details.get("serial"), details.get("rrsets", [])
+                    )
+                    reindexed += 1
+
+            if removed:
+                await self._run(self._remove_zones, removed)
+
+            self.ready = True
+            self._stats["reconciles"] += 1
+            self._stats["zones_indexed"] += reindexed
+            self._stats["zones_removed"] += len(removed)
+            self._stats["last_reconcile_ms"] = (time.time() - start_time) * 1000
+
+            if reindexed or removed:
+                logger.info(
+                    f"DNS search index reconciled: {reindexed} zones indexed, "
+                    f"{len(removed)} removed in {self._stats['last_reconcile_ms']:.1f}ms"
+                )
+            return reindexed + len(removed)
+
+    async def search(
+        self,
+        query: str,
+        record_type: Optional[str] = None,
+        zones: Optional[List[str]] = None,
+        content_search: bool = False,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search indexed RRsets by name or record content.
+
+        Args:
+            query: Case-insensitive substring to look for (empty matches everything)
+            record_type: Filter by record type (A, AAAA, CNAME, etc.)
+            zones: Only search these zones (None = all zones)
+            content_search: Search in record content instead of names
+            limit: Maximum results to return
+
+        Returns:
+            Matching RRsets with zone information, ordered by zone and name
+        """
+        self._stats["searches"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(self._search, query, record_type, zones, content_search, limit),
+        )
+
+    async def _run(self, func, *args) -> Any:
+        """Run a database function on the index writer thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _rrset_row(self, zone: str, rrset: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a dns_search_records row from a PowerDNS RRset."""
+        records = rrset.get("records", [])
+        return {
+            "zone": zone,
+            "name": rrset.get("name", ""),
+            "type": rrset.get("type", "").upper(),
+            "ttl": rrset.get("ttl"),
+            "records": self._codec.dumps(records).decode("utf-8"),
+            "content": "\n".join(record.get("content", "") for record in records),
+        }
+
+    def _write_rrsets(self, batch: Dict[RRsetKey, Optional[Dict[str, Any]]]) -> None:
+        """Replace or delete individual RRsets in one transaction."""
+        records_table = DNSSearchRecord.__table__
+        delete_stmt = delete(records_table).where(
+            records_table.c.zone == bindparam("key_zone"),
+            records_table.c.name == bindparam("key_name"),
+            records_table.c.type == bindparam("key_type"),
+        )
+        keys = [
+            {"key_zone": zone, "key_name": name, "key_type": rtype} for zone, name, rtype in batch
+        ]
+        rows = [self._rrset_row(key[0], rrset) for key, rrset in batch.items() if rrset]
+
+        with self.db_manager.get_session() as session:
+            session.execute(delete_stmt, keys)
+            if rows:
+                session.execute(insert(records_table), rows)
+
+    def _replace_zone(self, zone: str, serial: Any, rrsets: List[Dict[str, Any]]) -> None:
+        """Replace every indexed RRset of a zone and record its serial."""
+        records_table = DNSSearchRecord.__table__
+        zones_table = DNSSearchZone.__table__
+        rows = [self._rrset_row(zone, rrset) for rrset in rrsets if rrset.get("records")]
+
+        with self.db_manager.get_session() as session:
+            session.execute(delete(records_table).where(records_table.c.zone == zone))
+            if rows:
+                session.execute(insert(records_table), rows)
+            session.execute(delete(zones_table).where(zones_table.c.zone == zone))
+            session.execute(
+                insert(zones_table),
+                {"zone": zone, "serial": serial, "indexed_at": datetime.now(timezone.utc)},
+            )
+
+    def _remove_zones(self, zones: List[str]) -> None:
+        """Drop zones that no longer exist in PowerDNS."""
+        records_table = DNSSearchRecord.__table__
+        zones_table = DNSSearchZone.__table__
+
+        with self.db_manager.get_session() as session:
+            session.execute(delete(records_table).where(records_table.c.zone.in_(zones)))
+            session.execute(delete(zones_table).where(zones_table.c.zone.in_(zones)))
+
+    def _load_serials(self) -> Dict[str, Any]:
+        """Get the serial each indexed zone was copied at."""
+        zones_table = DNSSearchZone.__table__
+        with self.db_manager.get_session() as session:
+            result = session.execute(select(zones_table.c.zone, zones_table.c.serial))
+            return {zone: serial for zone, serial in result}
+
+    def _search(
+        self,
+        query: str,
+        record_type: Optional[str],
+        zones: Optional[List[str]],
+        content_search: bool,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Run a search query (on an executor thread)."""
+        if zones is not None and not zones:
+            return []
+
+        column = "content" if content_search else "name"
+        source = "dns_search_records r"
+        conditions = []
+        params: Dict[str, Any] = {"limit": limit}
+
+        if query and len(query) >= _MIN_FTS_QUERY and self._fts_available():
+            # A quoted trigram phrase matches any substring, case-insensitively
+            source = "dns_record_search JOIN dns_search_records r ON r.id = dns_record_search.rowid"
+            conditions.append("dns_record_search MATCH :match")
+            params["match"] = f'{column} : "{query.replace(chr(34), chr(34) * 2)}"'
+        elif query:
+            conditions.append(f"instr(lower(r.{column}), :query) > 0")
+            params["query"] = query.lower()
+
+        if record_type:
+            conditions.append("r.type = :record_type")
+            params["record_type"] = record_type.upper()
+
+        if zones is not None:
+            conditions.append("r.zone IN :zones")
+            params["zones"] = [absolute_zone_name(zone) for zone in zones]
+
+        sql = f"SELECT r.zone, r.name, r.type, r.ttl, r.records FROM {source}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY r.zone, r.name, r.type LIMIT :limit"
+
+        stmt = text(sql)
+        if zones is not None:
+            stmt = stmt.bindparams(bindparam("zones", expanding=True))
+
+        with self.db_manager.get_session() as session:
+            rows = session.execute(stmt, params).fetchall()
+
+        return [
+            {
+                "name": name,
+                "type": rtype,
+                "ttl": ttl,
+                "records": self._codec.loads(records),
+                "zone": zone,
+            }
+            for zone, name, rtype, ttl, records in rows
+        ]
+
+    def _fts_available(self) -> bool:
+        """Check (once) whether the FTS5 trigram table exists."""
+        if self._has_fts is None:
+            with self.db_manager.get_session() as session:
+                result = session.execute(
+                    text(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type='table' AND name='dns_record_search'"
+                    )
+                )
+                self._has_fts = result.fetchone() is not None
+            if not self._has_fts:
+                logger.warning("SQLite FTS5 trigram index unavailable; record search scans")
+        return self._has_fts
+
+    async def _flush_loop(self) -> None:
+        """Write queued RRset changes shortly after they arrive."""
+        while True:
+            await self._flush_requested.wait()
+            await asyncio.sleep(_FLUSH_INTERVAL)
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def _reconcile_loop(self) -> None:
+        """Reconcile at startup, then periodically or when requested."""
+        while True:
+            await self.reconcile()
+            try:
+                await asyncio.wait_for(
+                    self._reconcile_requested.wait(), timeout=self.reconcile_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._reconcile_requested.clear()
+
+    def start(self) -> None:
+        """Register as the process search index and start the background tasks."""
+        global _search_index
+        _search_index = self
+
+        if not self._tasks:
+            flush_task = asyncio.create_task(self._flush_loop())
+            flush_task.set_name("dns_search_index_flush")
+            reconcile_task = asyncio.create_task(self._reconcile_loop())
+            reconcile_task.set_name("dns_search_index_reconcile")
+            self._tasks = [flush_task, reconcile_task]
+
+    async def stop(self) -> None:
+        """Stop the background tasks, write queued changes and unregister."""
+        global _search_index
+        if _search_index is self:
+            _search_index = None
+
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self._stats.copy()
+        stats["ready"] = self.ready
+        stats["pending"] = len(self._pending)
+        return stats
+
+
+def create_dns_search_index(
+    config: Dict[str, Any],
+    db_manager: DatabaseManager,
+    dns_client: "PowerDNSClient",
+) -> DNSSearchIndex:
+    """
+    Create a DNS search index from configuration.
+
+    Args:
+        config: Configuration dictionary
+        db_manager: Database manager holding the index tables
+        dns_client: PowerDNS client used by reconciles
+
+    Returns:
+        Configured DNSSearchIndex instance
+    """
+    index_config = DNSSearchIndexConfig(config)
+    return DNSSearchIndex(
+        db_manager, dns_client, reconcile_interval=index_config.reconcile_interval
+    )
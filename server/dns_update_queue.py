@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+DNS Update Queue for Prism DNS Server
+Coalesces registration-driven A/AAAA changes into batched PowerDNS PATCHes.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .database.connection import DatabaseManager
+from .database.operations import HostOperations
+from .dns_manager import PowerDNSClient, PowerDNSConnectionError, send_with_single_retry
+
+logger = logging.getLogger(__name__)
+
+
+class DNSUpdateQueueConfigError(Exception):
+    """Exception raised for DNS update queue configuration errors."""
+
+    pass
+
+
+class DNSUpdateQueueConfig:
+    """Configuration for the batched DNS update queue."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize DNS update queue configuration."""
+        reg_config = config.get("registration", {})
+
+        self.flush_interval_ms = reg_config.get("dns_flush_interval_ms", 200)
+        self.batch_size = reg_config.get("dns_batch_size", 500)
+
+        if self.flush_interval_ms <= 0:
+            raise DNSUpdateQueueConfigError("dns_flush_interval_ms must be positive")
+
+        if self.batch_size <= 0:
+            raise DNSUpdateQueueConfigError("dns_batch_size must be positive")
+
+
+class DNSUpdateQueue:
+    """
+    Queues address record changes and sends them to PowerDNS in batches.
+
+    Registrations that create a host or change its IP used to PATCH PowerDNS
+    inline, one request per host. The queue instead keeps the newest address
+    per record (zone, hostname, record type) - a host that changes IP twice
+    before a flush only has its last address sent - and every ``flush_interval_ms``
+    (or once ``batch_size`` records are waiting) sends them grouped by zone,
+    up to ``batch_size`` RRsets per PATCH. The hosts' dns_sync_status is then
+    written in one transaction per flush.
+
+    Hostnames are only unique per user, so hosts of different users can
+    share a record. Every host queued for a record is kept with it and gets
+    the record's outcome, so none is left pending.
+
+    PowerDNS rejects a PATCH as a whole, so when a batch is refused its
+    records are retried one per request and only the rejected ones are
+    marked failed. If PowerDNS is unreachable (including while the client's
+    circuit breaker is open) the batch is deferred instead: its hosts are
+    marked pending and the updates go back on the queue for the next flush,
+    unless a newer address for the host has been queued meanwhile. Flushes
+    are serialized, so a later address for a host is never overtaken by an
+    earlier one.
+    """
+
+    def __init__(
+        self,
+        dns_client: PowerDNSClient,
+        db_manager: Optional[DatabaseManager] = None,
+        flush_interval_ms: int = 200,
+        batch_size: int = 500,
+    ):
+        """
+        Initialize DNS update queue.
+
+        Args:
+            dns_client: PowerDNS client used for PATCHes
+            db_manager: Database manager for dns_sync_status writes (optional)
+            flush_interval_ms: Maximum time an update stays queued
+            batch_size: Maximum RRsets per PATCH; a full batch triggers an early flush
+        """
+        self.dns_client = dns_client
+        self.host_ops = HostOperations(db_manager) if db_manager else None
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.batch_size = batch_size
+
+        # (zone, hostname, record type) -> (host IDs, address)
+        self._pending: Dict[Tuple[str, str, str], Tuple[Tuple[int, ...], str]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Single writer thread keeps status writes ordered and off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dns-flush")
+
+        self._stats = {
+            "updates_queued": 0,
+            "updates_coalesced": 0,
+            "records_sent": 0,
+            "records_failed": 0,
+            "records_deferred": 0,
+            "patches": 0,
+            "patch_errors": 0,
+        }
+
+        logger.info(
+            f"DNSUpdateQueue initialized: flush_interval={flush_interval_ms}ms, "
+            f"batch_size={batch_size}"
+        )
+
+    def enqueue(
+        self,
+        host_id: Optional[int],
+        hostname: str,
+        ip_address: str,
+        zone: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue an address record update for a host.
+
+        Args:
+            host_id: Host primary key for the status write (None to skip it)
+            hostname: Hostname to point at the address
+            ip_address: IPv4 or IPv6 address
+            zone: DNS zone (defaults to the client's default zone)
+
+        Returns:
+            True if queued, False if ip_address is not a valid IP address
+        """
+        try:
+            version = ipaddress.ip_address(ip_address).version
+        except ValueError:
+            logger.warning(f"Not queuing DNS update for {hostname}: invalid address {ip_address}")
+            return False
+
+        key = (zone or self.dns_client.default_zone, hostname, "A" if version == 4 else "AAAA")
+        host_ids: Tuple[int, ...] = ()
+        if key in self._pending:
+            self._stats["updates_coalesced"] += 1
+            host_ids = self._pending[key][0]
+        if host_id is not None and host_id not in host_ids:
+            host_ids += (host_id,)
+        self._pending[key] = (host_ids, ip_address)
+        self._stats["updates_queued"] += 1
+
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    def pending_count(self) -> int:
+        """Get number of queued record updates."""
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """
+        Send all queued updates to PowerDNS and record the outcome.
+
+        Returns:
+            Number of records PowerDNS accepted
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            start_time = time.time()
+
+            by_zone: Dict[str, List[Tuple[str, str, str, Tuple[int, ...]]]] = {}
+            for (zone, hostname, record_type), (host_ids, address) in batch.items():
+                by_zone.setdefault(zone, []).append((hostname, record_type, address, host_ids))
+
+            # Zones are independent; records within a zone go out in order
+            results = await asyncio.gather(
+                *(self._flush_zone(zone, updates) for zone, updates in by_zone.items())
+            )
+
+            synced: Dict[int, Tuple[str, str]] = {}
+            failed: List[int] = []
+            deferred: List[Tuple[str, Tuple[str, str, str, Tuple[int, ...]]]] = []
+            failed_records = 0
+            for zone, (zone_synced, zone_failed, zone_deferred) in zip(by_zone, results):
+                synced.update(zone_synced)
+                for _, _, _, host_ids in zone_failed:
+                    failed.extend(host_ids)
+                failed_records += len(zone_failed)
+                deferred.extend((zone, update) for update in zone_deferred)
+
+            # Queue unreachable updates again; a newer address queued while
+            # flushing wins, but its record keeps the deferred hosts too
+            pending_ids: List[int] = []
+            for zone, (hostname, record_type, address, host_ids) in deferred:
+                key = (zone, hostname, record_type)
+                newer_ids, newer_address = self._pending.get(key, ((), address))
+                merged = newer_ids + tuple(i for i in host_ids if i not in newer_ids)
+                self._pending[key] = (merged, newer_address)
+                pending_ids.extend(host_ids)
+
+            await self._record_status(synced, failed, pending_ids)
+
+            logger.debug(
+                f"Flushed {len(batch)} DNS updates in {len(by_zone)} zones in "
+                f"{(time.time() - start_time) * 1000:.1f}ms"
+            )
+            return len(batch) - failed_records - len(deferred)
+
+    async def _flush_zone(
+        self, zone: str, updates: List[Tuple[str, str, str, Tuple[int, ...]]]
+    ) -> Tuple[
+        Dict[int, Tuple[str, str]],
+        List[Tuple[str, str, str, Tuple[int, ...]]],
+        List[Tuple[str, str, str, Tuple[int, ...]]],
+    ]:
+        """Send one zone's updates in batches; return (synced hosts, failed, deferred)."""
+        synced: Dict[int, Tuple[str, str]] = {}
+        failed: List[Tuple[str, str, str, Tuple[int, ...]]] = []
+        deferred: List[Tuple[str, str, str, Tuple[int, ...]]] = []
+
+        for start in range(0, len(updates), self.batch_size):
+            chunk = updates[start : start + self.batch_size]
+            try:
+                outcomes = await send_with_single_retry(
+                    lambda batch: self._patch(zone, batch), chunk, lambda update: update[0], zone
+                )
+            except PowerDNSConnectionError as e:
+                logger.warning(f"Deferring DNS batch of {len(chunk)} in {zone}: {e}")
+                self._stats["records_deferred"] += len(chunk)
+                deferred.extend(chunk)
+                continue
+            except Exception as e:
+                logger.error(f"Unexpected error sending DNS batch in {zone}: {e}")
+                outcomes = [(chunk, None)]
+
+            for sent, result in outcomes:
+                if result is not None and result.get("status") == "success":
+                    self._stats["records_sent"] += len(sent)
+                    for (_, _, _, host_ids), fqdn in zip(sent, result["fqdns"]):
+                        for host_id in host_ids:
+                            synced[host_id] = (result["zone"], fqdn)
+                else:
+                    self._stats["records_failed"] += len(sent)
+                    failed.extend(sent)
+
+        return synced, failed, deferred
+
+    async def _patch(
+        self, zone: str, updates: List[Tuple[str, str, str, Tuple[int, ...]]]
+    ) -> Dict[str, Any]:
+        """Send one multi-RRset PATCH."""
+        self._stats["patches"] += 1
+        try:
+            return await self.dns_client.replace_address_records(
+                zone,
+                [(hostname, record_type, address) for hostname, record_type, address, _ in updates],
+            )
+        except Exception:
+            self._stats["patch_errors"] += 1
+            raise
+
+    async def _record_status(
+        self,
+        synced: Dict[int, Tuple[str, str]],
+        failed: List[int],
+        pending: Iterable[int] = (),
+    ) -> None:
+        """Write dns_sync_status for a flushed batch in one transaction."""
+        pending = list(pending)
+        if self.host_ops is None or not (synced or failed or pending):
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._executor, self.host_ops.bulk_update_dns_info, synced, failed, pending
+            )
+        except Exception as e:
+            count = len(synced) + len(failed) + len(pending)
+            logger.error(f"Could not record DNS status for {count} hosts: {e}")
+
+    async def _flush_loop(self) -> None:
+        """Flush periodically or when a full batch is waiting."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+            self._task.set_name("dns_update_queue_flush")
+
+    async def stop(self) -> None:
+        """Stop the flush task and send any remaining updates."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self._stats.copy()
+        stats["pending"] = len(self._pending)
+        return stats
+
+
+def create_dns_update_queue(
+    config: Dict[str, Any],
+    dns_client: PowerDNSClient,
+    db_manager: Optional[DatabaseManager] = None,
+) -> DNSUpdateQueue:
+    """
+    Create a DNS update queue from configuration.
+
+    Args:
+        config: Configuration dictionary
+        dns_client: PowerDNS client used for PATCHes
+        db_manager: Database manager for dns_sync_status writes (optional)
+
+    Returns:
+        Configured DNSUpdateQueue instance
+    """
+    queue_config = DNSUpdateQueueConfig(config)
+    return DNSUpdateQueue(
+        dns_client,
+        db_manager=db_manager,
+        flush_interval_ms=queue_config.flush_interval_ms,
+        batch_size=queue_config.batch_size,
+    )
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Heartbeat Buffer for Prism DNS Server
+Write-behind coalescing of host last_seen updates.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .database.connection import DatabaseManager
+from .database.operations import HostOperations
+from .host_index import HostIndex
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatBufferConfigError(Exception):
+    """Exception raised for heartbeat buffer configuration errors."""
+
+    pass
+
+
+class HeartbeatBufferConfig:
+    """Configuration for the heartbeat write-behind buffer."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize heartbeat buffer configuration."""
+        reg_config = config.get("registration", {})
+
+        self.flush_interval_ms = reg_config.get("heartbeat_flush_interval_ms", 500)
+        self.max_pending = reg_config.get("heartbeat_max_pending", 10000)
+
+        if self.flush_interval_ms <= 0:
+            raise HeartbeatBufferConfigError("heartbeat_flush_interval_ms must be positive")
+
+        if self.max_pending <= 0:
+            raise HeartbeatBufferConfigError("heartbeat_max_pending must be positive")
+
+
+class HeartbeatBuffer:
+    """
+    Coalesces heartbeat writes and flushes them in batches.
+
+    Heartbeats for hosts that are already online with an unchanged IP only
+    need last_seen bumped. Instead of one transaction per heartbeat, the
+    buffer keeps the newest timestamp per host ID and writes all of them in
+    one executemany UPDATE every ``flush_interval_ms`` (or sooner once
+    ``max_pending`` hosts are waiting).
+
+    When a flush updates fewer rows than it was given, the hosts were deleted
+    behind the registration pipeline's back; they are evicted from the host
+    index (if any) so their next registration recreates them.
+
+    Staleness guarantee: a recorded heartbeat reaches the database within
+    ``flush_interval_ms``, unless a flush fails, in which case it is kept for
+    the next attempt. ``max_staleness`` covers both: it is the flush interval
+    plus the age of the oldest heartbeat still waiting to be written.
+    HeartbeatMonitor flushes the buffer before each timeout sweep and widens
+    its cutoff by ``max_staleness``, so a host is never marked offline while
+    its heartbeat is still buffered, even after failed flushes.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        flush_interval_ms: int = 500,
+        max_pending: int = 10000,
+        host_index: Optional[HostIndex] = None,
+    ):
+        """
+        Initialize heartbeat buffer.
+
+        Args:
+            db_manager: Database manager used for flushes
+            flush_interval_ms: Maximum time a heartbeat stays buffered
+            max_pending: Number of buffered hosts that triggers an early flush
+            host_index: Host index to evict deleted hosts from (optional)
+        """
+        self.host_ops = HostOperations(db_manager)
+        self.host_index = host_index
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+
+        self._pending: Dict[int, datetime] = {}
+        # When the oldest heartbeat not yet written was recorded (None if nothing is pending)
+        self._pending_since: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Single writer thread keeps flushes ordered and off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="heartbeat-flush")
+
+        self._stats = {
+            "heartbeats_recorded": 0,
+            "heartbeats_coalesced": 0,
+            "rows_flushed": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "missing_hosts": 0,
+        }
+
+        logger.info(
+            f"HeartbeatBuffer initialized: flush_interval={flush_interval_ms}ms, "
+            f"max_pending={max_pending}"
+        )
+
+    @property
+    def max_staleness(self) -> float:
+        """Upper bound in seconds between a heartbeat and its database write."""
+        if self._pending_since is None:
+            return self.flush_interval
+        return self.flush_interval + (time.time() - self._pending_since)
+
+    def record(self, host_id: int, seen_at: Optional[datetime] = None) -> None:
+        """
+        Buffer a heartbeat for a host.
+
+        Args:
+            host_id: Host primary key
+            seen_at: Time the heartbeat was received (defaults to now)
+        """
+        if seen_at is None:
+            seen_at = datetime.now(timezone.utc)
+
+        if host_id in self._pending:
+            self._stats["heartbeats_coalesced"] += 1
+        elif self._pending_since is None:
+            self._pending_since = time.time()
+        self._pending[host_id] = seen_at
+        self._stats["heartbeats_recorded"] += 1
+
+        if len(self._pending) >= self.max_pending:
+            self._flush_requested.set()
+
+    def pending_count(self) -> int:
+        """Get number of hosts with buffered heartbeats."""
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered heartbeats to the database.
+
+        Returns:
+            Number of rows updated
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            batch_since, self._pending_since = self._pending_since, None
+            start_time = time.time()
+
+            try:
+                loop = asyncio.get_running_loop()
+                rows = await loop.run_in_executor(
+                    self._executor, self.host_ops.bulk_update_last_seen, batch
+                )
+
+            except Exception as e:
+                # Keep the batch, but let newer heartbeats recorded meanwhile win
+                for host_id, seen_at in batch.items():
+                    self._pending.setdefault(host_id, seen_at)
+                # The database may lag these hosts since the batch's first heartbeat
+                self._pending_since = batch_since
+                self._stats["flush_errors"] += 1
+                logger.error(f"Heartbeat flush of {len(batch)} hosts failed: {e}")
+                return 0
+
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += rows
+
+            if rows < len(batch):
+                await self._evict_missing(loop, list(batch))
+
+            logger.debug(
+                f"Flushed {len(batch)} heartbeats in {(time.time() - start_time) * 1000:.1f}ms"
+            )
+            return rows
+
+    async def _evict_missing(self, loop: asyncio.AbstractEventLoop, host_ids: list) -> None:
+        """Drop hosts whose rows no longer exist from the host index."""
+        try:
+            existing = await loop.run_in_executor(
+                self._executor, self.host_ops.get_existing_host_ids, host_ids
+            )
+        except Exception as e:
+            logger.warning(f"Could not check for deleted hosts after flush: {e}")
+            return
+
+        missing = [host_id for host_id in host_ids if host_id not in existing]
+        if not missing:
+            return
+
+        self._stats["missing_hosts"] += len(missing)
+        if self.host_index is not None:
+            self.host_index.remove_ids(missing)
+        logger.info(f"Heartbeat flush skipped {len(missing)} deleted hosts")
+
+    async def _flush_loop(self) -> None:
+        """Flush periodically or when the buffer fills up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+            self._task.set_name("heartbeat_buffer_flush")
+
+    async def stop(self) -> None:
+        """Stop the flush task and write any remaining heartbeats."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get buffer statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self._stats.copy()
+        stats["pending"] = len(self._pending)
+        return stats
+
+
+def create_heartbeat_buffer(
+    config: Dict[str, Any],
+    db_manager: DatabaseManager,
+    host_index: Optional[HostIndex] = None,
+) -> HeartbeatBuffer:
+    """
+    Create a heartbeat buffer from configuration.
+
+    Args:
+        config: Configuration dictionary
+        db_manager: Database manager used for flushes
+        host_index: Host index to keep coherent with deletions (optional)
+
+    Returns:
+        Configured HeartbeatBuffer instance
+    """
+    buffer_config = HeartbeatBufferConfig(config)
+    return HeartbeatBuffer(
+        db_manager,
+        flush_interval_ms=buffer_config.flush_interval_ms,
+        max_pending=buffer_config.max_pending,
+        host_index=host_index,
+    )
@@ -5,11 +5,12 @@ Monitors host heartbeats and manages host status transitions.
 """
 
 import asyncio
+import functools
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
 from server.database.connection import DatabaseManager
 from server.database.models import Host
@@ -32,6 +33,8 @@ class TimeoutResult:
     hosts_timed_out: int
     timed_out_hosts: List[str]
     check_duration: float
+    # Host ids matching timed_out_hosts; hostnames are only unique per user
+    timed_out_host_ids: List[int] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -39,6 +42,7 @@ class TimeoutResult:
             "hosts_checked": self.hosts_checked,
             "hosts_timed_out": self.hosts_timed_out,
             "timed_out_hosts": self.timed_out_hosts,
+            "timed_out_host_ids": self.timed_out_host_ids,
             "check_duration": self.check_duration,
         }
 
@@ -92,15 +96,32 @@ class HeartbeatMonitor:
     Handles timeout detection, status changes, and monitoring statistics.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        heartbeat_buffer: Optional[Any] = None,
+        host_index: Optional[Any] = None,
+        run_blocking: Optional[Callable[..., Awaitable[Any]]] = None,
+    ):
         """
         Initialize heartbeat monitor.
 
         Args:
             config: Configuration dictionary
+            heartbeat_buffer: Write-behind heartbeat buffer to flush before
+                each timeout check (optional)
+            host_index: Registration host index to keep in step with hosts
+                marked offline or cleaned up (optional)
+            run_blocking: Coroutine function running blocking calls off the
+                event loop, e.g. RegistrationProcessor.run_blocking (optional;
+                the loop's default executor is used without it)
         """
         self.config = HeartbeatConfig(config)
         self.db_manager = DatabaseManager(config)
+        self.heartbeat_buffer = heartbeat_buffer
+        self.host_index = host_index
+        self._run_blocking = run_blocking
+        self._schema_initialized = False
         self._statistics = {
             "total_checks_performed": 0,
             "total_hosts_timed_out": 0,
@@ -137,6 +158,45 @@ class HeartbeatMonitor:
 
         return threshold
 
+    async def run_blocking(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking database call off the event loop.
+
+        Args:
+            operation: Operation name used for metrics
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        if self._run_blocking is not None:
+            return await self._run_blocking(operation, func, *args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _timeout_cutoff(self, heartbeat_interval: int) -> datetime:
+        """
+        Compute the last_seen cutoff for timed out hosts.
+
+        Args:
+            heartbeat_interval: Expected heartbeat interval in seconds
+
+        Returns:
+            Hosts last seen before this time have timed out
+        """
+        timeout_threshold = self.calculate_timeout_threshold(heartbeat_interval)
+
+        if self.heartbeat_buffer is not None:
+            # Persist buffered heartbeats first, and allow for ones recorded
+            # after this flush that have not reached the database yet
+            await self.heartbeat_buffer.flush()
+            timeout_threshold += self.heartbeat_buffer.max_staleness
+
+        return datetime.now(timezone.utc) - timedelta(seconds=timeout_threshold)
+
     async def check_host_timeouts(
         self, heartbeat_interval: int = 60, limit: Optional[int] = None
     ) -> TimeoutResult:
@@ -155,9 +215,7 @@ class HeartbeatMonitor:
         if limit is None:
             limit = self.config.max_hosts_per_check
 
-        # Calculate timeout threshold
-        timeout_threshold = self.calculate_timeout_threshold(heartbeat_interval)
-        cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=timeout_threshold)
+        cutoff_time = await self._timeout_cutoff(heartbeat_interval)
 
         logger.debug(f"Checking for hosts with last_seen before {cutoff_time}")
 
@@ -174,7 +232,8 @@ class HeartbeatMonitor:
                 host_last_seen = host_last_seen.replace(tzinfo=timezone.utc)
             if host_last_seen < cutoff_time:
                 timed_out_hosts.append(host)
-        timed_out_hostnames = [host.hostname for host in timed_out_hosts if host.status == "online"]
+        timed_out_hosts = [host for host in timed_out_hosts if host.status == "online"]
+        timed_out_hostnames = [host.hostname for host in timed_out_hosts]
 
         check_duration = time.time() - start_time
 
@@ -196,6 +255,7 @@ class HeartbeatMonitor:
             hosts_timed_out=len(timed_out_hostnames),
             timed_out_hosts=timed_out_hostnames,
             check_duration=check_duration,
+            timed_out_host_ids=[host.id for host in timed_out_hosts],
         )
 
         logger.info(
@@ -205,14 +265,92 @@ class HeartbeatMonitor:
 
         return result
 
+    async def sweep_host_timeouts(self, heartbeat_interval: int = 60) -> StatusChangeResult:
+        """
+        Mark every timed out host offline with set-based UPDATEs.
+
+        Each chunk of up to ``max_hosts_per_check`` hosts is one short
+        transaction run on the executor, so the event loop keeps serving
+        connections during the sweep and the SQLite writer lock is released
+        between chunks on very large fleets.
+
+        Args:
+            heartbeat_interval: Expected heartbeat interval in seconds
+
+        Returns:
+            StatusChangeResult with operation statistics
+        """
+        start_time = time.time()
+        cutoff_time = await self._timeout_cutoff(heartbeat_interval)
+        chunk_size = self.config.max_hosts_per_check
+        host_ops = HostOperations(self.db_manager)
+
+        marked_offline: List[str] = []
+        success = True
+        try:
+            if not self._schema_initialized:
+                await self.run_blocking("initialize_schema", self.db_manager.initialize_schema)
+                self._schema_initialized = True
+
+            while True:
+                chunk = await self.run_blocking(
+                    "mark_timed_out_hosts_offline",
+                    host_ops.mark_timed_out_hosts_offline,
+                    cutoff_time,
+                    limit=chunk_size,
+                )
+                for host in chunk:
+                    marked_offline.append(host["hostname"])
+                    if self.host_index is not None:
+                        self.host_index.mark_offline(host["created_by"], host["hostname"])
+                if len(chunk) < chunk_size:
+                    break
+
+        except Exception as e:
+            logger.error(f"Error during heartbeat timeout sweep: {e}")
+            success = False
+
+        operation_duration = time.time() - start_time
+
+        # Update statistics
+        self._statistics["total_checks_performed"] += 1
+        self._statistics["last_check_time"] = datetime.now(timezone.utc).isoformat()
+        self._statistics["total_status_changes"] += len(marked_offline)
+        self._statistics["total_hosts_timed_out"] += len(marked_offline)
+        self._statistics["check_durations"].append(operation_duration)
+        if len(self._statistics["check_durations"]) > 100:
+            self._statistics["check_durations"] = self._statistics["check_durations"][-100:]
+        self._statistics["average_check_duration"] = sum(self._statistics["check_durations"]) / len(
+            self._statistics["check_durations"]
+        )
+
+        if marked_offline:
+            logger.info(
+                f"Heartbeat sweep marked {len(marked_offline)} hosts offline "
+                f"in {operation_duration:.3f}s"
+            )
+            logger.debug(f"Timed out hosts: {marked_offline}")
+
+        return StatusChangeResult(
+            success=success,
+            hosts_processed=len(marked_offline),
+            hosts_marked_offline=len(marked_offline),
+            failed_hosts=[],
+            operation_duration=operation_duration,
+        )
+
     async def mark_hosts_offline(
-        self, hostnames: List[str], reason: str = "heartbeat_timeout"
+        self, host_ids: List[int], reason: str = "heartbeat_timeout"
     ) -> StatusChangeResult:
         """
         Mark hosts as offline.
 
+        Hosts are addressed by id because the same hostname can belong to
+        several users.
+
         Args:
-            hostnames: List of hostnames to mark offline
+            host_ids: List of host ids to mark offline, e.g.
+                TimeoutResult.timed_out_host_ids
             reason: Reason for status change
 
         Returns:
@@ -228,23 +366,28 @@ class HeartbeatMonitor:
             self.db_manager.initialize_schema()
             host_ops = HostOperations(self.db_manager)
 
-            for hostname in hostnames:
+            for host_id in host_ids:
                 try:
                     hosts_processed += 1
 
                     # Get current host
-                    host = host_ops.get_host_by_hostname(hostname)
+                    host = host_ops.get_host_by_id(host_id)
                     if host and host.status == "online":
-                        # Mark offline
-                        if host_ops.mark_host_offline(hostname):
+                        # Mark offline by primary key so only this host's row is touched
+                        if host_ops.mark_host_offline_by_id(host.id):
                             hosts_marked_offline += 1
-                            logger.debug(f"Marked host '{hostname}' offline (reason: {reason})")
+                            if self.host_index is not None:
+                                self.host_index.mark_offline(host.created_by, host.hostname)
+                            logger.debug(
+                                f"Marked host '{host.hostname}' ({host.id}) offline "
+                                f"(reason: {reason})"
+                            )
                         else:
-                            failed_hosts.append(hostname)
+                            failed_hosts.append(host.hostname)
 
                 except Exception as e:
-                    logger.error(f"Failed to mark host '{hostname}' offline: {e}")
-                    failed_hosts.append(hostname)
+                    logger.error(f"Failed to mark host {host_id} offline: {e}")
+                    failed_hosts.append(str(host_id))
 
         except Exception as e:
             logger.error(f"Error during mark_hosts_offline operation: {e}")
@@ -374,19 +517,11 @@ class HeartbeatMonitor:
 
         while True:
             try:
-                # Check for timeouts
-                timeout_result = await self.check_host_timeouts(heartbeat_interval)
-
-                # Mark timed out hosts as offline
-                if timeout_result.timed_out_hosts:
-                    status_result = await self.mark_hosts_offline(
-                        timeout_result.timed_out_hosts, "heartbeat_timeout"
-                    )
+                # Mark timed out hosts offline in one set-based sweep
+                status_result = await self.sweep_host_timeouts(heartbeat_interval)
 
-                    if not status_result.success:
-                        logger.warning(
-                            f"Some hosts failed to be marked offline: {status_result.failed_hosts}"
-                        )
+                if not status_result.success:
+                    logger.warning("Heartbeat timeout sweep did not complete")
 
                 # Wait for next check
                 await asyncio.sleep(self.config.check_interval)
@@ -488,6 +623,8 @@ class HeartbeatMonitor:
                     try:
                         session.delete(host)
                         cleaned_count += 1
+                        if self.host_index is not None:
+                            self.host_index.remove(host.created_by, host.hostname)
                         logger.debug(f"Cleaned up old offline host: {host.hostname}")
                     except Exception as e:
                         logger.error(f"Error cleaning up host {host.hostname}: {e}")
@@ -509,14 +646,24 @@ class HeartbeatMonitor:
             self.db_manager.cleanup()
 
 
-def create_heartbeat_monitor(config: Dict[str, Any]) -> HeartbeatMonitor:
+def create_heartbeat_monitor(
+    config: Dict[str, Any],
+    heartbeat_buffer: Optional[Any] = None,
+    host_index: Optional[Any] = None,
+    run_blocking: Optional[Callable[..., Awaitable[Any]]] = None,
+) -> HeartbeatMonitor:
     """
     Create a heartbeat monitor instance.
 
     Args:
         config: Configuration dictionary
+        heartbeat_buffer: Write-behind heartbeat buffer (optional)
+        host_index: Registration host index (optional)
+        run_blocking: Coroutine function running blocking calls on an executor (optional)
 
     Returns:
         Configured HeartbeatMonitor instance
     """
-    return HeartbeatMonitor(config)
+    return HeartbeatMonitor(
+        config, heartbeat_buffer=heartbeat_buffer, host_index=host_index, run_blocking=run_blocking
+    )
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Host Index for Prism DNS Server
+In-memory host state for the registration hot path.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+
+from .database.connection import DatabaseManager
+from .database.models import Host
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class HostEntry:
+    """Cached registration state for one host.
+
+    Attribute names mirror the Host model so the registration processor can
+    use an entry wherever it used a Host row.
+    """
+
+    id: int
+    hostname: str
+    created_by: str
+    current_ip: str
+    status: str
+    last_seen: Optional[datetime]
+
+
+class HostIndex:
+    """
+    Authoritative in-process index of host state keyed by (user_id, hostname).
+
+    Loaded once at startup and then updated by every component in this
+    process that changes host state (registration processor, heartbeat
+    monitor sweep and cleanup), so the common "same IP, still online"
+    heartbeat needs no database read at all. A miss falls back to the
+    database and repopulates the entry, and hosts removed behind the index's
+    back are evicted when a heartbeat flush or a registration's write finds
+    their row gone (the registration then looks the host up again).
+
+    The index is confined to the event loop thread: all methods are
+    synchronous and must only be called from coroutines, never from executor
+    threads.
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        Initialize host index.
+
+        Args:
+            db_manager: Database manager used to load the index
+        """
+        self.db_manager = db_manager
+        self._entries: Dict[Tuple[str, str], HostEntry] = {}
+        self._key_by_id: Dict[int, Tuple[str, str]] = {}
+
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    def load(self) -> int:
+        """
+        Replace the index contents with every host in the database.
+
+        Returns:
+            Number of hosts loaded
+        """
+        start_time = time.time()
+        hosts_table = Host.__table__
+        stmt = select(
+            hosts_table.c.id,
+            hosts_table.c.hostname,
+            hosts_table.c.created_by,
+            hosts_table.c.current_ip,
+            hosts_table.c.status,
+            hosts_table.c.last_seen,
+        )
+
+        entries: Dict[Tuple[str, str], HostEntry] = {}
+        key_by_id: Dict[int, Tuple[str, str]] = {}
+        with self.db_manager.get_session() as session:
+            for row in session.execute(stmt):
+                key = (row.created_by, row.hostname)
+                entries[key] = HostEntry(
+                    id=row.id,
+                    hostname=row.hostname,
+                    created_by=row.created_by,
+                    current_ip=row.current_ip,
+                    status=row.status,
+                    last_seen=row.last_seen,
+                )
+                key_by_id[row.id] = key
+
+        self._entries = entries
+        self._key_by_id = key_by_id
+
+        logger.info(f"HostIndex loaded {len(entries)} hosts in {time.time() - start_time:.3f}s")
+        return len(entries)
+
+    def get(self, user_id: str, hostname: str) -> Optional[HostEntry]:
+        """
+        Look up a host.
+
+        Args:
+            user_id: Owner of the host
+            hostname: Hostname
+
+        Returns:
+            HostEntry if indexed, None otherwise (the caller should check the database)
+        """
+        entry = self._entries.get((user_id, hostname))
+        if entry is None:
+            self._stats["misses"] += 1
+        else:
+            self._stats["hits"] += 1
+        return entry
+
+    def put(self, host: Any) -> HostEntry:
+        """
+        Add or replace an entry from a Host row (or anything with the same attributes).
+
+        Args:
+            host: Host model instance or HostEntry
+
+        Returns:
+            The indexed HostEntry
+        """
+        entry = HostEntry(
+            id=host.id,
+            hostname=host.hostname,
+            created_by=host.created_by,
+            current_ip=host.current_ip,
+            status=host.status,
+            last_seen=host.last_seen,
+        )
+        key = (entry.created_by, entry.hostname)
+        self._entries[key] = entry
+        self._key_by_id[entry.id] = key
+        return entry
+
+    def mark_online(self, user_id: str, hostname: str, ip_address: str, seen_at: datetime) -> None:
+        """
+        Record a successful registration or heartbeat.
+
+        Args:
+            user_id: Owner of the host
+            hostname: Hostname
+            ip_address: Current IP address
+            seen_at: Time the host was seen
+        """
+        entry = self._entries.get((user_id, hostname))
+        if entry is not None:
+            entry.current_ip = ip_address
+            entry.status = "online"
+            entry.last_seen = seen_at
+
+    def mark_offline(self, user_id: str, hostname: str) -> None:
+        """
+        Record that a host was marked offline.
+
+        Args:
+            user_id: Owner of the host
+            hostname: Hostname
+        """
+        entry = self._entries.get((user_id, hostname))
+        if entry is not None:
+            entry.status = "offline"
+
+    def remove(self, user_id: str, hostname: str) -> None:
+        """
+        Drop a host that was deleted.
+
+        Args:
+            user_id: Owner of the host
+            hostname: Hostname
+        """
+        entry = self._entries.pop((user_id, hostname), None)
+        if entry is not None:
+            self._key_by_id.pop(entry.id, None)
+
+    def remove_ids(self, host_ids: Iterable[int]) -> int:
+        """
+        Drop hosts by primary key, e.g. rows that vanished from the database.
+
+        Args:
+            host_ids: Host primary keys
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for host_id in host_ids:
+            key = self._key_by_id.pop(host_id, None)
+            if key is not None:
+                self._entries.pop(key, None)
+                removed += 1
+
+        self._stats["evictions"] += removed
+        return removed
+
+    def __len__(self) -> int:
+        """Get number of indexed hosts."""
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self._stats.copy()
+        stats["size"] = len(self._entries)
+        return stats
+
+
+def create_host_index(db_manager: DatabaseManager) -> HostIndex:
+    """
+    Create and load a host index.
+
+    Args:
+        db_manager: Database manager to load hosts from
+
+    Returns:
+        Loaded HostIndex instance
+    """
+    host_index = HostIndex(db_manager)
+    host_index.load()
+    return host_index
@@ -193,9 +193,8 @@ class HostManager:
             # Reactivation
             if existing_host.current_ip != ip_address:
                 # IP changed during offline period
-                success = self.host_ops.update_host_ip(hostname, ip_address)
+                success = self.host_ops.set_host_online(existing_host.id, ip_address)
                 if success:
-                    self.host_ops.update_host_last_seen(hostname)
                     self._stats["hosts_reactivated"] += 1
                     self._stats["ip_changes_processed"] += 1
 
@@ -215,7 +214,7 @@ class HostManager:
                     )
             else:
                 # Same IP, just reactivation
-                success = self.host_ops.update_host_last_seen(hostname)
+                success = self.host_ops.set_host_online(existing_host.id)
                 if success:
                     self._stats["hosts_reactivated"] += 1
 
@@ -232,9 +231,8 @@ class HostManager:
 
         elif existing_host.current_ip != ip_address:
             # IP address changed
-            success = self.host_ops.update_host_ip(hostname, ip_address)
+            success = self.host_ops.set_host_online(existing_host.id, ip_address)
             if success:
-                self.host_ops.update_host_last_seen(hostname)
                 self._stats["ip_changes_processed"] += 1
 
                 logger.info(f"IP address updated: {hostname} {previous_ip} -> {ip_address}")
@@ -249,7 +247,7 @@ class HostManager:
                 )
         else:
             # Same IP, just timestamp update
-            success = self.host_ops.update_host_last_seen(hostname)
+            success = self.host_ops.set_host_online(existing_host.id)
             if success:
                 self._stats["hosts_updated"] += 1
 
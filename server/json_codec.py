@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+JSON Codec for Prism DNS Server
+Compact UTF-8 JSON encoding with an optional orjson or msgspec backend.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+# Backends in order of preference for auto-detection
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def available_backends() -> list:
+    """Get the JSON backends importable in this environment, fastest first."""
+    installed = {"orjson": orjson is not None, "msgspec": msgspec is not None, "json": True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+class JSONCodec:
+    """
+    JSON encoder/decoder with a pluggable backend.
+
+    All backends produce compact UTF-8 bytes (non-ASCII characters are not
+    escaped) and raise ValueError for malformed input, so callers do not
+    need to know which library is in use.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize JSON codec.
+
+        Args:
+            backend: 'orjson', 'msgspec' or 'json'. Defaults to the
+                PRISM_JSON_BACKEND environment variable, then the fastest
+                installed backend.
+
+        Raises:
+            ValueError: If the backend is unknown or not installed
+        """
+        if backend is None:
+            backend = os.environ.get("PRISM_JSON_BACKEND") or available_backends()[0]
+
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}. Must be one of: {list(BACKENDS)}")
+        if backend not in available_backends():
+            raise ValueError(f"JSON backend '{backend}' is not installed")
+
+        self.backend = backend
+
+        if backend == "msgspec":
+            self._msgspec_encoder = msgspec.json.Encoder()
+            self._msgspec_decoder = msgspec.json.Decoder()
+
+        logger.debug(f"JSONCodec using {backend} backend")
+
+    def dumps(
+        self, obj: Any, default: Optional[Callable[[Any], Any]] = None, indent: bool = False
+    ) -> bytes:
+        """
+        Encode an object as JSON.
+
+        Args:
+            obj: Object to encode
+            default: Called for objects the backend cannot encode natively
+            indent: Pretty-print with two-space indentation
+
+        Returns:
+            UTF-8 encoded JSON
+
+        Raises:
+            TypeError: If the object cannot be encoded
+        """
+        if self.backend == "orjson":
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=default, option=option)
+
+        if self.backend == "msgspec":
+            encoder = self._msgspec_encoder
+            if default is not None:
+                encoder = msgspec.json.Encoder(enc_hook=default)
+            try:
+                data = encoder.encode(obj)
+            except msgspec.EncodeError as e:
+                raise TypeError(str(e)) from e
+            return msgspec.json.format(data, indent=2) if indent else data
+
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, default=default, indent=2).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, default=default, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        """
+        Decode JSON.
+
+        Args:
+            data: UTF-8 encoded JSON, or a str
+
+        Returns:
+            Decoded object
+
+        Raises:
+            ValueError: If the data is not valid UTF-8 JSON
+        """
+        if self.backend == "orjson":
+            return orjson.loads(data)
+
+        if self.backend == "msgspec":
+            try:
+                return self._msgspec_decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+        if not isinstance(data, str):
+            # Decode explicitly: json.loads(bytes) runs Python-level encoding detection
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+
+# Global codec instance
+_json_codec: Optional[JSONCodec] = None
+
+
+def get_json_codec() -> JSONCodec:
+    """Get or create the global JSON codec instance."""
+    global _json_codec
+    if _json_codec is None:
+        _json_codec = JSONCodec()
+        logger.info(f"JSON codec backend: {_json_codec.backend}")
+    return _json_codec
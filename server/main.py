@@ -12,7 +12,12 @@ import sys
 from typing import Any, Dict, Optional
 
 from server.api.app import create_app
+from server.auth.models import configure_token_lookup_key
 from server.config import ConfigFileError, ConfigValidationError, ServerConfiguration
+from server.database.connection import DatabaseManager
+from server.dns_manager import PowerDNSClient, close_shared_session, create_dns_client
+from server.dns_reconciler import DNSReconcilerConfig, create_dns_reconciler
+from server.dns_search_index import DNSSearchIndexConfig, create_dns_search_index
 from server.heartbeat_monitor import create_heartbeat_monitor
 from server.logging_setup import LoggingConfigError, setup_logging
 from server.signal_handlers import create_signal_handler
@@ -43,12 +48,18 @@ class ServerApplication:
 
         # Validate configuration
         self.config.validate()
+        configure_token_lookup_key(self.config.api.token_lookup_key, self.config.server.environment)
 
         # Initialize components
         self.tcp_server: Optional[TCPServer] = None
+        self.dns_client: Optional[PowerDNSClient] = None
         self.api_server = None
         self.heartbeat_monitor = None
         self.heartbeat_task: Optional[asyncio.Task] = None
+        self.dns_search_index = None
+        self.search_db_manager: Optional[DatabaseManager] = None
+        self.dns_reconciler = None
+        self.reconciler_db_manager: Optional[DatabaseManager] = None
         self.shutdown_event = asyncio.Event()
         self.signal_handler = None
 
@@ -63,6 +74,10 @@ class ServerApplication:
             self.signal_handler = create_signal_handler(self.shutdown, async_mode=True)
             self.signal_handler.setup()
 
+            # One PowerDNS client (circuit breakers, zone cache) for every DNS consumer
+            if self.config.powerdns.enabled:
+                self.dns_client = create_dns_client(self.config.to_dict())
+
             # Start TCP server
             await self._start_tcp_server()
 
@@ -72,6 +87,12 @@ class ServerApplication:
             # Start heartbeat monitor
             await self._start_heartbeat_monitor()
 
+            # Start DNS record search index
+            await self._start_dns_search_index()
+
+            # Start DNS reconciler for hosts whose DNS sync is pending or failed
+            await self._start_dns_reconciler()
+
             logger.info("All server components started successfully")
             logger.info(
                 f"TCP server listening on {self.config.server.host}:{self.config.server.tcp_port}"
@@ -88,7 +109,7 @@ class ServerApplication:
     async def _start_tcp_server(self) -> None:
         """Start TCP server for client connections."""
         try:
-            self.tcp_server = TCPServer(self.config.to_dict())
+            self.tcp_server = TCPServer(self.config.to_dict(), dns_client=self.dns_client)
             await self.tcp_server.start()
             logger.info(
                 f"TCP server started on {self.config.server.host}:{self.config.server.tcp_port}"
@@ -133,7 +154,22 @@ class ServerApplication:
     async def _start_heartbeat_monitor(self) -> None:
         """Start heartbeat monitor background task."""
         try:
-            self.heartbeat_monitor = create_heartbeat_monitor(self.config.to_dict())
+            heartbeat_buffer = None
+            host_index = None
+            run_blocking = None
+            if self.tcp_server and self.tcp_server.registration_service:
+                registration_service = self.tcp_server.registration_service
+                heartbeat_buffer = registration_service.heartbeat_buffer
+                host_index = registration_service.host_index
+                # Sweep chunks share the registration executor, off the event loop
+                run_blocking = registration_service.registration_processor.run_blocking
+
+            self.heartbeat_monitor = create_heartbeat_monitor(
+                self.config.to_dict(),
+                heartbeat_buffer=heartbeat_buffer,
+                host_index=host_index,
+                run_blocking=run_blocking,
+            )
 
             # Start background monitoring
             self.heartbeat_task = await self.heartbeat_monitor.start_background_monitoring()
@@ -143,6 +179,46 @@ class ServerApplication:
             logger.error(f"Failed to start heartbeat monitor: {e}")
             raise
 
+    async def _start_dns_search_index(self) -> None:
+        """Start the local DNS record search index (builds in the background)."""
+        config = self.config.to_dict()
+        if not self.config.powerdns.enabled or not DNSSearchIndexConfig(config).enabled:
+            return
+
+        try:
+            self.search_db_manager = DatabaseManager(config)
+            self.search_db_manager.initialize_schema()
+
+            self.dns_search_index = create_dns_search_index(
+                config, self.search_db_manager, self.dns_client
+            )
+            self.dns_search_index.start()
+            logger.info("DNS search index started")
+
+        except Exception as e:
+            logger.error(f"Failed to start DNS search index: {e}")
+            raise
+
+    async def _start_dns_reconciler(self) -> None:
+        """Start the background DNS reconciler."""
+        config = self.config.to_dict()
+        if not self.config.powerdns.enabled or not DNSReconcilerConfig(config).enabled:
+            return
+
+        try:
+            self.reconciler_db_manager = DatabaseManager(config)
+            self.reconciler_db_manager.initialize_schema()
+
+            self.dns_reconciler = create_dns_reconciler(
+                config, self.reconciler_db_manager, self.dns_client
+            )
+            self.dns_reconciler.start()
+            logger.info("DNS reconciler started")
+
+        except Exception as e:
+            logger.error(f"Failed to start DNS reconciler: {e}")
+            raise
+
     async def shutdown(self) -> None:
         """Gracefully shutdown all server components."""
         if self.shutdown_event.is_set():
@@ -169,6 +245,27 @@ class ServerApplication:
             # Give it a moment to stop gracefully
             await asyncio.sleep(1)
 
+        # Stop DNS reconciler
+        if self.dns_reconciler:
+            logger.info("Stopping DNS reconciler...")
+            await self.dns_reconciler.stop()
+        if self.reconciler_db_manager:
+            self.reconciler_db_manager.cleanup()
+
+        # Stop DNS search index
+        if self.dns_search_index:
+            logger.info("Stopping DNS search index...")
+            await self.dns_search_index.stop()
+        if self.search_db_manager:
+            self.search_db_manager.cleanup()
+
+        # Close the PowerDNS client once every component using it has stopped
+        if self.dns_client:
+            await self.dns_client.close()
+
+        # Close the PowerDNS connection pool shared by the TCP server and API
+        await close_shared_session()
+
         # Cleanup heartbeat monitor
         if self.heartbeat_monitor:
             self.heartbeat_monitor.cleanup()
@@ -4,6 +4,7 @@ Production Monitoring and Metrics Collection (SCRUM-38)
 Prometheus metrics for Prism DNS server monitoring.
 """
 
+import asyncio
 import logging
 import time
 from typing import Optional
@@ -152,12 +153,47 @@ powerdns_zone_operations_total = Counter(
     ["operation", "status"],  # 'create', 'check' / 'success', 'failed'
 )
 
+powerdns_cache_requests_total = Counter(
+    "prism_powerdns_cache_requests_total",
+    "PowerDNS zone cache lookups",
+    ["cache", "result"],  # 'zone_list', 'zone' / 'hit', 'miss', 'stale'
+)
+
+powerdns_cache_evictions_total = Counter(
+    "prism_powerdns_cache_evictions_total",
+    "PowerDNS zone cache entries dropped",
+    ["reason"],  # 'lru', 'invalidated'
+)
+
 dns_sync_status_gauge = Gauge(
     "prism_dns_sync_status",
     "DNS synchronization status by state",
     ["status"],  # 'pending', 'synced', 'failed'
 )
 
+dns_reconcile_backlog = Gauge(
+    "prism_dns_reconcile_backlog",
+    "Hosts whose DNS records are pending or failed sync",
+)
+
+dns_reconcile_lag_seconds = Gauge(
+    "prism_dns_reconcile_lag_seconds",
+    "How long the longest-waiting unsynced host has been in the backlog",
+)
+
+# Event loop metrics
+event_loop_lag_seconds = Histogram(
+    "prism_event_loop_lag_seconds",
+    "Delay between a scheduled event loop wakeup and when it actually ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+blocking_call_duration_seconds = Histogram(
+    "prism_blocking_call_duration_seconds",
+    "Duration of blocking calls offloaded from the event loop",
+    ["operation"],
+)
+
 
 class MetricsCollector:
     """Centralized metrics collection and management."""
@@ -250,6 +286,14 @@ class MetricsCollector:
         """Record PowerDNS zone operation."""
         powerdns_zone_operations_total.labels(operation=operation, status=status).inc()
 
+    def record_powerdns_cache_request(self, cache: str, result: str):
+        """Record a PowerDNS zone cache lookup."""
+        powerdns_cache_requests_total.labels(cache=cache, result=result).inc()
+
+    def record_powerdns_cache_eviction(self, reason: str, count: int = 1):
+        """Record PowerDNS zone cache entries being dropped."""
+        powerdns_cache_evictions_total.labels(reason=reason).inc(count)
+
     def record_dns_operation(self, operation: str, status: str, duration: float = 0):
         """Record DNS operation metrics."""
         dns_operations_total.labels(operation=operation, status=status).inc()
@@ -262,6 +306,19 @@ class MetricsCollector:
         dns_sync_status_gauge.labels(status="synced").set(synced)
         dns_sync_status_gauge.labels(status="failed").set(failed)
 
+    def update_dns_reconcile_backlog(self, backlog: int, lag: float):
+        """Update DNS reconciler backlog size and lag gauges."""
+        dns_reconcile_backlog.set(backlog)
+        dns_reconcile_lag_seconds.set(lag)
+
+    def record_event_loop_lag(self, lag: float):
+        """Record event loop scheduling lag."""
+        event_loop_lag_seconds.observe(lag)
+
+    def record_blocking_call(self, operation: str, duration: float):
+        """Record a blocking call executed off the event loop."""
+        blocking_call_duration_seconds.labels(operation=operation).observe(duration)
+
     def get_metrics(self) -> bytes:
         """Get all metrics in Prometheus format."""
         self.update_server_metrics()
@@ -280,6 +337,25 @@ def get_metrics_collector() -> MetricsCollector:
     return _metrics_collector
 
 
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """
+    Sample event loop lag until cancelled.
+
+    Sleeps for ``interval`` seconds and records how late the wakeup was;
+    sustained lag means something is blocking the loop thread.
+
+    Args:
+        interval: Sampling interval in seconds
+    """
+    loop = asyncio.get_running_loop()
+    metrics = get_metrics_collector()
+
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        metrics.record_event_loop_lag(max(0.0, loop.time() - scheduled))
+
+
 def reset_metrics_collector():
     """Reset the metrics collector (for testing)."""
     global _metrics_collector
@@ -4,14 +4,54 @@ Message Protocol Handling for Prism DNS Server (SCRUM-14)
 Handles length-prefixed JSON message framing and parsing.
 """
 
-import json
+import asyncio
+import functools
 import logging
 import struct
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from .json_codec import JSONCodec, get_json_codec
+
 logger = logging.getLogger(__name__)
 
+# 4-byte big-endian length prefix in front of every JSON payload
+_LENGTH_PREFIX = struct.Struct("!I")
+
+# Consumed bytes at the front of the decode buffer are only dropped once they
+# reach this size and make up at least half the buffer
+_BUFFER_COMPACT_THRESHOLD = 65536
+
+# Wire formats. "json" is the original encoding; "compact" is a fixed binary
+# layout for registrations whose first payload byte is the wire version (2).
+# A JSON payload always starts with "{", so the first byte tells the two apart
+# and both are served on the same port. Both decode to the same v1.0 message.
+# The compact format only saves framing bytes: like JSON it sends the full API
+# token on every registration, so it needs the same transport protection.
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_COMPACT = "compact"
+COMPACT_MARKER = 0x02
+COMPACT_REGISTRATION = 0x01
+COMPACT_RESPONSE = 0x02
+# marker, message type, timestamp in epoch milliseconds
+_COMPACT_HEADER = struct.Struct("!BBQ")
+# Registration header followed by the uint8 hostname length
+_COMPACT_REGISTRATION_HEADER = struct.Struct("!BBQB")
+# Registration body: uint8 hostname length + hostname, uint8 token length + token
+# Response body: uint8 status (0 success, 1 error), uint16 message length + message
+_COMPACT_RESPONSE_STATUS = struct.Struct("!BH")
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_epoch_second(seconds: int) -> str:
+    """Format a UTC epoch second as ISO 8601 without offset (heartbeats share seconds)."""
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+# Fraction and offset for each millisecond, matching datetime.isoformat() output
+_MILLIS_SUFFIXES = ["+00:00"] + [f".{millis:03d}000+00:00" for millis in range(1, 1000)]
+
 
 class ProtocolError(Exception):
     """Exception raised for protocol-related errors."""
@@ -19,6 +59,16 @@ class ProtocolError(Exception):
     pass
 
 
+class FrameSizeError(ProtocolError):
+    """Exception raised when a length prefix exceeds the message size limit.
+
+    The stream cannot be resynchronised after this, so the connection should
+    be closed.
+    """
+
+    pass
+
+
 class MessageProtocol:
     """
     Length-prefixed JSON message protocol handler.
@@ -27,17 +77,28 @@ class MessageProtocol:
     [4 bytes: message length (big-endian uint32)][JSON message data]
     """
 
-    def __init__(self, max_message_size: int = 65536, max_buffer_size: int = 1048576):
+    def __init__(
+        self,
+        max_message_size: int = 65536,
+        max_buffer_size: int = 1048576,
+        codec: Optional[JSONCodec] = None,
+    ):
         """
         Initialize message protocol handler.
 
         Args:
             max_message_size: Maximum size for individual messages (64KB default)
             max_buffer_size: Maximum size for internal buffer (1MB default)
+            codec: JSON codec (defaults to the shared auto-detected codec)
         """
         self.max_message_size = max_message_size
         self.max_buffer_size = max_buffer_size
+        self.codec = codec or get_json_codec()
+        # Wire format of the last decoded message; responses are sent in kind
+        self.wire_format = WIRE_FORMAT_JSON
         self._buffer = bytearray()
+        # Start of the first unconsumed byte in _buffer
+        self._offset = 0
 
         logger.debug(
             f"MessageProtocol initialized with max_message_size={max_message_size}, "
@@ -59,33 +120,30 @@ class MessageProtocol:
         """
         try:
             # Convert message to JSON
-            json_data = json.dumps(message, ensure_ascii=True, separators=(",", ":"))
-            json_bytes = json_data.encode("utf-8")
-
-            # Check message size
-            if len(json_bytes) > self.max_message_size:
-                raise ProtocolError(
-                    f"Message too large: {len(json_bytes)} > {self.max_message_size}"
-                )
-
-            # Create length prefix (4 bytes, big-endian)
-            length_prefix = struct.pack("!I", len(json_bytes))
-
-            # Combine prefix and data
-            encoded_message = length_prefix + json_bytes
-
-            logger.debug(f"Encoded message of {len(json_bytes)} bytes")
-            return encoded_message
-
-        except json.JSONEncoder as e:
+            json_bytes = self.codec.dumps(message)
+        except (TypeError, ValueError) as e:
             raise ProtocolError(f"JSON encoding failed: {e}")
         except Exception as e:
             raise ProtocolError(f"Message encoding failed: {e}")
 
+        # Check message size
+        if len(json_bytes) > self.max_message_size:
+            raise ProtocolError(f"Message too large: {len(json_bytes)} > {self.max_message_size}")
+
+        # Length prefix (4 bytes, big-endian) followed by the JSON data
+        encoded_message = _LENGTH_PREFIX.pack(len(json_bytes)) + json_bytes
+
+        logger.debug(f"Encoded message of {len(json_bytes)} bytes")
+        return encoded_message
+
     def decode_messages(self, data: bytes) -> List[Dict[str, Any]]:
         """
         Decode one or more messages from byte data.
 
+        A read offset is advanced past each complete frame and only the
+        payload is copied out; the buffer is compacted once the consumed
+        prefix is large, so pipelined frames cost linear time.
+
         Args:
             data: Raw byte data to decode
 
@@ -99,53 +157,185 @@ class MessageProtocol:
         self._buffer.extend(data)
 
         # Check buffer size limit
-        if len(self._buffer) > self.max_buffer_size:
-            raise ProtocolError(f"Buffer overflow: {len(self._buffer)} > {self.max_buffer_size}")
+        pending = len(self._buffer) - self._offset
+        if pending > self.max_buffer_size:
+            raise ProtocolError(f"Buffer overflow: {pending} > {self.max_buffer_size}")
 
         messages = []
+        buffer = self._buffer
+        offset = self._offset
+        buffer_end = len(buffer)
 
-        while len(self._buffer) >= 4:  # Need at least 4 bytes for length prefix
-            # Read length prefix
-            length = struct.unpack("!I", self._buffer[:4])[0]
+        try:
+            while buffer_end - offset >= 4:  # Need at least 4 bytes for length prefix
+                (length,) = _LENGTH_PREFIX.unpack_from(buffer, offset)
+
+                # Check message size limit
+                if length > self.max_message_size:
+                    raise FrameSizeError(f"Message too large: {length} > {self.max_message_size}")
+
+                # Check if we have complete message
+                frame_end = offset + 4 + length
+                if frame_end > buffer_end:
+                    break  # Wait for more data
+
+                payload = buffer[offset + 4 : frame_end]
+                # Consume the frame first so a malformed payload is skipped, not retried
+                offset = frame_end
+                messages.append(self._parse_payload(payload))
+        finally:
+            self._offset = offset
+            self._compact_buffer()
 
-            # Check message size limit
-            if length > self.max_message_size:
-                raise ProtocolError(f"Message too large: {length} > {self.max_message_size}")
+        return messages
 
-            # Check if we have complete message
-            total_length = 4 + length
-            if len(self._buffer) < total_length:
-                break  # Wait for more data
+    async def read_message(self, reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+        """
+        Read exactly one message from a stream.
 
-            # Extract message data
-            message_data = self._buffer[4:total_length]
+        Reads the length prefix and then exactly that many payload bytes, so
+        no framing buffer is needed.
 
-            try:
-                # Decode JSON
-                json_str = message_data.decode("utf-8")
-                message = json.loads(json_str)
-                messages.append(message)
+        Args:
+            reader: Stream to read from
 
-                logger.debug(
-                    f"Decoded message: {message.get('type', 'unknown')} from {message.get('hostname', 'unknown')}"
-                )
+        Returns:
+            Decoded message dictionary, or None if the stream ended between messages
 
-            except (UnicodeDecodeError, json.JSONDecodeError) as e:
-                raise ProtocolError(f"Message decoding failed: {e}")
+        Raises:
+            asyncio.IncompleteReadError: If the stream ended part way through a message
+            FrameSizeError: If the length prefix exceeds max_message_size
+            ProtocolError: If the payload is not valid JSON
+        """
+        try:
+            header = await reader.readexactly(4)
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise
 
-            # Remove processed message from buffer
-            self._buffer = self._buffer[total_length:]
+        (length,) = _LENGTH_PREFIX.unpack(header)
+        if length > self.max_message_size:
+            raise FrameSizeError(f"Message too large: {length} > {self.max_message_size}")
 
-        return messages
+        payload = await reader.readexactly(length)
+        return self._parse_payload(payload)
+
+    def _parse_payload(self, payload: bytes) -> Dict[str, Any]:
+        """Parse one JSON or compact binary payload."""
+        try:
+            if payload and payload[0] == COMPACT_MARKER:
+                message = self.decode_compact_registration(payload)
+                self.wire_format = WIRE_FORMAT_COMPACT
+            else:
+                message = self.codec.loads(payload)
+                self.wire_format = WIRE_FORMAT_JSON
+        except ValueError as e:
+            raise ProtocolError(f"Message decoding failed: {e}")
+
+        if logger.isEnabledFor(logging.DEBUG) and isinstance(message, dict):
+            logger.debug(
+                f"Decoded message: {message.get('type', 'unknown')} from {message.get('hostname', 'unknown')}"
+            )
+
+        return message
+
+    def decode_compact_registration(self, payload: bytes) -> Dict[str, Any]:
+        """
+        Decode a compact registration payload.
+
+        The result is the same v1.0 registration message a JSON client would
+        send, so validation and processing do not depend on the wire format.
+        That includes the full ``auth_token``: there is no session or token
+        reference, each frame carries the bearer token itself.
+
+        Args:
+            payload: Payload bytes without the length prefix
+
+        Returns:
+            Registration message dictionary
+
+        Raises:
+            ValueError: If the payload is truncated, has trailing bytes or is
+                not a registration
+        """
+        length = len(payload)
+        if length < _COMPACT_REGISTRATION_HEADER.size + 1:
+            raise ValueError("Compact message too short")
+
+        _, message_type, timestamp_ms, hostname_length = _COMPACT_REGISTRATION_HEADER.unpack_from(
+            payload
+        )
+        if message_type != COMPACT_REGISTRATION:
+            raise ValueError(f"Unsupported compact message type: {message_type}")
+
+        hostname_end = _COMPACT_REGISTRATION_HEADER.size + hostname_length
+        if hostname_end >= length:
+            raise ValueError("Compact message truncated")
+        token_start = hostname_end + 1
+        if token_start + payload[hostname_end] != length:
+            raise ValueError("Compact message length mismatch")
+
+        seconds, millis = divmod(timestamp_ms, 1000)
+        try:
+            timestamp = _format_epoch_second(seconds) + _MILLIS_SUFFIXES[millis]
+        except (OverflowError, OSError) as e:
+            raise ValueError(f"Invalid compact timestamp: {e}")
+
+        message = {
+            "version": "1.0",
+            "type": "registration",
+            "timestamp": timestamp,
+            "hostname": payload[_COMPACT_REGISTRATION_HEADER.size : hostname_end].decode("ascii"),
+        }
+        if token_start < length:
+            message["auth_token"] = payload[token_start:].decode("ascii")
+        return message
+
+    def encode_response(self, status: str, message: str) -> bytes:
+        """
+        Encode a registration response in the wire format the client last used.
+
+        Args:
+            status: Response status ('success' or 'error')
+            message: Response message text
+
+        Returns:
+            Encoded response with length prefix
+
+        Raises:
+            ProtocolError: If the response cannot be encoded
+        """
+        if self.wire_format != WIRE_FORMAT_COMPACT:
+            return self.encode_message(self.create_registration_response(status, message))
+
+        text = message.encode("utf-8")[:65535]
+        payload = (
+            _COMPACT_HEADER.pack(COMPACT_MARKER, COMPACT_RESPONSE, int(time.time() * 1000))
+            + _COMPACT_RESPONSE_STATUS.pack(0 if status == "success" else 1, len(text))
+            + text
+        )
+        return _LENGTH_PREFIX.pack(len(payload)) + payload
+
+    def _compact_buffer(self) -> None:
+        """Drop consumed bytes from the front of the buffer when worthwhile."""
+        if self._offset == len(self._buffer):
+            self._buffer.clear()
+            self._offset = 0
+        elif self._offset >= _BUFFER_COMPACT_THRESHOLD and self._offset * 2 >= len(self._buffer):
+            del self._buffer[: self._offset]
+            self._offset = 0
 
     def reset_buffer(self) -> None:
         """Reset internal buffer (useful for connection cleanup)."""
         self._buffer.clear()
+        self._offset = 0
+        self.wire_format = WIRE_FORMAT_JSON
         logger.debug("Protocol buffer reset")
 
     def get_buffer_size(self) -> int:
-        """Get current buffer size in bytes."""
-        return len(self._buffer)
+        """Get number of buffered bytes not yet decoded."""
+        return len(self._buffer) - self._offset
 
     def create_registration_response(self, status: str, message: str) -> Dict[str, Any]:
         """
@@ -219,11 +409,12 @@ class MessageProtocol:
         Returns:
             Dictionary with protocol statistics
         """
+        buffer_size = self.get_buffer_size()
         return {
-            "buffer_size": len(self._buffer),
+            "buffer_size": buffer_size,
             "max_message_size": self.max_message_size,
             "max_buffer_size": self.max_buffer_size,
-            "buffer_utilization": len(self._buffer) / self.max_buffer_size,
+            "buffer_utilization": buffer_size / self.max_buffer_size,
         }
 
 
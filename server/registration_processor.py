@@ -5,16 +5,22 @@ Advanced host registration processing with IP change detection and logging.
 """
 
 import asyncio
-import json
+import functools
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from .database.connection import DatabaseManager
 from .database.operations import HostOperations
+from .heartbeat_buffer import HeartbeatBuffer
+from .host_index import HostIndex
+from .json_codec import get_json_codec
 from .message_validator import MessageValidator
+from .monitoring import get_metrics_collector
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +47,7 @@ class RegistrationResult:
     previous_status: Optional[str] = None
     processing_time_ms: Optional[float] = None
     auth_status: Optional[str] = None  # authenticated, anonymous, invalid_token
+    host_id: Optional[int] = None  # Primary key of the registered host, for follow-up updates
 
     def __post_init__(self):
         if self.timestamp is None:
@@ -52,7 +59,7 @@ class RegistrationResult:
 
     def to_json(self) -> str:
         """Convert result to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
+        return get_json_codec().dumps(self.to_dict(), default=str).decode("utf-8")
 
 
 class RegistrationConfig:
@@ -68,7 +75,9 @@ class RegistrationConfig:
         self.duplicate_registration_window = reg_config.get("duplicate_registration_window", 5)
         self.enable_rate_limiting = reg_config.get("enable_rate_limiting", True)
         self.enable_validation = reg_config.get("enable_validation", True)
-        
+        # Threads for blocking DB/bcrypt work; 0 runs it inline on the event loop
+        self.executor_workers = reg_config.get("executor_workers", 8)
+
         # Validation
         if self.max_registrations_per_minute <= 0:
             raise RegistrationConfigError("max_registrations_per_minute must be positive")
@@ -76,6 +85,9 @@ class RegistrationConfig:
         if self.duplicate_registration_window < 0:
             raise RegistrationConfigError("duplicate_registration_window must be non-negative")
 
+        if self.executor_workers < 0:
+            raise RegistrationConfigError("executor_workers must be non-negative")
+
         logger.info(
             f"Registration processor configured: ip_tracking={self.enable_ip_tracking}, "
             f"rate_limit={self.max_registrations_per_minute}/min"
@@ -94,19 +106,36 @@ class RegistrationProcessor:
     - Validation and error handling
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        db_manager: Optional[DatabaseManager] = None,
+        heartbeat_buffer: Optional[HeartbeatBuffer] = None,
+        host_index: Optional[HostIndex] = None,
+    ):
         """
         Initialize registration processor.
 
         Args:
             config: Configuration dictionary
+            db_manager: Shared database manager (optional). When provided the
+                processor reuses its engine and leaves cleanup to the owner.
+            heartbeat_buffer: Write-behind buffer for plain heartbeats (optional).
+                Without it every heartbeat is written immediately.
+            host_index: In-memory host state (optional). Without it every
+                registration reads the host row from the database.
         """
         self.config = RegistrationConfig(config)
 
         # Initialize database connection
-        self.db_manager = DatabaseManager(config)
-        self.db_manager.initialize_schema()
+        self._owns_db_manager = db_manager is None
+        if db_manager is None:
+            db_manager = DatabaseManager(config)
+            db_manager.initialize_schema()
+        self.db_manager = db_manager
         self.host_ops = HostOperations(self.db_manager)
+        self.heartbeat_buffer = heartbeat_buffer
+        self.host_index = host_index
 
         # Initialize validator
         self.validator = MessageValidator()
@@ -135,9 +164,53 @@ class RegistrationProcessor:
         # Token caching
         self._token_cache = {}  # Simple cache for token lookups
         self._cache_ttl = 300  # 5 minutes
+        self._token_lookups_in_flight: Dict[str, asyncio.Future] = {}
+
+        # Unknown tokens are remembered briefly so repeats skip the database
+        self._invalid_token_cache: Dict[str, float] = {}  # cache key -> expiry
+        self._invalid_token_ttl = 60
+        self._invalid_token_cache_size = 10000
+
+        # Legacy tokens (no lookup hash) need a bcrypt scan; run one at a
+        # time and stop once none are left
+        self._legacy_scan_lock = threading.Lock()
+        self._legacy_tokens_remaining = True
+
+        # Bounded executor keeps SQLite sessions and bcrypt off the event loop
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.config.executor_workers > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.executor_workers,
+                thread_name_prefix="registration",
+            )
 
         logger.info("RegistrationProcessor initialized")
 
+    async def run_blocking(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call on the registration executor.
+
+        Args:
+            operation: Operation name used for metrics
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        start_time = time.time()
+        try:
+            if self._executor is None:
+                return func(*args, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+        finally:
+            get_metrics_collector().record_blocking_call(operation, time.time() - start_time)
+
     async def process_registration(
         self, hostname: str, client_ip: str, message_timestamp: str, user_id: str = None, auth_token: str = None
     ) -> RegistrationResult:
@@ -383,7 +456,12 @@ class RegistrationProcessor:
         self._recent_registrations[registration_key] = time.time()
 
     async def _process_host_registration(
-        self, hostname: str, client_ip: str, message_timestamp: str, user_id: str
+        self,
+        hostname: str,
+        client_ip: str,
+        message_timestamp: str,
+        user_id: str,
+        use_index: bool = True,
     ) -> RegistrationResult:
         """
         Process host registration based on current host state.
@@ -393,21 +471,45 @@ class RegistrationProcessor:
             client_ip: Client IP address
             message_timestamp: Registration timestamp
             user_id: User ID who owns this host
+            use_index: Whether the host may be taken from the host index
 
         Returns:
             RegistrationResult with operation details
         """
         # Check if host exists for this user (user-scoped hostname namespace)
-        existing_host = self.host_ops.get_host_by_hostname(hostname, user_id)
+        existing_host = None
+        if self.host_index is not None and use_index:
+            existing_host = self.host_index.get(user_id, hostname)
+
+        if existing_host is None:
+            existing_host = await self.run_blocking(
+                "get_host", self.host_ops.get_host_by_hostname, hostname, user_id
+            )
+            if existing_host is not None and self.host_index is not None:
+                existing_host = self.host_index.put(existing_host)
 
         if existing_host is None:
             # New host registration
             return await self._process_new_host_registration(hostname, client_ip, user_id)
         else:
             # Existing host - check what type of update this is
-            return await self._process_existing_host_registration(
+            result = await self._process_existing_host_registration(
                 existing_host, hostname, client_ip, message_timestamp, user_id
             )
+            if result is None:
+                if use_index:
+                    # The indexed row is gone: look the host up again, creating it if missing
+                    return await self._process_host_registration(
+                        hostname, client_ip, message_timestamp, user_id, use_index=False
+                    )
+                result = RegistrationResult(
+                    success=False,
+                    result_type="database_error",
+                    message="Failed to update host record in database",
+                    hostname=hostname,
+                    ip_address=client_ip,
+                )
+            return result
 
     async def _process_new_host_registration(
         self, hostname: str, client_ip: str, user_id: str
@@ -425,10 +527,14 @@ class RegistrationProcessor:
         """
         try:
             # Create new host record
-            new_host = self.host_ops.create_host(hostname, client_ip, user_id)
+            new_host = await self.run_blocking(
+                "create_host", self.host_ops.create_host, hostname, client_ip, user_id
+            )
 
             if new_host:
                 self._stats["new_registrations"] += 1
+                if self.host_index is not None:
+                    self.host_index.put(new_host)
 
                 logger.info(f"New host registered: {hostname} ({client_ip})")
 
@@ -438,6 +544,7 @@ class RegistrationProcessor:
                     message=f"New host registered with IP {client_ip}",
                     hostname=hostname,
                     ip_address=client_ip,
+                    host_id=new_host.id,
                 )
             else:
                 return RegistrationResult(
@@ -460,7 +567,7 @@ class RegistrationProcessor:
 
     async def _process_existing_host_registration(
         self, existing_host, hostname: str, client_ip: str, message_timestamp: str, user_id: str
-    ) -> RegistrationResult:
+    ) -> Optional[RegistrationResult]:
         """
         Process registration for existing host.
 
@@ -472,7 +579,8 @@ class RegistrationProcessor:
             user_id: User ID making the registration
 
         Returns:
-            RegistrationResult with operation details
+            RegistrationResult with operation details, or None if the update
+            matched no row (the host was deleted behind the host index)
         """
         # Verify the user owns this host
         if existing_host.created_by != user_id:
@@ -486,17 +594,24 @@ class RegistrationProcessor:
         try:
             previous_ip = existing_host.current_ip
             previous_status = existing_host.status
+            seen_at = datetime.now(timezone.utc)
 
             # Check if this is a reconnection (host was offline)
             if existing_host.status == "offline":
                 # Host reconnection
                 if existing_host.current_ip != client_ip:
                     # IP changed during offline period
-                    success = self.host_ops.update_host_ip(hostname, client_ip)
+                    success = await self.run_blocking(
+                        "set_host_online",
+                        self.host_ops.set_host_online,
+                        existing_host.id,
+                        client_ip,
+                        seen_at,
+                    )
                     if success:
-                        self.host_ops.update_host_last_seen(hostname)
                         self._stats["reconnections"] += 1
                         self._stats["ip_changes"] += 1
+                        self._update_host_index(user_id, hostname, client_ip, seen_at)
 
                         logger.info(
                             f"Host reconnected with IP change: {hostname} "
@@ -511,13 +626,20 @@ class RegistrationProcessor:
                             ip_address=client_ip,
                             previous_ip=previous_ip,
                             previous_status=previous_status,
+                            host_id=existing_host.id,
                         )
                 else:
                     # Same IP, just reconnection
-                    success = self.host_ops.update_host_last_seen(hostname)
+                    success = await self.run_blocking(
+                        "set_host_online",
+                        self.host_ops.set_host_online,
+                        existing_host.id,
+                        None,
+                        seen_at,
+                    )
                     if success:
-                        # Mark host as online (implicit in update_host_last_seen)
                         self._stats["reconnections"] += 1
+                        self._update_host_index(user_id, hostname, client_ip, seen_at)
 
                         logger.info(f"Host reconnected: {hostname} ({client_ip})")
 
@@ -528,14 +650,21 @@ class RegistrationProcessor:
                             hostname=hostname,
                             ip_address=client_ip,
                             previous_status=previous_status,
+                            host_id=existing_host.id,
                         )
 
             elif existing_host.current_ip != client_ip:
                 # IP address changed
-                success = self.host_ops.update_host_ip(hostname, client_ip)
+                success = await self.run_blocking(
+                    "set_host_online",
+                    self.host_ops.set_host_online,
+                    existing_host.id,
+                    client_ip,
+                    seen_at,
+                )
                 if success:
-                    self.host_ops.update_host_last_seen(hostname)
                     self._stats["ip_changes"] += 1
+                    self._update_host_index(user_id, hostname, client_ip, seen_at)
 
                     logger.info(f"IP address changed: {hostname} {previous_ip} -> {client_ip}")
 
@@ -546,12 +675,25 @@ class RegistrationProcessor:
                         hostname=hostname,
                         ip_address=client_ip,
                         previous_ip=previous_ip,
+                        host_id=existing_host.id,
                     )
             else:
                 # Same IP, heartbeat update
-                success = self.host_ops.update_host_last_seen(hostname)
+                if self.heartbeat_buffer is not None:
+                    # Online with unchanged IP: only last_seen moves, write it behind
+                    self.heartbeat_buffer.record(existing_host.id, seen_at)
+                    success = True
+                else:
+                    success = await self.run_blocking(
+                        "set_host_online",
+                        self.host_ops.set_host_online,
+                        existing_host.id,
+                        None,
+                        seen_at,
+                    )
                 if success:
                     self._stats["heartbeat_updates"] += 1
+                    self._update_host_index(user_id, hostname, client_ip, seen_at)
 
                     logger.debug(f"Heartbeat updated: {hostname} ({client_ip})")
 
@@ -561,16 +703,13 @@ class RegistrationProcessor:
                         message="Heartbeat updated",
                         hostname=hostname,
                         ip_address=client_ip,
+                        host_id=existing_host.id,
                     )
 
-            # If we get here, database operation failed
-            return RegistrationResult(
-                success=False,
-                result_type="database_error",
-                message="Failed to update host record in database",
-                hostname=hostname,
-                ip_address=client_ip,
-            )
+            # If we get here, the update matched no row: evict the stale entry
+            if self.host_index is not None:
+                self.host_index.remove_ids([existing_host.id])
+            return None
 
         except Exception as e:
             logger.error(f"Error updating existing host {hostname}: {e}")
@@ -582,6 +721,13 @@ class RegistrationProcessor:
                 ip_address=client_ip,
             )
 
+    def _update_host_index(
+        self, user_id: str, hostname: str, client_ip: str, seen_at: datetime
+    ) -> None:
+        """Mirror a successful host update into the host index."""
+        if self.host_index is not None:
+            self.host_index.mark_online(user_id, hostname, client_ip, seen_at)
+
     async def _cleanup_rate_tracker(self) -> None:
         """Clean up old rate tracking entries."""
         current_time = time.time()
@@ -626,56 +772,182 @@ class RegistrationProcessor:
             Dictionary with validation result
         """
         import hashlib
-        from datetime import datetime, timezone
-        from server.auth.models import APIToken
-        
+
         # Check cache first
         cache_key = hashlib.sha256(token.encode()).hexdigest()
         if cache_key in self._token_cache:
             cached = self._token_cache[cache_key]
             if time.time() - cached['timestamp'] < self._cache_ttl:
                 return cached['result']
-        
-        # Database lookup
+
+        invalid_until = self._invalid_token_cache.get(cache_key)
+        if invalid_until is not None:
+            if time.time() < invalid_until:
+                return {'valid': False, 'reason': 'token_not_found'}
+            del self._invalid_token_cache[cache_key]
+
+        # Concurrent cache misses for the same token share one lookup
+        in_flight = self._token_lookups_in_flight.get(cache_key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._token_lookups_in_flight[cache_key] = future
+        try:
+            result = await self.run_blocking("token_lookup", self._lookup_token, token, client_ip)
+
+            # Cache successful validations, and unknown tokens for a short time
+            if result['valid']:
+                self._token_cache[cache_key] = {
+                    'result': result,
+                    'timestamp': time.time()
+                }
+            elif result['reason'] == 'token_not_found':
+                if len(self._invalid_token_cache) >= self._invalid_token_cache_size:
+                    self._invalid_token_cache.clear()
+                self._invalid_token_cache[cache_key] = time.time() + self._invalid_token_ttl
+
+            future.set_result(result)
+            return result
+
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+
+        finally:
+            del self._token_lookups_in_flight[cache_key]
+
+    def _lookup_token(self, token: str, client_ip: str) -> Dict[str, Any]:
+        """
+        Look up and verify an API token in the database.
+
+        Tokens are located through the indexed ``lookup_hash`` column, so a
+        validation costs one query and one bcrypt verification. Legacy tokens
+        issued before the column existed have no lookup hash; see
+        _find_legacy_token.
+
+        Args:
+            token: Plain API token
+            client_ip: Client IP address for tracking
+
+        Returns:
+            Dictionary with validation result
+        """
+        from server.auth.models import APIToken
+
         with self.db_manager.get_session() as db:
             try:
-                # Find all active tokens (we need to check each one since we store hashes)
-                tokens = db.query(APIToken).filter(APIToken.is_active == True).all()
-                
-                for api_token in tokens:
-                    if api_token.verify_token(token):
-                        # Check if token is valid
-                        if not api_token.is_valid():
-                            return {
-                                'valid': False,
-                                'reason': 'token_expired' if api_token.expires_at else 'token_inactive'
-                            }
-                        
-                        # Update token usage
-                        api_token.last_used_at = datetime.now(timezone.utc)
-                        api_token.last_used_ip = client_ip
-                        db.commit()
-                        
-                        # Cache the result
-                        result = {
-                            'valid': True,
-                            'user_id': str(api_token.user_id),
-                            'token_id': str(api_token.id)
-                        }
-                        self._token_cache[cache_key] = {
-                            'result': result,
-                            'timestamp': time.time()
-                        }
-                        
-                        return result
-                
-                # Token not found
-                return {'valid': False, 'reason': 'token_not_found'}
-                
+                lookup_hash = APIToken.compute_lookup_hash(token)
+                api_token = (
+                    db.query(APIToken).filter(APIToken.lookup_hash == lookup_hash).first()
+                )
+                if api_token is not None and not api_token.verify_token(token):
+                    api_token = None
+
+                if api_token is None and self._legacy_tokens_remaining:
+                    api_token = self._find_legacy_token(db, token, lookup_hash)
+
+                if api_token is None:
+                    return {'valid': False, 'reason': 'token_not_found'}
+
+                # Check if token is valid
+                if not api_token.is_valid():
+                    return {
+                        'valid': False,
+                        'reason': 'token_expired' if api_token.expires_at else 'token_inactive'
+                    }
+
+                # Update token usage
+                api_token.last_used_at = datetime.now(timezone.utc)
+                api_token.last_used_ip = client_ip
+                db.commit()
+
+                return {
+                    'valid': True,
+                    'user_id': str(api_token.user_id),
+                    'token_id': str(api_token.id)
+                }
+
             except Exception as e:
                 logger.error(f"Token validation error: {e}")
                 return {'valid': False, 'reason': 'validation_error'}
 
+    def _find_legacy_token(self, db, token: str, lookup_hash: str):
+        """
+        Find a token without a lookup hash by verifying it against each one.
+
+        A match is backfilled with its lookup hash, so each legacy token is
+        scanned for once. The scan costs one bcrypt check per legacy token;
+        scans run one at a time on the registration executor, so concurrent
+        clients wait their turn instead of being rejected. Unknown tokens are
+        remembered by _validate_token and not scanned for again while cached,
+        and once no legacy tokens are left the scan is never run again.
+
+        Args:
+            db: Database session
+            token: Plain API token
+            lookup_hash: Lookup hash of the token
+
+        Returns:
+            Matching APIToken, or None if there is none
+        """
+        from server.auth.models import APIToken
+
+        with self._legacy_scan_lock:
+            legacy_tokens = (
+                db.query(APIToken)
+                .filter(APIToken.is_active == True, APIToken.lookup_hash.is_(None))
+                .all()
+            )
+            if not legacy_tokens:
+                self._legacy_tokens_remaining = False
+                return None
+
+            for legacy_token in legacy_tokens:
+                if legacy_token.verify_token(token):
+                    legacy_token.lookup_hash = lookup_hash
+                    # Commit now so the next scan no longer sees this token
+                    db.commit()
+                    logger.info(f"Backfilled lookup hash for API token {legacy_token.id}")
+                    return legacy_token
+            return None
+
+    def backfill_lookup_hashes(self, tokens: List[str]) -> int:
+        """
+        Backfill lookup hashes for known plain tokens ahead of their first use.
+
+        Lookup hashes cannot be derived from the stored bcrypt hashes, so
+        operators who hold their clients' tokens can run this offline (see
+        scripts/backfill_token_lookup_hashes.py) to spare those clients the
+        legacy scan after an upgrade.
+
+        Args:
+            tokens: Plain API tokens
+
+        Returns:
+            Number of legacy tokens backfilled
+        """
+        from server.auth.models import APIToken
+
+        backfilled = 0
+        with self.db_manager.get_session() as db:
+            for token in tokens:
+                if not self._legacy_tokens_remaining:
+                    break
+                lookup_hash = APIToken.compute_lookup_hash(token)
+                if db.query(APIToken.id).filter(APIToken.lookup_hash == lookup_hash).first():
+                    continue
+                if self._find_legacy_token(db, token, lookup_hash) is not None:
+                    backfilled += 1
+
+        logger.info(f"Backfilled lookup hashes for {backfilled} API tokens")
+        return backfilled
 
     def reset_statistics(self) -> None:
         """Reset all statistics counters."""
@@ -686,7 +958,11 @@ class RegistrationProcessor:
 
     def cleanup(self) -> None:
         """Clean up resources."""
-        if self.db_manager:
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self.db_manager and self._owns_db_manager:
             self.db_manager.cleanup()
 
         logger.info("RegistrationProcessor cleanup completed")
@@ -700,14 +976,27 @@ class RegistrationProcessor:
         self.cleanup()
 
 
-def create_registration_processor(config: Dict[str, Any]) -> RegistrationProcessor:
+def create_registration_processor(
+    config: Dict[str, Any],
+    db_manager: Optional[DatabaseManager] = None,
+    heartbeat_buffer: Optional[HeartbeatBuffer] = None,
+    host_index: Optional[HostIndex] = None,
+) -> RegistrationProcessor:
     """
     Create a registration processor instance.
 
     Args:
         config: Configuration dictionary
+        db_manager: Shared database manager (optional)
+        heartbeat_buffer: Write-behind heartbeat buffer (optional)
+        host_index: In-memory host state index (optional)
 
     Returns:
         Configured RegistrationProcessor instance
     """
-    return RegistrationProcessor(config)
+    return RegistrationProcessor(
+        config,
+        db_manager=db_manager,
+        heartbeat_buffer=heartbeat_buffer,
+        host_index=host_index,
+    )
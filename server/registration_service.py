@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Registration Service for Prism DNS Server
+Server-scoped registration pipeline shared by all TCP connections.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from .database.connection import DatabaseManager
+from .database.operations import HostOperations
+from .dns_manager import PowerDNSClient, create_dns_client
+from .dns_update_queue import DNSUpdateQueue, create_dns_update_queue
+from .heartbeat_buffer import HeartbeatBuffer, create_heartbeat_buffer
+from .host_index import HostIndex, create_host_index
+from .registration_processor import RegistrationProcessor, create_registration_processor
+
+logger = logging.getLogger(__name__)
+
+
+class RegistrationService:
+    """
+    Shared registration pipeline for the TCP server.
+
+    Owns the components that used to be built per connection: one
+    registration processor (and therefore one token cache, rate limiter and
+    duplicate tracker), one database engine, and one PowerDNS client, plus
+    the host index, heartbeat write-behind buffer and batched DNS update
+    queue. The TCP server creates
+    a single instance, starts it with the server and closes it on shutdown.
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        db_manager: DatabaseManager,
+        dns_client: Optional[PowerDNSClient] = None,
+    ):
+        """
+        Initialize registration service.
+
+        Args:
+            config: Full server configuration dictionary
+            db_manager: Shared database manager owned by the TCP server
+            dns_client: PowerDNS client owned by the caller; one is created
+                (and closed with the service) when omitted
+        """
+        self.config = config
+        self.db_manager = db_manager
+        self.host_ops = HostOperations(db_manager)
+
+        # Auth tables live alongside hosts; make sure they exist once, not per connection
+        self.db_manager.initialize_schema()
+
+        self.host_index: Optional[HostIndex] = None
+        if config.get("registration", {}).get("host_index_enabled", True):
+            self.host_index = create_host_index(db_manager)
+
+        self.heartbeat_buffer: HeartbeatBuffer = create_heartbeat_buffer(
+            config, db_manager, host_index=self.host_index
+        )
+
+        self.registration_processor: RegistrationProcessor = create_registration_processor(
+            config,
+            db_manager=db_manager,
+            heartbeat_buffer=self.heartbeat_buffer,
+            host_index=self.host_index,
+        )
+
+        self.dns_client: Optional[PowerDNSClient] = dns_client
+        self._owns_dns_client = False
+        if self.dns_client is None and config.get("powerdns", {}).get("enabled", False):
+            self.dns_client = create_dns_client(config)
+            self._owns_dns_client = True
+
+        self.dns_update_queue: Optional[DNSUpdateQueue] = None
+        if self.dns_client and config.get("registration", {}).get("dns_batch_enabled", True):
+            self.dns_update_queue = create_dns_update_queue(config, self.dns_client, db_manager)
+
+        logger.info(
+            f"RegistrationService initialized: dns_enabled={self.dns_client is not None}, "
+            f"dns_batched={self.dns_update_queue is not None}, "
+            f"host_index={len(self.host_index) if self.host_index is not None else 'disabled'}"
+        )
+
+    async def start(self) -> None:
+        """Start background tasks (heartbeat and DNS update flushing)."""
+        self.heartbeat_buffer.start()
+        if self.dns_update_queue:
+            self.dns_update_queue.start()
+
+    async def close(self) -> None:
+        """Release shared resources (the database manager is owned by the caller)."""
+        try:
+            # Write buffered heartbeats before the database goes away
+            await self.heartbeat_buffer.stop()
+
+            # Send queued DNS updates while the client session is still open
+            if self.dns_update_queue:
+                await self.dns_update_queue.stop()
+
+            if self.dns_client and self._owns_dns_client:
+                await self.dns_client.close()
+
+            self.registration_processor.cleanup()
+
+            logger.info("RegistrationService closed")
+
+        except Exception as e:
+            logger.error(f"Error closing registration service: {e}")
+
+
+def create_registration_service(
+    config: Dict[str, Any],
+    db_manager: DatabaseManager,
+    dns_client: Optional[PowerDNSClient] = None,
+) -> RegistrationService:
+    """
+    Create a registration service instance.
+
+    Args:
+        config: Full server configuration dictionary
+        db_manager: Shared database manager
+        dns_client: Optional PowerDNS client shared with other components
+
+    Returns:
+        Configured RegistrationService instance
+    """
+    return RegistrationService(config, db_manager, dns_client)
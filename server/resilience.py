@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Resilience Helpers for Prism DNS Server
+Retry with jittered exponential backoff and circuit breaking for outbound calls.
+"""
+
+import asyncio
+import logging
+import random
+from datetime import datetime
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ExceptionTypes = Union[Type[BaseException], Tuple[Type[BaseException], ...]]
+
+
+class RetryConfig:
+    """Configuration for retry behavior."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        initial_delay: float = 1.0,
+        max_delay: float = 60.0,
+        exponential_base: float = 2.0,
+        jitter: bool = True,
+    ):
+        """
+        Initialize retry configuration.
+
+        Args:
+            max_attempts: Maximum number of attempts
+            initial_delay: Initial delay between retries in seconds
+            max_delay: Maximum delay between retries in seconds
+            exponential_base: Base for exponential backoff
+            jitter: Whether to add randomness to delays
+        """
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.exponential_base = exponential_base
+        self.jitter = jitter
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the delay before retrying after a failed attempt.
+
+        With jitter the delay is scaled by a random factor between 0.5 and
+        1.5, so clients that failed together do not retry together.
+
+        Args:
+            attempt: Zero-based number of the attempt that failed
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.initial_delay * (self.exponential_base**attempt), self.max_delay)
+        if self.jitter:
+            delay *= 0.5 + random.random()
+        return delay
+
+
+def with_retry(retry_config: RetryConfig, retry_on: ExceptionTypes = Exception):
+    """
+    Decorator for adding retry logic to async functions.
+
+    Args:
+        retry_config: Configuration for retry behavior
+        retry_on: Exception type(s) that are retried; others are raised at once
+
+    Returns:
+        Decorated function with retry logic
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            last_exception = None
+
+            for attempt in range(retry_config.max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except retry_on as e:
+                    last_exception = e
+
+                    if attempt == retry_config.max_attempts - 1:
+                        raise
+
+                    delay = retry_config.get_delay(attempt)
+                    logger.warning(
+                        f"Attempt {attempt + 1} failed: {e}. " f"Retrying in {delay:.2f} seconds..."
+                    )
+
+                    await asyncio.sleep(delay)
+
+            raise last_exception
+
+        return wrapper
+
+    return decorator
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"  # Normal operation
+    OPEN = "open"  # Failing, reject requests
+    HALF_OPEN = "half_open"  # Testing if recovered
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker to prevent cascading failures.
+
+    The circuit breaker has three states:
+    - CLOSED: Normal operation, requests pass through
+    - OPEN: Too many failures, requests are rejected
+    - HALF_OPEN: Testing if the service has recovered
+
+    Wrap calls with call(), or use before_call(), record_success() and
+    record_failure() around calls whose outcome needs classifying first.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 60,
+        expected_exception: ExceptionTypes = Exception,
+        name: Optional[str] = None,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Number of failures before opening circuit
+            recovery_timeout: Seconds to wait before attempting recovery
+            expected_exception: Exception type(s) that trigger the circuit
+            name: Name used in log messages and errors
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.expected_exception = expected_exception
+        self.name = name
+        self.failure_count = 0
+        self.last_failure_time = None
+        self.state = CircuitState.CLOSED
+
+    def _now(self) -> datetime:
+        """Get the current time."""
+        return datetime.now()
+
+    def _label(self) -> str:
+        """Describe the breaker for log messages."""
+        return f"Circuit breaker {self.name}" if self.name else "Circuit breaker"
+
+    async def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call function through circuit breaker.
+
+        Args:
+            func: Async function to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If circuit is open
+            Exception: If func raises
+        """
+        self.before_call()
+
+        try:
+            result = await func(*args, **kwargs)
+            self._on_success()
+            return result
+        except self.expected_exception:
+            self._on_failure()
+            raise
+
+    def before_call(self) -> None:
+        """
+        Check that a call may be made, moving to HALF_OPEN once recovery is due.
+
+        Raises:
+            CircuitOpenError: If circuit is open
+        """
+        if self.state == CircuitState.OPEN:
+            if self._should_attempt_reset():
+                self.state = CircuitState.HALF_OPEN
+                logger.info(f"{self._label()} transitioning to HALF_OPEN")
+            else:
+                raise CircuitOpenError(
+                    f"Circuit breaker is OPEN{f' for {self.name}' if self.name else ''}"
+                )
+
+    def record_success(self) -> None:
+        """Record a successful call made outside call()."""
+        self._on_success()
+
+    def record_failure(self) -> None:
+        """Record a failed call made outside call()."""
+        self._on_failure()
+
+    def _should_attempt_reset(self) -> bool:
+        """
+        Check if we should attempt to reset the circuit.
+
+        Returns:
+            bool: True if we should transition to half-open
+        """
+        if self.last_failure_time is None:
+            return False
+
+        time_since_failure = self._now() - self.last_failure_time
+        return time_since_failure.total_seconds() >= self.recovery_timeout
+
+    def _on_success(self) -> None:
+        """Handle successful call."""
+        if self.state == CircuitState.HALF_OPEN:
+            logger.info(f"{self._label()} closing after successful call")
+            self.state = CircuitState.CLOSED
+
+        self.failure_count = 0
+        self.last_failure_time = None
+
+    def _on_failure(self) -> None:
+        """Handle failed call."""
+        self.failure_count += 1
+        self.last_failure_time = self._now()
+
+        if self.failure_count >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                logger.warning(f"{self._label()} opening after {self.failure_count} failures")
+                self.state = CircuitState.OPEN
+        elif self.state == CircuitState.HALF_OPEN:
+            logger.warning(f"{self._label()} reopening after failure in HALF_OPEN state")
+            self.state = CircuitState.OPEN
+
+    def is_closed(self) -> bool:
+        """Check if circuit is closed (normal operation)."""
+        return self.state == CircuitState.CLOSED
+
+    def is_open(self) -> bool:
+        """Check if circuit is open (rejecting requests)."""
+        return self.state == CircuitState.OPEN
+
+    def reset(self) -> None:
+        """Manually reset the circuit breaker."""
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+        self.last_failure_time = None
+        logger.info(f"{self._label()} manually reset")
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<CircuitBreaker state={self.state.value} "
+            f"failures={self.failure_count}/{self.failure_threshold}>"
+        )
@@ -4,7 +4,6 @@ Server Statistics and Monitoring for Prism DNS Server (SCRUM-14)
 Tracks connection, message, and performance statistics.
 """
 
-import json
 import logging
 import threading
 import time
@@ -12,6 +11,8 @@ from collections import defaultdict, deque
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from .json_codec import get_json_codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -307,7 +308,7 @@ class ServerStats:
             JSON representation of statistics
         """
         stats = self.get_comprehensive_stats()
-        return json.dumps(stats, indent=2, default=str)
+        return get_json_codec().dumps(stats, default=str, indent=True).decode("utf-8")
 
     def get_connection_rate(self, window_seconds: int = 60) -> float:
         """
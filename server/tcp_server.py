@@ -14,6 +14,9 @@ from typing import Any, Callable, Dict, List, Optional
 from .connection_handler import ConnectionHandler, ConnectionManager
 from .database.connection import DatabaseManager
 from .database.migrations import init_database
+from .dns_manager import PowerDNSClient
+from .monitoring import monitor_event_loop_lag
+from .registration_service import RegistrationService, create_registration_service
 from .server_stats import ServerStats, StatsCollector
 
 logger = logging.getLogger(__name__)
@@ -42,6 +45,8 @@ class TCPServerConfig:
         self.max_connections = server_config.get("max_connections", 1000)
         self.connection_timeout = server_config.get("connection_timeout", 30.0)
         self.graceful_shutdown_timeout = server_config.get("graceful_shutdown_timeout", 10.0)
+        self.loop_lag_interval = server_config.get("loop_lag_interval", 0.5)
+        self.listen_backlog = server_config.get("listen_backlog", 1024)
 
         # Database configuration
         self.database_config = config.get("database", {})
@@ -70,20 +75,23 @@ class TCPServer:
     message processing, database integration, and comprehensive monitoring.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], dns_client: Optional[PowerDNSClient] = None):
         """
         Initialize TCP server.
 
         Args:
             config: Server configuration dictionary
+            dns_client: Optional PowerDNS client shared with other server components
         """
         self.config = TCPServerConfig(config)
         self.full_config = config  # Store full config for connection handlers
+        self.dns_client = dns_client
 
         # Server state
         self._server: Optional[Server] = None
         self._running = False
         self._start_time: Optional[float] = None
+        self._loop_lag_task: Optional[asyncio.Task] = None
 
         # Connection management
         self.connection_manager = ConnectionManager(self.config.max_connections)
@@ -96,6 +104,10 @@ class TCPServer:
         self.db_manager: Optional[DatabaseManager] = None
         self._initialize_database()
 
+        # Shared registration pipeline (one processor, engine and DNS client)
+        self.registration_service: Optional[RegistrationService] = None
+        self._initialize_registration_service()
+
         # Shutdown handling
         self._shutdown_event = asyncio.Event()
         self._setup_signal_handlers()
@@ -139,6 +151,20 @@ class TCPServer:
             # Continue without database (graceful degradation)
             self.db_manager = None
 
+    def _initialize_registration_service(self) -> None:
+        """Create the registration pipeline shared by all connections."""
+        if not self.db_manager:
+            return
+
+        try:
+            self.registration_service = create_registration_service(
+                self.full_config, self.db_manager, self.dns_client
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize registration service: {e}")
+            # Connection handlers fall back to per-connection processing
+            self.registration_service = None
+
     def _setup_signal_handlers(self) -> None:
         """Setup signal handlers for graceful shutdown."""
 
@@ -176,12 +202,21 @@ class TCPServer:
                 limit=16384,  # Per-connection buffer limit
                 reuse_address=True,
                 reuse_port=True,
+                backlog=self.config.listen_backlog,
             )
 
             # Update server state
             self._running = True
             self._start_time = time.time()
 
+            if self.registration_service:
+                await self.registration_service.start()
+
+            # Sample event loop lag so blocking work on the loop is visible
+            self._loop_lag_task = asyncio.create_task(
+                monitor_event_loop_lag(self.config.loop_lag_interval)
+            )
+
             # Add custom metrics
             self.stats_collector.add_custom_metric("server_start_time", self._start_time)
             self.stats_collector.add_custom_metric("server_version", "1.0")
@@ -228,6 +263,14 @@ class TCPServer:
             # Update server state
             self._running = False
 
+            if self._loop_lag_task:
+                self._loop_lag_task.cancel()
+                self._loop_lag_task = None
+
+            # Release shared registration resources before the database
+            if self.registration_service:
+                await self.registration_service.close()
+
             # Cleanup database
             if self.db_manager:
                 self.db_manager.cleanup()
@@ -287,6 +330,7 @@ class TCPServer:
                 db_manager=self.db_manager,
                 stats=self.stats,
                 timeout=self.config.connection_timeout,
+                registration_service=self.registration_service,
             )
 
             # Check connection limits
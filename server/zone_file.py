@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Zone File Parser for Prism DNS Server
+Streaming RFC 1035 master file parser for BIND zone imports.
+"""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Record classes accepted in the class field (only IN records are imported)
+_CLASSES = {"IN", "CH", "HS", "CS"}
+
+# RDATA fields holding domain names, which are qualified with $ORIGIN
+_NAME_FIELDS = {
+    "NS": (0,),
+    "CNAME": (0,),
+    "PTR": (0,),
+    "DNAME": (0,),
+    "MX": (1,),
+    "SRV": (3,),
+    "SOA": (0, 1),
+}
+
+# SOA timer fields, which may use TTL units such as 1h
+_SOA_TIMER_FIELDS = (3, 4, 5, 6)
+
+_TTL_PATTERN = re.compile(r"(\d+)([smhdw]?)", re.IGNORECASE)
+_TTL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+_DELIMITERS = ' \t;()"'
+
+
+class ZoneFileError(ValueError):
+    """Raised for malformed zone file input."""
+
+    def __init__(self, message: str, line_number: int):
+        super().__init__(f"Line {line_number}: {message}")
+        self.line_number = line_number
+
+
+class ResourceRecord(NamedTuple):
+    """A single resource record with an absolute owner name."""
+
+    name: str
+    ttl: int
+    type: str
+    content: str
+
+
+def parse_ttl(value: str) -> int:
+    """
+    Parse a TTL in seconds or with BIND units (e.g. 3600, 1h30m, 2w).
+
+    Args:
+        value: TTL text
+
+    Returns:
+        TTL in seconds
+
+    Raises:
+        ValueError: If the value is not a TTL
+    """
+    position = 0
+    seconds = 0
+    for match in _TTL_PATTERN.finditer(value):
+        if match.start() != position:
+            break
+        seconds += int(match.group(1)) * _TTL_UNITS[match.group(2).lower()]
+        position = match.end()
+
+    if not value or position != len(value):
+        raise ValueError(f"Invalid TTL: {value}")
+    return seconds
+
+
+def _quoted_end(line: str, start: int, line_number: int) -> int:
+    """Return the index of the quote closing the string opened at start."""
+    end = start + 1
+    while end < len(line) and line[end] != '"':
+        end += 2 if line[end] == "\\" else 1
+    if end >= len(line):
+        raise ZoneFileError("Unterminated quoted string", line_number)
+    return end
+
+
+def _word_end(line: str, start: int) -> int:
+    """Return the index just past the unquoted token starting at start."""
+    end = start
+    while end < len(line) and line[end] not in _DELIMITERS:
+        end += 2 if line[end] == "\\" else 1
+    return end
+
+
+def _tokenize(line: str, tokens: List[str], depth: int, line_number: int) -> int:
+    """
+    Split one physical line into tokens, tracking parentheses.
+
+    Args:
+        line: Line without its newline
+        tokens: List the tokens are appended to
+        depth: Open parentheses before this line
+        line_number: Line number for errors
+
+    Returns:
+        Open parentheses after this line
+    """
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == ";":
+            break
+        if char == '"':
+            end = _quoted_end(line, i, line_number) + 1
+            tokens.append(line[i:end])
+            i = end
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                raise ZoneFileError("Unbalanced ')'", line_number)
+        elif char not in " \t":
+            end = _word_end(line, i)
+            tokens.append(line[i:end])
+            i = end
+            continue
+        i += 1
+    return depth
+
+
+def _logical_lines(lines: Iterable[str]) -> Iterator[Tuple[int, bool, List[str]]]:
+    """
+    Join parenthesised continuation lines into logical lines.
+
+    Args:
+        lines: Zone file lines
+
+    Yields:
+        (first line number, owner omitted, tokens) for each non-empty entry
+    """
+    tokens: List[str] = []
+    depth = 0
+    start = 0
+    owner_omitted = False
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if depth == 0:
+            start = line_number
+            owner_omitted = line[:1] in (" ", "\t")
+
+        depth = _tokenize(line, tokens, depth, line_number)
+        if depth == 0 and tokens:
+            yield start, owner_omitted, tokens
+            tokens = []
+
+    if depth:
+        raise ZoneFileError("Unbalanced '('", start)
+
+
+def _absolute(name: str, origin: Optional[str], line_number: int) -> str:
+    """Qualify a name with the origin unless it is already absolute."""
+    if name.endswith(".") and not name.endswith("\\."):
+        return name
+    if origin is None:
+        raise ZoneFileError(f"Relative name '{name}' without $ORIGIN", line_number)
+    if name == "@":
+        return origin
+    return f"{name}{origin}" if origin == "." else f"{name}.{origin}"
+
+
+def _ttl(value: str, line_number: int) -> int:
+    """Parse a TTL field, reporting the line on failure."""
+    try:
+        return parse_ttl(value)
+    except ValueError as e:
+        raise ZoneFileError(str(e), line_number)
+
+
+class _ParserState:
+    """Origin, owner and TTL defaults carried from one entry to the next."""
+
+    __slots__ = ("origin", "owner", "default_ttl", "ttl_directive")
+
+    def __init__(self, origin: Optional[str], default_ttl: int):
+        if origin is not None and not origin.endswith("."):
+            origin += "."
+        self.origin = origin
+        self.owner: Optional[str] = None
+        self.default_ttl = default_ttl
+        self.ttl_directive = False
+
+
+def _apply_directive(state: _ParserState, tokens: List[str], line_number: int) -> None:
+    """Apply a $ORIGIN or $TTL entry; other directives ($INCLUDE) are rejected."""
+    directive = tokens[0].upper()
+    if directive not in ("$ORIGIN", "$TTL"):
+        raise ZoneFileError(f"Unsupported directive {tokens[0]}", line_number)
+    if len(tokens) < 2:
+        raise ZoneFileError(f"{directive} requires a value", line_number)
+
+    if directive == "$ORIGIN":
+        state.origin = _absolute(tokens[1], state.origin, line_number)
+    else:
+        state.default_ttl = _ttl(tokens[1], line_number)
+        state.ttl_directive = True
+
+
+def _take_owner(
+    state: _ParserState, tokens: List[str], owner_omitted: bool, line_number: int
+) -> str:
+    """Pop the owner name, or inherit the previous record's."""
+    if not owner_omitted:
+        state.owner = _absolute(tokens.pop(0), state.origin, line_number)
+    elif state.owner is None:
+        raise ZoneFileError("Record without an owner name", line_number)
+    return state.owner
+
+
+def _take_ttl(state: _ParserState, tokens: List[str], line_number: int) -> int:
+    """
+    Pop the optional TTL and class, in either order, and resolve the TTL.
+
+    A record without a TTL uses $TTL, or the last explicit TTL if no $TTL
+    has been seen.
+    """
+    ttl = None
+    for _ in range(2):
+        if tokens and tokens[0].upper() in _CLASSES:
+            record_class = tokens.pop(0).upper()
+            if record_class != "IN":
+                raise ZoneFileError(f"Unsupported class {record_class}", line_number)
+        elif ttl is None and tokens and tokens[0][:1].isdigit():
+            ttl = _ttl(tokens.pop(0), line_number)
+
+    if ttl is None:
+        return state.default_ttl
+    if not state.ttl_directive:
+        state.default_ttl = ttl
+    return ttl
+
+
+def _build_record(
+    owner: str, ttl: int, tokens: List[str], origin: Optional[str], line_number: int
+) -> ResourceRecord:
+    """Assemble a record from its type and data, qualifying names in the data."""
+    if len(tokens) < 2:
+        raise ZoneFileError("Record without type and data", line_number)
+    record_type = tokens.pop(0).upper()
+
+    for index in _NAME_FIELDS.get(record_type, ()):
+        if index < len(tokens):
+            tokens[index] = _absolute(tokens[index], origin, line_number)
+    if record_type == "SOA":
+        for index in _SOA_TIMER_FIELDS:
+            if index < len(tokens):
+                tokens[index] = str(_ttl(tokens[index], line_number))
+
+    return ResourceRecord(owner, ttl, record_type, " ".join(tokens))
+
+
+def iter_zone_file(
+    lines: Iterable[str], origin: Optional[str] = None, default_ttl: int = 3600
+) -> Iterator[ResourceRecord]:
+    """
+    Parse a zone file into resource records, one line at a time.
+
+    Supports $ORIGIN and $TTL, parenthesised multi-line records, comments,
+    quoted strings, TTL units, TTL and class in either order, and owner
+    names inherited from the previous record. Relative names, including
+    those inside NS, CNAME, PTR, DNAME, MX, SRV and SOA data, are qualified
+    with the current origin. A record without a TTL uses $TTL, or the last
+    explicit TTL if no $TTL has been seen.
+
+    Args:
+        lines: Zone file lines (e.g. an open file or io.StringIO)
+        origin: Initial origin for relative names
+        default_ttl: TTL used before any $TTL or explicit TTL
+
+    Yields:
+        Parsed resource records
+
+    Raises:
+        ZoneFileError: On malformed input or unsupported directives
+    """
+    state = _ParserState(origin, default_ttl)
+
+    for line_number, owner_omitted, tokens in _logical_lines(lines):
+        if tokens[0].startswith("$"):
+            _apply_directive(state, tokens, line_number)
+            continue
+
+        owner = _take_owner(state, tokens, owner_omitted, line_number)
+        ttl = _take_ttl(state, tokens, line_number)
+        yield _build_record(owner, ttl, tokens, state.origin, line_number)
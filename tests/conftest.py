@@ -4,6 +4,7 @@ Test fixtures for authentication tests.
 """
 
 import asyncio
+import os
 from typing import AsyncGenerator
 
 import pytest
@@ -27,8 +28,12 @@ from server.auth.models import (
     UserActivity,
     UserOrganization,
 )
-from server.database.connection import get_async_db
+from server.database.connection import DatabaseManager, get_async_db
 from server.database.models import Base
+from server.dns_manager import PowerDNSAPIError, PowerDNSClient
+
+# Key for API token lookup hashes in tests that do not create an app
+os.environ.setdefault("API_TOKEN_LOOKUP_KEY", "test-token-lookup-key")
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -115,3 +120,84 @@ async def db_session(app):
     async for session in _async_db_manager.get_session():
         yield session
         await session.rollback()  # Rollback any changes made in tests
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Create a file-backed database with the schema in place."""
+    manager = DatabaseManager({"database": {"path": str(tmp_path / "hosts.db")}})
+    manager.initialize_schema()
+    yield manager
+    manager.cleanup()
+
+
+class FakePowerDNS:
+    """
+    In-memory PowerDNS API for tests that drive a real PowerDNSClient.
+
+    Serves the zone listing and zone details from ``zones`` (zone name ->
+    ``{"serial": ..., "rrsets": [...]}``), applies PATCHes and records every
+    request as ``(method, endpoint)``. PATCHes touching a name in ``rejected``
+    are refused with a 422.
+    """
+
+    def __init__(self, zones):
+        self.zones = zones
+        self.requests = []
+        self.patched = []
+        self.rejected = set()
+
+    @property
+    def gets(self):
+        """Endpoints of the GET requests, in order."""
+        return [endpoint for method, endpoint in self.requests if method == "GET"]
+
+    @property
+    def fetched(self):
+        """Zones whose details were fetched, in order."""
+        return [e.rsplit("/", 1)[1] for e in self.gets if e != "servers/localhost/zones"]
+
+    def rrset(self, zone, name, rtype):
+        """Return the stored RRset for a name and type, or None."""
+        for rrset in self.zones[zone]["rrsets"]:
+            if (rrset["name"], rrset["type"]) == (name, rtype):
+                return rrset
+        return None
+
+    def client(self, **settings):
+        """Create an enabled PowerDNSClient backed by this fake."""
+        client = PowerDNSClient({"powerdns": {"enabled": True, **settings}})
+        client._make_request = self
+        return client
+
+    async def __call__(self, method, endpoint, json_data=None, params=None):
+        self.requests.append((method, endpoint))
+        if endpoint == "servers/localhost/zones":
+            if method != "GET":
+                return {}
+            return [{"name": name, "serial": zone["serial"]} for name, zone in self.zones.items()]
+
+        name = endpoint.rsplit("/", 1)[1]
+        if method == "GET":
+            zone = self.zones[name]
+            return {**zone, "name": name, "rrsets": list(zone["rrsets"])}
+        if method == "PATCH":
+            self._apply_patch(self.zones[name], json_data["rrsets"])
+        return {}
+
+    def _apply_patch(self, zone, rrsets):
+        names = [rrset["name"] for rrset in rrsets]
+        self.patched.append(names)
+        if self.rejected.intersection(names):
+            raise PowerDNSAPIError("Unprocessable", status_code=422)
+        for rrset in rrsets:
+            key = (rrset["name"], rrset["type"])
+            zone["rrsets"] = [r for r in zone["rrsets"] if (r["name"], r["type"]) != key]
+            if rrset.get("changetype") != "DELETE":
+                zone["rrsets"].append(rrset)
+
+
+@pytest.fixture
+def fake_powerdns():
+    """Build a FakePowerDNS from a zone mapping."""
+    return FakePowerDNS
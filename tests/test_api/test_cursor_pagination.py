@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for cursor pagination of the host, activity log and zone listings.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from server.api.app import create_app
+from server.api.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from server.auth.dependencies import get_admin_override, get_current_verified_user
+from server.auth.models import User, UserActivity
+from server.database.connection import DatabaseManager, get_async_db
+from server.database.models import Host
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a database with the schema in place."""
+    path = str(tmp_path / "pagination.db")
+    manager = DatabaseManager({"database": {"path": path}})
+    manager.initialize_schema()
+    manager.cleanup()
+    return path
+
+
+@pytest.fixture
+def user():
+    """Create the user making the requests."""
+    return SimpleNamespace(id=uuid4(), username="pager", is_admin=False)
+
+
+@pytest.fixture
+def client(db_path, user):
+    """Create a client for the app, authenticated as the user."""
+    app = create_app({"database": {"path": db_path}})
+    app.dependency_overrides[get_current_verified_user] = lambda: user
+    with TestClient(app) as client:
+        yield client
+
+
+def _add_rows(db_path, rows):
+    """Insert model instances with a separate database manager."""
+    manager = DatabaseManager({"database": {"path": db_path}})
+    with manager.get_session() as session:
+        session.add_all(rows)
+    manager.cleanup()
+
+
+def _walk(client, url, params, items_key=None):
+    """Follow next cursors from the first page to the end, returning every page."""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        pages.append(response)
+        body = response.json()
+        pagination = body if items_key is None else body["pagination"]
+        cursor = pagination["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_and_scope():
+    """Test cursors keep datetimes and ids and only decode for their own listing."""
+    seen = datetime(2026, 1, 2, 3, 4, 5, 6)
+    cursor = encode_cursor("hosts", (seen, 7), "prev")
+
+    assert decode_cursor("hosts", cursor) == ([seen, 7], "prev")
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("activity", cursor)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("hosts", "not a cursor")
+
+
+def test_host_cursors_page_both_ways_while_hosts_move(client, db_path, user):
+    """Test host pages by cursor are stable when a heartbeat reorders hosts."""
+    now = datetime.now(timezone.utc)
+    _add_rows(
+        db_path,
+        [
+            # Pairs of hosts share a last_seen, so ties are broken by id
+            Host(
+                hostname=f"host-{i}",
+                current_ip="10.0.0.1",
+                created_by=str(user.id),
+                last_seen=now - timedelta(minutes=i // 2),
+            )
+            for i in range(7)
+        ]
+        + [Host(hostname="other", current_ip="10.0.0.2", created_by="someone-else")],
+    )
+
+    first = client.get("/api/hosts", params={"per_page": 3}).json()
+    assert [h["hostname"] for h in first["hosts"]] == ["host-1", "host-0", "host-3"]
+    assert (first["total"], first["prev_cursor"]) == (7, None)
+
+    # A heartbeat moves the newest host of the next page to the top
+    manager = DatabaseManager({"database": {"path": db_path}})
+    with manager.get_session() as session:
+        session.query(Host).filter(Host.hostname == "host-2").update(
+            {"last_seen": now + timedelta(minutes=1)}
+        )
+    manager.cleanup()
+
+    second = client.get("/api/hosts", params={"per_page": 3, "cursor": first["next_cursor"]})
+    second = second.json()
+    assert [h["hostname"] for h in second["hosts"]] == ["host-5", "host-4", "host-6"]
+    assert second["next_cursor"] is None
+
+    back = client.get("/api/hosts", params={"per_page": 3, "cursor": second["prev_cursor"]})
+    assert [h["hostname"] for h in back.json()["hosts"]] == ["host-1", "host-0", "host-3"]
+
+    pages = _walk(client, "/api/hosts/status/online", {"per_page": 2})
+    assert len(pages) == 4
+    assert sum(len(page.json()["hosts"]) for page in pages) == 7
+
+    assert client.get("/api/hosts", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_activity_log_cursor_headers(client, db_path, user):
+    """Test the activity log returns cursors in headers and pages through ties."""
+    created_at = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    _add_rows(
+        db_path, [User(id=user.id, email="pager@example.com", username="pager", password_hash="x")]
+    )
+    _add_rows(
+        db_path,
+        [
+            UserActivity(
+                user_id=user.id,
+                activity_type="login",
+                activity_description=f"Login {i}",
+                created_at=created_at - timedelta(seconds=i // 3),
+            )
+            for i in range(8)
+        ],
+    )
+
+    async def async_db():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with AsyncSession(engine) as session:
+            yield session
+        await engine.dispose()
+
+    client.app.dependency_overrides[get_async_db] = async_db
+
+    seen = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/api/users/me/activity", params={"limit": 3, **({"cursor": cursor} if cursor else {})}
+        )
+        assert response.status_code == 200, response.text
+        seen.extend(activity["id"] for activity in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 8
+    assert "X-Prev-Cursor" in response.headers
+    by_page = client.get("/api/users/me/activity", params={"page": 2, "limit": 3})
+    assert [activity["id"] for activity in by_page.json()] == seen[3:6]
+
+    back = client.get(
+        "/api/users/me/activity", params={"limit": 3, "cursor": by_page.headers["X-Prev-Cursor"]}
+    )
+    assert [activity["id"] for activity in back.json()] == seen[:3]
+    assert "X-Prev-Cursor" not in back.headers
+
+
+def test_zone_cursors_follow_sort_order(client):
+    """Test zone cursors page in descending serial order and reject another sort."""
+    zones = [{"name": f"z{i}.test.", "kind": "Native", "serial": i % 3} for i in range(7)]
+    client.app.dependency_overrides[get_admin_override] = lambda: True
+    powerdns = AsyncMock()
+    powerdns.list_zones.return_value = zones
+
+    with patch("server.api.routes.dns.get_powerdns_client") as get_client:
+        get_client.return_value.__aenter__.return_value = powerdns
+        params = {"limit": 3, "sort": "serial", "order": "desc"}
+        pages = _walk(client, "/api/dns/zones", params, items_key="zones")
+        names = [zone["name"] for page in pages for zone in page.json()["zones"]]
+
+        last = pages[-1].json()["pagination"]
+        back = client.get("/api/dns/zones", params={**params, "cursor": last["prev_cursor"]}).json()
+        wrong_sort = client.get(
+            "/api/dns/zones", params={"limit": 3, "cursor": last["prev_cursor"]}
+        )
+
+    assert names == [
+        "z5.test.",
+        "z2.test.",
+        "z4.test.",
+        "z1.test.",
+        "z6.test.",
+        "z3.test.",
+        "z0.test.",
+    ]
+    assert [zone["name"] for zone in back["zones"]] == names[3:6]
+    assert wrong_sort.status_code == 400
@@ -401,6 +401,57 @@ class TestHealthAPI:
         assert response.status_code == 200
         assert response_time_ms < 50  # Health endpoint should be very fast
 
+    def test_database_manager_shared_across_requests(self, app):
+        """Test requests share one database manager created at startup."""
+        from unittest.mock import patch
+
+        from server.api import dependencies
+        from server.database.connection import DatabaseManager
+
+        with patch.object(dependencies, "DatabaseManager", wraps=DatabaseManager) as manager:
+            with TestClient(app) as client:
+                shared = dependencies._db_manager
+                for _ in range(3):
+                    assert client.get("/api/health").status_code == 200
+                    assert client.get("/api/stats").status_code == 200
+                assert dependencies._db_manager is shared
+
+        assert manager.call_count == 1
+        assert dependencies._db_manager is None
+
+    def test_statistics_aggregated_once_per_cache_ttl(self, app, api_config):
+        """Test health and stats share cached host statistics until the TTL expires."""
+        from unittest.mock import patch
+
+        from server.api.stats_cache import StatsCache
+        from server.database.operations import HostOperations
+
+        api_config["api"]["stats_cache_ttl"] = 60
+        original = HostOperations.get_host_statistics
+
+        with patch.object(
+            HostOperations, "get_host_statistics", autospec=True, side_effect=original
+        ) as get_statistics:
+            with TestClient(app) as client:
+                for _ in range(3):
+                    assert client.get("/api/health").json()["total_hosts"] == 0
+                    assert client.get("/api/stats").status_code == 200
+
+                from server.api import dependencies
+
+                dependencies._stats_cache.invalidate()
+                HostOperations(dependencies._db_manager).create_host("h1", "10.0.0.1", "u1")
+                assert client.get("/api/health").json()["total_hosts"] == 1
+
+        assert get_statistics.call_count == 2
+
+        clock = iter([0.0, 1.0, 5.0])
+        with patch("server.api.stats_cache.time.monotonic", side_effect=lambda: next(clock)):
+            cache = StatsCache(ttl=5)
+            values = iter(["first", "second"])
+            results = [cache.get("key", lambda: next(values)) for _ in range(3)]
+        assert results == ["first", "first", "second"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
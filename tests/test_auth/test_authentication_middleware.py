@@ -148,9 +148,8 @@ class TestAuthenticationMiddleware:
         response = await async_client.get(
             "/api/hosts/test-host", headers={"Authorization": f"Bearer {token}"}
         )
-        # Currently returns 500 due to dependency error handling
-        # TODO: Fix dependency error handling to preserve original status codes
-        assert response.status_code in [404, 500]
+        # Host IDs are integers, so the hostname fails path validation
+        assert response.status_code == 422
 
     async def test_hosts_by_status_requires_auth(self, async_client: AsyncClient):
         """Test hosts by status endpoint requires authentication."""
@@ -441,6 +441,21 @@ class TestConfigValidation:
         with pytest.raises(ValueError):
             validate_port(65536)
 
+    def test_token_lookup_key_required_in_production(self):
+        """Test production refuses to start without an API token lookup key."""
+        from server.config import ConfigValidationError, ServerConfig
+
+        with patch.dict(os.environ, {}, clear=True):
+            with pytest.raises(ConfigValidationError):
+                ServerConfig({"server": {"environment": "production"}}).validate()
+
+            assert ServerConfig({"server": {"environment": "development"}}).validate()
+
+            with patch.dict(os.environ, {"API_TOKEN_LOOKUP_KEY": "secret"}):
+                config = ServerConfig({"server": {"environment": "production"}})
+                assert config.validate()
+                assert config.api.token_lookup_key == "secret"
+
     def test_path_validation(self):
         """Test file path validation."""
         from server.config import validate_path
@@ -7,7 +7,7 @@ Test-driven development for host record operations.
 import os
 import tempfile
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 
 
@@ -234,6 +234,142 @@ class TestHostOperations(unittest.TestCase):
         updated_host = host_ops.get_host_by_hostname(self.sample_host["hostname"])
         self.assertEqual(updated_host.status, "offline")
 
+    def test_mark_timed_out_hosts_offline_in_chunks(self):
+        """Test set-based timeout sweep marks stale hosts offline without touching last_seen."""
+        from datetime import timedelta
+
+        from server.database.connection import DatabaseManager
+        from server.database.models import Host
+        from server.database.operations import HostOperations
+
+        config = {"database": {"path": self.db_path, "connection_pool_size": 20}}
+        db_manager = DatabaseManager(config)
+        db_manager.initialize_schema()
+        host_ops = HostOperations(db_manager)
+
+        stale_time = datetime.now(timezone.utc) - timedelta(hours=1)
+        with db_manager.get_session() as session:
+            for i in range(5):
+                session.add(
+                    Host(
+                        hostname=f"stale-{i}",
+                        current_ip="10.0.0.1",
+                        created_by="user-1",
+                        last_seen=stale_time,
+                    )
+                )
+            session.add(Host(hostname="fresh", current_ip="10.0.0.2", created_by="user-1"))
+
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=5)
+        first = host_ops.mark_timed_out_hosts_offline(cutoff, limit=3)
+        second = host_ops.mark_timed_out_hosts_offline(cutoff, limit=3)
+        third = host_ops.mark_timed_out_hosts_offline(cutoff, limit=3)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertEqual(third, [])
+        marked = {host["hostname"] for host in first + second}
+        self.assertEqual(marked, {f"stale-{i}" for i in range(5)})
+        self.assertEqual(first[0]["created_by"], "user-1")
+
+        host = host_ops.get_host_by_hostname("stale-0")
+        self.assertEqual(host.status, "offline")
+        self.assertEqual(host.last_seen.replace(tzinfo=None), stale_time.replace(tzinfo=None))
+        self.assertEqual(host_ops.get_host_by_hostname("fresh").status, "online")
+
+        db_manager.cleanup()
+
+    def test_updates_are_scoped_to_one_tenant(self):
+        """Test hostname updates with user_id and by-id updates leave other tenants' hosts alone."""
+        from server.database.connection import DatabaseManager
+        from server.database.operations import HostOperations
+
+        config = {"database": {"path": self.db_path, "connection_pool_size": 20}}
+        db_manager = DatabaseManager(config)
+        db_manager.initialize_schema()
+        host_ops = HostOperations(db_manager)
+
+        host_a = host_ops.create_host("shared", "10.0.0.1", "user-a")
+        host_b = host_ops.create_host("shared", "10.0.0.2", "user-b")
+
+        self.assertTrue(host_ops.update_host_ip("shared", "10.0.0.3", user_id="user-b"))
+        self.assertTrue(host_ops.mark_host_offline_by_id(host_a.id))
+        self.assertTrue(host_ops.update_dns_info_by_id(host_b.id, dns_sync_status="synced"))
+
+        stored_a = host_ops.get_host_by_hostname("shared", "user-a")
+        stored_b = host_ops.get_host_by_hostname("shared", "user-b")
+        self.assertEqual(stored_a.current_ip, "10.0.0.1")
+        self.assertEqual(stored_a.status, "offline")
+        self.assertEqual(stored_a.dns_sync_status, "pending")
+        self.assertEqual(stored_b.current_ip, "10.0.0.3")
+        self.assertEqual(stored_b.status, "online")
+        self.assertEqual(stored_b.dns_sync_status, "synced")
+
+        seen_at = datetime.now(timezone.utc)
+        self.assertTrue(host_ops.set_host_online(host_a.id, "10.0.0.4", seen_at))
+        stored_a = host_ops.get_host_by_hostname("shared", "user-a")
+        self.assertEqual(stored_a.current_ip, "10.0.0.4")
+        self.assertEqual(stored_a.status, "online")
+        self.assertEqual(stored_a.last_seen.replace(tzinfo=None), seen_at.replace(tzinfo=None))
+        self.assertEqual(host_ops.get_host_by_hostname("shared", "user-b").current_ip, "10.0.0.3")
+
+        self.assertFalse(host_ops.set_host_online(host_a.id, "not-an-ip"))
+        self.assertFalse(host_ops.set_host_online(999999))
+
+        db_manager.cleanup()
+
+    def test_get_hosts_page_filters_counts_and_pages_in_sql(self):
+        """Test host pages: newest first, totals counted, search indexed and kept in sync."""
+        from datetime import timedelta
+
+        from server.database.connection import DatabaseManager
+        from server.database.models import Host
+        from server.database.operations import HostOperations
+
+        config = {"database": {"path": self.db_path, "connection_pool_size": 20}}
+        db_manager = DatabaseManager(config)
+        db_manager.initialize_schema()
+        host_ops = HostOperations(db_manager)
+
+        now = datetime.now(timezone.utc)
+        with db_manager.get_session() as session:
+            for i in range(5):
+                session.add(
+                    Host(
+                        hostname=f"Web-{i}",
+                        current_ip="10.0.0.1",
+                        created_by="user-a",
+                        last_seen=now - timedelta(minutes=i),
+                        status="offline" if i == 4 else "online",
+                    )
+                )
+            session.add(Host(hostname="db-1", current_ip="10.0.0.2", created_by="user-a"))
+            session.add(Host(hostname="web-other", current_ip="10.0.0.3", created_by="user-b"))
+
+        hosts, total = host_ops.get_hosts_page(user_id="user-a", search="WEB", limit=2, offset=2)
+        self.assertEqual(total, 5)
+        self.assertEqual([host.hostname for host in hosts], ["Web-2", "Web-3"])
+
+        hosts, total = host_ops.get_hosts_page(search="eb-", status="online")
+        self.assertEqual(total, 5)
+        self.assertNotIn("Web-4", [host.hostname for host in hosts])
+
+        # Short searches fall back to a scan
+        self.assertEqual(host_ops.get_hosts_page(user_id="user-a", search="b-")[1], 6)
+        self.assertEqual(host_ops.get_hosts_page(user_id="user-b", limit=1)[1], 1)
+        self.assertEqual(host_ops.get_hosts_page(user_id="user-c"), ([], 0))
+
+        # The search index follows renames and deletes
+        with db_manager.get_session() as session:
+            session.query(Host).filter(Host.hostname == "db-1").update({"hostname": "web-db"})
+            session.query(Host).filter(Host.hostname == "Web-0").delete()
+        hosts, total = host_ops.get_hosts_page(user_id="user-a", search="web")
+        self.assertEqual(total, 5)
+        self.assertIn("web-db", [host.hostname for host in hosts])
+        self.assertNotIn("Web-0", [host.hostname for host in hosts])
+
+        db_manager.cleanup()
+
     def test_cleanup_old_hosts(self):
         """Test cleaning up old offline hosts."""
         from datetime import datetime, timedelta
@@ -291,6 +427,109 @@ class TestHostOperations(unittest.TestCase):
         # Existing host
         self.assertTrue(host_ops.host_exists(self.sample_host["hostname"]))
 
+    def test_statistics_aggregate_in_one_query(self):
+        """Test host, system and DNS statistics are each a single conditional aggregate."""
+        from sqlalchemy import event
+
+        from server.database.connection import DatabaseManager
+        from server.database.operations import HostOperations
+
+        config = {"database": {"path": self.db_path, "connection_pool_size": 20}}
+        db_manager = DatabaseManager(config)
+        db_manager.initialize_schema()
+        host_ops = HostOperations(db_manager)
+
+        host_ops.create_host("web", "10.0.0.1", "user-a")
+        db_host = host_ops.create_host("db", "10.0.0.2", "user-a")
+        host_ops.create_host("web", "10.0.0.3", "user-b")
+        host_ops.mark_host_offline("db", user_id="user-a")
+        host_ops.update_dns_info_by_id(db_host.id, dns_sync_status="synced")
+
+        statements = []
+        event.listen(
+            db_manager.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        user_stats = host_ops.get_host_statistics(user_id="user-a")
+        all_stats = host_ops.get_host_statistics()
+        system_stats = host_ops.get_system_host_statistics()
+        dns_stats = host_ops.get_dns_statistics()
+
+        self.assertEqual(len(statements), 4)
+        self.assertEqual(
+            (user_stats["total_hosts"], user_stats["online_hosts"], user_stats["offline_hosts"]),
+            (2, 1, 1),
+        )
+        self.assertEqual(user_stats["recent_activity_24h"], 2)
+        self.assertIsNotNone(user_stats["last_seen_date"])
+        self.assertEqual(all_stats["total_hosts"], 3)
+        self.assertEqual(
+            system_stats, {"total_hosts": 3, "users_with_hosts": 2, "anonymous_hosts": 0}
+        )
+        self.assertEqual((dns_stats["dns_synced"], dns_stats["dns_pending"]), (1, 2))
+        self.assertEqual(host_ops.get_host_statistics(user_id="user-c")["total_hosts"], 0)
+
+        db_manager.cleanup()
+
+    def test_host_counters_follow_host_changes(self):
+        """Test host_counters stay in step with hosts and are rebuilt by migration."""
+        from sqlalchemy import text
+
+        from server.database.connection import DatabaseManager
+        from server.database.migrations import DatabaseMigrations
+        from server.database.models import Host
+        from server.database.operations import HostOperations
+
+        config = {"database": {"path": self.db_path, "connection_pool_size": 20}}
+        db_manager = DatabaseManager(config)
+        db_manager.initialize_schema()
+        host_ops = HostOperations(db_manager)
+
+        def counts(user_id):
+            stats = host_ops.get_host_counters(user_id)
+            return stats["total_hosts"], stats["online_hosts"], stats["offline_hosts"]
+
+        for i in range(3):
+            host_ops.create_host(f"web-{i}", "10.0.0.1", "user-a")
+        host_ops.create_host("web-0", "10.0.0.2", "user-b")
+        self.assertEqual(counts("user-a"), (3, 3, 0))
+        self.assertIsNotNone(host_ops.get_host_counters("user-a")["last_registration"])
+
+        # Status transitions only: a second offline mark and heartbeats change nothing
+        host_ops.mark_host_offline("web-0", user_id="user-a")
+        host_ops.mark_host_offline("web-0", user_id="user-a")
+        host_ops.update_host_last_seen("web-1", user_id="user-a")
+        self.assertEqual(counts("user-a"), (3, 2, 1))
+
+        # The heartbeat sweep updates the counters in the same statement
+        stale = datetime.now(timezone.utc) + timedelta(minutes=1)
+        self.assertEqual(len(host_ops.mark_timed_out_hosts_offline(stale, limit=100)), 3)
+        self.assertEqual(counts("user-a"), (3, 0, 3))
+        host_ops.update_host_last_seen("web-2", user_id="user-a")
+        self.assertEqual(counts("user-a"), (3, 1, 2))
+
+        with db_manager.get_session() as session:
+            session.query(Host).filter(Host.hostname == "web-1").update({"created_by": "user-b"})
+            session.query(Host).filter(Host.created_by == "user-b").delete()
+        self.assertEqual(counts("user-a"), (2, 1, 1))
+        self.assertEqual(counts("user-b"), (0, 0, 0))
+        self.assertEqual(
+            host_ops.get_system_host_statistics(),
+            {"total_hosts": 2, "users_with_hosts": 1, "anonymous_hosts": 0},
+        )
+
+        # Migration fills the counters from hosts created before they existed
+        with db_manager.get_session() as session:
+            session.execute(text("DROP TABLE host_counters"))
+        DatabaseMigrations(db_manager)._migrate_to_v13()
+        self.assertEqual(counts("user-a"), (2, 1, 1))
+        host_ops.create_host("web-3", "10.0.0.3", "user-a")
+        self.assertEqual(counts("user-a"), (3, 2, 1))
+
+        db_manager.cleanup()
+
     def test_get_host_count(self):
         """Test getting total host count."""
         from server.database.connection import DatabaseManager
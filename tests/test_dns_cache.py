@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the PowerDNS zone cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from server.dns_cache import ZoneCache
+
+
+def _zone(name, serial, rrsets=None):
+    """Build a zone detail response."""
+    return {"name": name, "serial": serial, "rrsets": rrsets or []}
+
+
+@pytest.fixture
+def powerdns(fake_powerdns):
+    """Create a fake PowerDNS with two zones."""
+    return fake_powerdns(
+        {
+            "a.test.": _zone("a.test.", 1, [{"name": "www.a.test.", "type": "A", "records": []}]),
+            "b.test.": _zone("b.test.", 7),
+        }
+    )
+
+
+def test_serial_change_and_ttl_invalidate():
+    """Cached details are served until the listing reports a new serial or they expire."""
+    cache = ZoneCache(ttl=60, list_ttl=5)
+    cache.put_zone("a.test", _zone("a.test.", 1))
+
+    assert cache.get_zone("a.test.")["serial"] == 1
+    cache.put_zone_list([{"name": "a.test.", "serial": 1}])
+    assert cache.get_zone("a.test.") is not None
+
+    cache.put_zone_list([{"name": "a.test.", "serial": 2}])
+    assert cache.get_zone("a.test.") is None
+
+    cache.put_zone("a.test.", _zone("a.test.", 2))
+    with patch("server.dns_cache.time.monotonic", return_value=10**9):
+        assert cache.get_zone("a.test.") is None
+        assert cache.get_zone_list() is None
+
+    assert cache.get_stats()["stale"] == 3
+
+
+def test_lru_eviction():
+    """Only max_zones zones are kept, dropping the least recently used."""
+    cache = ZoneCache(max_zones=2)
+    cache.put_zone("a.", _zone("a.", 1))
+    cache.put_zone("b.", _zone("b.", 1))
+    cache.get_zone("a.")
+    cache.put_zone("c.", _zone("c.", 1))
+
+    assert len(cache) == 2
+    assert cache.get_zone("b.") is None
+    assert cache.get_zone("a.") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_list_zones_reads_through_cache(powerdns):
+    """Repeated listings and record reads cost no GETs until a zone changes."""
+    client = powerdns.client()
+
+    zones = await client.list_zones()
+    assert [zone["record_count"] for zone in zones] == [1, 0]
+    assert len(powerdns.gets) == 3
+
+    await client.list_zones()
+    assert await client.list_records("a.test.") == powerdns.zones["a.test."]["rrsets"]
+    assert len(powerdns.gets) == 3
+
+    # Changed behind our back: the listing's new serial invalidates the zone
+    powerdns.zones["b.test."] = _zone("b.test.", 8)
+    client.zone_cache.list_ttl = 0
+    await client.list_zones()
+    assert powerdns.gets[3:] == ["servers/localhost/zones", "servers/localhost/zones/b.test."]
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_every_client(powerdns):
+    """A write through one client is visible to another client's next read."""
+    api_client = powerdns.client()
+    registration_client = powerdns.client(cache_enabled=False)
+    assert registration_client.zone_cache is None
+
+    await api_client.get_zone_details("a.test.")
+    await registration_client.create_a_record("host1", "10.0.0.1", zone="a.test")
+    await api_client.get_zone_details("a.test.")
+    assert powerdns.gets == ["servers/localhost/zones/a.test.", "servers/localhost/zones/a.test."]
+
+    await api_client.create_or_update_record(
+        "a.test.", "www.a.test.", "A", [{"content": "10.0.0.2", "disabled": False}]
+    )
+    await api_client.get_zone_details("a.test.")
+    assert len(powerdns.gets) == 3
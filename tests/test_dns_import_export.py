@@ -4,8 +4,9 @@ Test DNS Import/Export API (SCRUM-120)
 Tests for DNS zone import and export functionality.
 """
 
+import json
 from asyncio import Future
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -207,6 +208,63 @@ def test_export_specific_zones(client):
     )
 
 
+def test_export_zones_streaming(client, sample_zones):
+    """Test streamed exports fetch full zones and match the buffered formats."""
+    zones = sample_zones + [{**sample_zones[0], "name": "test.com.", "id": "test.com."}]
+    dns_client = PowerDNSClient({"powerdns": {"enabled": True, "cache_enabled": False}})
+
+    async def make_request(method, endpoint, json_data=None, params=None):
+        if endpoint == "servers/localhost/zones":
+            return [{"name": zone["name"]} for zone in zones]
+        return next(zone for zone in zones if zone["name"] == endpoint.rsplit("/", 1)[1])
+
+    dns_client._make_request = make_request
+
+    with patch("server.api.routes.dns.get_powerdns_client", return_value=dns_client):
+        json_response = client.get("/api/dns/export/zones?format=json&stream=true")
+        ndjson_response = client.get("/api/dns/export/zones?format=ndjson&stream=true&gzip=true")
+        bind_response = client.get("/api/dns/export/zones?format=bind&stream=true&zones=test.com.")
+
+    assert json_response.status_code == 200
+    assert json_response.headers["content-type"] == "application/json"
+    assert json_response.json() == {"format": "json", "version": "1.0", "zones": zones}
+
+    # The test client decodes the gzip stream transparently
+    assert ndjson_response.headers["content-encoding"] == "gzip"
+    lines = ndjson_response.text.splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["example.com.", "test.com."]
+
+    assert bind_response.text == dns_client._export_zones_bind(zones[1:]) + "\n"
+    assert "dns-export.bind" in bind_response.headers["Content-Disposition"]
+
+
+def test_export_zones_streaming_records_outcome(client):
+    """Test streamed exports record their metrics outcome once the stream ends."""
+
+    async def failing_chunks():
+        yield b'{"zones":['
+        raise PowerDNSError("Zone fetch failed")
+
+    async def stream_export_zones(*args, **kwargs):
+        return failing_chunks()
+
+    mock_client = MagicMock()
+    mock_client.stream_export_zones = stream_export_zones
+    mock_context = MagicMock()
+    mock_context.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_context.__aexit__ = AsyncMock(return_value=None)
+    metrics = MagicMock()
+
+    with (
+        patch("server.api.routes.dns.get_powerdns_client", return_value=mock_context),
+        patch("server.api.routes.dns.get_metrics_collector", return_value=metrics),
+    ):
+        with pytest.raises(PowerDNSError):
+            client.get("/api/dns/export/zones?format=json&stream=true")
+
+    metrics.record_dns_operation.assert_called_once_with("export_zones", "error")
+
+
 def test_import_zones_json(client):
     """Test importing zones in JSON format."""
     import_data = {
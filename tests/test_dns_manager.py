@@ -16,6 +16,7 @@ from server.dns_manager import (
     PowerDNSAPIError,
     PowerDNSClient,
     PowerDNSConnectionError,
+    close_shared_session,
     create_dns_client,
 )
 
@@ -311,6 +312,27 @@ class TestPowerDNSClient:
         with pytest.raises(ValueError, match="Unsupported record type"):
             await client.update_record("host1", "192.168.1.100", "MX")
 
+    @pytest.mark.asyncio
+    async def test_clients_share_pooled_session(self, config):
+        """Test clients reuse one keep-alive pool that closing a client leaves open."""
+        first = PowerDNSClient(config)
+        second = PowerDNSClient(config)
+
+        session = await first._get_session()
+        assert await second._get_session() is session
+        assert isinstance(session.connector, aiohttp.TCPConnector)
+        assert session.connector.limit == 100
+
+        async with first:
+            pass
+        assert not session.closed
+        assert await first._get_session() is session
+
+        await close_shared_session()
+        assert session.closed
+        assert await second._get_session() is not session
+        await close_shared_session()
+
     def test_create_dns_client(self, config):
         """Test factory function."""
         client = create_dns_client(config)
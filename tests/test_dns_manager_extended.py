@@ -14,6 +14,7 @@ from aiohttp import ClientError, ClientTimeout
 
 from server.dns_manager import (
     PowerDNSAPIError,
+    PowerDNSCircuitOpenError,
     PowerDNSClient,
     PowerDNSConnectionError,
     PowerDNSError,
@@ -329,3 +330,140 @@ class TestPowerDNSClientExtended:
         with patch.object(client, "_get_session", return_value=mock_session):
             with pytest.raises(PowerDNSError):
                 await client._make_request("GET", "/test")
+
+    @pytest.mark.asyncio
+    async def test_search_records_fans_out_and_stops_at_limit(self, config):
+        """Test zones are searched concurrently, in order, and stop once limit is reached."""
+        config["powerdns"].update({"zone_concurrency": 3, "cache_enabled": False})
+        client = PowerDNSClient(config)
+        zone_names = [f"zone{i}.test." for i in range(20)]
+        in_flight = 0
+        peak = 0
+        fetched = []
+
+        async def make_request(method, endpoint, json_data=None, params=None):
+            nonlocal in_flight, peak
+            if endpoint == "servers/localhost/zones":
+                return [{"name": name} for name in zone_names]
+            zone_name = endpoint.rsplit("/", 1)[1]
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0 if zone_name in zone_names[:4] else 0.01)
+            in_flight -= 1
+            fetched.append(zone_name)
+            return {"name": zone_name, "rrsets": [{"name": f"www.{zone_name}", "type": "A"}]}
+
+        with patch.object(client, "_make_request", side_effect=make_request):
+            zones = await client.list_zones()
+            assert [zone["record_count"] for zone in zones] == [1] * 20
+            assert peak == 3
+
+            fetched.clear()
+            results = await client.search_records("www", limit=4)
+
+        assert [record["zone"] for record in results] == zone_names[:4]
+        # Slower zones past the limit are cancelled instead of fetched
+        assert fetched == zone_names[:4]
+
+    @pytest.mark.asyncio
+    async def test_import_zones_batches_rrsets_and_reports_progress(self, config):
+        """Test each imported zone is created and filled with batched PATCHes."""
+        config["powerdns"].update(
+            {"zone_concurrency": 4, "import_batch_size": 100, "cache_enabled": False}
+        )
+        client = PowerDNSClient(config)
+        zone_file = "\n".join(
+            f"$ORIGIN zone{z}.test.\n"
+            f"@ 3600 IN SOA ns1 hostmaster 1 1h 15m 1w 300\n"
+            + "\n".join(f"host{i} A 10.0.{z}.{i}" for i in range(250))
+            for z in range(6)
+        )
+        patches = []
+        created = []
+
+        async def make_request(method, endpoint, json_data=None, params=None):
+            if method == "GET":
+                raise PowerDNSAPIError("Not found", status_code=404)
+            if method == "POST":
+                created.append(json_data["name"])
+            elif method == "PATCH":
+                patches.append((endpoint.rsplit("/", 1)[1], len(json_data["rrsets"])))
+            return {}
+
+        progress = []
+        with patch.object(client, "_make_request", side_effect=make_request):
+            results = await client.import_zones(zone_file, format="bind", progress=progress.append)
+
+        zone_names = [f"zone{z}.test." for z in range(6)]
+        assert results["zones_created"] == 6
+        assert results["records_added"] == 6 * 251
+        assert results["errors"] == []
+        assert sorted(created) == zone_names
+        # 251 RRsets per zone in PATCHes of at most 100
+        expected = [(zone, size) for zone in zone_names for size in (100, 100, 51)]
+        assert sorted(patches) == sorted(expected)
+        assert [update["zones_done"] for update in progress] == [1, 2, 3, 4, 5, 6]
+        assert [update["zone"] for update in progress] == zone_names
+
+    @pytest.mark.asyncio
+    async def test_server_errors_retried_with_jitter_and_circuit_opens(self, config):
+        """Test 5xx is retried with jittered backoff and a failing endpoint fails fast."""
+        config["powerdns"].update({"retry_max_delay": 2, "circuit_breaker_threshold": 2})
+        client = PowerDNSClient(config)
+        requests = []
+        statuses = {"servers/localhost/zones/bad.": 503, "servers/localhost/zones/gone.": 404}
+
+        class Response:
+            def __init__(self, status):
+                self.status = status
+
+            async def text(self):
+                return "" if self.status == 200 else "error"
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        class Session:
+            def request(self, method, url, **kwargs):
+                endpoint = url.split("/api/v1/", 1)[1]
+                requests.append((method, endpoint))
+                return Response(statuses.get(endpoint, 200))
+
+        sleep = AsyncMock()
+        with patch.object(client, "_get_session", AsyncMock(return_value=Session())):
+            with patch("asyncio.sleep", sleep), patch("random.random", return_value=0.25):
+                for _ in range(2):
+                    with pytest.raises(PowerDNSAPIError) as exc_info:
+                        await client._make_request("GET", "servers/localhost/zones/bad.")
+                    assert exc_info.value.status_code == 503
+
+                # 4xx is the caller's problem: not retried, and no breaker for it
+                with pytest.raises(PowerDNSAPIError):
+                    await client._make_request("GET", "servers/localhost/zones/gone.")
+
+                # POST is not idempotent, so its 5xx is not retried
+                statuses["servers/localhost/zones"] = 500
+                with pytest.raises(PowerDNSAPIError):
+                    await client._make_request("POST", "servers/localhost/zones", json_data={})
+
+                # The failing endpoint is now rejected without a request; others still work
+                with pytest.raises(PowerDNSCircuitOpenError):
+                    await client._make_request("GET", "servers/localhost/zones/bad.")
+                assert await client._make_request("GET", "servers/localhost/zones/ok.") == {}
+
+        assert requests == [("GET", "servers/localhost/zones/bad.")] * 6 + [
+            ("GET", "servers/localhost/zones/gone."),
+            ("POST", "servers/localhost/zones"),
+            ("GET", "servers/localhost/zones/ok."),
+        ]
+        # retry_delay 1s doubling, capped at 2s, scaled by jitter factor 0.75
+        assert [c.args[0] for c in sleep.call_args_list] == [0.75, 1.5] * 2
+        status = client.get_circuit_status()
+        assert status["host"] == "closed"
+        assert status["endpoints"] == {
+            "servers/localhost/zones/bad.": {"state": "open", "failures": 2},
+            "servers/localhost/zones": {"state": "closed", "failures": 1},
+        }
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the background DNS reconciler.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from server.database.operations import HostOperations
+from server.dns_manager import PowerDNSConnectionError
+from server.dns_reconciler import (
+    DNSReconciler,
+    DNSReconcilerConfigError,
+    create_dns_reconciler,
+)
+
+
+@pytest.fixture
+def powerdns(fake_powerdns):
+    """Create a fake PowerDNS with one zone holding one up-to-date record."""
+    www = {
+        "name": "www.a.test.",
+        "type": "A",
+        "ttl": 300,
+        "records": [{"content": "10.0.0.1", "disabled": False}],
+    }
+    return fake_powerdns({"a.test.": {"serial": 1, "rrsets": [www]}})
+
+
+def test_reconcile_diffs_pages_and_corrects_in_batches(db_manager, powerdns):
+    """In-sync hosts need no request; stale ones share a PATCH; bad ones fail alone."""
+    host_ops = HostOperations(db_manager)
+    www = host_ops.create_host("www", "10.0.0.1", "user-a")
+    api = host_ops.create_host("api", "10.0.0.2", "user-a")
+    db = host_ops.create_host("db", "2001:db8::5", "user-a")
+    bad = host_ops.create_host("bad", "10.0.0.4", "user-a")
+    lost = host_ops.create_host("lost", "10.0.0.5", "user-a")
+    host_ops.update_dns_info_by_id(lost.id, dns_zone="missing.test.")
+    powerdns.rejected.add("bad.a.test.")
+
+    async def run():
+        reconciler = DNSReconciler(
+            db_manager,
+            powerdns.client(cache_enabled=False, default_zone="a.test."),
+            page_size=3,
+            rate_limit=1000,
+        )
+        synced = await reconciler.reconcile()
+        stats = reconciler.get_stats()
+        await reconciler.stop()
+        return synced, stats
+
+    synced, stats = asyncio.run(run())
+
+    assert synced == 3
+    zone = "servers/localhost/zones/a.test."
+    assert powerdns.requests == [
+        ("GET", "servers/localhost/zones"),
+        # Page 1: one zone fetch, www already right, api and db in one PATCH
+        ("GET", zone),
+        ("PATCH", zone),
+        # Page 2: the refused record is the only one in its zone
+        ("GET", zone),
+        ("PATCH", zone),
+    ]
+    assert powerdns.patched == [["api.a.test.", "db.a.test."], ["bad.a.test."]]
+    db_rrset = powerdns.rrset("a.test.", "db.a.test.", "AAAA")
+    assert db_rrset["records"][0]["content"] == "2001:db8::5"
+    status = {h: host_ops.get_host_by_id(h.id).dns_sync_status for h in (www, api, db, bad, lost)}
+    assert status == {www: "synced", api: "synced", db: "synced", bad: "failed", lost: "failed"}
+    assert host_ops.get_host_by_id(api.id).dns_record_id == "api.a.test."
+    assert stats["hosts_in_sync"] == 1
+    assert stats["hosts_corrected"] == 2
+    assert stats["hosts_failed"] == 2
+    assert stats["backlog"] == 2
+
+
+def test_unreachable_powerdns_stops_pass_and_lag_grows(db_manager, powerdns):
+    """A connection error ends the pass; hosts stay pending and their wait is tracked."""
+    host_ops = HostOperations(db_manager)
+    hosts = [host_ops.create_host(f"host-{i}", f"10.0.1.{i}", "user-a") for i in range(3)]
+    client = powerdns.client(cache_enabled=False, default_zone="a.test.")
+    clock = {"now": 1000.0}
+    # The rate limiter's clock only moves when it sleeps, so spacing does not
+    # depend on how fast the passes run
+    monotonic = {"now": 0.0}
+
+    async def unreachable(zone, rrsets_data):
+        raise PowerDNSConnectionError("down")
+
+    async def fake_sleep(delay):
+        monotonic["now"] += delay
+
+    async def run():
+        reconciler = DNSReconciler(db_manager, client, page_size=1, rate_limit=5)
+        stats = []
+        with (
+            patch("server.dns_reconciler.time.monotonic", side_effect=lambda: monotonic["now"]),
+            patch("asyncio.sleep", AsyncMock(side_effect=fake_sleep)) as sleep,
+        ):
+            with patch("server.dns_reconciler.time.time", side_effect=lambda: clock["now"]):
+                with patch.object(client, "_patch_zone", side_effect=unreachable):
+                    for _ in range(2):
+                        assert await reconciler.reconcile() == 0
+                        stats.append(reconciler.get_stats())
+                        clock["now"] += 30
+
+            sleep.reset_mock()
+            assert await reconciler.reconcile() == 3
+            stats.append(reconciler.get_stats())
+        await reconciler.stop()
+        return stats, sleep
+
+    (first, second, third), sleep = asyncio.run(run())
+
+    assert (first["pass_errors"], first["hosts_checked"], first["backlog"]) == (1, 1, 3)
+    assert first["lag_seconds"] == 0.0
+    assert second["lag_seconds"] == 30.0
+    assert {host_ops.get_host_by_id(host.id).dns_sync_status for host in hosts} == {"synced"}
+    assert (third["backlog"], third["lag_seconds"]) == (0, 0.0)
+    # Three single-host pages, each PATCH spaced 1/rate_limit after the previous attempt
+    delays = [c.args[0] for c in sleep.call_args_list]
+    assert delays == pytest.approx([0.2] * 3)
+
+    with pytest.raises(DNSReconcilerConfigError):
+        create_dns_reconciler({"powerdns": {"host_reconcile_rate_limit": 0}}, db_manager, client)
+
+
+def test_unreachable_powerdns_closes_zone_fetches(db_manager, powerdns):
+    """Prefetched zone fetches are closed as soon as a correction fails."""
+    host_ops = HostOperations(db_manager)
+    host_ops.create_host("api", "10.0.0.2", "user-a")
+    client = powerdns.client(cache_enabled=False, default_zone="a.test.")
+    map_zones = client.map_zones
+    closed = []
+
+    generators = []
+
+    async def tracked(*args):
+        try:
+            async for item in map_zones(*args):
+                yield item
+        finally:
+            closed.append(True)
+
+    def tracked_map_zones(*args):
+        # Keep a reference, as a pending traceback would, so only aclose() closes it
+        generators.append(tracked(*args))
+        return generators[-1]
+
+    async def unreachable(zone, rrsets_data):
+        raise PowerDNSConnectionError("down")
+
+    async def run():
+        reconciler = DNSReconciler(db_manager, client, rate_limit=1000)
+        with patch.object(client, "map_zones", side_effect=tracked_map_zones):
+            with patch.object(client, "_patch_zone", side_effect=unreachable):
+                assert await reconciler.reconcile() == 0
+                closed_on_return = list(closed)
+        await reconciler.stop()
+        return closed_on_return
+
+    assert asyncio.run(run()) == [True]
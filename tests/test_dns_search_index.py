@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the local DNS record search index.
+"""
+
+import asyncio
+
+import pytest
+
+from server.dns_search_index import DNSSearchIndex, get_dns_search_index
+
+
+def _rrset(name, rtype, *contents):
+    """Build a PowerDNS RRset."""
+    return {
+        "name": name,
+        "type": rtype,
+        "ttl": 300,
+        "records": [{"content": content, "disabled": False} for content in contents],
+    }
+
+
+@pytest.fixture
+def powerdns(fake_powerdns):
+    """Create a fake PowerDNS with two zones."""
+    return fake_powerdns(
+        {
+            "a.test.": {
+                "serial": 1,
+                "rrsets": [
+                    _rrset("www.a.test.", "A", "10.0.0.1"),
+                    _rrset("mail.a.test.", "MX", "10 mx.example.net."),
+                    _rrset("a.test.", "NS", "ns1.example.net.", "ns2.example.net."),
+                ],
+            },
+            "b.test.": {"serial": 7, "rrsets": [_rrset("www.b.test.", "AAAA", "2001:db8::1")]},
+        }
+    )
+
+
+def test_search_by_name_content_type_and_zone(db_manager, powerdns):
+    """Name and content queries are case-insensitive substrings, optionally filtered."""
+    index = DNSSearchIndex(db_manager, powerdns.client(cache_enabled=False))
+
+    async def run():
+        assert await index.reconcile() == 2
+        return {
+            "www": await index.search("WWW"),
+            "a_only": await index.search("www", zones=["a.test"]),
+            "content": await index.search("example.net", content_search=True),
+            "typed": await index.search("test", record_type="aaaa"),
+            "short": await index.search("ma"),
+            "none": await index.search("www", zones=[]),
+        }
+
+    results = asyncio.run(run())
+
+    assert index.ready
+    assert [(r["zone"], r["name"]) for r in results["www"]] == [
+        ("a.test.", "www.a.test."),
+        ("b.test.", "www.b.test."),
+    ]
+    assert results["www"][0]["records"] == [{"content": "10.0.0.1", "disabled": False}]
+    assert [r["name"] for r in results["a_only"]] == ["www.a.test."]
+    assert [r["name"] for r in results["content"]] == ["a.test.", "mail.a.test."]
+    assert [r["name"] for r in results["typed"]] == ["www.b.test."]
+    assert [r["name"] for r in results["short"]] == ["mail.a.test."]
+    assert results["none"] == []
+
+
+def test_reconcile_refetches_only_changed_zones(db_manager, powerdns):
+    """Zones are re-indexed when their serial changes and dropped when deleted."""
+    index = DNSSearchIndex(db_manager, powerdns.client(cache_enabled=False))
+
+    async def run():
+        await index.reconcile()
+        powerdns.requests.clear()
+
+        # Changed outside Prism
+        powerdns.zones["b.test."] = {"serial": 8, "rrsets": [_rrset("db.b.test.", "A", "10.1.1.1")]}
+        del powerdns.zones["a.test."]
+        assert await index.reconcile() == 2
+        return await index.search("")
+
+    records = asyncio.run(run())
+
+    assert powerdns.fetched == ["b.test."]
+    assert [r["name"] for r in records] == ["db.b.test."]
+    assert index.get_stats()["zones_removed"] == 1
+
+
+def test_our_writes_update_the_index(db_manager, powerdns):
+    """RRsets PATCHed through any client are applied without a reconcile."""
+    client = powerdns.client(cache_enabled=False)
+    index = DNSSearchIndex(db_manager, client)
+
+    async def run():
+        await index.reconcile()
+        index.start()
+        try:
+            assert get_dns_search_index() is index
+            await client.create_a_record("api", "10.0.0.9", zone="a.test")
+            await client.delete_record("www", "A", zone="a.test")
+            await index.flush()
+            return await client.search_records("a.test", limit=10)
+        finally:
+            await index.stop()
+
+    records = asyncio.run(run())
+
+    names = [r["name"] for r in records]
+    assert "api.a.test." in names
+    assert "www.a.test." not in names
+    assert get_dns_search_index() is None
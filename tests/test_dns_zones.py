@@ -314,3 +314,36 @@ def test_zone_hierarchy_detection():
     assert "sub.example.com." in hierarchy["children"]
     assert "test.example.com." in hierarchy["children"]
     assert hierarchy["level"] == 0
+
+
+def test_zone_hierarchy_index():
+    """Test the zone hierarchy index answers lookups for many zones."""
+    from server.dns_manager import ZoneHierarchy
+
+    zones = [
+        "a.b.example.com.",
+        "example.com.",
+        "b.example.com.",
+        "example.org.",
+        "x.a.b.example.com.",
+    ]
+    hierarchy = ZoneHierarchy(zones)
+
+    assert hierarchy.parent("x.a.b.example.com.") == "a.b.example.com."
+    assert hierarchy.level("x.a.b.example.com.") == 1
+    assert hierarchy.parent("a.b.example.com.") == "b.example.com."
+    assert hierarchy.parent("example.com.") is None
+    assert hierarchy.level("example.com.") == 0
+
+    # Zones need not be indexed; levels count labels up to the nearest parent
+    assert hierarchy.parent("deep.www.example.org.") == "example.org."
+    assert hierarchy.level("deep.www.example.org.") == 2
+
+    # All descendants, in listing order
+    assert hierarchy.children("example.com.") == [
+        "a.b.example.com.",
+        "b.example.com.",
+        "x.a.b.example.com.",
+    ]
+    assert hierarchy.children("com.") == [z for z in zones if z.endswith("com.")]
+    assert hierarchy.children("missing.net.") == []
@@ -166,6 +166,154 @@ class TestHeartbeatMonitor(unittest.TestCase):
 
         asyncio.run(test_old_hosts())
 
+    def test_buffered_heartbeat_prevents_timeout(self):
+        """Test that heartbeats still in the write-behind buffer count as seen."""
+
+        async def test_buffered():
+            from server.database.connection import DatabaseManager
+            from server.database.models import Host
+            from server.database.operations import HostOperations
+            from server.heartbeat_buffer import HeartbeatBuffer
+            from server.heartbeat_monitor import HeartbeatMonitor
+
+            db_manager = DatabaseManager(self.monitor_config)
+            db_manager.initialize_schema()
+            host_ops = HostOperations(db_manager)
+            host = host_ops.create_host("buffered-host", "192.168.1.100", "user-1")
+
+            with db_manager.get_session() as session:
+                session.query(Host).filter(Host.id == host.id).update(
+                    {"last_seen": datetime.now(timezone.utc) - timedelta(minutes=10)}
+                )
+
+            buffer = HeartbeatBuffer(db_manager, flush_interval_ms=60000)
+            buffer.record(host.id)
+            buffer.record(host.id)
+            self.assertEqual(buffer.pending_count(), 1)
+
+            monitor = HeartbeatMonitor(self.monitor_config, heartbeat_buffer=buffer)
+            timeout_results = await monitor.check_host_timeouts()
+
+            # The monitor flushed the buffer before deciding
+            self.assertEqual(timeout_results.hosts_timed_out, 0)
+            self.assertEqual(buffer.pending_count(), 0)
+            stats = buffer.get_stats()
+            self.assertEqual(stats["heartbeats_coalesced"], 1)
+            self.assertEqual(stats["rows_flushed"], 1)
+            self.assertEqual(host_ops.get_host_by_id(host.id).status, "online")
+
+            await buffer.stop()
+            monitor.cleanup()
+            db_manager.cleanup()
+
+        asyncio.run(test_buffered())
+
+    def test_failed_flush_widens_timeout_cutoff(self):
+        """Test that heartbeats re-queued after failed flushes still count as seen."""
+
+        async def test_failed_flush():
+            from server.database.connection import DatabaseManager
+            from server.database.models import Host
+            from server.database.operations import HostOperations
+            from server.heartbeat_buffer import HeartbeatBuffer
+            from server.heartbeat_monitor import HeartbeatMonitor
+
+            db_manager = DatabaseManager(self.monitor_config)
+            db_manager.initialize_schema()
+            host_ops = HostOperations(db_manager)
+            host = host_ops.create_host("requeued-host", "192.168.1.100", "user-1")
+
+            with db_manager.get_session() as session:
+                session.query(Host).filter(Host.id == host.id).update(
+                    {"last_seen": datetime.now(timezone.utc) - timedelta(minutes=10)}
+                )
+
+            buffer = HeartbeatBuffer(db_manager, flush_interval_ms=1000)
+            buffer.record(host.id)
+            # The heartbeat has been waiting since flushes started failing 10 minutes ago
+            buffer._pending_since = time.time() - 600
+
+            monitor = HeartbeatMonitor(self.monitor_config, heartbeat_buffer=buffer)
+            with patch.object(
+                buffer.host_ops, "bulk_update_last_seen", side_effect=Exception("database locked")
+            ):
+                timeout_results = await monitor.check_host_timeouts()
+                self.assertGreaterEqual(buffer.max_staleness, 600)
+
+            self.assertEqual(timeout_results.hosts_timed_out, 0)
+            self.assertEqual(buffer.pending_count(), 1)
+            self.assertEqual(buffer.get_stats()["flush_errors"], 1)
+
+            # Once the database recovers the buffer drains and the widening goes away
+            await buffer.flush()
+            self.assertEqual(buffer.pending_count(), 0)
+            self.assertEqual(buffer.max_staleness, buffer.flush_interval)
+            self.assertEqual(host_ops.get_host_by_id(host.id).status, "online")
+
+            await buffer.stop()
+            monitor.cleanup()
+            db_manager.cleanup()
+
+        asyncio.run(test_failed_flush())
+
+    def test_sweep_host_timeouts(self):
+        """Test the set-based sweep marks only timed out hosts offline across chunks."""
+
+        async def test_sweep():
+            from server.database.connection import DatabaseManager
+            from server.database.models import Host
+            from server.database.operations import HostOperations
+            from server.heartbeat_monitor import HeartbeatMonitor
+
+            config = dict(self.monitor_config)
+            config["heartbeat"] = dict(self.monitor_config["heartbeat"], max_hosts_per_check=2)
+            blocking_calls = []
+
+            async def run_blocking(operation, func, *args, **kwargs):
+                blocking_calls.append(operation)
+                return await asyncio.to_thread(func, *args, **kwargs)
+
+            monitor = HeartbeatMonitor(config, run_blocking=run_blocking)
+
+            db_manager = DatabaseManager(config)
+            db_manager.initialize_schema()
+            host_ops = HostOperations(db_manager)
+            old_time = datetime.now(timezone.utc) - timedelta(minutes=10)
+            with db_manager.get_session() as session:
+                for i in range(5):
+                    session.add(
+                        Host(
+                            hostname=f"old-{i}",
+                            current_ip="192.168.1.100",
+                            created_by="user-1",
+                            last_seen=old_time,
+                        )
+                    )
+                session.add(
+                    Host(hostname="recent", current_ip="192.168.1.101", created_by="user-1")
+                )
+
+            result = await monitor.sweep_host_timeouts()
+
+            self.assertTrue(result.success)
+            self.assertEqual(result.hosts_marked_offline, 5)
+            self.assertEqual(host_ops.get_host_count_by_status("offline"), 5)
+            self.assertEqual(host_ops.get_host_by_hostname("recent").status, "online")
+            # Every chunk ran on the executor: 2 + 2 + 1 hosts
+            self.assertEqual(blocking_calls.count("mark_timed_out_hosts_offline"), 3)
+
+            stats = await monitor.get_monitoring_statistics()
+            self.assertEqual(stats["total_hosts_timed_out"], 5)
+
+            # Nothing left to sweep
+            result = await monitor.sweep_host_timeouts()
+            self.assertEqual(result.hosts_marked_offline, 0)
+
+            monitor.cleanup()
+            db_manager.cleanup()
+
+        asyncio.run(test_sweep())
+
     def test_mark_hosts_offline(self):
         """Test marking hosts as offline."""
 
@@ -180,19 +328,19 @@ class TestHeartbeatMonitor(unittest.TestCase):
             db_manager = DatabaseManager(self.monitor_config)
             db_manager.initialize_schema()
             host_ops = HostOperations(db_manager)
-            host_ops.create_host("test-host", "192.168.1.100")
+            host = host_ops.create_host("test-host", "192.168.1.100", "user-a")
+            other_host = host_ops.create_host("test-host", "192.168.1.200", "user-b")
 
             # Mark host offline
-            hostnames = ["test-host"]
-            result = await monitor.mark_hosts_offline(hostnames, "heartbeat_timeout")
+            result = await monitor.mark_hosts_offline([host.id], "heartbeat_timeout")
 
             self.assertTrue(result.success)
             self.assertEqual(result.hosts_processed, 1)
             self.assertEqual(result.hosts_marked_offline, 1)
 
-            # Verify host is offline
-            host = host_ops.get_host_by_hostname("test-host")
-            self.assertEqual(host.status, "offline")
+            # Verify only that user's host is offline
+            self.assertEqual(host_ops.get_host_by_id(host.id).status, "offline")
+            self.assertEqual(host_ops.get_host_by_id(other_host.id).status, "online")
 
             db_manager.cleanup()
 
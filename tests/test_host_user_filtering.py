@@ -109,7 +109,7 @@ class TestHostListFiltering:
         """Test that regular users only see their own hosts."""
         # Filter mock hosts to only user's hosts
         user_hosts = [h for h in mock_hosts if h.created_by == str(mock_regular_user.id)]
-        mock_host_ops.get_all_hosts.return_value = user_hosts
+        mock_host_ops.get_hosts_page.return_value = (user_hosts, len(user_hosts))
         
         # Call the endpoint
         result = await get_hosts(
@@ -118,6 +118,7 @@ class TestHostListFiltering:
             per_page=50,
             status=None,
             search=None,
+            cursor=None,
             current_user=mock_regular_user,
             host_ops=mock_host_ops
         )
@@ -127,7 +128,9 @@ class TestHostListFiltering:
         assert all(h.hostname in ["host1.example.com", "host2.example.com"] for h in result.hosts)
         
         # Verify host_ops was called with user ID
-        mock_host_ops.get_all_hosts.assert_called_with(user_id=str(mock_regular_user.id))
+        mock_host_ops.get_hosts_page.assert_called_with(
+            user_id=str(mock_regular_user.id), status=None, search=None, limit=50, offset=0
+        )
         
     @pytest.mark.asyncio
     async def test_admin_sees_all_hosts_with_flag(self, mock_admin_user, mock_hosts, mock_db):
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pluggable JSON codec.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from server.json_codec import BACKENDS, JSONCodec, available_backends
+from server.protocol import MessageProtocol, ProtocolError
+
+REGISTRATION = {
+    "version": "1.0",
+    "type": "registration",
+    "timestamp": "2025-06-01T15:30:00Z",
+    "hostname": "test-host-001",
+    "auth_token": "tok",
+}
+
+
+@pytest.fixture(params=BACKENDS)
+def codec(request):
+    """Create a codec for every backend that is installed."""
+    if request.param not in available_backends():
+        pytest.skip(f"{request.param} not installed")
+    return JSONCodec(request.param)
+
+
+class TestJSONCodec:
+    """Test codec behaviour is the same across backends."""
+
+    def test_round_trip_is_compact_utf8(self, codec):
+        """Test encoded output is compact and decodes back to the same object."""
+        data = codec.dumps({"hostname": "höst", "ports": [1, 2]})
+
+        assert isinstance(data, bytes)
+        assert b" " not in data
+        assert "höst".encode("utf-8") in data
+        assert codec.loads(data) == {"hostname": "höst", "ports": [1, 2]}
+        assert codec.loads(bytearray(data)) == codec.loads(data.decode("utf-8"))
+
+    def test_default_and_indent(self, codec):
+        """Test default handles unknown types and indent pretty-prints."""
+
+        class Opaque:
+            def __str__(self):
+                return "opaque"
+
+        data = codec.dumps({"value": Opaque()}, default=str, indent=True)
+
+        assert b"\n  " in data
+        assert codec.loads(data) == {"value": "opaque"}
+
+    def test_errors_are_normalised(self, codec):
+        """Test malformed input raises ValueError and unencodable objects TypeError."""
+        with pytest.raises(ValueError):
+            codec.loads(b"{ invalid json }")
+        with pytest.raises(ValueError):
+            codec.loads(b'{"a": "\xff"}')
+        with pytest.raises(TypeError):
+            codec.dumps({"value": object()})
+
+    def test_protocol_round_trip(self, codec):
+        """Test the TCP protocol frames messages through the configured codec."""
+        protocol = MessageProtocol(codec=codec)
+
+        messages = protocol.decode_messages(protocol.encode_message(REGISTRATION))
+
+        assert messages == [REGISTRATION]
+        with pytest.raises(ProtocolError):
+            protocol.encode_message({"value": object()})
+
+
+def test_backend_selection(monkeypatch):
+    """Test auto-detection, the environment override and unknown backends."""
+    monkeypatch.delenv("PRISM_JSON_BACKEND", raising=False)
+    assert JSONCodec().backend == available_backends()[0]
+
+    monkeypatch.setenv("PRISM_JSON_BACKEND", "json")
+    assert JSONCodec().backend == "json"
+
+    with pytest.raises(ValueError):
+        JSONCodec("yaml")
+
+
+def test_to_json_uses_codec():
+    """Test RegistrationResult.to_json still returns a str with non-JSON values stringified."""
+    from server.registration_processor import RegistrationResult
+
+    result = RegistrationResult(
+        success=True,
+        result_type="heartbeat_update",
+        message="Heartbeat updated",
+        hostname="test-host",
+        ip_address="10.0.0.1",
+        timestamp=datetime(2025, 6, 1, tzinfo=timezone.utc),
+    )
+
+    decoded = JSONCodec("json").loads(result.to_json())
+    assert decoded["hostname"] == "test-host"
+    assert decoded["timestamp"].startswith("2025-06-01")
@@ -5,7 +5,7 @@ Following TDD approach as specified in the user story.
 
 import json
 import struct
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -211,3 +211,29 @@ class TestMessageProtocol:
         assert deserialized["hostname"] == hostname
         assert deserialized["version"] == "1.0"
         assert deserialized["type"] == "registration"
+
+    def test_compact_registration_round_trip(self):
+        """Test compact registrations decode on the server and compact responses parse."""
+        from server.protocol import MessageProtocol as ServerProtocol
+
+        protocol = MessageProtocol()
+        sender = TCPSender()
+        timestamp = datetime(2025, 6, 1, 15, 30, tzinfo=timezone.utc)
+
+        payload = protocol.serialize_compact_registration(" compact-host ", "a" * 64, timestamp)
+        json_payload = protocol.serialize_message(
+            protocol.create_registration_message("compact-host")
+        )
+        assert len(payload) < len(json_payload)
+
+        server = ServerProtocol()
+        decoded = server.decode_messages(sender.frame_message(payload))[0]
+        assert decoded["hostname"] == "compact-host"
+        assert decoded["auth_token"] == "a" * 64
+        assert decoded["version"] == protocol.get_current_version()
+        protocol.validate_message(decoded)
+
+        with pytest.raises(MessageValidationError):
+            protocol.serialize_compact_registration("höst")
+        with pytest.raises(MessageValidationError):
+            protocol.serialize_compact_registration("h" * 256)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched DNS update queue used by the registration path.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from server.database.operations import HostOperations
+from server.dns_manager import PowerDNSClient, PowerDNSConnectionError, PowerDNSError
+from server.dns_update_queue import (
+    DNSUpdateQueue,
+    DNSUpdateQueueConfigError,
+    create_dns_update_queue,
+)
+
+
+@pytest.fixture
+def dns_client():
+    """Create an enabled PowerDNS client whose requests are recorded, not sent."""
+    client = PowerDNSClient({"powerdns": {"enabled": True, "default_zone": "test.local."}})
+    client._make_request = AsyncMock(return_value={})
+    return client
+
+
+def _patched_rrsets(dns_client):
+    """Get the RRset names of every PATCH sent, one list per request."""
+    return [
+        [rrset["name"] for rrset in call.kwargs["json_data"]["rrsets"]]
+        for call in dns_client._make_request.call_args_list
+    ]
+
+
+def test_flush_coalesces_and_batches_per_zone(db_manager, dns_client):
+    """Last write wins per record and each zone gets batch-sized multi-RRset PATCHes."""
+    host_ops = HostOperations(db_manager)
+    hosts = [host_ops.create_host(f"host-{i}", f"10.0.0.{i}", "user-a") for i in range(5)]
+
+    async def run():
+        queue = DNSUpdateQueue(dns_client, db_manager, batch_size=2)
+        for host in hosts:
+            queue.enqueue(host.id, host.hostname, "10.0.0.1")
+        # Renumbered again before the flush: only the newest address is sent
+        queue.enqueue(hosts[0].id, "host-0", "10.9.9.9")
+        queue.enqueue(hosts[1].id, "host-1", "2001:db8::1")
+        queue.enqueue(None, "other", "10.0.0.7", zone="other.local")
+
+        assert queue.pending_count() == 7
+        assert await queue.flush() == 7
+        return queue.get_stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["updates_coalesced"] == 1
+    assert stats["records_sent"] == 7
+    assert stats["patches"] == 4
+    assert stats["pending"] == 0
+
+    endpoints = [call.args[1] for call in dns_client._make_request.call_args_list]
+    assert endpoints.count("servers/localhost/zones/test.local.") == 3
+    assert endpoints.count("servers/localhost/zones/other.local.") == 1
+    assert max(len(names) for names in _patched_rrsets(dns_client)) == 2
+
+    bodies = [
+        call.kwargs["json_data"]["rrsets"] for call in dns_client._make_request.call_args_list
+    ]
+    host_0 = [rrset for body in bodies for rrset in body if rrset["name"] == "host-0.test.local."]
+    assert [rrset["records"][0]["content"] for rrset in host_0] == ["10.9.9.9"]
+
+    for host in hosts:
+        stored = host_ops.get_host_by_id(host.id)
+        assert stored.dns_sync_status == "synced"
+        assert stored.dns_record_id == f"{host.hostname}.test.local."
+        assert stored.dns_zone == "test.local."
+
+
+def test_rejected_batch_is_retried_singly(db_manager, dns_client):
+    """A refused PATCH is split so only the bad record is marked failed."""
+    host_ops = HostOperations(db_manager)
+    good = host_ops.create_host("good", "10.0.0.1", "user-a")
+    bad = host_ops.create_host("bad", "10.0.0.2", "user-a")
+
+    async def make_request(method, endpoint, json_data=None, params=None):
+        if any(rrset["name"] == "bad.test.local." for rrset in json_data["rrsets"]):
+            # _make_request reports API errors wrapped in PowerDNSError
+            raise PowerDNSError("Unexpected error: API error: 422")
+        return {}
+
+    dns_client._make_request = AsyncMock(side_effect=make_request)
+
+    async def run():
+        queue = DNSUpdateQueue(dns_client, db_manager)
+        queue.enqueue(good.id, "good", "10.0.0.1")
+        queue.enqueue(bad.id, "bad", "10.0.0.2")
+        return await queue.flush(), queue.get_stats()
+
+    accepted, stats = asyncio.run(run())
+
+    assert accepted == 1
+    assert _patched_rrsets(dns_client) == [
+        ["good.test.local.", "bad.test.local."],
+        ["good.test.local."],
+        ["bad.test.local."],
+    ]
+    assert stats["records_failed"] == 1
+    assert host_ops.get_host_by_id(good.id).dns_sync_status == "synced"
+    assert host_ops.get_host_by_id(bad.id).dns_sync_status == "failed"
+
+
+def test_unreachable_powerdns_defers_batch_without_retry(db_manager, dns_client):
+    """Connection errors defer the batch once, leaving hosts pending for the next flush."""
+    host_ops = HostOperations(db_manager)
+    hosts = [host_ops.create_host(f"host-{i}", "10.0.0.1", "user-a") for i in range(3)]
+    dns_client._make_request = AsyncMock(side_effect=PowerDNSConnectionError("down"))
+
+    async def run():
+        queue = DNSUpdateQueue(dns_client, db_manager)
+        for host in hosts:
+            queue.enqueue(host.id, host.hostname, "10.0.0.1")
+        assert not queue.enqueue(None, "broken", "not-an-ip")
+        assert await queue.flush() == 0
+        assert queue.pending_count() == 3
+        assert queue.get_stats()["records_deferred"] == 3
+        statuses = {host_ops.get_host_by_id(host.id).dns_sync_status for host in hosts}
+
+        # PowerDNS is back: the deferred updates go out, with any newer address
+        dns_client._make_request = AsyncMock(return_value={})
+        queue.enqueue(hosts[0].id, "host-0", "10.9.9.9")
+        assert await queue.flush() == 3
+        return statuses
+
+    assert asyncio.run(run()) == {"pending"}
+    contents = [
+        rrset["records"][0]["content"]
+        for rrset in dns_client._make_request.call_args.kwargs["json_data"]["rrsets"]
+    ]
+    assert sorted(contents) == ["10.0.0.1", "10.0.0.1", "10.9.9.9"]
+    assert {host_ops.get_host_by_id(host.id).dns_sync_status for host in hosts} == {"synced"}
+
+
+def test_shared_record_reports_status_to_every_tenant(db_manager, dns_client):
+    """Hosts of different users with the same hostname all get the record's outcome."""
+    host_ops = HostOperations(db_manager)
+    web_a = host_ops.create_host("web", "10.0.0.1", "user-a")
+    web_b = host_ops.create_host("web", "10.0.0.2", "user-b")
+    dns_client._make_request = AsyncMock(side_effect=PowerDNSConnectionError("down"))
+
+    async def run():
+        queue = DNSUpdateQueue(dns_client, db_manager)
+        queue.enqueue(web_a.id, "web", "10.0.0.1")
+        queue.enqueue(web_b.id, "web", "10.0.0.2")
+        assert queue.pending_count() == 1
+
+        # Deferred: both hosts stay queued with the record
+        assert await queue.flush() == 0
+        statuses = {host_ops.get_host_by_id(h.id).dns_sync_status for h in (web_a, web_b)}
+
+        dns_client._make_request = AsyncMock(return_value={})
+        assert await queue.flush() == 1
+        return statuses
+
+    assert asyncio.run(run()) == {"pending"}
+    assert _patched_rrsets(dns_client) == [["web.test.local."]]
+    for host in (web_a, web_b):
+        stored = host_ops.get_host_by_id(host.id)
+        assert stored.dns_sync_status == "synced"
+        assert stored.dns_record_id == "web.test.local."
+
+
+def test_stop_flushes_pending_updates(dns_client):
+    """Stopping the queue sends what is still pending."""
+
+    async def run():
+        queue = create_dns_update_queue(
+            {"registration": {"dns_flush_interval_ms": 60000}}, dns_client
+        )
+        queue.start()
+        queue.enqueue(None, "late", "10.0.0.1")
+        await queue.stop()
+        return queue.pending_count()
+
+    assert asyncio.run(run()) == 0
+    assert _patched_rrsets(dns_client) == [["late.test.local."]]
+
+    with pytest.raises(DNSUpdateQueueConfigError):
+        create_dns_update_queue({"registration": {"dns_batch_size": 0}}, dns_client)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory host index used by the registration hot path.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from server.database.models import Host
+from server.database.operations import HostOperations
+from server.heartbeat_buffer import HeartbeatBuffer
+from server.host_index import HostIndex, create_host_index
+from server.registration_processor import RegistrationProcessor
+
+
+def test_load_indexes_hosts_per_user(db_manager):
+    """Same hostname under two users gives two independent entries."""
+    host_ops = HostOperations(db_manager)
+    host_ops.create_host("web", "10.0.0.1", "user-a")
+    host_ops.create_host("web", "10.0.0.2", "user-b")
+
+    host_index = create_host_index(db_manager)
+
+    assert len(host_index) == 2
+    assert host_index.get("user-a", "web").current_ip == "10.0.0.1"
+    assert host_index.get("user-b", "web").current_ip == "10.0.0.2"
+    assert host_index.get("user-c", "web") is None
+
+    host_index.mark_offline("user-a", "web")
+    assert host_index.get("user-a", "web").status == "offline"
+    assert host_index.get("user-b", "web").status == "online"
+
+    host_index.remove("user-b", "web")
+    assert host_index.get("user-b", "web") is None
+    assert host_index.get_stats()["size"] == 1
+
+
+def test_heartbeat_served_from_index_without_reads(db_manager):
+    """Known online hosts with an unchanged IP never read the hosts table."""
+
+    async def run():
+        host_index = HostIndex(db_manager)
+        buffer = HeartbeatBuffer(db_manager, flush_interval_ms=60000, host_index=host_index)
+        processor = RegistrationProcessor(
+            {"registration": {"executor_workers": 0}},
+            db_manager=db_manager,
+            heartbeat_buffer=buffer,
+            host_index=host_index,
+        )
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        # First registration creates the host and indexes it
+        result = await processor._process_host_registration(
+            "hb-host", "10.0.0.1", timestamp, "user-a"
+        )
+        assert result.result_type == "new_registration"
+        assert host_index.get("user-a", "hb-host") is not None
+
+        with patch.object(
+            processor.host_ops, "get_host_by_hostname", side_effect=AssertionError("DB read")
+        ):
+            result = await processor._process_host_registration(
+                "hb-host", "10.0.0.1", timestamp, "user-a"
+            )
+        assert result.result_type == "heartbeat_update"
+        assert buffer.pending_count() == 1
+
+        # IP change goes through the database and updates the index
+        result = await processor._process_host_registration(
+            "hb-host", "10.0.0.9", timestamp, "user-a"
+        )
+        assert result.result_type == "ip_change"
+        assert host_index.get("user-a", "hb-host").current_ip == "10.0.0.9"
+
+        await buffer.stop()
+        processor.cleanup()
+
+    asyncio.run(run())
+
+
+def test_flush_evicts_hosts_deleted_elsewhere(db_manager):
+    """A heartbeat for a row deleted outside the pipeline drops it from the index."""
+
+    async def run():
+        host = HostOperations(db_manager).create_host("gone", "10.0.0.1", "user-a")
+        host_index = create_host_index(db_manager)
+        buffer = HeartbeatBuffer(db_manager, host_index=host_index)
+
+        with db_manager.get_session() as session:
+            session.query(Host).filter(Host.id == host.id).delete()
+
+        buffer.record(host.id)
+        assert await buffer.flush() == 0
+        assert host_index.get("user-a", "gone") is None
+        assert buffer.get_stats()["missing_hosts"] == 1
+
+        await buffer.stop()
+
+    asyncio.run(run())
+
+
+def test_stale_entry_is_evicted_and_host_recreated(db_manager):
+    """A registration for a host deleted behind the index re-creates it."""
+
+    async def run():
+        host = HostOperations(db_manager).create_host("stale", "10.0.0.1", "user-a")
+        host_index = create_host_index(db_manager)
+        processor = RegistrationProcessor(
+            {"registration": {"executor_workers": 0}},
+            db_manager=db_manager,
+            host_index=host_index,
+        )
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        with db_manager.get_session() as session:
+            session.query(Host).filter(Host.id == host.id).delete()
+
+        # The indexed id no longer matches a row, so the write touches nothing
+        result = await processor._process_host_registration(
+            "stale", "10.0.0.2", timestamp, "user-a"
+        )
+        assert result.result_type == "new_registration"
+        assert host_index.get("user-a", "stale").id == result.host_id
+        assert HostOperations(db_manager).get_host_by_id(result.host_id).current_ip == "10.0.0.2"
+        assert host_index.get_stats()["evictions"] == 1
+
+        processor.cleanup()
+
+    asyncio.run(run())
@@ -143,6 +143,127 @@ class TestMessageProtocol(unittest.TestCase):
         with self.assertRaises(ProtocolError):
             protocol.decode_messages(oversized_length)
 
+    def test_decode_pipelined_messages_across_chunks(self):
+        """Test many pipelined frames split at arbitrary points decode in order."""
+        from server.protocol import MessageProtocol
+
+        protocol = MessageProtocol()
+        stream = b"".join(
+            protocol.encode_message({"type": "registration", "hostname": f"host-{i}"})
+            for i in range(5000)
+        )
+
+        messages = []
+        for start in range(0, len(stream), 1000):
+            messages.extend(protocol.decode_messages(stream[start : start + 1000]))
+
+        self.assertEqual([m["hostname"] for m in messages], [f"host-{i}" for i in range(5000)])
+        self.assertEqual(protocol.get_buffer_size(), 0)
+
+    def test_decode_skips_invalid_frame(self):
+        """Test a malformed payload is consumed so the next frame still decodes."""
+        from server.protocol import MessageProtocol, ProtocolError
+
+        protocol = MessageProtocol()
+        invalid_json = b"{ invalid json }"
+
+        with self.assertRaises(ProtocolError):
+            protocol.decode_messages(struct.pack("!I", len(invalid_json)) + invalid_json)
+
+        messages = protocol.decode_messages(
+            protocol.encode_message(self.sample_registration_message)
+        )
+        self.assertEqual(messages, [self.sample_registration_message])
+
+    def test_read_message_from_stream(self):
+        """Test read_message frames with readexactly and reports clean EOF as None."""
+        from server.protocol import FrameSizeError, MessageProtocol
+
+        async def read_all():
+            protocol = MessageProtocol(max_message_size=1024)
+            reader = asyncio.StreamReader()
+            reader.feed_data(protocol.encode_message(self.sample_registration_message))
+            reader.feed_data(protocol.encode_message(self.sample_response_message))
+            reader.feed_eof()
+
+            first = await protocol.read_message(reader)
+            second = await protocol.read_message(reader)
+            end = await protocol.read_message(reader)
+
+            truncated = asyncio.StreamReader()
+            truncated.feed_data(protocol.encode_message(self.sample_registration_message)[:10])
+            truncated.feed_eof()
+            with self.assertRaises(asyncio.IncompleteReadError):
+                await protocol.read_message(truncated)
+
+            oversized = asyncio.StreamReader()
+            oversized.feed_data(struct.pack("!I", 2048))
+            with self.assertRaises(FrameSizeError):
+                await protocol.read_message(oversized)
+
+            return first, second, end
+
+        first, second, end = asyncio.run(read_all())
+
+        self.assertEqual(first, self.sample_registration_message)
+        self.assertEqual(second, self.sample_response_message)
+        self.assertIsNone(end)
+
+    def test_decode_compact_registration(self):
+        """Test a compact frame decodes to a v1.0 message and the response follows suit."""
+        from server.protocol import WIRE_FORMAT_COMPACT, WIRE_FORMAT_JSON, MessageProtocol
+
+        protocol = MessageProtocol()
+        payload = (
+            struct.pack("!BBQ", 0x02, 0x01, 1748791800000)
+            + bytes((13,))
+            + b"test-host-001"
+            + bytes((3,))
+            + b"tok"
+        )
+
+        messages = protocol.decode_messages(struct.pack("!I", len(payload)) + payload)
+
+        self.assertEqual(
+            messages,
+            [
+                {
+                    "version": "1.0",
+                    "type": "registration",
+                    "timestamp": "2025-06-01T15:30:00+00:00",
+                    "hostname": "test-host-001",
+                    "auth_token": "tok",
+                }
+            ],
+        )
+        self.assertEqual(protocol.wire_format, WIRE_FORMAT_COMPACT)
+
+        response = protocol.encode_response("success", "ok")
+        self.assertEqual(response[4:6], bytes((0x02, 0x02)))
+        self.assertEqual(response[14:], struct.pack("!BH", 0, 2) + b"ok")
+
+        # A JSON frame on the same connection switches responses back to JSON
+        protocol.decode_messages(protocol.encode_message(self.sample_registration_message))
+        self.assertEqual(protocol.wire_format, WIRE_FORMAT_JSON)
+        self.assertEqual(
+            protocol.decode_messages(protocol.encode_response("error", "no"))[0]["status"], "error"
+        )
+
+    def test_decode_compact_registration_malformed(self):
+        """Test truncated or padded compact frames raise ProtocolError."""
+        from server.protocol import MessageProtocol, ProtocolError
+
+        protocol = MessageProtocol()
+        header = struct.pack("!BBQ", 0x02, 0x01, 1748791800000)
+        for payload in (
+            header,
+            header + bytes((10,)) + b"short",
+            header + bytes((4,)) + b"host" + bytes((0,)) + b"extra",
+            struct.pack("!BBQ", 0x02, 0x09, 0) + bytes((1,)) + b"h" + bytes((0,)),
+        ):
+            with self.assertRaises(ProtocolError):
+                protocol.decode_messages(struct.pack("!I", len(payload)) + payload)
+
     def test_create_registration_response_success(self):
         """Test creating successful registration response."""
         from server.protocol import MessageProtocol
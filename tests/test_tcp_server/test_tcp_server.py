@@ -409,6 +409,60 @@ class TestTCPServer(unittest.TestCase):
 
         asyncio.run(test_stats_tracking())
 
+    def test_tcp_server_shares_registration_pipeline(self):
+        """Test all connections reuse the server-scoped registration service."""
+
+        async def test_shared_pipeline():
+            from server.connection_handler import ConnectionHandler
+            from server.tcp_server import TCPServer
+
+            server = TCPServer(self.server_config)
+            self.assertIsNotNone(server.registration_service)
+
+            handlers = []
+            for port in (10001, 10002):
+                mock_writer = Mock()
+                mock_writer.get_extra_info.return_value = ("127.0.0.1", port)
+                handlers.append(
+                    ConnectionHandler(
+                        AsyncMock(),
+                        mock_writer,
+                        config=self.server_config,
+                        db_manager=server.db_manager,
+                        registration_service=server.registration_service,
+                    )
+                )
+
+            first, second = handlers
+            self.assertIs(first.registration_processor, second.registration_processor)
+            self.assertIs(first.registration_processor.db_manager, server.db_manager)
+            self.assertIs(first.host_ops, second.host_ops)
+
+            await server.registration_service.close()
+            server.db_manager.cleanup()
+
+        asyncio.run(test_shared_pipeline())
+
+    def test_tcp_server_uses_provided_dns_client(self):
+        """Test a caller-owned PowerDNS client is used but not closed by the server."""
+
+        async def test_provided_client():
+            from server.tcp_server import TCPServer
+
+            config = dict(self.server_config, powerdns={"enabled": True})
+            dns_client = AsyncMock()
+
+            server = TCPServer(config, dns_client=dns_client)
+            registration_service = server.registration_service
+            self.assertIs(registration_service.dns_client, dns_client)
+            self.assertIs(registration_service.dns_update_queue.dns_client, dns_client)
+
+            await registration_service.close()
+            dns_client.close.assert_not_awaited()
+            server.db_manager.cleanup()
+
+        asyncio.run(test_provided_client())
+
 
 class TestConnectionHandler(unittest.TestCase):
     """Test connection handler functionality."""
@@ -479,7 +533,11 @@ class TestConnectionHandler(unittest.TestCase):
             encoded_message = protocol.encode_message(message)
 
             # Mock reader to return our test message, then simulate disconnect
-            mock_reader.read.side_effect = [encoded_message, b""]  # First message, then disconnect
+            mock_reader.readexactly.side_effect = [
+                encoded_message[:4],
+                encoded_message[4:],
+                asyncio.IncompleteReadError(b"", 4),
+            ]
 
             handler = ConnectionHandler(mock_reader, mock_writer, db_manager=mock_db_manager)
 
@@ -521,8 +579,8 @@ class TestConnectionHandler(unittest.TestCase):
             mock_writer.wait_closed = AsyncMock()
             mock_writer.is_closing.return_value = False  # Not closing initially
 
-            # Mock reader to simulate client disconnect (empty read)
-            mock_reader.read.return_value = b""
+            # Mock reader to simulate client disconnect (EOF before a length prefix)
+            mock_reader.readexactly.side_effect = asyncio.IncompleteReadError(b"", 4)
 
             # Mock database manager to prevent logging errors
             mock_db_manager = Mock()
@@ -555,7 +613,7 @@ class TestConnectionHandler(unittest.TestCase):
             mock_writer.is_closing.return_value = False  # Not closing initially
 
             # Mock reader to simulate timeout
-            mock_reader.read.side_effect = asyncio.TimeoutError()
+            mock_reader.readexactly.side_effect = asyncio.TimeoutError()
 
             # Mock database manager to prevent logging errors
             mock_db_manager = Mock()
@@ -4,6 +4,9 @@ Tests for Server-Side Token Validation (SCRUM-140)
 Test-driven development for token validation in TCP registration messages.
 """
 
+import asyncio
+import time
+
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, Mock, patch
@@ -143,6 +146,7 @@ class TestTokenValidation:
         # Mock the database manager's get_session method
         mock_session = Mock()
         mock_query = Mock()
+        mock_query.filter.return_value.first.return_value = None  # legacy token, no lookup hash
         mock_query.filter.return_value.all.return_value = [valid_token]
         mock_session.query.return_value = mock_query
         mock_session.commit = Mock()
@@ -168,6 +172,7 @@ class TestTokenValidation:
         # Mock the database manager's get_session method
         mock_session = Mock()
         mock_query = Mock()
+        mock_query.filter.return_value.first.return_value = None  # legacy token, no lookup hash
         mock_query.filter.return_value.all.return_value = [expired_token]
         mock_session.query.return_value = mock_query
         mock_session.commit = Mock()
@@ -188,6 +193,7 @@ class TestTokenValidation:
         # Mock the database manager's get_session method
         mock_session = Mock()
         mock_query = Mock()
+        mock_query.filter.return_value.first.return_value = None  # legacy token, no lookup hash
         mock_query.filter.return_value.all.return_value = [valid_token]
         mock_session.query.return_value = mock_query
         mock_session.commit = Mock()
@@ -210,6 +216,156 @@ class TestTokenValidation:
             
             assert result1 == result2
 
+    @pytest.mark.asyncio
+    async def test_indexed_lookup_and_legacy_backfill(self, tmp_path, test_user):
+        """Test tokens are found by lookup hash and legacy tokens are backfilled."""
+        config = {"database": {"path": str(tmp_path / "tokens.db")}}
+        processor = RegistrationProcessor(config)
+
+        with processor.db_manager.get_session() as db:
+            db.add(test_user)
+            db.add(
+                APIToken(
+                    user_id=test_user.id,
+                    name="New Token",
+                    token_hash=APIToken.hash_token("new-token-123"),
+                    lookup_hash=APIToken.compute_lookup_hash("new-token-123"),
+                )
+            )
+            db.add(
+                APIToken(
+                    user_id=test_user.id,
+                    name="Legacy Token",
+                    token_hash=APIToken.hash_token("legacy-token-123"),
+                )
+            )
+
+        result = processor._lookup_token("new-token-123", "192.168.1.100")
+        assert result['valid'] is True
+        assert result['user_id'] == str(test_user.id)
+
+        result = processor._lookup_token("legacy-token-123", "192.168.1.100")
+        assert result['valid'] is True
+
+        with processor.db_manager.get_session() as db:
+            legacy = db.query(APIToken).filter(APIToken.name == "Legacy Token").one()
+            assert legacy.lookup_hash == APIToken.compute_lookup_hash("legacy-token-123")
+
+        result = processor._lookup_token("unknown-token", "192.168.1.100")
+        assert result == {'valid': False, 'reason': 'token_not_found'}
+
+        processor.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_unknown_tokens_do_not_rescan_legacy_tokens(self, tmp_path, test_user):
+        """Test unknown tokens are cached and legacy tokens are never rejected unscanned."""
+        config = {"database": {"path": str(tmp_path / "tokens.db")}}
+        processor = RegistrationProcessor(config)
+
+        with processor.db_manager.get_session() as db:
+            db.add(test_user)
+            db.add(
+                APIToken(
+                    user_id=test_user.id,
+                    name="Legacy Token",
+                    token_hash=APIToken.hash_token("legacy-token-123"),
+                )
+            )
+
+        with patch.object(APIToken, 'verify_token', autospec=True, return_value=False) as verify:
+            result = await processor._validate_token("garbage-1", "192.168.1.100")
+            assert result == {'valid': False, 'reason': 'token_not_found'}
+            assert verify.call_count == 1
+
+            # A repeated unknown token is answered from the cache
+            with patch.object(processor, '_lookup_token') as lookup:
+                result = await processor._validate_token("garbage-1", "192.168.1.100")
+                assert result == {'valid': False, 'reason': 'token_not_found'}
+                assert not lookup.called
+            assert verify.call_count == 1
+
+        # A legacy token presented right after another scan is still accepted
+        result = await processor._validate_token("legacy-token-123", "192.168.1.100")
+        assert result['valid'] is True
+
+        # With no legacy tokens left the scan is skipped altogether
+        result = processor._lookup_token("garbage-3", "192.168.1.100")
+        assert result == {'valid': False, 'reason': 'token_not_found'}
+        assert processor._legacy_tokens_remaining is False
+
+        processor.cleanup()
+
+    def test_backfill_lookup_hashes(self, tmp_path, test_user):
+        """Test legacy tokens can be backfilled offline from known plain tokens."""
+        config = {"database": {"path": str(tmp_path / "tokens.db")}}
+        processor = RegistrationProcessor(config)
+
+        with processor.db_manager.get_session() as db:
+            db.add(test_user)
+            for name in ("legacy-a", "legacy-b"):
+                db.add(
+                    APIToken(
+                        user_id=test_user.id,
+                        name=name,
+                        token_hash=APIToken.hash_token(f"{name}-token"),
+                    )
+                )
+
+        assert processor.backfill_lookup_hashes(["legacy-a-token", "unknown-token"]) == 1
+        # Already backfilled tokens are skipped
+        assert processor.backfill_lookup_hashes(["legacy-a-token", "legacy-b-token"]) == 1
+
+        with processor.db_manager.get_session() as db:
+            hashes = {t.name: t.lookup_hash for t in db.query(APIToken).all()}
+        assert hashes == {
+            "legacy-a": APIToken.compute_lookup_hash("legacy-a-token"),
+            "legacy-b": APIToken.compute_lookup_hash("legacy-b-token"),
+        }
+
+        # The backfilled token now takes the indexed path without a scan
+        with patch.object(processor, '_find_legacy_token') as scan:
+            assert processor._lookup_token("legacy-b-token", "192.168.1.100")['valid'] is True
+            assert not scan.called
+
+        processor.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_token_lookup_runs_off_event_loop(self, test_config):
+        """Test blocking token lookups run on the executor and are coalesced."""
+        import threading
+
+        processor = RegistrationProcessor(test_config)
+        lookup_threads = []
+
+        def slow_lookup(token, client_ip):
+            lookup_threads.append(threading.current_thread())
+            time.sleep(0.05)
+            return {'valid': True, 'user_id': 'user-123', 'token_id': 'token-1'}
+
+        with patch.object(processor, '_lookup_token', side_effect=slow_lookup):
+            results = await asyncio.gather(
+                *(processor._validate_token("shared-token", "192.168.1.100") for _ in range(5))
+            )
+
+        assert all(result['valid'] for result in results)
+        assert len(lookup_threads) == 1  # concurrent misses share one lookup
+        assert lookup_threads[0] is not threading.main_thread()
+
+        processor.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_executor_disabled_runs_inline(self, test_config):
+        """Test executor_workers=0 keeps blocking calls on the loop thread."""
+        import threading
+
+        config = dict(test_config, registration={"executor_workers": 0})
+        processor = RegistrationProcessor(config)
+
+        thread = await processor.run_blocking("probe", threading.current_thread)
+        assert thread is threading.main_thread()
+
+        processor.cleanup()
+
     @pytest.mark.asyncio
     async def test_registration_metrics(self, test_config):
         """Test that registration metrics are tracked."""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the BIND zone file parser.
+"""
+
+import io
+import re
+
+import pytest
+
+from server.dns_manager import PowerDNSClient
+from server.zone_file import ResourceRecord, ZoneFileError, iter_zone_file, parse_ttl
+
+ZONE_FILE = """\
+$ORIGIN example.com.
+$TTL 1h
+@   IN  SOA ns1 hostmaster (
+            2024010101 ; serial
+            2h         ; refresh
+            15m 1w 300 )
+    IN  NS  ns1
+    IN  NS  ns2.example.net.
+    IN  MX  10 mail
+www 300 IN A 192.0.2.1
+        IN  AAAA 2001:db8::1
+txt IN 600 TXT "v=spf1 ; -all" "second"
+_sip._tcp IN SRV 10 60 5060 sip
+$ORIGIN sub.example.com.
+host    A   192.0.2.2
+"""
+
+
+def test_parse_zone_file():
+    """Directives, continuations, inherited owners and relative names are resolved."""
+    records = list(iter_zone_file(io.StringIO(ZONE_FILE)))
+
+    assert records == [
+        ResourceRecord(
+            "example.com.",
+            3600,
+            "SOA",
+            "ns1.example.com. hostmaster.example.com. 2024010101 7200 900 604800 300",
+        ),
+        ResourceRecord("example.com.", 3600, "NS", "ns1.example.com."),
+        ResourceRecord("example.com.", 3600, "NS", "ns2.example.net."),
+        ResourceRecord("example.com.", 3600, "MX", "10 mail.example.com."),
+        ResourceRecord("www.example.com.", 300, "A", "192.0.2.1"),
+        ResourceRecord("www.example.com.", 3600, "AAAA", "2001:db8::1"),
+        ResourceRecord("txt.example.com.", 600, "TXT", '"v=spf1 ; -all" "second"'),
+        ResourceRecord("_sip._tcp.example.com.", 3600, "SRV", "10 60 5060 sip.example.com."),
+        ResourceRecord("host.sub.example.com.", 3600, "A", "192.0.2.2"),
+    ]
+
+
+def test_ttl_defaults_and_units():
+    """Without $TTL, records inherit the last explicit TTL."""
+    records = list(iter_zone_file(["a 120 A 192.0.2.1", "b A 192.0.2.2"], origin="test"))
+
+    assert [(r.name, r.ttl) for r in records] == [("a.test.", 120), ("b.test.", 120)]
+    assert parse_ttl("1w2d3h4m5s") == 788645
+    with pytest.raises(ValueError):
+        parse_ttl("1x")
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ("www A 192.0.2.1", "Line 1: Relative name 'www' without $ORIGIN"),
+        ("$ORIGIN test.\n@ SOA ns1 hostmaster ( 1 2 3\n", "Line 2: Unbalanced '('"),
+        ("$INCLUDE other.zone", "Line 1: Unsupported directive $INCLUDE"),
+        ('$ORIGIN test.\n@ TXT "open', "Line 2: Unterminated quoted string"),
+        ("  A 192.0.2.1", "Line 1: Record without an owner name"),
+    ],
+)
+def test_parse_errors(data, message):
+    """Malformed input is reported with its line number."""
+    with pytest.raises(ZoneFileError, match=re.escape(message)):
+        list(iter_zone_file(io.StringIO(data)))
+
+
+def test_bind_import_groups_records_by_soa_zone():
+    """Records go to the closest zone with an SOA, grouped into RRsets."""
+    client = PowerDNSClient({"powerdns": {"enabled": True}})
+    zone_file = ZONE_FILE + "$ORIGIN sub.example.com.\n@ SOA ns1 hostmaster 1 2 3 4 5\n"
+
+    zones = {zone["name"]: zone for zone in client._parse_bind_import(zone_file)}
+
+    assert sorted(zones) == ["example.com.", "sub.example.com."]
+    ns = [r for r in zones["example.com."]["rrsets"] if r["type"] == "NS"]
+    assert [record["content"] for record in ns[0]["records"]] == [
+        "ns1.example.com.",
+        "ns2.example.net.",
+    ]
+    assert [r["name"] for r in zones["sub.example.com."]["rrsets"]] == [
+        "host.sub.example.com.",
+        "sub.example.com.",
+    ]